@@ -40,6 +40,10 @@ Data 엔티티 등록 / 경로 조립 / 메타 조회를 담당.
     #   "analysis_id": "CBNIPT-202507-0001-A001",
     #   "metadata":    {"ref_genome": "hg38", "mean_depth": 42.3},
     # }
+
+    # 등록된 파일 MD5 / 크기 검증 (프로세스 풀, 변경 없는 파일은 건너뜀) → 결과를 한 번에 기록
+    summary = svc.verify_checksums(analysis_id="CBNIPT-202507-0001-A001")
+    # {"일치": 3, "변경 없음": 5, "불일치": 1}
 """
 
 import os
@@ -47,8 +51,9 @@ from typing import Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
-from app.schema.objects import Data, Analysis
-from app.service.id_service import IDService
+from app.core import checksum
+from app.core.id_service import IDService
+from app.schema.objects import Data, Analysis, _kst_now
 
 
 # 파일 타입별 기본 확장자 힌트 (override 가능)
@@ -149,6 +154,8 @@ class DataService:
             "file_ext":        row.file_ext,
             "file_size_bytes": row.file_size_bytes,
             "md5_checksum":    row.md5_checksum,
+            "verify_status":   row.verify_status,
+            "verified_at":     row.verified_at.isoformat() if row.verified_at else None,
             "is_archived":     row.is_archived,
             "analysis_id":     row.analysis_id,
             "created_at":      row.created_at.isoformat() if row.created_at else None,
@@ -170,6 +177,69 @@ class DataService:
             row.file_size_bytes = size_bytes
             self.db.flush()
 
+    def update_checksums(self, results: list[dict]) -> int:
+        """
+        checksum.verify_files 결과(key = Data.id)를 bulk UPDATE 한 번으로 기록.
+            - 계산한 size / mtime / 검증 결과 / 시각은 항상 갱신, 실제 MD5 는 verified_md5 에
+            - md5_checksum 은 기록이 없던 파일(신규 기록)만 채움 (불일치여도 원래 기록은 보존)
+            - 변경 없음은 verified_at 만 갱신
+        """
+        now = _kst_now()
+        mappings = []
+        for r in results:
+            row = {"id": r["key"], "verified_at": now}
+            if r["status"] != checksum.UNCHANGED:
+                row["verify_status"] = r["status"]
+            if r["size"] is not None:
+                row["file_size_bytes"] = r["size"]
+                row["file_mtime_ns"] = r["mtime_ns"]
+            if r["md5"]:
+                row["verified_md5"] = r["md5"]
+            if r["status"] == checksum.RECORDED:
+                row["md5_checksum"] = r["md5"]
+            mappings.append(row)
+        # 같은 컬럼 조합끼리 붙여 둬야 executemany 로 묶인다
+        mappings.sort(key=lambda row: sorted(row))
+        self.db.bulk_update_mappings(Data, mappings)
+        self.db.flush()
+        return len(mappings)
+
+    def verify_checksums(
+        self,
+        data_ids: Optional[list[str]] = None,
+        analysis_id: Optional[str] = None,
+        workers: Optional[int] = None,
+        force: bool = False,
+        include_archived: bool = False,
+    ) -> dict:
+        """
+        등록된 파일을 다시 읽어 기록된 md5 와 비교하고 결과를 update_checksums 로 기록.
+        지난 검증 뒤 size / mtime 이 그대로인 파일은 읽지 않음 (force=True 면 전부).
+        그 사이 md5_checksum 이 바뀌었으면 verified_md5 로 다시 판정.
+        반환: {검증 결과: 파일 수}   (commit은 호출자가)
+        """
+        q = self.db.query(
+            Data.id, Data.file_path, Data.md5_checksum, Data.file_size_bytes,
+            Data.file_mtime_ns, Data.verify_status, Data.verified_md5,
+        )
+        if data_ids is not None:
+            q = q.filter(Data.data_id.in_(data_ids))
+        if analysis_id:
+            q = q.filter(Data.analysis_id == analysis_id)
+        if not include_archived:
+            q = q.filter(Data.is_archived == 0)
+
+        items = [
+            {"key": pk, "path": path, "md5": md5, "size": size, "mtime_ns": mtime_ns, "status": status,
+             "verified_md5": verified_md5}
+            for pk, path, md5, size, mtime_ns, status, verified_md5 in q.all()
+        ]
+        if not items:
+            return {}
+        results = checksum.verify_files(items, workers=workers, force=force)
+        self.update_checksums(results)
+        return checksum.summarize(results)
+
     def update_metadata(self, data_id: str, extra: dict) -> None:
         """file_metadata에 key-value merge"""
         row = self.db.query(Data).filter(Data.data_id == data_id).first()
@@ -4,26 +4,37 @@ app/core/database.py
 DB 엔진 + 세션 팩토리.
 
 환경변수 DATABASE_URL 없으면 로컬 SQLite 사용 (개발용).
+엔진 튜닝(SQLite PRAGMA / PostgreSQL 풀·타임아웃)은 app/core/db_profile.py, LIMS_DB_* 환경변수.
+마이그레이션은 타임아웃 없는 별도 엔진(maintenance_engine)으로 실행합니다.
+스키마는 create_all 이 아니라 app/migrations 의 revision 으로 관리합니다 (init_db).
 """
 
 import os
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 
+from app.core.db_profile import create_lims_engine, create_maintenance_engine
+from app.core.migrations import ensure_schema
+
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./lims.db")
+MIGRATIONS_PACKAGE = "app.migrations"
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
-    pool_pre_ping=True,
-    echo=False,
-)
+engine = create_lims_engine(DATABASE_URL, echo=False)
 
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
 
+def maintenance_engine():
+    """마이그레이션 / backfill 용 엔진 (풀 없음, PostgreSQL 타임아웃 없음 — 다 쓰면 dispose)"""
+    return create_maintenance_engine(DATABASE_URL, echo=False)
+
+
+def init_db() -> list:
+    """기동 시 1회. 밀린 revision 만 적용 (최신이면 이력 조회 한 번으로 끝, 적용은 maintenance_engine 으로)"""
+    return ensure_schema(engine, MIGRATIONS_PACKAGE, maintenance=maintenance_engine)
+
+
 @contextmanager
 def get_session() -> Session:
     db = SessionLocal()
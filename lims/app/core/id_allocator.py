@@ -0,0 +1,126 @@
+# app/core/id_allocator.py
+"""
+ID 발급 카운터 (id_sequences 테이블).
+
+(scope, key) 한 행이 "지금까지 발급한 마지막 번호" 를 들고 있고,
+발급은 INSERT ... ON CONFLICT DO UPDATE ... RETURNING 한 문장으로 끝납니다.
+    - PostgreSQL : 해당 카운터 행에 행 잠금이 걸려 동시에 발급해도 번호가 겹치지 않습니다.
+    - SQLite     : 발급 문장이 트랜잭션의 첫 쓰기가 되어 RESERVED 잠금을 잡습니다
+                   (BEGIN IMMEDIATE 와 같은 효과, 다른 쓰기는 busy_timeout 동안 대기).
+    - 그 외 DB   : SELECT ... FOR UPDATE 로 행을 잠근 뒤 갱신합니다.
+잠금은 호출한 세션의 트랜잭션이 끝날 때 풀립니다. 롤백하면 발급도 함께 취소됩니다.
+그러므로 발급은 트랜잭션 안에서 가능한 한 늦게(INSERT 직전에) 하는 것이 좋습니다.
+
+카운터가 아직 없는 key 는 reserve(seed=...) 로 기존 데이터의 최대 번호에서 이어서 시작합니다
+(key 마다 처음 한 번만 조회).
+
+이 모듈은 ngs_web_lims / lims 두 앱에 동일하게 들어 있습니다.
+두 사본이 같은지는 ngs_web_lims/tests/test_shared_modules.py 가 확인합니다 (고칠 때는 양쪽을 같이).
+앱별 ID 규칙은 각 앱의 app/core/id_service.py 에 있습니다.
+"""
+import re
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+ID_SEQUENCE_TABLE = "id_sequences"
+
+id_metadata = MetaData()
+id_sequences = Table(
+    ID_SEQUENCE_TABLE, id_metadata,
+    Column("scope", String(30), primary_key=True),    # 예: "order", "retest", "sample"
+    Column("key", String(100), primary_key=True),     # 예: "260618", 원본 sample_id, project_id
+    Column("last_value", Integer, nullable=False, default=0),
+    Column("updated_at", DateTime, server_default=func.now()),
+)
+
+
+# ==========================================
+# [1] 카운터
+# ==========================================
+def _upsert(dialect_name):
+    """(INSERT 생성자, 두 값 중 큰 값 함수) ─ upsert 를 지원하지 않는 DB는 (None, None)"""
+    if dialect_name == "postgresql":
+        return pg_insert, func.greatest
+    if dialect_name == "sqlite":
+        return sqlite_insert, func.max
+    return None, None
+
+
+def allocate(db, scope, key, count=1, floor=0):
+    """
+    (scope, key) 카운터에서 번호 count 개를 발급해 range 로 돌려줍니다.
+    floor 는 "이미 쓰인 번호의 최댓값" 으로, 카운터가 그보다 작으면 floor 다음부터 발급합니다.
+    """
+    if count < 1:
+        return range(0)
+    c = id_sequences.c
+    insert, greatest = _upsert(db.get_bind().dialect.name)
+
+    if insert is not None:
+        stmt = insert(id_sequences).values(scope=scope, key=key, last_value=floor + count)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[c.scope, c.key],
+            set_={"last_value": greatest(c.last_value, floor) + count, "updated_at": func.now()},
+        ).returning(c.last_value)
+        last = db.execute(stmt).scalar_one()
+    else:
+        current = db.execute(
+            select(c.last_value).where(c.scope == scope, c.key == key).with_for_update()
+        ).scalar_one_or_none()
+        last = max(current or 0, floor) + count
+        if current is None:
+            db.execute(id_sequences.insert().values(scope=scope, key=key, last_value=last))
+        else:
+            db.execute(id_sequences.update().where(c.scope == scope, c.key == key)
+                       .values(last_value=last, updated_at=func.now()))
+    return range(last - count + 1, last + 1)
+
+
+def current_value(db, scope, key):
+    """마지막으로 발급한 번호 (카운터가 없으면 None). 발급하지 않고 미리보기만 할 때 사용"""
+    c = id_sequences.c
+    return db.execute(select(c.last_value).where(c.scope == scope, c.key == key)).scalar_one_or_none()
+
+
+def existing_keys(db, scope, keys):
+    """카운터 행이 이미 있는 key 집합 (IN 1회)"""
+    keys = list(keys)
+    if not keys:
+        return set()
+    c = id_sequences.c
+    return set(db.execute(select(c.key).where(c.scope == scope, c.key.in_(keys))).scalars())
+
+
+def reserve(db, scope, key, count=1, seed=None):
+    """
+    allocate() + 첫 발급 시 기존 데이터 반영.
+    seed: fn(db) -> 이미 쓰인 최대 번호. 카운터가 없을 때만 호출합니다.
+    """
+    floor = 0
+    if seed is not None and current_value(db, scope, key) is None:
+        floor = seed(db) or 0
+    return allocate(db, scope, key, count, floor)
+
+
+# ==========================================
+# [2] 기존 ID 에서 번호 읽기 (seed 용)
+# ==========================================
+def max_suffix(db, column, pattern, like=None, where=None):
+    """
+    column 값 중 정규식 pattern 의 첫 그룹(숫자)이 가장 큰 값.
+    like(접두사 LIKE) / where 로 먼저 좁혀서 읽습니다. 없으면 0.
+    """
+    regex = re.compile(pattern)
+    stmt = select(column)
+    if like is not None:
+        stmt = stmt.where(column.like(like))
+    if where is not None:
+        stmt = stmt.where(where)
+    best = 0
+    for value in db.execute(stmt).scalars():
+        m = regex.search(str(value or ""))
+        if m:
+            best = max(best, int(m.group(1)))
+    return best
@@ -11,13 +11,19 @@ ID 규칙:
 
 project_code / panel_code 정규화:
   공백 → '_', 소문자 → 대문자  예) "NGS Service" → "NGS_SERVICE"
+
+채번 방식:
+  seq 는 id_sequences 카운터 행(scope=종류, key=접두사)에서 원자적으로 발급합니다
+  (app/core/id_allocator.py). 동시에 등록해도 번호가 겹치지 않고, 세션 트랜잭션을
+  롤백하면 발급도 취소됩니다. 카운터가 없는 접두사는 처음 한 번만 기존 ID 의 최대 seq 를 읽습니다.
+  플레이트 단위 일괄 등록은 next_sample_ids(project_id, n) 처럼 n 개를 한 번에 예약합니다.
 """
 
 import re
 from datetime import datetime, timezone, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
+from app.core.id_allocator import reserve, max_suffix
 from app.schema.objects import Project, Sample, Library, SequencingRun, Analysis, Data
 
 
@@ -34,68 +40,49 @@ class IDService:
     def __init__(self, db: Session):
         self.db = db
 
+    # ── 공통 ─────────────────────────────────────────
+    def _reserve(self, scope: str, prefix: str, id_column, count: int, width: int) -> list:
+        """prefix 뒤에 붙는 seq 를 count 개 예약 → ["{prefix}{seq:0{width}d}", ...]"""
+        seed = lambda db: max_suffix(db, id_column, rf"^{re.escape(prefix)}(\d+)$", like=f"{prefix}%")
+        return [f"{prefix}{seq:0{width}d}" for seq in reserve(self.db, scope, prefix, count, seed=seed)]
+
     # ── Project ──────────────────────────────────────
     def next_project_id(self, project_code: str) -> str:
         """{PROJECT_CODE}-{YYYYMM}-{seq:04d}"""
-        code = _normalize_code(project_code)
-        yyyymm = _kst_yyyymm()
-        prefix = f"{code}-{yyyymm}-"
-        count = (
-            self.db.query(func.count(Project.id))
-            .filter(Project.project_id.like(f"{prefix}%"))
-            .scalar()
-        ) or 0
-        return f"{prefix}{count + 1:04d}"
+        prefix = f"{_normalize_code(project_code)}-{_kst_yyyymm()}-"
+        return self._reserve("project", prefix, Project.project_id, 1, 4)[0]
 
     # ── Sample ───────────────────────────────────────
+    def next_sample_ids(self, project_id: str, count: int) -> list:
+        """{project_id}-S{seq:03d} × count (플레이트 일괄 등록용)"""
+        return self._reserve("sample", f"{project_id}-S", Sample.sample_id, count, 3)
+
     def next_sample_id(self, project_id: str) -> str:
-        """{project_id}-S{seq:03d}"""
-        count = (
-            self.db.query(func.count(Sample.id))
-            .filter(Sample.project_id == project_id)
-            .scalar()
-        ) or 0
-        return f"{project_id}-S{count + 1:03d}"
+        return self.next_sample_ids(project_id, 1)[0]
 
     # ── Library ──────────────────────────────────────
+    def next_library_ids(self, sample_id: str, count: int) -> list:
+        """{sample_id}-L{seq:03d} × count"""
+        return self._reserve("library", f"{sample_id}-L", Library.library_id, count, 3)
+
     def next_library_id(self, sample_id: str) -> str:
-        """{sample_id}-L{seq:03d}"""
-        count = (
-            self.db.query(func.count(Library.id))
-            .filter(Library.sample_id == sample_id)
-            .scalar()
-        ) or 0
-        return f"{sample_id}-L{count + 1:03d}"
+        return self.next_library_ids(sample_id, 1)[0]
 
     # ── SequencingRun ────────────────────────────────
     def next_run_id(self, panel_code: str) -> str:
         """{PANEL_CODE}-{YYYYMM}-{seq:04d}"""
-        code = _normalize_code(panel_code)
-        yyyymm = _kst_yyyymm()
-        prefix = f"{code}-{yyyymm}-"
-        count = (
-            self.db.query(func.count(SequencingRun.id))
-            .filter(SequencingRun.run_id.like(f"{prefix}%"))
-            .scalar()
-        ) or 0
-        return f"{prefix}{count + 1:04d}"
+        prefix = f"{_normalize_code(panel_code)}-{_kst_yyyymm()}-"
+        return self._reserve("run", prefix, SequencingRun.run_id, 1, 4)[0]
 
     # ── Analysis ─────────────────────────────────────
     def next_analysis_id(self, project_id: str) -> str:
         """{project_id}-A{seq:03d}"""
-        count = (
-            self.db.query(func.count(Analysis.id))
-            .filter(Analysis.project_id == project_id)
-            .scalar()
-        ) or 0
-        return f"{project_id}-A{count + 1:03d}"
+        return self._reserve("analysis", f"{project_id}-A", Analysis.analysis_id, 1, 3)[0]
 
     # ── Data ─────────────────────────────────────────
+    def next_data_ids(self, analysis_id: str, count: int) -> list:
+        """{analysis_id}-D{seq:03d} × count"""
+        return self._reserve("data", f"{analysis_id}-D", Data.data_id, count, 3)
+
     def next_data_id(self, analysis_id: str) -> str:
-        """{analysis_id}-D{seq:03d}"""
-        count = (
-            self.db.query(func.count(Data.id))
-            .filter(Data.analysis_id == analysis_id)
-            .scalar()
-        ) or 0
-        return f"{analysis_id}-D{count + 1:03d}"
\ No newline at end of file
+        return self.next_data_ids(analysis_id, 1)[0]
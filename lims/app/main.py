@@ -4,8 +4,7 @@ from fastapi import FastAPI
 from fastapi.responses import RedirectResponse
 from starlette.middleware.wsgi import WSGIMiddleware
 
-from app.core.database import engine
-from app.schema.objects import Base
+from app.core.database import init_db
 from app.pages.project import create_project_app
 from app.pages.sample  import create_sample_app
 
@@ -14,8 +13,8 @@ from app.pages.sample  import create_sample_app
 async def lifespan(app: FastAPI):
     print("🚀 Starting: Initializing DB…")
     try:
-        Base.metadata.create_all(bind=engine)
-        print("✅ DB 준비 완료")
+        applied = init_db()
+        print(f"✅ DB 준비 완료 (revision {len(applied)}개 적용)" if applied else "✅ DB 준비 완료 (스키마 최신)")
     except Exception as e:
         print(f"❌ DB 초기화 오류: {e}")
         raise
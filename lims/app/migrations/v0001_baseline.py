@@ -0,0 +1,256 @@
+"""
+기준선: 처음 도입한 테이블 (project_master / panel_master / projects / samples / libraries /
+sequencing_runs / library_sequencing_runs / analyses / data / reports / action_logs).
+
+    - 없는 테이블만 생성. 테이블 모양은 이 revision 을 만들 당시 모델 그대로 아래에 고정해 두었으므로
+      app/schema/objects.py 가 바뀌어도 결과가 같음 (그 뒤에 생긴 컬럼 / 테이블은 v0002 부터)
+    - 파이썬 쪽 default / onupdate 는 DDL 에 나오지 않으므로 생략
+    - data.file_size_bytes 는 처음부터 BIGINT (예전 정의 INTEGER 로 적용한 PostgreSQL DB 는 v0003 이 넓힘)
+"""
+from sqlalchemy import (
+    JSON, BigInteger, Column, Date, DateTime, Float, ForeignKey, Index, Integer, MetaData, String, Table, Text,
+    UniqueConstraint,
+)
+
+REVISION = "0001"
+DESCRIPTION = "baseline tables"
+
+_meta = MetaData()
+panel_master = Table(
+    "panel_master", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("panel_code", String(50), unique=True, index=True, nullable=False),
+    Column("panel_name", String(200), nullable=False),
+    Column("target_nucleic_acid", String(20), nullable=False),
+    Column("request_template_name", String(100), nullable=False),
+    Column("default_analysis_version", String(50), nullable=False),
+    Column("report_schema_type", String(100), nullable=False),
+    Column("is_active", Integer, nullable=False),
+)
+project_master = Table(
+    "project_master", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("project_code", String(50), unique=True, index=True, nullable=False),
+    Column("project_label", String(200), nullable=False),
+    Column("description", String(500)),
+    Column("is_active", Integer, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+)
+projects = Table(
+    "projects", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("project_id", String(50), unique=True, index=True, nullable=False),
+    Column("project_code", String(50), index=True, nullable=False),
+    Column("project_name", String(200), nullable=False),
+    Column("project_type", String(50), nullable=False),
+    Column("pi_name", String(100)),
+    Column("facility", String(200), nullable=False),
+    Column("client_team", String(100), nullable=False),
+    Column("client_name", String(100), nullable=False),
+    Column("client_email", String(200), nullable=False),
+    Column("client_phone", String(50), nullable=False),
+    Column("reception_date", Date, nullable=False),
+    Column("deadline", Date),
+    Column("sales_unit_price", Integer, nullable=False),
+    Column("current_status", String(50), nullable=False),
+    Column("issue_comment", Text),
+    Column("project_metadata", JSON, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    Column("creator_id", String(50)),
+    Column("updater_id", String(50)),
+)
+sequencing_runs = Table(
+    "sequencing_runs", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("run_id", String(50), unique=True, index=True, nullable=False),
+    Column("platform", String(50), nullable=False),
+    Column("flowcell_id", String(100)),
+    Column("instrument_id", String(100)),
+    Column("read_type", String(10)),
+    Column("read_length", String(20)),
+    Column("seq_facility_type", String(50), nullable=False),
+    Column("run_date", Date),
+    Column("q30_score", Float),
+    Column("total_reads", Float),
+    Column("total_bases", Float),
+    Column("fastq_path", String(500)),
+    Column("seq_qc_status", String(20)),
+    Column("current_status", String(50), nullable=False),
+    Column("seq_comment", Text),
+    Column("run_metadata", JSON, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    Column("creator_id", String(50)),
+    Column("updater_id", String(50)),
+)
+samples = Table(
+    "samples", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("sample_id", String(50), unique=True, index=True, nullable=False),
+    Column("project_pk", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("project_id", String(30), index=True, nullable=False),
+    Column("sample_name", String(200), nullable=False),
+    Column("origin", String(100), nullable=False),
+    Column("pairing_info", String(100)),
+    Column("outside_id", String(100)),
+    Column("sample_received", String(50), nullable=False),
+    Column("receiver_name", String(100)),
+    Column("visual_inspection", String(50), nullable=False),
+    Column("storage_location", String(200)),
+    Column("initial_volume", Float),
+    Column("test_progress", String(20), nullable=False),
+    Column("current_status", String(50), nullable=False),
+    Column("issue_comment", Text),
+    Column("sample_metadata", JSON, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    Column("creator_id", String(50)),
+    Column("updater_id", String(50)),
+    UniqueConstraint("project_pk", "sample_id", name="uq_sample_project_sample_id"),
+)
+libraries = Table(
+    "libraries", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("library_id", String(70), unique=True, index=True, nullable=False),
+    Column("sample_pk", Integer, ForeignKey("samples.id"), nullable=False),
+    Column("sample_id", String(50), index=True, nullable=False),
+    Column("target_panel", String(50), nullable=False),
+    Column("assay_type", String(20), nullable=False),
+    Column("nucleic_acid_type", String(20), nullable=False),
+    Column("dna_concentration", Float),
+    Column("dna_volume", Float),
+    Column("purity_260_280", Float),
+    Column("purity_260_230", Float),
+    Column("din", Float),
+    Column("dna_qc", String(20)),
+    Column("rna_concentration", Float),
+    Column("rna_volume", Float),
+    Column("dv200", Float),
+    Column("rin", Float),
+    Column("rna_qc", String(20)),
+    Column("library_method", String(100)),
+    Column("library_concentration", Float),
+    Column("library_molarity", Float),
+    Column("library_volume", Float),
+    Column("library_size", Float),
+    Column("index_id", String(100)),
+    Column("library_qc", String(20)),
+    Column("workflow_version", String(50), nullable=False),
+    Column("current_status", String(50), nullable=False),
+    Column("issue_comment", Text),
+    Column("qc_comment", Text),
+    Column("library_metadata", JSON, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    Column("creator_id", String(50)),
+    Column("updater_id", String(50)),
+    UniqueConstraint("sample_pk", "library_id", name="uq_library_sample_library_id"),
+)
+analyses = Table(
+    "analyses", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("analysis_id", String(50), unique=True, index=True, nullable=False),
+    Column("library_pk", Integer, ForeignKey("libraries.id"), nullable=False),
+    Column("library_id", String(70), index=True, nullable=False),
+    Column("project_pk", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("project_id", String(30), index=True, nullable=False),
+    Column("pipeline_name", String(100)),
+    Column("pipeline_version", String(50), nullable=False),
+    Column("reference_version", String(30)),
+    Column("analyst", String(100)),
+    Column("analysis_start_date", Date),
+    Column("analysis_end_date", Date),
+    Column("result_path", String(500)),
+    Column("analysis_qc_status", String(20)),
+    Column("current_status", String(50), nullable=False),
+    Column("issue_comment", Text),
+    Column("analysis_metadata", JSON, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    Column("creator_id", String(50)),
+    Column("updater_id", String(50)),
+)
+library_sequencing_runs = Table(
+    "library_sequencing_runs", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("library_pk", Integer, ForeignKey("libraries.id"), nullable=False),
+    Column("sequencing_run_pk", Integer, ForeignKey("sequencing_runs.id"), nullable=False),
+    Column("is_rerun", Integer, nullable=False),
+    Column("rerun_reason", String(200)),
+    Column("lane_number", String(20)),
+    Column("sample_sheet_index", String(50)),
+    Column("per_sample_reads", Float),
+    Column("per_sample_bases", Float),
+    Column("per_sample_q30", Float),
+    Column("demux_status", String(20)),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    Column("creator_id", String(50)),
+    Column("updater_id", String(50)),
+    UniqueConstraint("library_pk", "sequencing_run_pk", "is_rerun", name="uq_lib_seq_run_rerun"),
+)
+action_logs = Table(
+    "action_logs", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("created_at", DateTime, nullable=False),
+    Column("entity_type", String(30), index=True, nullable=False),
+    Column("entity_id", String(70), index=True, nullable=False),
+    Column("project_pk", Integer, ForeignKey("projects.id")),
+    Column("sample_pk", Integer, ForeignKey("samples.id")),
+    Column("library_pk", Integer, ForeignKey("libraries.id")),
+    Column("sequencing_run_pk", Integer, ForeignKey("sequencing_runs.id")),
+    Column("analysis_pk", Integer, ForeignKey("analyses.id")),
+    Column("action_type", String(50), nullable=False),
+    Column("previous_state", String(100)),
+    Column("new_state", String(100)),
+    Column("details", Text),
+    Column("actor_id", String(50)),
+    Index("ix_action_log_entity", "entity_type", "entity_id"),
+    Index("ix_action_log_project_type", "project_pk", "entity_type"),
+)
+data = Table(
+    "data", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("data_id", String(100), unique=True, index=True, nullable=False),
+    Column("analysis_pk", Integer, ForeignKey("analyses.id"), nullable=False),
+    Column("analysis_id", String(70), index=True, nullable=False),
+    Column("file_ext", String(30), nullable=False),
+    Column("file_name", String(200), nullable=False),
+    Column("file_path", String(1000), nullable=False),
+    Column("file_type", String(30), nullable=False),
+    Column("file_size_bytes", BigInteger),
+    Column("md5_checksum", String(64)),
+    Column("is_archived", Integer, nullable=False),
+    Column("file_metadata", JSON, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    Column("creator_id", String(50)),
+    Column("updater_id", String(50)),
+)
+reports = Table(
+    "reports", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("analysis_pk", Integer, ForeignKey("analyses.id"), nullable=False),
+    Column("analysis_id", String(50), index=True, nullable=False),
+    Column("project_pk", Integer, ForeignKey("projects.id"), nullable=False),
+    Column("project_id", String(30), index=True, nullable=False),
+    Column("report_type", String(50), nullable=False),
+    Column("report_status", String(50), nullable=False),
+    Column("reviewer", String(100)),
+    Column("reporter", String(100)),
+    Column("pathologist_name", String(100)),
+    Column("standard_report_date", Date),
+    Column("final_report_date", Date),
+    Column("report_file_path", String(1000)),
+    Column("report_comment", Text),
+    Column("report_metadata", JSON, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+    Column("creator_id", String(50)),
+    Column("updater_id", String(50)),
+)
+
+
+def upgrade(op):
+    op.create_tables(_meta)
@@ -0,0 +1,20 @@
+"""Data 파일 검증 상태 컬럼(file_mtime_ns / verify_status / verified_at) 추가, file_size_bytes 는 BIGINT 로.
+컬럼 정의는 아래에 고정."""
+from sqlalchemy import BigInteger, Column, DateTime, String
+
+REVISION = "0003"
+DESCRIPTION = "data file verification state"
+
+COLUMNS = (
+    Column("file_mtime_ns", BigInteger, nullable=True),
+    Column("verify_status", String(20), nullable=True),
+    Column("verified_at", DateTime, nullable=True),
+)
+
+
+def upgrade(op):
+    for column in COLUMNS:
+        op.add_column("data", column)
+    # SQLite 의 INTEGER 는 이미 8바이트. 예전 v0001(INTEGER)로 만든 PostgreSQL DB 만 2GB 넘는 파일 크기를 담도록 넓힘
+    if op.dialect.name == "postgresql":
+        op.execute("ALTER TABLE data ALTER COLUMN file_size_bytes TYPE BIGINT")
@@ -0,0 +1,9 @@
+"""Data 마지막 검증 때 계산한 MD5(verified_md5) 컬럼 추가 — 기록 MD5 가 바뀌면 재판정. 컬럼 정의는 아래에 고정."""
+from sqlalchemy import Column, String
+
+REVISION = "0004"
+DESCRIPTION = "data verified md5"
+
+
+def upgrade(op):
+    op.add_column("data", Column("verified_md5", String(64), nullable=True))
@@ -16,7 +16,7 @@ ID 체계 (자동 채번):
 
 from datetime import datetime, timezone, timedelta
 from sqlalchemy import (
-    Column, Integer, String, Float, Date, DateTime,
+    Column, Integer, BigInteger, String, Float, Date, DateTime,
     ForeignKey, JSON, UniqueConstraint, Text, Index,
 )
 from sqlalchemy.orm import declarative_base, relationship
@@ -397,10 +397,16 @@ class Data(Base, TrackingMixin):
     file_type = Column(String(30), nullable=False)                             # BAM / VCF / FASTQ / JSON_REPORT / QC_HTML
 
     # 무결성 / 보관
-    file_size_bytes = Column(Integer, nullable=True)
+    file_size_bytes = Column(BigInteger, nullable=True)                        # FASTQ / BAM 은 2GB 초과가 흔함
     md5_checksum    = Column(String(64), nullable=True)
     is_archived     = Column(Integer, nullable=False, default=0)               # 0=활성, 1=보관
 
+    # 마지막 검증 (app/core/checksum.py) — size / mtime 이 그대로면 재검증 때 다시 읽지 않음
+    file_mtime_ns   = Column(BigInteger, nullable=True)
+    verify_status   = Column(String(20), nullable=True)                        # 일치 / 불일치 / 파일 없음 / 신규 기록 / 오류
+    verified_md5    = Column(String(64), nullable=True)                        # 마지막 검증 때 실제로 계산한 MD5 (md5_checksum 이 바뀌면 이 값으로 재판정)
+    verified_at     = Column(DateTime, nullable=True)
+
     # 파일별 자유 메타 (key-value 확장용)
     # BAM  예) {"ref_genome": "hg38", "mean_depth": 42.3, "mapped_pct": 99.1}
     # FASTQ예) {"read_count": 1200000, "q30_pct": 94.2, "read_length": 150}
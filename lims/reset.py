@@ -1,7 +1,9 @@
 from pathlib import Path
 import importlib
 
-from app.core.database import Base, engine
+from app.core.database import MIGRATIONS_PACKAGE, engine
+from app.core.migrations import upgrade
+from app.schema.objects import Base
 
 
 def import_all_models():
@@ -26,7 +28,7 @@ def import_all_models():
 def reset_db():
     """
     SQLite DB 파일을 물리적으로 삭제하고,
-    현재 schema 기준으로 DB를 다시 생성합니다.
+    마이그레이션을 처음부터 다시 적용해 DB를 재생성합니다.
     """
 
     import_all_models()
@@ -50,8 +52,8 @@ def reset_db():
     for table_name in Base.metadata.tables.keys():
         print(f"  - {table_name}")
 
-    print("[CREATE] 테이블 생성 시작")
-    Base.metadata.create_all(bind=engine)
+    print("[CREATE] 마이그레이션 적용 시작")
+    upgrade(engine, MIGRATIONS_PACKAGE)
 
     print("[DONE] DB 재세팅 완료")
 
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel, Field
+import json
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, ValidationError
 from typing import List, Union, Literal, Optional
 from sqlalchemy.orm import Session
 
 # 🚀 1. DB 세션 및 스키마 모델 불러오기
 from app.core.database import SessionLocal
-from app.models._schema import Sample, Analysis
+from app.core import ingest_queue
+from app.models._schema import IngestEvent
 
 # 🚀 2. 라우터 객체 초기화 (이 부분이 빠지면 @router 에러가 납니다!)
 router = APIRouter(tags=["Analysis API"])
@@ -61,33 +64,109 @@ class AnalysisPayload(BaseModel):
 # ---------------------------------------------------------
 # 🚀 6. 수신 API 라우터 엔드포인트
 # ---------------------------------------------------------
-@router.post("/result")
-def receive_formalized_analysis(payload: AnalysisPayload, db: Session = Depends(get_db)):
-    sample = db.query(Sample).filter(
-        Sample.sample_id == payload.sample_id,
-        Sample.order_id == payload.order_id
-    ).first()
-    
-    if not sample:
-        raise HTTPException(
-            status_code=404, 
-            detail=f"Sample mismatch! Could not find Sample '{payload.sample_id}' under Order '{payload.order_id}'."
-        )
-    if not sample:
-        raise HTTPException(status_code=404, detail="Sample ID not found")
-        
-    if not sample.analysis:
-        sample.analysis = Analysis(sample_id=sample.id)
-        
-    # 공통 컬럼 업데이트
-    sample.analysis.analysis_status = "분석 완료"
-    sample.analysis.pipeline_version = payload.pipeline_version
-    
-    # 규격화된 결과 JSON을 DB에 저장 (Pydantic이 이미 완벽히 검증했으므로 100% 안전함)
-    sample.analysis.analysis_results = payload.results.model_dump()
-    
-    # 마스터 테이블이나 칸반 등 LIMS 전반의 상태 업데이트
-    sample.current_status = "분석 진행" 
-    
+MAX_BATCH_ITEMS = 1000   # 한 요청에 받을 최대 샘플 수 (run 하나는 보통 48~96)
+
+
+@router.post("/result", status_code=202)
+def receive_formalized_analysis(payload: AnalysisPayload, db: Session = Depends(get_db),
+                                idempotency_key: Optional[str] = Header(None)):
+    # 검증만 하고 수신함(ingest_events)에 저장 → 202. DB 반영은 백그라운드 워커가 묶어서 처리
+    event = ingest_queue.accept(db, ingest_queue.SOURCE_RESULT, [payload.model_dump()], idempotency_key)[0]
+    db.commit()
+    ingest_queue.get_worker().notify()
+    return {"message": f"Accepted {payload.results.analysis_type} formalized data.", **event}
+
+
+# 🚀 수신 큐 상태 조회 / dead letter 재처리
+@router.get("/ingest/events/{event_id}")
+def get_ingest_event(event_id: int, db: Session = Depends(get_db)):
+    event = db.get(IngestEvent, event_id)
+    if event is None:
+        raise HTTPException(status_code=404, detail=f"수신 이벤트 {event_id} 가 없습니다.")
+    return {"event_id": event.id, "source": event.source, "sample_id": event.sample_id,
+            "idempotency_key": event.idempotency_key, "status": event.status, "attempts": event.attempts,
+            "error": event.error, "received_at": event.received_at, "processed_at": event.processed_at}
+
+
+@router.get("/ingest/dead-letters")
+def list_dead_letters(limit: int = 100, db: Session = Depends(get_db)):
+    rows = (db.query(IngestEvent).filter(IngestEvent.status == ingest_queue.DEAD)
+            .order_by(IngestEvent.id.desc()).limit(min(limit, 1000)).all())
+    return [{"event_id": e.id, "source": e.source, "sample_id": e.sample_id, "attempts": e.attempts,
+             "error": e.error, "processed_at": e.processed_at} for e in rows]
+
+
+@router.post("/ingest/dead-letters/requeue")
+def requeue_dead_letters(event_ids: Optional[List[int]] = None, db: Session = Depends(get_db)):
+    count = ingest_queue.requeue(db, event_ids)
     db.commit()
-    return {"message": f"Successfully saved {payload.results.analysis_type} formalized data."}
\ No newline at end of file
+    if count:
+        ingest_queue.get_worker().notify()
+    return {"requeued": count}
+
+
+def _parse_batch_body(raw, content_type):
+    """JSON 배열 / {"items": [...]} / NDJSON(한 줄에 하나) → dict 목록"""
+    text = raw.decode("utf-8-sig")
+    if "ndjson" in content_type or "jsonl" in content_type:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    body = json.loads(text)
+    if isinstance(body, dict):
+        body = body.get("items")
+    if not isinstance(body, list):
+        raise ValueError("본문은 AnalysisPayload 배열, {\"items\": [...]} 또는 NDJSON 이어야 합니다.")
+    return body
+
+
+def _accept_batch(records):
+    """
+    검증된 항목을 항목마다 수신 이벤트 1건으로 저장 (/result 와 같은 idempotency_key 규칙).
+    스레드풀에서 실행되므로 요청 세션을 넘겨받지 않고 여기서 세션을 따로 엽니다.
+    """
+    db = SessionLocal()
+    try:
+        events = ingest_queue.accept(db, ingest_queue.SOURCE_RESULT, records)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    ingest_queue.get_worker().notify()
+    return events
+
+
+# 🚀 7. run 단위 일괄 수신: 항목별 검증 → 수신함(ingest_events)에 항목마다 이벤트 1건 → 202
+#      DB 반영은 /result 와 같이 백그라운드 워커가 묶어서 처리. 같은 배치를 다시 보내면 기존 이벤트를 돌려줌(duplicate)
+@router.post("/analysis/results:batch", status_code=202)
+async def receive_analysis_batch(request: Request):
+    raw = await request.body()
+    try:
+        records = _parse_batch_body(raw, request.headers.get("content-type", ""))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"배치 본문 파싱 실패: {e}")
+    if not records:
+        raise HTTPException(status_code=400, detail="적재할 항목이 없습니다.")
+    if len(records) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=413, detail=f"한 번에 최대 {MAX_BATCH_ITEMS}건까지 받을 수 있습니다 ({len(records)}건).")
+
+    # 항목별로 검증 → 잘못된 항목만 invalid 로 표시하고 나머지는 수신함에 저장
+    payloads, results = [], [None] * len(records)
+    for i, record in enumerate(records):
+        try:
+            payloads.append((i, AnalysisPayload.model_validate(record)))
+        except ValidationError as e:
+            sample_id = record.get("sample_id") if isinstance(record, dict) else None
+            results[i] = {"index": i, "sample_id": sample_id, "status": "invalid",
+                          "message": "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())}
+
+    if payloads:
+        # DB 작업은 스레드풀에서 (이벤트 루프를 막지 않도록)
+        events = await run_in_threadpool(_accept_batch, [p.model_dump() for _, p in payloads])
+        for (i, payload), event in zip(payloads, events):
+            results[i] = {"index": i, "sample_id": payload.sample_id, **event}
+
+    counts = {}
+    for item in results:
+        counts[item["status"]] = counts.get(item["status"], 0) + 1
+    return {"total": len(results), "counts": counts, "items": results}
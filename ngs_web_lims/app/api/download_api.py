@@ -0,0 +1,79 @@
+# app/api/download_api.py
+"""
+Raw Data 다운로드 진행 상황 API.
+
+    GET /api/v1/downloads/log/stream : 다운로드 콘솔 로그를 SSE(text/event-stream) 로 push
+                                       (이벤트 id = 줄 번호 cursor, 재접속 시 Last-Event-ID 이후부터)
+    GET /api/v1/downloads/log        : 같은 로그를 cursor 기반으로 한 번 조회 (SSE 를 못 쓰는 클라이언트용)
+    GET /api/v1/downloads/tasks      : 파일별 작업 상태 (download_tasks 최근 순)
+로그 파일은 app/core/log_tail.py 가 끝에서부터 새 줄만 읽어 프로세스당 링 버퍼 하나로 공유합니다.
+"""
+import asyncio
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from app.core import downloads
+from app.core.database import SessionLocal
+from app.core.log_tail import get_tail
+
+router = APIRouter(tags=["Download API"])
+
+POLL_S = float(os.getenv("LIMS_LOG_STREAM_POLL_S", 0.5))
+HEARTBEAT_S = 15.0
+
+
+def _cursor(value):
+    try:
+        return int(value) if value not in (None, "") else None
+    except ValueError:
+        return None
+
+
+@router.get("/downloads/log")
+def read_download_log(cursor: Optional[int] = None):
+    lines, cursor = get_tail(downloads.LOG_PATH).read_since(cursor)
+    return {"cursor": cursor, "lines": lines}
+
+
+@router.get("/downloads/log/stream")
+async def stream_download_log(request: Request, cursor: Optional[int] = None):
+    tail = get_tail(downloads.LOG_PATH)
+    last_id = _cursor(request.headers.get("last-event-id"))
+    start = last_id if last_id is not None else cursor
+
+    async def events():
+        position, idle = start, 0.0
+        yield "retry: 3000\n\n"
+        while not await request.is_disconnected():
+            lines, position = await run_in_threadpool(tail.read_since, position)
+            if lines:
+                idle = 0.0
+                yield f"id: {position}\n" + "".join(f"data: {line}\n" for line in lines) + "\n"
+            else:
+                idle += POLL_S
+                if idle >= HEARTBEAT_S:
+                    idle = 0.0
+                    yield ": keep-alive\n\n"   # 프록시가 연결을 끊지 않도록
+            await asyncio.sleep(POLL_S)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@router.get("/downloads/tasks")
+def list_download_tasks(limit: int = 50):
+    db = SessionLocal()
+    try:
+        tasks = downloads.recent_tasks(db, limit=min(limit, 500))
+        return [{
+            "sample_id": t.sample_id, "read": t.read, "status": t.status, "dest_path": t.dest_path,
+            "bytes_done": t.bytes_done, "bytes_total": t.bytes_total, "attempts": t.attempts,
+            "expected_md5": t.expected_md5, "actual_md5": t.actual_md5, "error": t.error,
+            "updated_at": t.updated_at,
+        } for t in tasks]
+    finally:
+        db.close()
@@ -0,0 +1,45 @@
+# app/api/variant_api.py
+"""
+샘플 간 변이 검색 API (variants 테이블, app/core/variant_index.py).
+
+    GET /api/v1/variants         : 변이 행 조회. gene / protein / chrom + pos_from~pos_to / min_vaf / sample_id 조건,
+                                   Variant.id 순 keyset 페이지 (응답의 next_after 를 다음 요청의 after 로)
+    GET /api/v1/variants/samples : 조건에 맞는 변이가 있는 샘플 목록 (예: ?gene=KRAS&protein=G12C)
+protein 은 p.(Gly12Cys) / p.G12C / G12C 모두 같은 값으로 찾습니다.
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core import variant_index
+from app.core.database import get_db
+
+router = APIRouter(tags=["Variant API"])
+
+
+@router.get("/variants")
+def search_variants(gene: Optional[str] = None, protein: Optional[str] = None, chrom: Optional[str] = None,
+                    pos_from: Optional[int] = None, pos_to: Optional[int] = None,
+                    min_vaf: Optional[float] = None, sample_id: Optional[str] = None,
+                    after: Optional[int] = None, limit: int = Query(200, ge=1, le=variant_index.MAX_LIMIT),
+                    db: Session = Depends(get_db)):
+    if not any((gene, protein, chrom, sample_id)):
+        raise HTTPException(status_code=400, detail="gene / protein / chrom / sample_id 중 하나는 필요합니다.")
+    rows = variant_index.search(db, gene=gene, protein=protein, chrom=chrom, pos_from=pos_from, pos_to=pos_to,
+                                min_vaf=min_vaf, sample_id=sample_id, after_id=after, limit=limit)
+    return {"count": len(rows), "next_after": rows[-1]["id"] if len(rows) == limit else None, "items": rows}
+
+
+@router.get("/variants/samples")
+def samples_with_variant(gene: Optional[str] = None, protein: Optional[str] = None, chrom: Optional[str] = None,
+                         pos_from: Optional[int] = None, pos_to: Optional[int] = None,
+                         min_vaf: Optional[float] = None,
+                         limit: int = Query(1000, ge=1, le=variant_index.MAX_LIMIT),
+                         db: Session = Depends(get_db)):
+    try:
+        rows = variant_index.samples_with(db, gene=gene, protein=protein, chrom=chrom, pos_from=pos_from,
+                                          pos_to=pos_to, min_vaf=min_vaf, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"count": len(rows), "items": rows}
@@ -0,0 +1,170 @@
+# app/core/analysis_ingest.py
+"""
+정형화된 분석 결과(AnalysisPayload) 적재.
+
+샘플마다 조회 → 수정 → commit 하지 않고, 한 run(48+ 샘플) 묶음을
+    1) Sample + Analysis PK 를 IN 쿼리 한 번으로 가져오고 (IN_CHUNK_SIZE 단위)
+    2) Analysis 는 bulk_update_mappings / bulk_insert_mappings, Sample 상태는 bulk_update_mappings 로
+    3) 한 트랜잭션에 씁니다 (commit 은 호출측).
+큰 섹션(variants 등)은 app/core/result_store.py 로 analysis_blobs 에 따로 저장되고,
+small variant 는 app/core/variant_index.py 로 variants 테이블에 색인됩니다.
+저장하는 결과는 app/core/result_normalize.expand 로 JSON 문자열만 펼친 값입니다 (NA / 빈 값도 원본 그대로, 정리는 화면에서).
+생성 컬럼이 읽는 요약 키(tmb_score / msi_status / analysis_type)는 app/core/result_summary.py 가 섹션에서 꺼내 채웁니다.
+항목마다 결과(status)를 돌려주므로 일부 샘플이 없어도 나머지는 저장됩니다.
+    created   : Analysis 행을 새로 만듦
+    updated   : 기존 Analysis 행을 덮어씀
+    not_found : 해당 order 아래 sample 없음
+    duplicate : 같은 sample_id 가 뒤에 또 있음 (마지막 항목만 저장)
+merge_webhook_results 는 39번 서버 webhook(자유 형식 dict)용으로, 기존 결과에 값을 문자열로 병합합니다
+(dict / list 값은 구조 그대로 펼침).
+"""
+import json
+from datetime import datetime
+
+from app.core.result_normalize import expand_results, merge_updates
+from app.core.result_store import externalize
+from app.core.result_summary import apply_summary
+from app.core.variant_index import index_variants
+from app.models._schema import Analysis, Sample
+
+IN_CHUNK_SIZE = 500
+
+ANALYSIS_DONE = "분석 완료"
+SAMPLE_STATUS = "분석 진행"
+
+
+def _fetch_targets(db, sample_ids, with_results=False):
+    """sample_id → (Sample PK, order_id, Analysis PK | None[, 기존 analysis_results, result_sections, target_panel])"""
+    columns = [Sample.sample_id, Sample.id, Sample.order_id, Analysis.id]
+    if with_results:
+        columns += [Analysis.analysis_results, Analysis.result_sections, Sample.target_panel]
+    targets = {}
+    for i in range(0, len(sample_ids), IN_CHUNK_SIZE):
+        chunk = sample_ids[i:i + IN_CHUNK_SIZE]
+        rows = (
+            db.query(*columns)
+            .outerjoin(Analysis, Analysis.sample_id == Sample.id)
+            .filter(Sample.sample_id.in_(chunk))
+            .all()
+        )
+        for sample_id, *rest in rows:
+            targets[sample_id] = tuple(rest)
+    return targets
+
+
+def ingest_results(db, payloads):
+    """
+    AnalysisPayload 목록을 일괄 반영합니다 (commit 은 호출측에서).
+    반환값: 입력 순서대로 [{"index", "sample_id", "status", "message"}]
+    """
+    last_index = {p.sample_id: i for i, p in enumerate(payloads)}
+    targets = _fetch_targets(db, list(last_index))
+
+    items = []
+    analysis_updates, analysis_inserts, sample_updates = [], [], []
+    variant_sources = {}
+    for i, payload in enumerate(payloads):
+        item = {"index": i, "sample_id": payload.sample_id}
+        items.append(item)
+        if last_index[payload.sample_id] != i:
+            item.update(status="duplicate", message="같은 sample_id 가 뒤에 다시 있어 건너뜀")
+            continue
+
+        target = targets.get(payload.sample_id)
+        if target is None or target[1] != payload.order_id:
+            item.update(status="not_found", message=(
+                f"Sample mismatch! Could not find Sample '{payload.sample_id}' under Order '{payload.order_id}'."))
+            continue
+
+        sample_pk, _, analysis_pk = target
+        values = {
+            "analysis_status": ANALYSIS_DONE,
+            "pipeline_version": payload.pipeline_version,
+            "analysis_results": apply_summary(expand_results(payload.results.model_dump())),
+        }
+        if analysis_pk is None:
+            analysis_inserts.append({"sample_id": sample_pk, **values})
+            item.update(status="created", message=f"Saved {payload.results.analysis_type} formalized data.")
+        else:
+            analysis_updates.append({"id": analysis_pk, **values})
+            item.update(status="updated", message=f"Saved {payload.results.analysis_type} formalized data.")
+        sample_updates.append({"id": sample_pk, "current_status": SAMPLE_STATUS})
+        variant_sources[sample_pk] = values["analysis_results"]
+
+    index_variants(db, variant_sources)
+    _split_sections(db, analysis_updates + analysis_inserts)
+    if analysis_updates:
+        db.bulk_update_mappings(Analysis, analysis_updates)
+    if analysis_inserts:
+        db.bulk_insert_mappings(Analysis, analysis_inserts)
+    if sample_updates:
+        db.bulk_update_mappings(Sample, sample_updates)
+    return items
+
+
+def _split_sections(db, mappings, previous=None):
+    """mappings 의 analysis_results 에서 큰 섹션을 blob 으로 빼고 result_sections 를 채움 (제자리 수정)"""
+    previous = previous or [None] * len(mappings)
+    split = externalize(db, [(m["analysis_results"], refs) for m, refs in zip(mappings, previous)])
+    for m, (inline, refs) in zip(mappings, split):
+        m["analysis_results"], m["result_sections"] = inline, refs
+
+
+def merge_webhook_results(db, records):
+    """
+    webhook 본문({"sample_id", "pipeline", "results": {...}}) 목록을 일괄 병합합니다 (commit 은 호출측에서).
+    기존 analysis_results 에 값을 (문자열로, dict / list 는 그대로) 펼쳐서 덮어쓰고
+    pipeline_finished_at 을 남긴 뒤 Analysis / Sample 을 '분석 완료' 로.
+    본문에 없는 키의 큰 섹션(blob)은 다시 읽거나 쓰지 않습니다.
+    같은 샘플이 여러 번 있으면 순서대로 모두 병합합니다. 반환값은 ingest_results 와 같은 형식.
+    """
+    targets = _fetch_targets(db, list(dict.fromkeys(r.get("sample_id") for r in records)), with_results=True)
+    finished_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    items, merged, incoming = [], {}, {}
+    for i, record in enumerate(records):
+        sample_id = record.get("sample_id")
+        item = {"index": i, "sample_id": sample_id}
+        items.append(item)
+        target = targets.get(sample_id)
+        if target is None:
+            item.update(status="not_found", message=f"LIMS에 등록되지 않은 Sample ID입니다: {sample_id}")
+            continue
+
+        sample_pk, _, analysis_pk, current, refs, panel = target
+        if sample_pk not in merged:
+            if isinstance(current, str):
+                current = json.loads(current) if current else {}
+            if isinstance(refs, str):
+                refs = json.loads(refs) if refs else {}
+            merged[sample_pk] = (analysis_pk, dict(current or {}), dict(refs or {}))
+        _, results, refs = merged[sample_pk]
+        merge_updates(results, refs, {k: v if isinstance(v, (dict, list)) else str(v)
+                                      for k, v in (record.get("results") or {}).items()})
+        apply_summary(results, panel)
+        incoming.setdefault(sample_pk, {}).update(record.get("results") or {})   # 변이 색인은 원래 값으로
+        results["pipeline_finished_at"] = finished_at
+        item.update(status="updated" if analysis_pk else "created",
+                    message=f"샘플 {sample_id}의 분석 결과가 성공적으로 반영되었습니다.")
+
+    analysis_updates, analysis_inserts, sample_updates = [], [], []
+    update_refs, insert_refs = [], []
+    for sample_pk, (analysis_pk, results, refs) in merged.items():
+        values = {"analysis_results": results, "analysis_status": ANALYSIS_DONE}
+        if analysis_pk is None:
+            analysis_inserts.append({"sample_id": sample_pk, **values})
+            insert_refs.append(refs)
+        else:
+            analysis_updates.append({"id": analysis_pk, **values})
+            update_refs.append(refs)
+        sample_updates.append({"id": sample_pk, "current_status": ANALYSIS_DONE})
+
+    index_variants(db, incoming)
+    _split_sections(db, analysis_updates + analysis_inserts, update_refs + insert_refs)
+    if analysis_updates:
+        db.bulk_update_mappings(Analysis, analysis_updates)
+    if analysis_inserts:
+        db.bulk_insert_mappings(Analysis, analysis_inserts)
+    if sample_updates:
+        db.bulk_update_mappings(Sample, sample_updates)
+    return items
@@ -0,0 +1,153 @@
+# app/core/bulk_update.py
+"""
+그리드에서 바뀐 셀(diff)만 DB에 일괄 반영하는 헬퍼.
+
+입력은 {sample PK: {field: 새 값}} 형태이며,
+    1) 대상 Sample + 연관 테이블 PK 를 IN 쿼리 한 번으로 가져오고
+    2) 각 field 를 Sample → Order → WetLabQC → Sequencing → Analysis → panel_metadata(JSON)
+       순서로 라우팅해 테이블별 매핑을 모은 뒤
+    3) 테이블마다 bulk_update_mappings / bulk_insert_mappings 한 번으로 씁니다.
+ORM 객체를 만들지 않으므로 수정 셀 수에만 비례하는 비용으로 저장됩니다.
+"""
+from datetime import datetime
+
+from sqlalchemy import Date, DateTime, Float, Integer
+
+from app.models._schema import Analysis, Order, Sample, Sequencing, WetLabQC
+
+# IN 절 한 번에 넣을 최대 PK 수 (SQLite 바인드 변수 한도 999 고려)
+IN_CHUNK_SIZE = 500
+
+# 컬럼처럼 보이지만 직접 덮어쓰면 안 되는 필드 (PK / FK / JSON 저장소)
+PROTECTED_FIELDS = {"id", "order_pk", "panel_metadata", "analysis_results", "result_sections", "analysis_metadata"}
+
+CHILD_MODELS = (WetLabQC, Sequencing, Analysis)
+
+# 연관 테이블의 생성 컬럼(analysis_results 에서 계산되는 tmb_score 등)은 읽기 전용
+PROTECTED_FIELDS |= {
+    column.name for model in (Order,) + CHILD_MODELS
+    for column in model.__table__.columns if column.computed is not None
+}
+
+
+# ==========================================
+# [1] 필드 라우팅 & 형변환
+# ==========================================
+def route_field(field):
+    """field 가 실제로 저장될 모델 (None 이면 Sample.panel_metadata JSON)"""
+    for model in (Sample, Order) + CHILD_MODELS:
+        column = model.__table__.columns.get(field)
+        if column is not None:
+            # Sample 의 생성 컬럼(seq_provider 등)은 원본인 panel_metadata 에 써야 DB가 다시 계산한다
+            return None if column.computed is not None else model
+    return None
+
+
+def coerce_value(model, field, value, field_type=None):
+    """그리드 문자열을 컬럼 타입에 맞게 변환. 빈 문자열은 NULL"""
+    if value == "" or value is None:
+        return None
+
+    col_type = model.__table__.columns[field].type if model is not None else None
+    if field_type == "numeric" or isinstance(col_type, Float):
+        try: return float(value)
+        except (TypeError, ValueError): return None
+    if isinstance(col_type, Integer):
+        try: return int(float(value))
+        except (TypeError, ValueError): return None
+    if isinstance(col_type, (Date, DateTime)) and isinstance(value, str):
+        try: parsed = datetime.fromisoformat(value.strip()[:19])
+        except ValueError: return None
+        return parsed if isinstance(col_type, DateTime) else parsed.date()
+    if isinstance(col_type, Date) and isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+# ==========================================
+# [2] 일괄 반영
+# ==========================================
+def _fetch_targets(db, ids):
+    """sample PK → (order_pk, panel_metadata, {자식 모델: 자식 PK})"""
+    targets = {}
+    for i in range(0, len(ids), IN_CHUNK_SIZE):
+        chunk = ids[i:i + IN_CHUNK_SIZE]
+        rows = (
+            db.query(Sample.id, Sample.order_pk, Sample.panel_metadata, WetLabQC.id, Sequencing.id, Analysis.id)
+            .outerjoin(WetLabQC, WetLabQC.sample_id == Sample.id)
+            .outerjoin(Sequencing, Sequencing.sample_id == Sample.id)
+            .outerjoin(Analysis, Analysis.sample_id == Sample.id)
+            .filter(Sample.id.in_(chunk))
+            .all()
+        )
+        for sid, order_pk, meta, wet_id, seq_id, ana_id in rows:
+            targets[sid] = (order_pk, meta, {WetLabQC: wet_id, Sequencing: seq_id, Analysis: ana_id})
+    return targets
+
+
+def _group_by_keys(rows):
+    """같은 컬럼 조합끼리 붙여 둔다. SQLAlchemy 는 연속된 같은 키 묶음만 executemany 로 합친다"""
+    return sorted(rows, key=lambda row: sorted(row))
+
+
+def apply_sample_changes(db, changes, field_types=None):
+    """
+    {sample PK: {field: 값}} 를 테이블별 bulk 매핑으로 반영합니다 (commit 은 호출측에서).
+    반환값: 실제로 반영된 Sample 수
+    """
+    field_types = field_types or {}
+    ids = []
+    for key in changes or {}:
+        try: ids.append(int(key))
+        except (TypeError, ValueError): continue
+    if not ids:
+        return 0
+
+    targets = _fetch_targets(db, ids)
+    applied = set()
+
+    updates = {model: {} for model in (Sample, Order) + CHILD_MODELS}
+    inserts = {model: {} for model in CHILD_MODELS}
+
+    for key, fields in changes.items():
+        try: sid = int(key)
+        except (TypeError, ValueError): continue
+        if sid not in targets or not fields:
+            continue
+        order_pk, meta, child_ids = targets[sid]
+        new_meta = None
+
+        for field, raw in fields.items():
+            if field in PROTECTED_FIELDS:
+                continue
+            model = route_field(field)
+            value = coerce_value(model, field, raw, field_types.get(field))
+
+            if model is None:
+                # 어떤 테이블에도 없는 필드 → panel_metadata JSON 병합
+                if new_meta is None:
+                    new_meta = dict(meta) if isinstance(meta, dict) else {}
+                new_meta[field] = value
+            elif model is Sample:
+                updates[Sample].setdefault(sid, {"id": sid})[field] = value
+            elif model is Order:
+                if order_pk is None: continue
+                updates[Order].setdefault(order_pk, {"id": order_pk})[field] = value
+            elif child_ids[model] is not None:
+                updates[model].setdefault(child_ids[model], {"id": child_ids[model]})[field] = value
+            else:
+                # 아직 자식 행이 없으면 바뀐 값이 있을 때만 새로 만든다
+                inserts[model].setdefault(sid, {"sample_id": sid})[field] = value
+            applied.add(sid)
+
+        if new_meta is not None:
+            updates[Sample].setdefault(sid, {"id": sid})["panel_metadata"] = new_meta
+
+    for model, rows in updates.items():
+        if rows:
+            db.bulk_update_mappings(model, _group_by_keys(rows.values()))
+    for model, rows in inserts.items():
+        if rows:
+            db.bulk_insert_mappings(model, _group_by_keys(rows.values()))
+
+    return len(applied)
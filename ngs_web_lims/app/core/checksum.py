@@ -0,0 +1,160 @@
+# app/core/checksum.py
+"""
+등록된 파일(FASTQ / BAM / VCF ...)의 MD5 / 크기 검증 엔진.
+
+    - 파일은 큰 버퍼(LIMS_CHECKSUM_BUFFER_MB, 기본 8 MB) 하나를 readinto 로 재사용하며 끝까지 스트리밍 해시
+    - 여러 파일은 프로세스 풀(LIMS_CHECKSUM_WORKERS)로 나눠 해시 (디스크 / CPU 를 같이 씀)
+    - 지난 검증 때의 size / mtime_ns 가 그대로인 파일은 다시 읽지 않음
+        · 기록된 MD5 가 지난번에 계산한 MD5(verified_md5)와 같고 결과가 정상이었으면 → 변경 없음
+        · 기록된 MD5 가 그 뒤에 바뀌었으면(수정 / 업체 MD5 입력) → 지난 계산값으로 다시 판정 (파일은 안 읽음)
+
+DB 와는 무관한 모듈입니다. 호출측이 기록된 값(items)을 넘기고, 돌려받은 결과를 한 번에 저장합니다.
+    items   : [{"key": 식별자, "path": 경로, "md5": 기록된 MD5, "size": 지난 검증 크기,
+                "mtime_ns": 지난 검증 mtime, "status": 지난 검증 결과, "verified_md5": 지난 검증 때 계산한 MD5}, ...]
+    results : [{"key", "path", "status", "md5"(실제, 변경 없음이면 verified_md5), "expected", "size", "mtime_ns", "error"}, ...]
+    호출측은 results 의 md5 를 다음 검증의 verified_md5 로 저장해 둡니다.
+ngs_web_lims / lims 양쪽에 같은 파일로 둡니다. 두 사본이 같은지는 ngs_web_lims/tests/test_shared_modules.py 가 확인합니다 (고칠 때는 양쪽을 같이).
+"""
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+BUFFER_BYTES = int(float(os.getenv("LIMS_CHECKSUM_BUFFER_MB", 8)) * 1024 * 1024)
+WORKERS = int(os.getenv("LIMS_CHECKSUM_WORKERS", min(4, os.cpu_count() or 1)))
+
+# 검증 결과
+MATCH = "일치"
+MISMATCH = "불일치"
+MISSING = "파일 없음"
+UNCHANGED = "변경 없음"     # size / mtime / 기록 MD5 가 지난 검증과 같아 건너뜀
+RECORDED = "신규 기록"      # 기록된 MD5 가 없어 계산값을 새로 기록
+ERROR = "오류"
+OK_STATUSES = {MATCH, RECORDED, UNCHANGED}
+
+
+def normalize_md5(value):
+    """'ABC...  file.fastq.gz' 같은 md5sum 출력도 받아 32자리 소문자만 남김"""
+    text = str(value or "").strip().split()
+    return text[0].lower() if text else ""
+
+
+# ==========================================
+# [1] 파일 하나 해시 (워커 프로세스에서 실행)
+# ==========================================
+def file_md5(path, buffer_bytes=BUFFER_BYTES):
+    """(md5, size, mtime_ns). 읽는 도중 파일이 바뀌면 RuntimeError"""
+    before = os.stat(path)
+    digest = hashlib.md5()
+    buf = bytearray(buffer_bytes)
+    view = memoryview(buf)
+    size = 0
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            digest.update(view[:n])
+            size += n
+    after = os.stat(path)
+    if (after.st_size, after.st_mtime_ns) != (before.st_size, before.st_mtime_ns) or size != after.st_size:
+        raise RuntimeError("검증 중 파일이 변경됨 (쓰는 중인 파일?)")
+    return digest.hexdigest(), size, after.st_mtime_ns
+
+
+def _hash_job(path, buffer_bytes):
+    try:
+        md5, size, mtime_ns = file_md5(path, buffer_bytes)
+        return {"md5": md5, "size": size, "mtime_ns": mtime_ns, "error": None}
+    except FileNotFoundError:
+        return {"missing": True, "error": "파일 없음"}
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+# ==========================================
+# [2] 여러 파일 검증
+# ==========================================
+def _judge(item, job):
+    expected = normalize_md5(item.get("md5"))
+    result = {"key": item["key"], "path": item["path"], "expected": expected or None,
+              "md5": job.get("md5"), "size": job.get("size"), "mtime_ns": job.get("mtime_ns"),
+              "error": job.get("error")}
+    if job.get("missing"):
+        result["status"] = MISSING
+    elif job.get("error"):
+        result["status"] = ERROR
+    elif not expected:
+        result["status"] = RECORDED
+    else:
+        result["status"] = MATCH if job["md5"] == expected else MISMATCH
+    return result
+
+
+def _reuse(item, force):
+    """
+    파일을 다시 읽지 않아도 되면 결과 dict, 아니면 None.
+    size / mtime 이 지난 검증과 같고 그때 계산한 MD5(verified_md5)가 있을 때만:
+        기록된 MD5 == verified_md5 이고 지난번에도 기록된 MD5 와 비교해 맞았음(일치 / 변경 없음) → 변경 없음
+        그 밖에는 (신규 기록 뒤 업체 MD5 입력, 기록 MD5 수정 등) verified_md5 를 실제 값으로 보고 다시 판정
+    """
+    verified = normalize_md5(item.get("verified_md5"))
+    if force or not verified:
+        return None
+    try:
+        st = os.stat(item["path"])
+    except OSError:
+        return None
+    if item.get("size") != st.st_size or item.get("mtime_ns") != st.st_mtime_ns:
+        return None
+    job = {"md5": verified, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "error": None}
+    result = _judge(item, job)
+    if result["expected"] == verified and item.get("status") in (MATCH, UNCHANGED):
+        result["status"] = UNCHANGED
+    return result
+
+
+def verify_files(items, workers=None, force=False, buffer_bytes=BUFFER_BYTES, on_result=None):
+    """
+    items 를 검증해 결과 목록을 돌려줍니다 (items 순서 유지).
+    force=True 면 변경 없는 파일도 다시 해시. on_result(result) 는 파일 하나 끝날 때마다 호출 (진행 로그용).
+    """
+    workers = WORKERS if workers is None else workers
+    results = [None] * len(items)
+    pending = []
+    for i, item in enumerate(items):
+        if not str(item.get("path") or "").strip():
+            results[i] = _judge(item, {"missing": True, "error": "경로 없음"})
+        else:
+            results[i] = _reuse(item, force)
+            if results[i] is None:
+                pending.append(i)
+                continue
+        if on_result:
+            on_result(results[i])
+
+    def _done(i, job):
+        results[i] = _judge(items[i], job)
+        if on_result:
+            on_result(results[i])
+
+    if workers <= 1 or len(pending) <= 1:
+        for i in pending:
+            _done(i, _hash_job(items[i]["path"], buffer_bytes))
+        return results
+
+    # 웹 서버 스레드에서 불려도 안전하도록 fork 대신 spawn (잠긴 락을 복사하지 않음)
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(pending)), mp_context=ctx) as pool:
+        futures = {pool.submit(_hash_job, items[i]["path"], buffer_bytes): i for i in pending}
+        for future in as_completed(futures):
+            _done(futures[future], future.result())
+    return results
+
+
+def summarize(results):
+    """{상태: 개수}"""
+    counts = {}
+    for r in results:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    return counts
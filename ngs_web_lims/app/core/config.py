@@ -1,59 +1,248 @@
-import yaml
+import os
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
+
+import yaml
 
 # 1. 기준 경로 설정 (프로젝트 최상단)
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
-CONFIG_DIR = BASE_DIR / "config"
+CONFIG_DIR = Path(os.getenv("LIMS_CONFIG_DIR", BASE_DIR / "config"))
+
+# 파일 변경(mtime) 확인 주기(초). 호출마다 stat 하지 않도록 이 간격 안에서는 캐시를 그대로 씁니다.
+RELOAD_CHECK_INTERVAL_S = float(os.getenv("LIMS_CONFIG_RELOAD_INTERVAL", 2))
+
+
+class ConfigError(ValueError):
+    """YAML 내용이 기대한 형태가 아닐 때"""
+
+
+def freeze(value):
+    """dict → 읽기 전용 mapping, list → tuple (콜백끼리 공유하는 설정이 수정되지 않도록)"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+# ==========================================
+# [0] 공용: YAML 파일 1개 = 캐시 + mtime 기반 핫 리로드
+# ==========================================
+class ConfigFile:
+    """
+    YAML 파일을 한 번만 파싱해 build() 결과(불변 객체)를 캐시합니다.
+    mtime 이 바뀌면 다시 읽고, 새 객체를 끝까지 만든 뒤에 한 번에 교체합니다.
+    파일이 없거나 내용이 잘못되면 서버를 멈추지 않고 경고만 남깁니다.
+    (처음이면 기본값을 쓰고, 이미 읽은 적이 있으면 직전 설정을 유지합니다.)
+    """
+
+    def __init__(self, name, path, build):
+        self.name = name
+        self.path = Path(path)
+        self._build = build
+        self._snapshot = None
+        self._mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        if self._snapshot is None or time.monotonic() - self._checked_at >= RELOAD_CHECK_INTERVAL_S:
+            self.refresh()
+        return self._snapshot
+
+    def refresh(self, force=False):
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._snapshot is not None and now - self._checked_at < RELOAD_CHECK_INTERVAL_S:
+                return self._snapshot
+            self._checked_at = now
+
+            try:
+                mtime = self.path.stat().st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            if self._snapshot is not None and mtime == self._mtime and not force:
+                return self._snapshot
+            if self._snapshot is not None and mtime is None:
+                # 편집기가 파일을 교체하는 순간 등: 사라졌다고 빈 설정으로 바꾸지 않는다
+                print(f"⚠️ {self.name} 설정 파일이 사라졌습니다 (이전 설정 유지): {self.path}")
+                self._mtime = None
+                return self._snapshot
+
+            try:
+                if mtime is None:
+                    print(f"⚠️ {self.name} 설정 파일이 없습니다 (기본값 사용): {self.path}")
+                    raw = None
+                else:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        raw = yaml.safe_load(f)
+                snapshot = self._build(raw)
+            except (OSError, yaml.YAMLError, ConfigError) as e:
+                if self._snapshot is None:
+                    print(f"⚠️ {self.name} 설정 로드 실패 (기본값 사용): {e}")
+                    snapshot = self._build(None)
+                else:
+                    print(f"⚠️ {self.name} 설정 리로드 실패 (이전 설정 유지): {e}")
+                    self._mtime = mtime  # 같은 잘못된 파일을 주기마다 다시 파싱하지 않음
+                    return self._snapshot
+
+            if self._snapshot is not None:
+                print(f"🔄 {self.name} 설정 리로드: {self.path}")
+            self._snapshot, self._mtime = snapshot, mtime
+            return snapshot
+
+
+def _require_mapping(name, raw):
+    if raw is None:
+        return {}
+    if not isinstance(raw, dict):
+        raise ConfigError(f"{name}: 최상위가 mapping 이어야 합니다 (현재 {type(raw).__name__})")
+    return raw
+
 
 # ==========================================
 # [1] 워크플로우 설정 (workflows.yaml)
 # ==========================================
 WORKFLOW_FILE = CONFIG_DIR / "workflows.yaml"
 
-def load_workflows():
-    if not WORKFLOW_FILE.exists():
-        raise FileNotFoundError(f"Workflow 설정 파일을 찾을 수 없습니다: {WORKFLOW_FILE}")
-    with open(WORKFLOW_FILE, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
 
-LIMS_WORKFLOWS = load_workflows()
+@dataclass(frozen=True)
+class Workflows:
+    pipelines: MappingProxyType     # 분석 종류 → (step, ...)
+    stage_index: MappingProxyType   # 분석 종류 → {step id / step name: 순번}
+
+    def for_analysis(self, analysis_type):
+        clean_type = str(analysis_type).strip().upper()
+        return self.pipelines.get(clean_type, self.pipelines.get("DEFAULT"))
+
+    def index_for(self, analysis_type):
+        clean_type = str(analysis_type).strip().upper()
+        return self.stage_index.get(clean_type, self.stage_index.get("DEFAULT", MappingProxyType({})))
+
+
+def build_workflows(raw):
+    raw = _require_mapping("workflows.yaml", raw)
+    pipelines, stage_index = {}, {}
+    for analysis_type, steps in raw.items():
+        if not isinstance(steps, list):
+            raise ConfigError(f"workflows.yaml: {analysis_type} 는 step 목록이어야 합니다")
+        index = {}
+        for i, step in enumerate(steps):
+            if not isinstance(step, dict) or "id" not in step or "name" not in step:
+                raise ConfigError(f"workflows.yaml: {analysis_type}[{i}] 에 id / name 이 필요합니다")
+            if step["id"] in index:
+                raise ConfigError(f"workflows.yaml: {analysis_type} 의 step id 중복: {step['id']}")
+            index[step["id"]] = i
+            index.setdefault(step["name"], i)
+        key = str(analysis_type).strip().upper()
+        pipelines[key] = freeze(steps)
+        stage_index[key] = MappingProxyType(index)
+    return Workflows(MappingProxyType(pipelines), MappingProxyType(stage_index))
+
+
+WORKFLOWS = ConfigFile("workflows", WORKFLOW_FILE, build_workflows)
 
-def get_workflow_for_analysis(analysis_type: str) -> list:
+
+def get_workflow_for_analysis(analysis_type: str) -> tuple:
     """분석 종류에 맞는 워크플로우를 반환하며, 없으면 DEFAULT를 반환"""
-    clean_type = str(analysis_type).strip().upper() 
-    return LIMS_WORKFLOWS.get(clean_type, LIMS_WORKFLOWS.get("DEFAULT"))
+    return WORKFLOWS.get().for_analysis(analysis_type)
+
+
+def get_stage_index(analysis_type: str):
+    """분석 종류의 {step id / step name: 순번} (없으면 DEFAULT 기준)"""
+    return WORKFLOWS.get().index_for(analysis_type)
 
 
 # ==========================================
-# [2] 컬럼 및 화면 설정 (columns.yaml) - 신규 추가!
+# [2] 컬럼 및 화면 설정 (columns.yaml / pages.yaml)
 # ==========================================
 COLUMNS_FILE = CONFIG_DIR / "columns.yaml"
-def load_columns():
-    if not COLUMNS_FILE.exists():
-        raise FileNotFoundError(f"Column 설정 파일을 찾을 수 없습니다: {COLUMNS_FILE}")
-    with open(COLUMNS_FILE, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+PAGES_FILE = CONFIG_DIR / "pages.yaml"
+
+
+def build_columns(raw):
+    raw = _require_mapping("columns.yaml", raw)
+    for key in ("tracking_columns",):
+        if key in raw and not isinstance(raw[key], dict):
+            raise ConfigError(f"columns.yaml: {key} 는 mapping 이어야 합니다")
+    return freeze(raw)
+
 
-# 서버 어디서든 COLUMNS_CONFIG['wet_lab']['columns'] 형태로 꺼내 쓸 수 있습니다.
-COLUMNS_CONFIG = load_columns()
+def build_pages(raw):
+    raw = _require_mapping("pages.yaml", raw)
+    for page, section in raw.items():
+        if not isinstance(section, dict) or not isinstance(section.get("columns", []), list):
+            raise ConfigError(f"pages.yaml: {page}.columns 는 목록이어야 합니다")
+    return freeze(raw)
+
+
+COLUMNS = ConfigFile("columns", COLUMNS_FILE, build_columns)
+PAGES = ConfigFile("pages", PAGES_FILE, build_pages)
+
+
+def get_columns_config():
+    """COLUMNS_CONFIG['tracking_columns'] 형태로 꺼내 쓸 수 있습니다."""
+    return COLUMNS.get()
+
+
+def get_pages_config():
+    return PAGES.get()
 
 
 # ==========================================
-# [2] 컬럼 및 화면 설정 (columns.yaml) - 신규 추가!
+# [3] 데이터 등록 설정 (config.yaml 의 data_registry)
 # ==========================================
-PAGES_FILE = CONFIG_DIR / "pages.yaml"
-def load_columns():
-    if not PAGES_FILE.exists():
-        raise FileNotFoundError(f"Page 설정 파일을 찾을 수 없습니다: {PAGES_FILE}")
-    with open(PAGES_FILE, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+REGISTRY_FILE = CONFIG_DIR / "config.yaml"
+DEFAULT_REGISTRY_CONFIG = {
+    "default_base_path": "/storage/data/raw_data",
+    "seq_providers": ["Macrogen", "Theragen", "Novogene"],
+    "default_project": "Default_Project",
+}
+
+
+def build_registry(raw):
+    if raw is None:
+        return freeze(DEFAULT_REGISTRY_CONFIG)
+    section = _require_mapping("config.yaml", raw).get("data_registry") or {}
+    if not isinstance(section, dict):
+        raise ConfigError("config.yaml: data_registry 는 mapping 이어야 합니다")
+    return freeze(section)
+
+
+REGISTRY = ConfigFile("data_registry", REGISTRY_FILE, build_registry)
+
+
+def get_registry_config():
+    return REGISTRY.get()
+
+
+CONFIG_FILES = (WORKFLOWS, COLUMNS, PAGES, REGISTRY)
+
+
+def reload_all():
+    """mtime 과 관계없이 모든 설정을 다시 읽습니다 (관리용)."""
+    return {cfg.name: cfg.refresh(force=True) for cfg in CONFIG_FILES}
+
+
+# 예전 이름 호환: config.LIMS_WORKFLOWS 등은 접근할 때마다 최신 스냅샷을 돌려줍니다.
+_LEGACY_NAMES = {
+    "LIMS_WORKFLOWS": lambda: WORKFLOWS.get().pipelines,
+    "COLUMNS_CONFIG": get_columns_config,
+    "PAGES_CONFIG": get_pages_config,
+}
+
 
-# 서버 어디서든 COLUMNS_CONFIG['wet_lab']['columns'] 형태로 꺼내 쓸 수 있습니다.
-PAGES_CONFIG = load_columns()
+def __getattr__(name):
+    if name in _LEGACY_NAMES:
+        return _LEGACY_NAMES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ==========================================
-# [3] 전역 UI 메뉴 설정 (하드코딩 변수)
+# [4] 전역 UI 메뉴 설정 (하드코딩 변수)
 # ==========================================
 MAIN_MENU_ITEMS = [
     {"name": "Status Dashboard", "path": "/",         "icon": "carbon:dashboard"},
@@ -61,4 +250,4 @@ MAIN_MENU_ITEMS = [
     {"name": "Wet-Lab Board",    "path": "/wetlab/",  "icon": "carbon:chemistry"},
     {"name": "New Registration", "path": "/reg/",     "icon": "carbon:document-add"},
     {"name": "Raw DB Excel",     "path": "/excel/",   "icon": "carbon:database"},
-]
\ No newline at end of file
+]
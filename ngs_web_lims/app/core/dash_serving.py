@@ -0,0 +1,234 @@
+# app/core/dash_serving.py
+"""
+Dash 서브앱 서빙 방식 (LIMS_DASH_MODE).
+
+    - inprocess (기본) : 예전처럼 FastAPI 프로세스 안에서 WSGIMiddleware 로 마운트.
+                         Dash 콜백이 API 와 같은 스레드풀 / GIL 을 나눠 씁니다.
+    - proxy            : Dash 앱들은 별도의 멀티 워커 WSGI 서버(app/dash_server.py)에서 돌고,
+                         FastAPI 는 해당 경로를 비동기 리버스 프록시(httpx)로 넘기기만 합니다.
+                         PDF 생성 / SSH 동기화 / LLM 채팅 같은 무거운 콜백이
+                         webhook · /api/v1 엔드포인트를 막지 않습니다.
+
+레지스트리는 {"/경로": "모듈:팩토리함수"} 형태이며, 팩토리는 requests_pathname_prefix 를 받아
+Dash 인스턴스를 돌려줍니다. (proxy 모드의 FastAPI 는 페이지 모듈을 import 하지 않습니다.)
+
+proxy 모드의 Dash 서버(serve_dash_wsgi)는 워커가 요청마다 새로 뜨지 않고 계속 살아 있어야 합니다.
+Raw Data 다운로드(DownloadManager), MD5 검증, SSH 커넥션 풀, 칸반 보드 캐시처럼
+콜백이 시작한 백그라운드 스레드 / 프로세스 내 캐시가 그 워커 안에 남기 때문입니다.
+그래서 gunicorn 이 있으면 상주 prefork 워커(--workers N, gthread)로, 없으면 단일 프로세스 스레드 모드로 띄웁니다.
+(werkzeug 의 processes=N 은 요청마다 fork 하고 응답 후 자식이 끝나므로 쓰지 않습니다.)
+
+LIMS_DASH_LAZY=1 (기본) 이면 각 Dash 앱은 해당 경로로 첫 요청이 들어올 때 만들어집니다.
+워커마다 방문하지 않는 페이지(챗봇, 리포트 등)의 import / 레이아웃 생성 비용을 내지 않으므로
+서버 기동이 빨라집니다. (기동 시간 측정: python -m app.scripts.bench_import_time)
+"""
+import importlib
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import httpx
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+
+DASH_MODE = os.getenv("LIMS_DASH_MODE", "inprocess")
+DASH_UPSTREAM = os.getenv("LIMS_DASH_UPSTREAM", "http://127.0.0.1:8050")
+PROXY_TIMEOUT_S = float(os.getenv("LIMS_DASH_PROXY_TIMEOUT", 300))
+PROXY_MAX_CONNECTIONS = int(os.getenv("LIMS_DASH_PROXY_MAX_CONNECTIONS", 100))
+# proxy 모드에서 FastAPI 가 Dash 서버 프로세스를 직접 띄울지 (개발/단일 호스트용, 운영은 별도 서비스 권장)
+DASH_SPAWN = os.getenv("LIMS_DASH_SPAWN", "0") == "1"
+DASH_WORKERS = int(os.getenv("LIMS_DASH_WORKERS", 4))
+DASH_THREADS = int(os.getenv("LIMS_DASH_THREADS", 8))   # 워커당 요청 처리 스레드
+DASH_LAZY = os.getenv("LIMS_DASH_LAZY", "1") == "1"
+
+# 프록시가 그대로 넘기면 안 되는 hop-by-hop 헤더
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade", "host",
+}
+
+
+# ==========================================
+# [1] 레지스트리 → Dash 인스턴스
+# ==========================================
+def load_factory(spec):
+    """"app.pages.kanban:create_kanban_app" → 함수 객체"""
+    if callable(spec):
+        return spec
+    module_name, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def create_dash_app(path, spec):
+    return load_factory(spec)(requests_pathname_prefix=f"{path}/")
+
+
+class LazyDashWSGI:
+    """첫 요청 때 Dash 앱을 만들고, 이후에는 만들어 둔 Flask 서버로 바로 넘기는 WSGI 앱"""
+
+    def __init__(self, path, spec):
+        self.path = path
+        self.spec = spec
+        self._server = None
+        self._lock = threading.Lock()
+
+    @property
+    def built(self):
+        return self._server is not None
+
+    def build(self):
+        if self._server is None:
+            with self._lock:  # 동시에 들어온 첫 요청들이 앱을 두 번 만들지 않도록
+                if self._server is None:
+                    t0 = time.perf_counter()
+                    self._server = create_dash_app(self.path, self.spec).server
+                    print(f"🧩 Dash 앱 생성: {self.path} ({(time.perf_counter() - t0) * 1000:.0f} ms)")
+        return self._server
+
+    def __call__(self, environ, start_response):
+        return self.build()(environ, start_response)
+
+
+def dash_wsgi_app(path, spec, lazy=None):
+    lazy = DASH_LAZY if lazy is None else lazy
+    return LazyDashWSGI(path, spec) if lazy else create_dash_app(path, spec).server
+
+
+def build_dash_wsgi(registry, lazy=None):
+    """레지스트리의 Dash 앱들을 경로별로 묶은 WSGI 앱 (별도 WSGI 서버용)"""
+    from werkzeug.exceptions import NotFound
+    from werkzeug.middleware.dispatcher import DispatcherMiddleware
+
+    mounts = {path: dash_wsgi_app(path, spec, lazy) for path, spec in registry.items()}
+    return DispatcherMiddleware(NotFound(), mounts)
+
+
+# ==========================================
+# [2] 비동기 리버스 프록시 (ASGI)
+# ==========================================
+class DashProxy:
+    """
+    마운트된 경로의 요청을 원래 경로 그대로 upstream(Dash WSGI 서버)에 넘깁니다.
+    응답은 스트리밍으로 돌려주므로 큰 파일 다운로드도 메모리에 쌓이지 않습니다.
+    """
+
+    def __init__(self, upstream=DASH_UPSTREAM, client=None):
+        self.upstream = upstream.rstrip("/")
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=PROXY_TIMEOUT_S,
+                limits=httpx.Limits(max_connections=PROXY_MAX_CONNECTIONS),
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        request = Request(scope, receive)
+
+        # Mount 가 잘라낸 접두어까지 포함된 원래 경로
+        path = scope.get("raw_path") or scope["path"].encode()
+        url = self.upstream + path.decode("latin-1")
+        if scope.get("query_string"):
+            url += "?" + scope["query_string"].decode("latin-1")
+
+        headers = [(k, v) for k, v in request.headers.raw if k.decode("latin-1").lower() not in HOP_BY_HOP_HEADERS]
+        if request.client:
+            headers.append((b"x-forwarded-for", request.client.host.encode()))
+
+        upstream_request = self.client.build_request(request.method, url, headers=headers, content=request.stream())
+        try:
+            upstream_response = await self.client.send(upstream_request, stream=True)
+        except httpx.HTTPError as e:
+            response = JSONResponse({"detail": f"Dash upstream unavailable: {e.__class__.__name__}"}, status_code=502)
+            await response(scope, receive, send)
+            return
+
+        response = StreamingResponse(
+            upstream_response.aiter_raw(),
+            status_code=upstream_response.status_code,
+            headers={k: v for k, v in upstream_response.headers.items() if k.lower() not in HOP_BY_HOP_HEADERS},
+            background=BackgroundTask(upstream_response.aclose),
+        )
+        await response(scope, receive, send)
+
+
+# ==========================================
+# [3] FastAPI 에 마운트
+# ==========================================
+def mount_dash_apps(app, registry, mode=None, upstream=None, lazy=None):
+    """
+    mode 에 맞춰 레지스트리의 Dash 앱들을 FastAPI 에 마운트합니다.
+    proxy 모드에서 만든 DashProxy 목록을 반환합니다 (종료 시 aclose 용).
+    """
+    mode = mode or DASH_MODE
+    if mode == "proxy":
+        proxy = DashProxy(upstream or DASH_UPSTREAM)
+        for path in registry:
+            app.mount(path, proxy)
+        return [proxy]
+
+    if mode != "inprocess":
+        raise ValueError(f"알 수 없는 LIMS_DASH_MODE: {mode} (inprocess | proxy)")
+
+    from starlette.middleware.wsgi import WSGIMiddleware
+
+    for path, spec in registry.items():
+        app.mount(path, WSGIMiddleware(dash_wsgi_app(path, spec, lazy)))
+    return []
+
+
+def serve_dash_wsgi(load_app, host, port, workers=None, threads=None):
+    """
+    Dash WSGI 앱을 상주 워커로 서빙합니다 (블로킹).
+    load_app 은 WSGI 앱을 만드는 함수이며, gunicorn 워커에서는 fork 뒤 워커마다 한 번 호출됩니다
+    (preload 하지 않으므로 DB 커넥션 / 스레드가 워커 사이에 공유되지 않음).
+    gunicorn 이 없거나 workers == 1 이면 werkzeug 단일 프로세스 + 스레드 모드로 띄웁니다.
+    """
+    workers = workers or DASH_WORKERS
+    threads = threads or DASH_THREADS
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:  # gunicorn 미설치 (Windows 등): 프로세스 하나로
+        BaseApplication = None
+
+    if workers > 1 and BaseApplication is not None:
+        class _DashGunicorn(BaseApplication):
+            def load_config(self):
+                for key, value in {
+                    "bind": f"{host}:{port}", "workers": workers, "worker_class": "gthread", "threads": threads,
+                    "timeout": int(PROXY_TIMEOUT_S), "preload_app": False, "max_requests": 0,
+                }.items():
+                    self.cfg.set(key, value)
+
+            def load(self):
+                return load_app()
+
+        _DashGunicorn().run()
+        return
+
+    if workers > 1:
+        print(f"⚠️ gunicorn 이 없어 Dash 서버를 프로세스 1개(스레드 모드)로 띄웁니다. (요청 워커 {workers}개 → 1개)")
+    from werkzeug.serving import run_simple
+    run_simple(host, port, load_app(), threaded=True)
+
+
+def spawn_dash_server(upstream=None, workers=None):
+    """app.dash_server 를 자식 프로세스로 띄웁니다 (LIMS_DASH_SPAWN=1). Popen 을 반환합니다."""
+    port = httpx.URL(upstream or DASH_UPSTREAM).port or 8050
+    return subprocess.Popen([
+        sys.executable, "-m", "app.dash_server",
+        "--port", str(port), "--workers", str(workers or DASH_WORKERS),
+    ])
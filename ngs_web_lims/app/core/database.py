@@ -1,24 +1,35 @@
 import os
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-# 🚀 중요: 모델 파일(Base)을 가져와야 테이블을 생성할 수 있습니다.
-from app.models._schema import Base 
+from app.core.db_profile import create_lims_engine, create_maintenance_engine
+from app.core.migrations import ensure_schema
 
 # 🟢 핵심 수정 포인트: 환경변수가 없으면 무조건 에러를 내는 대신,
 # 기본값으로 "sqlite:///./lims.db"를 사용하도록 융통성을 줍니다!
 DATABASE_URL = os.getenv("LIMS_DATABASE_URL", "sqlite:///./lims.db")
 
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-engine = create_engine(DATABASE_URL, connect_args=connect_args, pool_pre_ping=True)
+# 🚀 스키마 revision 모음 (app/migrations/vNNNN_*.py)
+MIGRATIONS_PACKAGE = "app.migrations"
 
-# 🚀 테이블 생성: 데이터베이스에 테이블이 없으면 자동으로 만들어줍니다!
-Base.metadata.create_all(bind=engine)
+# ⚙️ SQLite: WAL + busy_timeout 등 PRAGMA / PostgreSQL: 풀 크기 + 타임아웃 (LIMS_DB_* 환경변수로 조정)
+engine = create_lims_engine(DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def maintenance_engine():
+    """마이그레이션 / 재색인 / backfill 용 엔진 (풀 없음, PostgreSQL 타임아웃 없음 — 다 쓰면 dispose)"""
+    return create_maintenance_engine(DATABASE_URL)
+
+def init_db():
+    """
+    서버 기동 시 1회 호출. 밀린 마이그레이션만 적용합니다.
+    (스키마가 최신이면 이력 테이블 조회 한 번으로 끝나고 DDL은 실행하지 않음.
+     밀린 revision 은 요청 처리용 engine 이 아니라 maintenance_engine 으로 적용)
+    """
+    return ensure_schema(engine, MIGRATIONS_PACKAGE, maintenance=maintenance_engine)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
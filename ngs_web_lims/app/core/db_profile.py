@@ -0,0 +1,141 @@
+# app/core/db_profile.py
+"""
+운영용 DB 엔진 프로파일.
+
+Dash 콜백은 WSGI 스레드마다 동시에 실행되므로, 기본 설정(SQLite rollback journal)에서는
+쓰기 잠금이 겹쳐 "database is locked" 가 자주 납니다. create_lims_engine() 은 URL 에 맞춰
+
+    - SQLite     : 접속마다 WAL / synchronous=NORMAL / busy_timeout / cache_size / mmap_size PRAGMA
+                   (WAL 에서는 읽기가 쓰기를 막지 않고, 쓰기끼리는 busy_timeout 동안 기다립니다)
+    - PostgreSQL : 커넥션 풀 크기 / 대기 시간 / 재활용 주기 + statement·lock·idle-in-transaction 타임아웃
+
+을 적용한 엔진을 만듭니다. 모든 값은 LIMS_DB_* 환경변수로 조정합니다.
+마이그레이션 / 재색인 / backfill 처럼 한 문장이 오래 걸리는 작업은 create_maintenance_engine() 으로
+(풀 없이 필요할 때만 접속하고, PostgreSQL 타임아웃을 끈 엔진) 따로 실행합니다.
+이 모듈은 ngs_web_lims / lims 두 앱에 동일하게 들어 있습니다.
+두 사본이 같은지는 ngs_web_lims/tests/test_shared_modules.py 가 확인합니다 (고칠 때는 양쪽을 같이).
+"""
+import os
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import NullPool
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+# ==========================================
+# ⚙️ 프로파일 값 (환경변수)
+# ==========================================
+# 커넥션 풀 (PostgreSQL 등 서버형 DB)
+POOL_SIZE = _env_int("LIMS_DB_POOL_SIZE", 10)
+MAX_OVERFLOW = _env_int("LIMS_DB_MAX_OVERFLOW", 20)
+POOL_TIMEOUT_S = _env_int("LIMS_DB_POOL_TIMEOUT", 30)
+POOL_RECYCLE_S = _env_int("LIMS_DB_POOL_RECYCLE", 1800)
+
+# SQLite (WAL 에서는 읽기끼리 / 읽기와 쓰기가 동시에 되고 쓰기만 busy_timeout 으로 줄을 섭니다.
+#         한 프로세스 안에서 동시에 세션을 여는 스레드 — Dash 워커의 요청 스레드 LIMS_DASH_THREADS(8),
+#         다운로드 워커 LIMS_DOWNLOAD_WORKERS(4), 수신 워커 LIMS_INGEST_WORKERS(2), FASTQ 검증 등 — 보다 풀이 작으면
+#         짧은 읽기도 pool_timeout 까지 기다리므로 기본 8 + overflow 16 으로 둡니다)
+SQLITE_POOL_SIZE = _env_int("LIMS_DB_SQLITE_POOL_SIZE", 8)
+SQLITE_MAX_OVERFLOW = _env_int("LIMS_DB_SQLITE_MAX_OVERFLOW", 16)
+SQLITE_JOURNAL_MODE = os.environ.get("LIMS_DB_SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.environ.get("LIMS_DB_SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = _env_int("LIMS_DB_SQLITE_BUSY_TIMEOUT_MS", 15000)
+SQLITE_CACHE_MB = _env_int("LIMS_DB_SQLITE_CACHE_MB", 64)
+SQLITE_MMAP_MB = _env_int("LIMS_DB_SQLITE_MMAP_MB", 256)
+
+# PostgreSQL (세션 단위 타임아웃, 0 이면 끔 — 요청 처리용 엔진에만, 유지보수 엔진은 항상 끔)
+PG_STATEMENT_TIMEOUT_MS = _env_int("LIMS_DB_STATEMENT_TIMEOUT_MS", 30000)
+PG_LOCK_TIMEOUT_MS = _env_int("LIMS_DB_LOCK_TIMEOUT_MS", 10000)
+PG_IDLE_TX_TIMEOUT_MS = _env_int("LIMS_DB_IDLE_TX_TIMEOUT_MS", 60000)
+PG_APPLICATION_NAME = os.environ.get("LIMS_DB_APPLICATION_NAME", "ngs-lims")
+
+
+# ==========================================
+# [1] SQLite
+# ==========================================
+def sqlite_pragmas(in_memory=False):
+    """접속 직후 실행할 PRAGMA 목록 (메모리 DB는 WAL 불가)"""
+    pragmas = [
+        f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}",
+        f"PRAGMA cache_size = -{SQLITE_CACHE_MB * 1024}",  # 음수 = KiB 단위
+        "PRAGMA temp_store = MEMORY",
+    ]
+    if not in_memory:
+        pragmas.insert(0, f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}")
+        pragmas.append(f"PRAGMA mmap_size = {SQLITE_MMAP_MB * 1024 * 1024}")
+    return pragmas
+
+
+def _attach_sqlite_pragmas(engine, in_memory):
+    pragmas = sqlite_pragmas(in_memory)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+# ==========================================
+# [2] 엔진 생성
+# ==========================================
+def engine_options(url, maintenance=False):
+    """
+    URL 종류별 create_engine 인자.
+    maintenance=True 면 풀 없이(NullPool) 접속하고 PostgreSQL statement / lock / idle 타임아웃을 모두 끕니다
+    (pg_advisory_lock 대기, CREATE INDEX, 전체 테이블 backfill 이 중간에 취소되지 않도록).
+    """
+    options = {"pool_pre_ping": True}
+    if maintenance:
+        options["poolclass"] = NullPool
+
+    if url.startswith("sqlite"):
+        in_memory = url in ("sqlite://", "sqlite:///:memory:")
+        # sqlite3 자체 대기 시간도 busy_timeout 과 맞춰 둔다
+        options["connect_args"] = {"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}
+        if not in_memory and not maintenance:
+            options.update(pool_size=SQLITE_POOL_SIZE, max_overflow=SQLITE_MAX_OVERFLOW, pool_timeout=POOL_TIMEOUT_S)
+        return options
+
+    if not maintenance:
+        options.update(
+            pool_size=POOL_SIZE,
+            max_overflow=MAX_OVERFLOW,
+            pool_timeout=POOL_TIMEOUT_S,
+            pool_recycle=POOL_RECYCLE_S,
+        )
+    if url.startswith("postgresql"):
+        pg_settings = {
+            "statement_timeout": 0 if maintenance else PG_STATEMENT_TIMEOUT_MS,
+            "lock_timeout": 0 if maintenance else PG_LOCK_TIMEOUT_MS,
+            "idle_in_transaction_session_timeout": 0 if maintenance else PG_IDLE_TX_TIMEOUT_MS,
+        }
+        options["connect_args"] = {
+            "application_name": f"{PG_APPLICATION_NAME}-maintenance" if maintenance else PG_APPLICATION_NAME,
+            "options": " ".join(f"-c {key}={value}" for key, value in pg_settings.items()),
+        }
+    return options
+
+
+def create_lims_engine(url, maintenance=False, **overrides):
+    """프로파일이 적용된 엔진. overrides 로 create_engine 인자를 덮어쓸 수 있습니다."""
+    options = {**engine_options(url, maintenance), **overrides}
+    engine = create_engine(url, **options)
+    if engine.dialect.name == "sqlite":
+        _attach_sqlite_pragmas(engine, in_memory=engine.url.database in (None, "", ":memory:"))
+    return engine
+
+
+def create_maintenance_engine(url, **overrides):
+    """마이그레이션 / 재색인 / backfill 용 엔진 (풀 없음, PostgreSQL 타임아웃 없음). 다 쓰면 dispose() 하세요."""
+    return create_lims_engine(url, maintenance=True, **overrides)
@@ -0,0 +1,349 @@
+# app/core/downloads.py
+"""
+Raw Data(FASTQ) 다운로드 관리자.
+
+wget 스크립트를 만들어 샘플을 하나씩 차례로 받던 방식을 대신합니다.
+    - 파일(R1 / R2)마다 download_tasks 행 하나: 상태 / 받은 바이트 / 시도 횟수 / MD5 를 DB 에 기록
+    - 워커 스레드 LIMS_DOWNLOAD_WORKERS 개가 큐에서 작업을 꺼내 동시에 받음
+    - '<dest>.part' 에 이어 쓰고, 끊기면 HTTP Range 로 받은 지점부터 재개 (서버가 Range 를 무시하면 처음부터)
+    - 받는 동안 MD5 를 같이 계산해서 md5_r1 / md5_r2 와 다르면 .part 를 지우고 한 번 더 받음
+    - 네트워크 오류 / 5xx 는 지수 백오프로 LIMS_DOWNLOAD_RETRIES 번까지 재시도
+검증이 끝나면 .part 를 dest_path 로 rename 합니다. 프로세스가 죽어도 다시 실행하면 .part 부터 이어받습니다.
+시작 / 진행률(10초마다) / 재시도 / 완료 이벤트는 LIMS_DOWNLOAD_LOG 파일에 한 줄씩 남기고,
+화면은 이 파일을 /api/v1/downloads/log/stream (SSE) 으로 받아 봅니다.
+
+다운로드 링크 칸에 URL 을 두 개(공백 / 쉼표 / 줄바꿈 구분) 넣으면 R1, R2 순서로 받습니다.
+"""
+import hashlib
+import os
+import queue
+import random
+import re
+import threading
+import time
+import traceback
+from datetime import datetime, timezone, timedelta
+
+import httpx
+from sqlalchemy import update
+
+from app.models._schema import DownloadTask
+
+WORKERS = int(os.getenv("LIMS_DOWNLOAD_WORKERS", 4))
+MAX_ATTEMPTS = int(os.getenv("LIMS_DOWNLOAD_RETRIES", 5))
+BACKOFF_S = float(os.getenv("LIMS_DOWNLOAD_BACKOFF_S", 2))
+TIMEOUT_S = float(os.getenv("LIMS_DOWNLOAD_TIMEOUT", 60))
+CHUNK_BYTES = 1 << 20
+PROGRESS_INTERVAL_S = 1.0
+MD5_RETRIES = 1
+# 콘솔 로그 (app/core/log_tail.py 로 끝에서부터 읽어 SSE 로 흘려보냄)
+LOG_PATH = os.getenv("LIMS_DOWNLOAD_LOG", os.path.join(os.getcwd(), "download_log.txt"))
+LOG_MAX_BYTES = int(float(os.getenv("LIMS_DOWNLOAD_LOG_MAX_MB", 50)) * 1024 * 1024)
+PROGRESS_LOG_INTERVAL_S = 10.0
+# '다운로드 중' 인데 이 시간 넘게 진행률 갱신이 없으면 (프로세스 종료 등) 다시 큐에 넣을 수 있음
+STALE_AFTER = timedelta(minutes=2)
+
+QUEUED, RUNNING, DONE, FAILED, MD5_MISMATCH = "대기", "다운로드 중", "완료", "실패", "MD5 불일치"
+ACTIVE_STATUSES = [QUEUED, RUNNING]
+READS = ("R1", "R2")
+
+
+def _now():
+    return datetime.now(timezone(timedelta(hours=9))).replace(tzinfo=None)
+
+
+_log_lock = threading.Lock()
+
+
+def log_event(message):
+    """다운로드 콘솔 로그에 한 줄 추가 (LOG_MAX_BYTES 를 넘으면 '.1' 로 돌리고 새 파일)"""
+    line = f"[{_now():%m-%d %H:%M:%S}] {message}\n"
+    with _log_lock:
+        try:
+            if os.path.getsize(LOG_PATH) > LOG_MAX_BYTES:
+                os.replace(LOG_PATH, LOG_PATH + ".1")
+        except OSError:
+            pass
+        with open(LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+class RetryableError(Exception):
+    """다시 시도하면 성공할 수 있는 오류 (연결 끊김 / 5xx)"""
+
+
+class Md5MismatchError(RetryableError):
+    pass
+
+
+# ==========================================
+# [1] 작업 등록
+# ==========================================
+def split_links(link):
+    return [u for u in re.split(r"[\s,;]+", str(link or "").strip()) if u]
+
+
+def plan_tasks(row):
+    """그리드 행 → 파일별 작업 dict 목록 (링크 2개면 R1 / R2, 1개면 R1)"""
+    sid = row["sample_id"]
+    tasks = []
+    for read, url in zip(READS, split_links(row.get("download_link"))):
+        key = read.lower()
+        dest = str(row.get(f"fastq_{key}") or "").strip() or f"./{sid}_{read}.fastq.gz"
+        tasks.append({
+            "sample_id": sid, "read": read, "url": url,
+            "dest_path": os.path.abspath(dest),
+            "expected_md5": str(row.get(f"md5_{key}") or "").strip().lower() or None,
+        })
+    return tasks
+
+
+def enqueue(db, rows):
+    """
+    선택 행들 → 대기 상태 작업 (커밋은 호출한 쪽에서).
+    목적지가 같은 기존 작업은 이어받기용으로 다시 '대기' 로 돌리고,
+    이미 받은 파일(같은 URL / MD5 일치)과 다른 곳에서 받는 중인 파일은 건너뜁니다.
+    반환: {"queued": [task id], "done": 건너뛴 완료 수, "running": 진행 중 수}
+    """
+    planned = [t for row in rows for t in plan_tasks(row)]
+    existing = {t.dest_path: t for t in db.query(DownloadTask)
+                .filter(DownloadTask.dest_path.in_([p["dest_path"] for p in planned]))}
+    now = _now()
+    summary, queued = {"queued": [], "done": 0, "running": 0}, []
+    for p in planned:
+        task = existing.get(p["dest_path"])
+        if task is None:
+            task = DownloadTask(**p, status=QUEUED, bytes_done=0, attempts=0, updated_at=now)
+            db.add(task)
+            existing[p["dest_path"]] = task
+        elif (task.status == DONE and task.url == p["url"] and os.path.exists(task.dest_path)
+              and p["expected_md5"] in (None, task.actual_md5)):
+            summary["done"] += 1
+            continue
+        elif task.status == RUNNING and task.updated_at and now - task.updated_at < STALE_AFTER:
+            summary["running"] += 1
+            continue
+        else:
+            for key, value in p.items():
+                setattr(task, key, value)
+            task.status, task.error, task.attempts, task.updated_at = QUEUED, None, 0, now
+        queued.append(task)
+    db.flush()
+    summary["queued"] = list(dict.fromkeys(t.id for t in queued))
+    return summary
+
+
+# ==========================================
+# [2] 파일 1개 받기
+# ==========================================
+class _PartFile:
+    """'<dest>.part' + 지금까지 쓴 바이트의 MD5 (이어받을 때 기존 바이트는 한 번만 읽어 해시)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.md5 = hashlib.md5()
+        self.size = 0
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(CHUNK_BYTES), b""):
+                    self.md5.update(block)
+                    self.size += len(block)
+
+    def reset(self):
+        self.md5, self.size = hashlib.md5(), 0
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def write(self, f, chunk):
+        f.write(chunk)
+        self.md5.update(chunk)
+        self.size += len(chunk)
+
+
+def _content_range(value):
+    """'bytes 100-999/1000' → (100, 1000)  (총 크기를 모르면 None)"""
+    m = re.match(r"bytes (\d+)-\d+/(\d+|\*)", value or "")
+    if not m:
+        return None, None
+    return int(m.group(1)), (int(m.group(2)) if m.group(2) != "*" else None)
+
+
+def _fetch(client, url, part, on_progress):
+    """part 뒤에 이어 받기 → 파일 전체 크기"""
+    headers = {"Range": f"bytes={part.size}-"} if part.size else {}
+    with client.stream("GET", url, headers=headers) as resp:
+        if resp.status_code == 416 and part.size:
+            return part.size  # 이미 끝까지 받아 둔 상태
+        if resp.status_code == 429 or resp.status_code >= 500:
+            raise RetryableError(f"HTTP {resp.status_code}")
+        if resp.status_code >= 400:
+            raise ValueError(f"HTTP {resp.status_code} ({url})")
+
+        if resp.status_code == 206:
+            start, total = _content_range(resp.headers.get("content-range"))
+            if start != part.size:
+                message = f"Range 응답 위치 불일치 (요청 {part.size} / 응답 {start})"
+                part.reset()
+                raise RetryableError(message)
+        else:
+            part.reset()  # Range 미지원 서버 → 처음부터
+            length = resp.headers.get("content-length")
+            total = int(length) if length and length.isdigit() else None
+
+        with open(part.path, "ab") as f:
+            on_progress(part.size, total)
+            for chunk in resp.iter_bytes(CHUNK_BYTES):
+                part.write(f, chunk)
+                on_progress(part.size, total)
+
+    if total is not None and part.size < total:
+        raise RetryableError(f"연결 끊김 ({part.size:,} / {total:,} bytes)")
+    return part.size
+
+
+def _record(session_factory, task_id, **values):
+    values["updated_at"] = _now()
+    with session_factory() as db:
+        db.execute(update(DownloadTask).where(DownloadTask.id == task_id).values(**values))
+        db.commit()
+
+
+def run_task(task_id, session_factory, client, max_attempts=MAX_ATTEMPTS, backoff_s=BACKOFF_S):
+    """작업 하나를 끝까지(완료 / 실패) 처리하고 최종 상태를 돌려줍니다."""
+    with session_factory() as db:
+        task = db.get(DownloadTask, task_id)
+        if task is None or task.status not in ACTIVE_STATUSES:
+            return None
+        url, dest, expected = task.url, task.dest_path, task.expected_md5
+        label = f"[{task.sample_id} {task.read}]"
+
+    os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+    part = _PartFile(dest + ".part")
+    _record(session_factory, task_id, status=RUNNING, started_at=_now(), finished_at=None, error=None,
+            bytes_done=part.size)
+    log_event(f"▶ {label} 다운로드 시작" + (f" ({_size(part.size)} 부터 이어받기)" if part.size else "") + f" → {dest}")
+
+    last_flush = 0.0
+    last_log = (time.monotonic(), part.size)
+
+    def on_progress(done, total):
+        nonlocal last_flush, last_log
+        now = time.monotonic()
+        if now - last_flush >= PROGRESS_INTERVAL_S:
+            last_flush = now
+            _record(session_factory, task_id, bytes_done=done, bytes_total=total)
+        if now - last_log[0] >= PROGRESS_LOG_INTERVAL_S:
+            speed = (done - last_log[1]) / (now - last_log[0])
+            last_log = (now, done)
+            pct = f"{done / total * 100:5.1f}% " if total else ""
+            log_event(f"   {label} {pct}{_size(done)}" + (f" / {_size(total)}" if total else "") + f"  {_size(speed)}/s")
+
+    attempt = mismatches = 0
+    while True:
+        attempt += 1
+        try:
+            size = _fetch(client, url, part, on_progress)
+            digest = part.md5.hexdigest()
+            if expected and digest != expected:
+                part.reset()
+                mismatches += 1
+                raise Md5MismatchError(f"MD5 불일치 (기대 {expected} / 실제 {digest})")
+            os.replace(part.path, dest)
+            _record(session_factory, task_id, status=DONE, actual_md5=digest, bytes_done=size, bytes_total=size,
+                    attempts=attempt, error=None, finished_at=_now())
+            log_event(f"✅ {label} 완료 {_size(size)} md5={digest}" + (" (검증 일치)" if expected else " (검증값 없음)"))
+            return DONE
+        except (RetryableError, httpx.TransportError) as e:
+            message = str(e) or type(e).__name__
+            # MD5 불일치는 한 번만 처음부터 다시 받음 (두 번 연속이면 입력한 MD5 쪽 문제)
+            if attempt >= max_attempts or mismatches > MD5_RETRIES:
+                status = MD5_MISMATCH if isinstance(e, Md5MismatchError) else FAILED
+                _record(session_factory, task_id, status=status, error=message, attempts=attempt,
+                        bytes_done=part.size, finished_at=_now())
+                log_event(f"❌ {label} {status}: {message}")
+                return status
+            _record(session_factory, task_id, attempts=attempt, bytes_done=part.size,
+                    error=f"재시도 {attempt}/{max_attempts - 1}: {message}")
+            delay = backoff_s * 2 ** (attempt - 1) * random.uniform(0.5, 1.0)
+            log_event(f"⚠️ {label} {message} → {delay:.1f}초 후 재시도 ({attempt}/{max_attempts - 1})")
+            time.sleep(delay)
+        except Exception as e:
+            _record(session_factory, task_id, status=FAILED, error=str(e), attempts=attempt,
+                    bytes_done=part.size, finished_at=_now())
+            log_event(f"❌ {label} {FAILED}: {e}")
+            return FAILED
+
+
+# ==========================================
+# [3] 워커 풀
+# ==========================================
+class DownloadManager:
+    """고정 개수 워커 스레드 + 작업 큐. 같은 작업이 큐에 두 번 들어가지 않습니다."""
+
+    def __init__(self, session_factory, workers=WORKERS, client=None, **task_options):
+        self.session_factory = session_factory
+        self.workers = max(1, workers)
+        self.client = client or httpx.Client(timeout=TIMEOUT_S, follow_redirects=True)
+        self.task_options = task_options
+        self._queue = queue.Queue()
+        self._inflight = set()
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def submit(self, task_ids):
+        with self._lock:
+            if not self._threads:
+                # daemon: 서버 종료 시 기다리지 않음 (받던 파일은 다음 실행 때 .part 부터 이어받기)
+                self._threads = [threading.Thread(target=self._worker, name=f"download-{i}", daemon=True)
+                                 for i in range(self.workers)]
+                for t in self._threads:
+                    t.start()
+            new_ids = [i for i in task_ids if i not in self._inflight]
+            self._inflight.update(new_ids)
+        for task_id in new_ids:
+            self._queue.put(task_id)
+        return new_ids
+
+    def join(self):
+        """큐가 빌 때까지 대기 (스크립트용)"""
+        self._queue.join()
+
+    def _worker(self):
+        while True:
+            task_id = self._queue.get()
+            try:
+                run_task(task_id, self.session_factory, self.client, **self.task_options)
+            except Exception:
+                print(f"❌ 다운로드 작업 {task_id} 처리 중 오류:\n{traceback.format_exc()}")
+            finally:
+                with self._lock:
+                    self._inflight.discard(task_id)
+                self._queue.task_done()
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_manager():
+    """프로세스당 하나의 다운로드 관리자 (처음 쓸 때 만듦)"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            from app.core.database import SessionLocal
+            _manager = DownloadManager(SessionLocal)
+        return _manager
+
+
+# ==========================================
+# [4] 진행 상황 조회
+# ==========================================
+def recent_tasks(db, limit=50):
+    return db.query(DownloadTask).order_by(DownloadTask.updated_at.desc(), DownloadTask.id.desc()).limit(limit).all()
+
+
+def _size(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:,.0f} {unit}" if unit == "B" else f"{n:,.1f} {unit}"
+        n /= 1024
@@ -0,0 +1,130 @@
+# app/core/excel_merge.py
+"""
+칸반 모달 '엑셀 덮어쓰기' 병합.
+
+모달에서 내려받은 엑셀(헤더 = 필드 id)을 수정해 다시 올리면
+    1) 헤더 플랜으로 필요한 컬럼만 골라 키(sample_id, 없으면 sample_name)로 색인하고
+    2) 단계 설정(STAGE_SCHEMA_CONFIG) 의 type / options 에 맞춰 컬럼 단위로 형변환한 뒤
+    3) 그리드 행 순서대로 reindex 해서 바뀐 셀만 덮어씁니다.
+행마다 업로드 전체를 훑지 않으므로 플레이트(384건) 단위도 바로 끝납니다.
+매칭되지 않은 행 / 중복 키 / 형식이 맞지 않는 값은 덮어쓰지 않고 병합 리포트로 돌려줍니다.
+"""
+import pandas as pd
+
+from app.core.mapping import BLANK_VALUES, compile_header_plan
+
+# 덮어쓰지 않는 필드 (id / 키 / 패널 / 화면 표시용)
+PROTECTED_FIELDS = ["id", "sample_id", "sample_name", "order_id", "target_panel", "is_split", "is_split_label"]
+KEY_FIELDS = ["sample_id", "sample_name"]
+# 리포트에 예시로 남길 최대 개수
+REPORT_LIMIT = 20
+
+
+def _merge_key(row_data, upload_columns):
+    """업로드와 그리드 모두에 있는 첫 번째 키 (sample_id 우선: DNA/RNA 분할 샘플은 sample_name 이 같다)"""
+    normalized = {str(c).strip() for c in upload_columns}
+    for key in KEY_FIELDS:
+        if key in normalized and any(row.get(key) for row in row_data):
+            return key
+    return None
+
+
+def _text(value):
+    """엑셀 값 → 그리드 문자열 (빈 칸은 None, 정수로 떨어지는 실수는 '.0' 제거)"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value).strip()
+    return None if text in BLANK_VALUES else text
+
+
+# ==========================================
+# [1] 컬럼 단위 형변환
+# ==========================================
+def coerce_column(series, column=None):
+    """
+    업로드 원본 컬럼 → (그리드 값 list, 형식 오류 mask list). 빈 칸은 None (덮어쓰지 않음)
+    numeric → float / date → 'YYYY-MM-DD' / options 가 있는 드롭다운 → 보기 중 하나 (대소문자 무시)
+    """
+    column = column or {}
+    texts = series.map(_text).astype(object)
+    blank = texts.isna()
+    col_type = column.get("type")
+
+    if col_type == "numeric":
+        parsed = pd.to_numeric(series.where(~blank), errors="coerce")
+    elif col_type == "date":
+        parsed = pd.to_datetime(series.where(~blank), errors="coerce", format="mixed")
+    elif column.get("options"):
+        options = {str(o).strip().upper(): o for o in column["options"]}
+        parsed = texts.map(lambda v: options.get(v.upper()) if isinstance(v, str) else None).astype(object)
+    else:
+        return texts.where(~blank, None).tolist(), [False] * len(series)
+
+    ok = parsed.notna()
+    if col_type == "date":
+        parsed = parsed.dt.strftime("%Y-%m-%d")
+    values = parsed.astype(object).where(ok, None)
+    return values.tolist(), (~ok & ~blank).tolist()
+
+
+# ==========================================
+# [2] 병합
+# ==========================================
+def merge_excel_rows(row_data, df_up, columns=()):
+    """
+    모달 rowData + 업로드 DataFrame → (새 rowData, 병합 리포트).
+    columns 는 현재 단계의 STAGE_SCHEMA_CONFIG[...]["columns"] (형변환 / 보기 검사에 사용).
+    리포트: key / matched / changed_cells / unmatched / duplicates / ambiguous / invalid / error
+    """
+    report = {"key": None, "matched": 0, "changed_cells": 0,
+              "unmatched": [], "duplicates": [], "ambiguous": [], "invalid": [], "error": None}
+    key = _merge_key(row_data, df_up.columns)
+    if key is None:
+        report["error"] = "엑셀에 sample_id / sample_name 컬럼이 없습니다."
+        return row_data, report
+    report["key"] = key
+
+    fields = [f for f in dict.fromkeys(k for row in row_data for k in row) if f not in PROTECTED_FIELDS]
+    plan = compile_header_plan(list(df_up.columns), {f: f for f in [key] + fields}, fuzzy=False)
+    up = plan.apply(df_up, clean=False)  # 형변환은 아래 coerce_column 에서 원본 값으로
+    up[key] = up[key].map(_text).astype(object)
+    up = up[up[key].notna()]
+
+    # 같은 키가 여러 번 나오면 첫 행만 사용
+    dup_mask = up[key].duplicated(keep="first")
+    report["duplicates"] = sorted(set(up.loc[dup_mask, key]))
+    up = up[~dup_mask].set_index(key)
+
+    grid_keys = [str(row.get(key) or "").strip() for row in row_data]
+    grid_key_set = set(grid_keys)
+    report["unmatched"] = [k for k in up.index if k not in grid_key_set]
+    if key == "sample_name":
+        counts = pd.Series(grid_keys).value_counts()
+        report["ambiguous"] = sorted(k for k in counts[counts > 1].index if k in up.index)
+
+    # 업로드를 그리드 행 순서로 정렬 (매칭 안 된 행은 전부 None)
+    aligned = up.reindex(grid_keys)
+    types = {c["id"]: c for c in columns}
+    coerced, invalid_seen = {}, set()
+    for field in aligned.columns:
+        values, bad = coerce_column(aligned[field], types.get(field))
+        coerced[field] = values
+        for i in (i for i, b in enumerate(bad) if b):
+            if (grid_keys[i], field) not in invalid_seen:
+                invalid_seen.add((grid_keys[i], field))
+                report["invalid"].append((grid_keys[i], types.get(field, {}).get("name", field), aligned[field].iat[i]))
+
+    matched = aligned.index.isin(up.index)
+    new_data = []
+    for i, row in enumerate(row_data):
+        if not matched[i]:
+            new_data.append(row)
+            continue
+        report["matched"] += 1
+        updates = {f: vals[i] for f, vals in coerced.items()
+                   if f in row and vals[i] is not None and vals[i] != row[f]}
+        report["changed_cells"] += len(updates)
+        new_data.append({**row, **updates} if updates else row)
+    return new_data, report
@@ -0,0 +1,139 @@
+# app/core/fastq_verify.py
+"""
+Raw Data 등록 화면의 FASTQ(R1 / R2) MD5 / 크기 검증.
+
+panel_metadata 의 fastq_r1 / md5_r1 / fastq_r2 / md5_r2 를 app/core/checksum.py 로 검증하고
+결과를 panel_metadata["fastq_check"] 에 기록합니다.
+    {"R1": {"status": "일치", "md5": "...", "size": 123, "mtime_ns": 456, "checked_at": "..."}, "R2": {...}}
+fastq_check 의 md5 는 실제로 계산한 값(verified_md5)입니다. 다음 검증 때 size / mtime 이 그대로인 파일은 다시 읽지 않고,
+그 사이 md5_r1 / md5_r2 가 바뀌었으면 이 값으로 다시 판정합니다.
+
+해시는 오래 걸리므로 DB 세션을 잡고 있지 않습니다.
+    1) 짧은 세션으로 경로 / 기록값만 읽고  2) 세션 없이 해시  3) 새 세션에서 bulk_update_mappings 한 번으로 기록
+기록 시점에 panel_metadata 를 다시 읽어 fastq_check(+ 비어 있던 md5)만 합치므로, 검증 도중 그리드 저장과 섞여도 덮어쓰지 않습니다.
+"""
+import threading
+from datetime import datetime
+
+from app.core import checksum
+from app.core.downloads import log_event
+from app.models._schema import Sample
+
+READS = ("R1", "R2")
+IN_CHUNK_SIZE = 500
+
+_running = threading.Lock()
+
+
+def _load(db, sample_ids):
+    rows = []
+    for i in range(0, len(sample_ids), IN_CHUNK_SIZE):
+        chunk = sample_ids[i:i + IN_CHUNK_SIZE]
+        rows += db.query(Sample.id, Sample.sample_id, Sample.panel_metadata).filter(Sample.sample_id.in_(chunk)).all()
+    return rows
+
+
+def plan_items(rows):
+    """(Sample PK, sample_id, panel_metadata) → checksum.verify_files 입력"""
+    items = []
+    for pk, sample_id, meta in rows:
+        meta = meta if isinstance(meta, dict) else {}
+        last = meta.get("fastq_check") or {}
+        for read in READS:
+            path = str(meta.get(f"fastq_{read.lower()}") or "").strip()
+            if not path:
+                continue
+            prev = last.get(read) or {}
+            items.append({
+                "key": (pk, sample_id, read), "path": path, "md5": meta.get(f"md5_{read.lower()}"),
+                # 경로가 바뀌었으면 지난 결과는 다른 파일 것이므로 무시
+                "size": prev.get("size") if prev.get("path") == path else None,
+                "mtime_ns": prev.get("mtime_ns"), "status": prev.get("status"),
+                "verified_md5": prev.get("md5") if prev.get("path") == path else None,
+            })
+    return items
+
+
+def write_results(db, results):
+    """검증 결과를 Sample.panel_metadata 에 bulk 로 기록 (commit 은 호출측). 반환: 갱신한 Sample 수"""
+    by_pk = {}
+    for r in results:
+        by_pk.setdefault(r["key"][0], []).append(r)
+    if not by_pk:
+        return 0
+
+    now = datetime.now().isoformat(timespec="seconds")
+    pks = list(by_pk)
+    metas = {}
+    for i in range(0, len(pks), IN_CHUNK_SIZE):
+        metas.update(db.query(Sample.id, Sample.panel_metadata).filter(Sample.id.in_(pks[i:i + IN_CHUNK_SIZE])).all())
+
+    mappings = []
+    for pk, sample_results in by_pk.items():
+        if pk not in metas:
+            continue
+        meta = dict(metas[pk]) if isinstance(metas[pk], dict) else {}
+        check = dict(meta.get("fastq_check") or {})
+        for r in sample_results:
+            read = r["key"][2]
+            prev = check.get(read) or {}
+            entry = {"path": r["path"], "checked_at": now}
+            if r["status"] == checksum.UNCHANGED:
+                entry.update({"status": prev.get("status"), "md5": r["md5"]})
+            else:
+                entry.update({"status": r["status"], "md5": r["md5"], "error": r["error"]})
+            entry.update({"size": r["size"], "mtime_ns": r["mtime_ns"]})
+            check[read] = entry
+            if r["status"] == checksum.RECORDED and not checksum.normalize_md5(meta.get(f"md5_{read.lower()}")):
+                meta[f"md5_{read.lower()}"] = r["md5"]
+        meta["fastq_check"] = check
+        mappings.append({"id": pk, "panel_metadata": meta})
+
+    db.bulk_update_mappings(Sample, mappings)
+    return len(mappings)
+
+
+def _log_result(r):
+    if r["status"] == checksum.UNCHANGED:
+        return
+    pk, sample_id, read = r["key"]
+    icon = "✅" if r["status"] in checksum.OK_STATUSES else "❌"
+    detail = f" ({r['error']})" if r.get("error") else ""
+    if r["status"] == checksum.MISMATCH:
+        detail = f" (기록 {r['expected']} / 실제 {r['md5']})"
+    log_event(f"{icon} [{sample_id} {read}] MD5 검증: {r['status']}{detail}")
+
+
+def verify_samples(session_factory, sample_ids, workers=None, force=False, on_result=_log_result):
+    """sample_id 목록의 FASTQ 를 검증하고 기록. 반환: {검증 결과: 파일 수}"""
+    with session_factory() as db:
+        items = plan_items(_load(db, list(sample_ids)))
+    if not items:
+        return {}
+
+    results = checksum.verify_files(items, workers=workers, force=force, on_result=on_result)
+
+    with session_factory() as db:
+        write_results(db, results)
+        db.commit()
+    return checksum.summarize(results)
+
+
+def start_verification(session_factory, sample_ids, force=False):
+    """백그라운드 스레드로 verify_samples 실행. 이미 돌고 있으면 False"""
+    if not _running.acquire(blocking=False):
+        return False
+
+    def _run():
+        try:
+            log_event(f"🔍 FASTQ MD5 검증 시작: 샘플 {len(sample_ids)}개 (워커 {checksum.WORKERS}개)")
+            summary = verify_samples(session_factory, sample_ids, force=force)
+            text = ", ".join(f"{k} {v}" for k, v in summary.items()) or "검증할 경로 없음"
+            log_event(f"🏁 FASTQ MD5 검증 완료: {text}")
+        except Exception as e:
+            log_event(f"🚨 FASTQ MD5 검증 오류: {e}")
+        finally:
+            _running.release()
+
+    threading.Thread(target=_run, daemon=True, name="fastq-verify").start()
+    return True
@@ -0,0 +1,170 @@
+# app/core/grid_query.py
+"""
+dash-ag-grid Infinite Row Model 요청(getRowsRequest)을 SQL로 번역하는 헬퍼 모음.
+
+그리드가 보내는 sortModel / filterModel / startRow / endRow 를 SQLAlchemy 쿼리에
+그대로 얹어서, 화면에 보이는 블록만 DB에서 꺼내오도록 합니다.
+column_map 은 {그리드 field: SQLAlchemy 컬럼(또는 표현식)} 형태입니다.
+"""
+from datetime import datetime
+
+from sqlalchemy import String, and_, cast, or_
+
+DEFAULT_BLOCK_SIZE = 100
+
+
+# ==========================================
+# [1] 페이지 범위 (LIMIT / OFFSET)
+# ==========================================
+def get_block_range(request: dict, block_size: int = DEFAULT_BLOCK_SIZE):
+    """getRowsRequest 에서 (offset, limit) 을 안전하게 꺼냅니다."""
+    start = max(int(request.get("startRow") or 0), 0)
+    end = int(request.get("endRow") or start + block_size)
+    return start, max(end - start, 1)
+
+
+def build_rows_response(rows: list, start: int, limit: int, count_query=None) -> dict:
+    """
+    getRowsResponse 를 조립합니다.
+    블록이 덜 찼다면 마지막 행 번호를 바로 알 수 있으므로 COUNT 쿼리를 생략합니다.
+    """
+    if len(rows) < limit:
+        row_count = start + len(rows)
+    elif count_query is not None:
+        row_count = count_query.order_by(None).count()
+    else:
+        row_count = None
+    response = {"rowData": rows}
+    if row_count is not None:
+        response["rowCount"] = row_count
+    return response
+
+
+# ==========================================
+# [2] 통합 검색 (키워드 → OR LIKE)
+# ==========================================
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def keyword_clause(keyword: str, columns: list):
+    """여러 컬럼 중 하나라도 키워드를 포함하면 통과하는 OR 조건"""
+    kw = (keyword or "").strip()
+    if not kw:
+        return None
+    pattern = f"%{_escape_like(kw)}%"
+    return or_(*[col.ilike(pattern, escape="\\") for col in columns])
+
+
+# ==========================================
+# [3] 정렬 (sortModel → ORDER BY)
+# ==========================================
+def apply_sort_model(query, sort_model: list, column_map: dict, default_order: list):
+    """
+    sortModel 을 ORDER BY 로 변환합니다.
+    default_order 는 항상 뒤에 붙여 페이지 경계가 흔들리지 않도록(안정 정렬) 합니다.
+    """
+    clauses = []
+    for item in sort_model or []:
+        col = column_map.get(item.get("colId"))
+        if col is None:
+            continue
+        clauses.append(col.desc() if item.get("sort") == "desc" else col.asc())
+    return query.order_by(*clauses, *default_order)
+
+
+# ==========================================
+# [4] 컬럼 필터 (filterModel → WHERE)
+# ==========================================
+def _parse_grid_date(value):
+    if not value:
+        return None
+    try:
+        return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def _compare(col, op, value, value_to=None):
+    if op == "equals":
+        return col == value
+    if op == "notEqual":
+        return col != value
+    if op == "lessThan":
+        return col < value
+    if op == "lessThanOrEqual":
+        return col <= value
+    if op == "greaterThan":
+        return col > value
+    if op == "greaterThanOrEqual":
+        return col >= value
+    if op == "inRange" and value_to is not None:
+        return col.between(value, value_to)
+    return None
+
+
+def _condition_clause(col, cond: dict):
+    ftype = cond.get("filterType", "text")
+    op = cond.get("type", "contains")
+
+    if op == "blank":
+        return col.is_(None) if ftype != "text" else or_(col.is_(None), cast(col, String) == "")
+    if op == "notBlank":
+        return col.isnot(None) if ftype != "text" else and_(col.isnot(None), cast(col, String) != "")
+
+    if ftype == "number":
+        if cond.get("filter") is None:
+            return None
+        return _compare(col, op, cond.get("filter"), cond.get("filterTo"))
+
+    if ftype == "date":
+        date_from = _parse_grid_date(cond.get("dateFrom"))
+        if date_from is None:
+            return None
+        return _compare(col, op, date_from, _parse_grid_date(cond.get("dateTo")))
+
+    # 텍스트 필터: 문자열이 아닌 컬럼(Date/Float 등)도 CAST 후 비교
+    text = str(cond.get("filter") or "")
+    if not text:
+        return None
+    text_col = col if isinstance(getattr(col, "type", None), String) else cast(col, String)
+    escaped = _escape_like(text)
+    if op == "equals":
+        return text_col == text
+    if op == "notEqual":
+        return text_col != text
+    if op == "startsWith":
+        return text_col.ilike(f"{escaped}%", escape="\\")
+    if op == "endsWith":
+        return text_col.ilike(f"%{escaped}", escape="\\")
+    if op == "notContains":
+        return ~text_col.ilike(f"%{escaped}%", escape="\\")
+    return text_col.ilike(f"%{escaped}%", escape="\\")
+
+
+def _filter_clause(col, model: dict):
+    # AG Grid v31+ : {"operator": "AND", "conditions": [...]}
+    # 구버전       : {"operator": "AND", "condition1": {...}, "condition2": {...}}
+    if "conditions" in model or "condition1" in model:
+        conds = model.get("conditions") or [model.get("condition1"), model.get("condition2")]
+        ftype = model.get("filterType", "text")
+        clauses = [
+            c for c in (_condition_clause(col, {"filterType": ftype, **cond}) for cond in conds if cond)
+            if c is not None
+        ]
+        if not clauses:
+            return None
+        return or_(*clauses) if model.get("operator") == "OR" else and_(*clauses)
+    return _condition_clause(col, model)
+
+
+def apply_filter_model(query, filter_model: dict, column_map: dict):
+    """filterModel 의 각 컬럼 조건을 WHERE 절로 누적합니다. 모르는 컬럼은 무시합니다."""
+    for field, model in (filter_model or {}).items():
+        col = column_map.get(field)
+        if col is None or not isinstance(model, dict):
+            continue
+        clause = _filter_clause(col, model)
+        if clause is not None:
+            query = query.filter(clause)
+    return query
@@ -0,0 +1,104 @@
+# app/core/id_service.py
+"""
+ngs_web_lims ID 규칙 + 채번 (카운터는 app/core/id_allocator.py).
+
+    Order   : GCX-{기관코드}-{YYMMDD}-{seq:02d}               예) GCX-C12-260618-03
+    Sample  : ACC-{YYMMDD}-{order seq}-{sample seq:03d}-{DNA|RNA}
+    재실험  : {원본 sample_id}-R{n}                             예) ACC-260618-03-001-DNA-R2
+
+Order seq 는 기관과 관계없이 "접수일" 하루 단위로 증가합니다 (ACC ID 가 seq 로 Order 를 구분하므로).
+Sample seq 는 한 Order 안에서만 쓰이므로 카운터 없이 등록 순서대로 붙입니다.
+"""
+import re
+
+from sqlalchemy import or_, select
+
+from app.core.id_allocator import allocate, current_value, existing_keys, max_suffix, reserve
+from app.models._schema import Order, Sample
+
+ORDER_SCOPE = "order"
+RETEST_SCOPE = "retest"
+RETEST_SUFFIX = re.compile(r"-R(\d+)$")
+
+# LIKE 조건을 OR 로 묶을 때 한 번에 넣는 개수
+LIKE_CHUNK = 200
+
+
+# ==========================================
+# [1] Order / ACC ID
+# ==========================================
+def format_order_id(facility_code, day_str, seq):
+    return f"GCX-{facility_code}-{day_str}-{seq:02d}"
+
+
+def format_sample_id(day_str, order_seq, sample_seq, na_type=None):
+    base = f"ACC-{day_str}-{order_seq:02d}-{sample_seq:03d}"
+    return f"{base}-{na_type}" if na_type else base
+
+
+def _order_seq_seed(day_str):
+    # 카운터 도입 전에 만들어진 같은 날짜의 Order 중 가장 큰 seq
+    return lambda db: max_suffix(db, Order.order_id, rf"^GCX-[^-]+-{day_str}-(\d+)$", like=f"GCX-%-{day_str}-%")
+
+
+def next_order_seq(db, day_str, count=1):
+    """접수일(YYMMDD)의 Order seq 발급 → range. 호출한 트랜잭션이 커밋될 때 확정됩니다."""
+    return reserve(db, ORDER_SCOPE, day_str, count, seed=_order_seq_seed(day_str))
+
+
+def peek_order_seq(db, day_str):
+    """다음에 발급될 seq (미리보기용, 발급하지 않음 ─ 실제 저장 시 달라질 수 있음)"""
+    last = current_value(db, ORDER_SCOPE, day_str)
+    if last is None:
+        last = _order_seq_seed(day_str)(db)
+    return last + 1
+
+
+# ==========================================
+# [2] 재실험(-R) 샘플 ID
+# ==========================================
+def retest_base(sample_id):
+    """'X-R2' → ('X', 2), 'X' → ('X', 0)"""
+    sample_id = str(sample_id or "UNKNOWN")
+    m = RETEST_SUFFIX.search(sample_id)
+    if m:
+        return sample_id[:m.start()], int(m.group(1))
+    return sample_id, 0
+
+
+def _used_suffixes(db, bases):
+    """samples 에 이미 있는 base-R{n} 의 base 별 최대 n (카운터가 없는 원본용, LIKE OR 묶음 조회)"""
+    used = {}
+    bases = list(bases)
+    for start in range(0, len(bases), LIKE_CHUNK):
+        chunk = bases[start:start + LIKE_CHUNK]
+        rows = db.execute(
+            select(Sample.sample_id).where(or_(*[Sample.sample_id.like(f"{b}-R%") for b in chunk]))
+        ).scalars()
+        wanted = set(chunk)
+        for sample_id in rows:
+            base, n = retest_base(sample_id)
+            if base in wanted and n:
+                used[base] = max(used.get(base, 0), n)
+    return used
+
+
+def allocate_retest_ids(db, sample_ids):
+    """
+    원본 sample_id 목록 → 새 재실험 sample_id 목록 (입력 순서 그대로).
+    같은 원본이 여러 번 들어 있으면 번호를 연속으로 발급합니다.
+    """
+    parsed = [retest_base(sid) for sid in sample_ids]
+    wanted = {}
+    for base, n in parsed:
+        count, floor = wanted.get(base, (0, 0))
+        wanted[base] = (count + 1, max(floor, n))
+
+    missing = set(wanted) - existing_keys(db, RETEST_SCOPE, wanted)
+    used = _used_suffixes(db, missing) if missing else {}
+
+    issued = {}
+    for base in sorted(wanted):  # 항상 같은 순서로 잠가 교착을 피한다
+        count, floor = wanted[base]
+        issued[base] = iter(allocate(db, RETEST_SCOPE, base, count, max(floor, used.get(base, 0))))
+    return [f"{base}-R{next(issued[base])}" for base, _ in parsed]
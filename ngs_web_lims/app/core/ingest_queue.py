@@ -0,0 +1,279 @@
+# app/core/ingest_queue.py
+"""
+분석 결과 수신 큐 (ingest_events 테이블 = 로컬 outbox).
+
+/api/v1/result, /api/analysis/complete 가 DB 병합을 요청 안에서 하지 않고
+    1) 본문 검증 → ingest_events 에 원본 저장 (accept) → 바로 202
+    2) 백그라운드 워커 LIMS_INGEST_WORKERS 개가 '대기' 행을 LIMS_INGEST_BATCH 개씩 가져가
+       app/core/analysis_ingest.py 로 한 트랜잭션에 반영
+하도록 합니다.
+    - idempotency_key = {source}:{batch_id}:{sample_id}:{pipeline_version} (또는 Idempotency-Key 헤더)
+      가 같은 요청은 새로 쌓지 않고 기존 행을 돌려줌 → 분석 서버 재시도로 두 번 반영되지 않음
+    - 행 가져가기는 UPDATE ... WHERE status='대기' RETURNING 으로 (워커 / 프로세스가 여러 개여도 한 번만)
+    - 배치가 통째로 실패하면 한 건씩 다시 처리해 문제 행만 골라내고,
+      오류는 지수 백오프로 LIMS_INGEST_RETRIES 번까지 재시도 후 '실패'(dead letter) 로 남김
+    - 등록되지 않은 샘플은 재시도해도 같으므로 바로 '실패' (requeue 로 다시 넣을 수 있음)
+    - '처리 중' 으로 STALE_AFTER 넘게 멈춘 행(프로세스 종료)은 다시 '대기' 로
+"""
+import hashlib
+import json
+import os
+import threading
+import traceback
+from datetime import datetime, timezone, timedelta
+
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+
+from app.core.analysis_ingest import ingest_results, merge_webhook_results
+from app.models._schema import IngestEvent
+
+WORKERS = int(os.getenv("LIMS_INGEST_WORKERS", 2))
+BATCH_SIZE = int(os.getenv("LIMS_INGEST_BATCH", 200))
+MAX_ATTEMPTS = int(os.getenv("LIMS_INGEST_RETRIES", 5))
+BACKOFF_S = float(os.getenv("LIMS_INGEST_BACKOFF_S", 2))
+POLL_S = 1.0                        # 다른 프로세스가 넣은 행도 이 간격으로 확인
+STALE_AFTER = timedelta(minutes=5)
+IN_CHUNK_SIZE = 500
+
+QUEUED, RUNNING, DONE, DEAD = "대기", "처리 중", "완료", "실패"
+SOURCE_RESULT, SOURCE_WEBHOOK = "result", "webhook"
+
+
+def _now():
+    return datetime.now(timezone(timedelta(hours=9))).replace(tzinfo=None)
+
+
+# ==========================================
+# [1] 수신 (요청 안에서 실행)
+# ==========================================
+def idempotency_key(source, record, header_key=None):
+    if header_key:
+        return f"{source}:{header_key.strip()}"
+    batch_id = record.get("batch_id")
+    if batch_id:
+        version = record.get("pipeline_version") or record.get("pipeline") or ""
+        return f"{source}:{batch_id}:{record.get('sample_id')}:{version}"
+    # batch_id 없는 webhook → 본문이 같으면 같은 결과
+    digest = hashlib.sha256(json.dumps(record, sort_keys=True, ensure_ascii=False, default=str).encode()).hexdigest()
+    return f"{source}:sha256:{digest}"
+
+
+def accept(db, source, records, header_key=None):
+    """
+    원본을 ingest_events 에 저장 (commit 은 호출측). header_key 는 records 가 하나일 때만 사용.
+    반환값: 입력 순서대로 [{"event_id", "idempotency_key", "status", "duplicate"}]
+    """
+    keys = [idempotency_key(source, r, header_key if len(records) == 1 else None) for r in records]
+    existing = {}
+    unique_keys = list(dict.fromkeys(keys))
+    for i in range(0, len(unique_keys), IN_CHUNK_SIZE):
+        rows = db.query(IngestEvent.idempotency_key, IngestEvent.id, IngestEvent.status).filter(
+            IngestEvent.idempotency_key.in_(unique_keys[i:i + IN_CHUNK_SIZE])).all()
+        existing.update({key: (event_id, status) for key, event_id, status in rows})
+
+    now = _now()
+    created = {}
+    for key, record in zip(keys, records):
+        if key in existing or key in created:
+            continue
+        created[key] = IngestEvent(source=source, idempotency_key=key, sample_id=record.get("sample_id"),
+                                   payload=record, status=QUEUED, attempts=0, received_at=now, updated_at=now)
+    if created:
+        db.add_all(created.values())
+        try:
+            db.flush()
+        except IntegrityError:
+            # 같은 키가 동시에 들어옴 → 되돌리고 다시 (이번엔 기존 행으로 잡힘)
+            db.rollback()
+            return accept(db, source, records, header_key)
+
+    out = []
+    for key in keys:
+        if key in created:
+            event = created.pop(key)
+            out.append({"event_id": event.id, "idempotency_key": key, "status": QUEUED, "duplicate": False})
+            existing[key] = (event.id, QUEUED)
+        else:
+            event_id, status = existing[key]
+            out.append({"event_id": event_id, "idempotency_key": key, "status": status, "duplicate": True})
+    return out
+
+
+def requeue(db, event_ids=None):
+    """'실패' 행을 다시 '대기' 로 (event_ids 가 없으면 전부). 반환: 바뀐 행 수"""
+    stmt = update(IngestEvent).where(IngestEvent.status == DEAD)
+    if event_ids:
+        stmt = stmt.where(IngestEvent.id.in_(event_ids))
+    return db.execute(stmt.values(status=QUEUED, attempts=0, error=None, next_attempt_at=None,
+                                  updated_at=_now())).rowcount
+
+
+# ==========================================
+# [2] 처리 (워커 스레드)
+# ==========================================
+def _claim(session_factory, batch_size):
+    """'대기' 행을 batch_size 개까지 '처리 중' 으로 바꾸며 가져옴 → [(id, source, payload, attempts)]"""
+    now = _now()
+    with session_factory() as db:
+        ids = [row[0] for row in db.query(IngestEvent.id).filter(
+            IngestEvent.status == QUEUED,
+            or_(IngestEvent.next_attempt_at.is_(None), IngestEvent.next_attempt_at <= now),
+        ).order_by(IngestEvent.id).limit(batch_size).all()]
+        if not ids:
+            return []
+        claimed = db.execute(
+            update(IngestEvent)
+            .where(IngestEvent.id.in_(ids), IngestEvent.status == QUEUED)
+            .values(status=RUNNING, updated_at=now)
+            .returning(IngestEvent.id, IngestEvent.source, IngestEvent.payload, IngestEvent.attempts)
+        ).all()
+        db.commit()
+    return sorted(claimed)
+
+
+def _apply(session_factory, source, events):
+    """같은 source 의 행들을 한 트랜잭션에 반영 → 행별 (status, error)"""
+    with session_factory() as db:
+        try:
+            if source == SOURCE_RESULT:
+                from app.api.analysis_api import AnalysisPayload  # 검증 스키마는 API 쪽에 있음
+                items = ingest_results(db, [AnalysisPayload.model_validate(e[2]) for e in events])
+            elif source == SOURCE_WEBHOOK:
+                items = merge_webhook_results(db, [e[2] for e in events])
+            else:
+                raise ValueError(f"알 수 없는 source: {source}")
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+    return [(DEAD, item["message"]) if item["status"] == "not_found" else (DONE, None) for item in items]
+
+
+def _failed(event, max_attempts, backoff_s):
+    """예외 직후 호출 → 재시도(지수 백오프) 또는 dead letter"""
+    attempts = (event[3] or 0) + 1
+    error = traceback.format_exc(limit=3).strip().splitlines()[-1]
+    if attempts >= max_attempts:
+        return (DEAD, error, attempts, None)
+    return (QUEUED, error, attempts, _now() + timedelta(seconds=backoff_s * 2 ** (attempts - 1)))
+
+
+def process_batch(session_factory, events, max_attempts=MAX_ATTEMPTS, backoff_s=BACKOFF_S):
+    """가져온 행들을 반영하고 결과를 기록. 반환: {상태: 행 수}"""
+    outcomes = {}
+    by_source = {}
+    for event in events:
+        by_source.setdefault(event[1], []).append(event)
+
+    for source, group in by_source.items():
+        try:
+            outcomes.update(zip((e[0] for e in group), _apply(session_factory, source, group)))
+        except Exception:
+            if len(group) == 1:
+                outcomes[group[0][0]] = _failed(group[0], max_attempts, backoff_s)
+                continue
+            # 배치 중 어느 행이 문제인지 모르므로 한 건씩 다시
+            for event in group:
+                try:
+                    outcomes[event[0]] = _apply(session_factory, source, [event])[0]
+                except Exception:
+                    outcomes[event[0]] = _failed(event, max_attempts, backoff_s)
+
+    now = _now()
+    mappings, counts = [], {}
+    for event_id, outcome in outcomes.items():
+        status, error = outcome[0], outcome[1]
+        row = {"id": event_id, "status": status, "error": error, "updated_at": now}
+        if len(outcome) == 4:
+            row.update(attempts=outcome[2], next_attempt_at=outcome[3])
+        if status in (DONE, DEAD):
+            row["processed_at"] = now
+        mappings.append(row)
+        counts[status] = counts.get(status, 0) + 1
+    mappings.sort(key=lambda row: sorted(row))   # 같은 컬럼 조합끼리 executemany
+    with session_factory() as db:
+        db.bulk_update_mappings(IngestEvent, mappings)
+        db.commit()
+    return counts
+
+
+def reclaim_stale(session_factory, stale_after=STALE_AFTER):
+    """'처리 중' 으로 오래 멈춘 행을 '대기' 로 되돌림 (기동 시)"""
+    with session_factory() as db:
+        n = db.execute(update(IngestEvent).where(
+            IngestEvent.status == RUNNING, IngestEvent.updated_at < _now() - stale_after,
+        ).values(status=QUEUED, updated_at=_now())).rowcount
+        db.commit()
+    return n
+
+
+class IngestWorker:
+    """고정 개수 워커 스레드. notify() 로 깨우고, 깨우지 않아도 POLL_S 마다 '대기' 행을 확인합니다."""
+
+    def __init__(self, session_factory, workers=WORKERS, batch_size=BATCH_SIZE, max_attempts=MAX_ATTEMPTS,
+                 backoff_s=BACKOFF_S, poll_s=POLL_S):
+        self.session_factory = session_factory
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_s = backoff_s
+        self.poll_s = poll_s
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            self._stop.clear()
+            reclaim_stale(self.session_factory)
+            self._threads = [threading.Thread(target=self._loop, name=f"ingest-{i}", daemon=True)
+                             for i in range(self.workers)]
+            for t in self._threads:
+                t.start()
+
+    def notify(self):
+        self.start()
+        self._wake.set()
+
+    def stop(self, timeout=10):
+        with self._lock:
+            threads, self._threads = self._threads, []
+        self._stop.set()
+        self._wake.set()
+        for t in threads:
+            t.join(timeout)
+
+    def drain_once(self):
+        """한 배치 처리. 반환: 처리한 행 수 (0 이면 할 일 없음)"""
+        events = _claim(self.session_factory, self.batch_size)
+        if events:
+            process_batch(self.session_factory, events, self.max_attempts, self.backoff_s)
+        return len(events)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                if self.drain_once():
+                    continue
+            except Exception:
+                print(f"❌ 분석 결과 수신 큐 처리 중 오류:\n{traceback.format_exc()}")
+            self._wake.wait(self.poll_s)
+            self._wake.clear()
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_worker():
+    """프로세스당 하나의 수신 큐 워커 (처음 쓸 때 만듦)"""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            from app.core.database import SessionLocal
+            _worker = IngestWorker(SessionLocal)
+        return _worker
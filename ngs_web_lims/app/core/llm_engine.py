@@ -2,7 +2,6 @@ import argparse
 import json
 import os
 from pathlib import Path
-from llama_cpp import Llama
 
 SYSTEM_PROMPT = """
 You are an AI assistant specialized in fetal and embryonic genetic disorders.
@@ -32,6 +31,9 @@ def load_model(model_path: str):
     if not os.path.exists(model_path):
         raise FileNotFoundError(f"모델 파일을 찾을 수 없습니다: {model_path}")
 
+    # llama_cpp 는 import 만으로도 무겁기 때문에 실제로 모델을 올릴 때 불러온다
+    from llama_cpp import Llama
+
     # 스레드 제한 로직 (CPU 과부하 방지)
     total_cores = os.cpu_count() or 8
     optimal_threads = min(total_cores, 32) 
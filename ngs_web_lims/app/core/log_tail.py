@@ -0,0 +1,92 @@
+# app/core/log_tail.py
+"""
+계속 커지는 로그 파일을 끝에서부터 따라 읽는 리더.
+
+매번 파일 전체를 readlines() 하지 않고
+    - 마지막으로 읽은 byte offset 부터 새로 붙은 부분만 seek 해서 읽고
+    - 처음 열 때는 파일 끝 TAIL_BYTES 만 읽으며
+    - 최근 max_lines 줄만 링 버퍼(deque)에 둡니다.
+클라이언트는 "마지막으로 받은 줄 번호(cursor)" 만 들고 있다가 read_since(cursor) 로 그 뒤 줄만 받습니다.
+파일이 잘리거나(rotate / truncate) 다른 파일로 바뀌면 처음부터 다시 따라갑니다.
+"""
+import os
+import threading
+from collections import deque
+from itertools import islice
+
+TAIL_BYTES = 64 * 1024
+MAX_READ_BYTES = 4 * 1024 * 1024   # 한 번에 읽을 최대 크기 (밀린 양이 더 크면 끝부분만)
+DEFAULT_MAX_LINES = 500
+
+
+class LogTail:
+    def __init__(self, path, max_lines=DEFAULT_MAX_LINES):
+        self.path = path
+        self._lines = deque(maxlen=max_lines)
+        self._seq = 0            # 지금까지 버퍼에 들어온 줄 수 (= 최신 cursor)
+        self._offset = None
+        self._file_id = None
+        self._partial = b""      # 아직 줄바꿈이 안 온 마지막 조각
+        self._lock = threading.Lock()
+
+    def _append(self, data):
+        data = self._partial + data
+        *complete, self._partial = data.split(b"\n")
+        for raw in complete:
+            self._lines.append(raw.decode("utf-8", errors="replace").rstrip("\r"))
+        self._seq += len(complete)
+
+    def _poll(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return
+        file_id = (st.st_dev, st.st_ino)
+        if self._offset is None or file_id != self._file_id or st.st_size < self._offset:
+            # 처음 열거나 rotate / truncate → 끝부분부터 다시
+            self._file_id, self._partial = file_id, b""
+            self._offset = max(0, st.st_size - TAIL_BYTES)
+            skip_first = self._offset > 0
+        else:
+            skip_first = False
+        if st.st_size == self._offset:
+            return
+
+        start = self._offset
+        if st.st_size - start > MAX_READ_BYTES:
+            start, self._partial, skip_first = st.st_size - MAX_READ_BYTES, b"", True
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            data = f.read(st.st_size - start)
+        self._offset = start + len(data)
+        if skip_first:
+            # 중간에서 시작했으면 잘린 첫 줄은 버림
+            data = data.split(b"\n", 1)[1] if b"\n" in data else b""
+        self._append(data)
+
+    def read_since(self, cursor=None):
+        """
+        cursor 이후에 쌓인 줄 → (lines, 새 cursor).
+        cursor 가 None 이거나 링 버퍼보다 오래됐으면(또는 서버가 재시작됐으면) 버퍼에 남은 줄부터 줍니다.
+        """
+        with self._lock:
+            self._poll()
+            first = self._seq - len(self._lines)
+            if cursor is None or cursor > self._seq:
+                skip = 0   # 처음 접속 / 서버 재시작 전 cursor
+            else:
+                skip = max(cursor - first, 0)
+            return list(islice(self._lines, skip, None)), self._seq
+
+
+_tails = {}
+_tails_lock = threading.Lock()
+
+
+def get_tail(path, max_lines=DEFAULT_MAX_LINES):
+    """경로별로 프로세스에 하나씩 (여러 클라이언트가 같은 버퍼를 공유)"""
+    path = os.path.abspath(path)
+    with _tails_lock:
+        if path not in _tails:
+            _tails[path] = LogTail(path, max_lines)
+        return _tails[path]
@@ -42,6 +42,9 @@ SPECIAL_MAPPING = {
     },
 }
 
+# Patient ID 칸이 비어 있을 때 샘플명으로 대신 쓰는 헤더 (앞에서부터)
+SAMPLE_NAME_FALLBACKS = ["Patient ID", "Sample ID", "환자번호", "검체번호", "Patient ID/ Sample ID"]
+
 def get_full_mapping_for_panel(panel_type):
     # 기본 맵 복사
     full_map = {k: {"db_col": v, "is_extra": False} for k, v in BASE_MAPPING.items()}
@@ -73,3 +76,123 @@ FACILITY_MAPPING = {
     "C24": {"facility": "삼성서울병원", "team": "유방외과"}
 }
 
+
+
+# ==========================================
+# 🚀 4. 헤더 매핑 플랜 (업로드 파일 1개당 1번만 계산)
+# ==========================================
+# 행마다 "엑셀 헤더 정규화 → 매핑 키 비교" 를 반복하지 않도록,
+# 업로드된 헤더 행과 매핑을 한 번 비교해 "몇 번째 컬럼 → 어떤 DB 컬럼" 목록으로 바꿔 둡니다.
+# 이후 변환은 DataFrame 컬럼 선택 + 이름 변경(벡터 연산)으로 끝납니다.
+BLANK_VALUES = ["", "nan", "NaT", "None"]
+
+
+def normalize_header(name):
+    """'Tumor\\n Type' → 'tumortype' (대소문자 / 공백 / 줄바꿈 무시)"""
+    return str(name).lower().replace(" ", "").replace("\n", "")
+
+
+def _find_header(normalized, key, fuzzy):
+    """get_fuzzy_val 과 같은 규칙: 정확히 같은 헤더 → (fuzzy 면) 정규화한 키를 포함하는 첫 헤더"""
+    target = normalize_header(key)
+    for i, (raw, _) in enumerate(normalized):
+        if raw == key:
+            return i
+    for i, (_, norm) in enumerate(normalized):
+        if norm == target or (fuzzy and target in norm):
+            return i
+    return None
+
+
+class HeaderPlan:
+    """
+    compile_header_plan() 결과.
+        indexes  : 업로드 헤더에서의 컬럼 위치 (targets 와 같은 순서)
+        targets  : 각 위치가 들어갈 DB 컬럼명
+        extra    : panel_metadata(JSON)로 들어갈 DB 컬럼명
+        fallbacks: {DB 컬럼: (대체 컬럼 위치, ...)} ─ 값이 비어 있으면 순서대로 채움
+        missing  : 파일에서 찾지 못한 매핑 키
+    """
+
+    def __init__(self, indexes, targets, extra, fallbacks, missing):
+        self.indexes = tuple(indexes)
+        self.targets = tuple(targets)
+        self.extra = frozenset(extra)
+        self.fallbacks = dict(fallbacks)
+        self.missing = tuple(missing)
+
+    def __repr__(self):
+        return f"<HeaderPlan {dict(zip(self.targets, self.indexes))} missing={list(self.missing)}>"
+
+    def apply(self, df, clean=True):
+        """
+        업로드 DataFrame → DB 컬럼명 DataFrame (열 선택 + 이름 변경).
+        clean=True 면 문자열 앞뒤 공백을 지우고 빈 값('', 'nan', 'NaT')은 None 으로 통일합니다.
+        """
+        out = df.iloc[:, list(self.indexes)].copy()
+        out.columns = list(self.targets)
+        for target, fallback_indexes in self.fallbacks.items():
+            if target not in out.columns:
+                out[target] = None
+            for idx in fallback_indexes:
+                out[target] = out[target].where(~_blank_mask(out[target]), df.iloc[:, idx])
+        if clean:
+            for col in out.columns:
+                out[col] = _clean_values(out[col])
+        return out
+
+    def split_records(self, df):
+        """업로드 DataFrame → [(Sample 직접 컬럼 dict, panel_metadata dict), ...]"""
+        out = self.apply(df)
+        base_cols = [c for c in out.columns if c not in self.extra]
+        extra_cols = [c for c in out.columns if c in self.extra]
+
+        def rows_of(cols):
+            # to_dict("records") 대신 컬럼별 tolist() 를 행으로 묶음
+            if not cols:
+                return [{} for _ in range(len(out))]
+            return [dict(zip(cols, values)) for values in zip(*(out[c].tolist() for c in cols))]
+
+        return list(zip(rows_of(base_cols), rows_of(extra_cols)))
+
+
+def _blank_mask(series):
+    return series.isna() | series.astype(str).str.strip().isin(BLANK_VALUES)
+
+
+def _clean_values(series):
+    """앞뒤 공백 제거 + 빈 값('', 'nan', 'NaT', 'None') → None (object 컬럼)"""
+    text = series.astype(str).str.strip()
+    blank = series.isna() | text.isin(BLANK_VALUES)
+    return text.astype(object).where(~blank, None)
+
+
+def compile_header_plan(header, mapping, fallbacks=None, fuzzy=True):
+    """
+    header   : 업로드 파일의 헤더 목록 (DataFrame.columns)
+    mapping  : {엑셀 헤더: DB 컬럼} 또는 get_full_mapping_for_panel() 형식 {엑셀 헤더: {"db_col", "is_extra"}}
+    fallbacks: {DB 컬럼: [대체 엑셀 헤더, ...]} ─ 주 헤더 값이 비어 있는 행만 대체 헤더 값으로 채움
+    fuzzy    : True 면 "정규화한 매핑 키를 포함하는 헤더" 까지 허용 (의뢰서 양식용)
+    """
+    normalized = [(h, normalize_header(h)) for h in header]
+    indexes, targets, extra, missing = [], [], set(), []
+    for key, spec in mapping.items():
+        db_col, is_extra = (spec["db_col"], spec.get("is_extra")) if isinstance(spec, dict) else (spec, False)
+        idx = _find_header(normalized, key, fuzzy)
+        if idx is None:
+            missing.append(key)
+            continue
+        if db_col in targets:
+            continue  # 같은 DB 컬럼으로 가는 키가 여럿이면 먼저 찾은 것
+        indexes.append(idx)
+        targets.append(db_col)
+        if is_extra:
+            extra.add(db_col)
+
+    resolved_fallbacks = {}
+    for db_col, keys in (fallbacks or {}).items():
+        found = [i for i in (_find_header(normalized, k, fuzzy) for k in keys) if i is not None]
+        found = [i for n, i in enumerate(found) if i not in found[:n]]
+        if found:
+            resolved_fallbacks[db_col] = tuple(found)
+    return HeaderPlan(indexes, targets, extra, resolved_fallbacks, missing)
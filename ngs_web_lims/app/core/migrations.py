@@ -0,0 +1,325 @@
+# app/core/migrations.py
+"""
+버전 관리형 스키마 마이그레이션 엔진 (Alembic 스타일 경량판).
+
+    - revision 은 `<package>/vNNNN_<설명>.py` 모듈 하나이며
+      REVISION(문자열), DESCRIPTION, upgrade(op) 를 가집니다.
+    - 적용 이력은 `schema_migrations` 테이블에 남습니다.
+    - ensure_schema() 는 서버 기동 시 호출합니다. 밀린 revision 이 없으면
+      이력 테이블 SELECT 한 번으로 끝나고 DDL / inspect 는 전혀 하지 않습니다.
+
+revision 작성 규칙
+    모든 연산은 "이미 되어 있으면 건너뛰는" 형태(idempotent)여야 합니다.
+    revision 은 앱 모델 / 앱 코드(app.models, app.schema, app.core ...)를 import 하지 않습니다.
+    만들 테이블 / 컬럼은 revision 파일 안에 Table / Column 으로, 데이터 변환 규칙은 함수로 고정해 두어
+    모델이나 앱 코드가 나중에 바뀌어도 같은 revision 은 언제 실행해도 같은 스키마 / 데이터를 만듭니다.
+    (v0001 은 처음 도입할 때의 테이블만 만들고, 그 뒤 컬럼 / 테이블은 각 revision 이 추가)
+
+온라인 안전 연산 (revision 트랜잭션이 커밋된 뒤 따로 실행)
+    - create_index : PostgreSQL 은 CREATE INDEX CONCURRENTLY (쓰기 잠금 없음)
+    - backfill     : PK 순서로 batch_size 건씩 끊어서 UPDATE, 배치마다 커밋
+    중간에 실패하면 이력이 기록되지 않으므로 다음 기동 때 같은 revision 이 다시 실행됩니다.
+
+이 모듈은 ngs_web_lims / lims 두 앱에 동일하게 들어 있습니다.
+두 사본이 같은지는 ngs_web_lims/tests/test_shared_modules.py 가 확인합니다 (고칠 때는 양쪽을 같이).
+"""
+import importlib
+import os
+import pkgutil
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, select, text
+from sqlalchemy.schema import CreateColumn
+
+VERSION_TABLE = "schema_migrations"
+DEFAULT_BATCH_SIZE = 1000
+PG_LOCK_KEY = 7_105_020  # 여러 워커가 동시에 기동해도 한 프로세스만 마이그레이션
+
+_version_metadata = MetaData()
+schema_migrations = Table(
+    VERSION_TABLE, _version_metadata,
+    Column("revision", String, primary_key=True),
+    Column("description", String),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+# ==========================================
+# [1] revision 로딩
+# ==========================================
+class Revision:
+    def __init__(self, revision, description, upgrade):
+        self.revision = revision
+        self.description = description
+        self.upgrade = upgrade
+
+    def __repr__(self):
+        return f"<Revision {self.revision} {self.description}>"
+
+
+def load_revisions(package):
+    """package 아래 vNNNN_*.py 모듈을 revision 순서대로 읽어옵니다."""
+    pkg = importlib.import_module(package)
+    revisions = []
+    for info in pkgutil.iter_modules(pkg.__path__):
+        if not info.name.startswith("v"):
+            continue
+        module = importlib.import_module(f"{package}.{info.name}")
+        revisions.append(Revision(module.REVISION, getattr(module, "DESCRIPTION", info.name), module.upgrade))
+
+    revisions.sort(key=lambda r: r.revision)
+    seen = set()
+    for rev in revisions:
+        if rev.revision in seen:
+            raise RuntimeError(f"중복된 마이그레이션 revision: {rev.revision}")
+        seen.add(rev.revision)
+    return revisions
+
+
+# ==========================================
+# [2] revision 안에서 쓰는 연산 (op)
+# ==========================================
+class Operations:
+    """upgrade(op) 에 전달되는 객체. 모든 연산은 이미 적용된 상태면 건너뜁니다."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.dialect = conn.dialect
+        # 트랜잭션 커밋 후 실행할 온라인 작업들: fn(engine)
+        self.deferred = []
+
+    # ── 조회 ─────────────────────────────────────
+    def has_table(self, table_name):
+        return inspect(self.conn).has_table(table_name)
+
+    def has_column(self, table_name, column_name):
+        return any(c["name"] == column_name for c in inspect(self.conn).get_columns(table_name))
+
+    def has_index(self, table_name, index_name):
+        return any(i["name"] == index_name for i in inspect(self.conn).get_indexes(table_name))
+
+    # ── DDL ──────────────────────────────────────
+    def execute(self, sql, params=None):
+        return self.conn.execute(text(sql) if isinstance(sql, str) else sql, params or {})
+
+    def create_tables(self, metadata, tables=None):
+        """없는 테이블만 생성 (tables 를 주면 그 테이블들만)"""
+        metadata.create_all(self.conn, tables=tables, checkfirst=True)
+
+    def add_column(self, table_name, column):
+        """
+        모델의 Column 객체를 그대로 받아 ALTER TABLE ADD COLUMN.
+        SQLite 는 STORED 생성 컬럼을 ALTER 로 추가할 수 없어 VIRTUAL 로 바꿔 추가합니다.
+        (PostgreSQL 의 STORED 생성 컬럼 추가는 테이블 재작성이 일어나므로, 큰 테이블은
+         일반 컬럼 + backfill 조합을 권장합니다.)
+        """
+        if not self.has_table(table_name) or self.has_column(table_name, column.name):
+            return False
+        col_spec = str(CreateColumn(column).compile(dialect=self.dialect)).strip()
+        if self.dialect.name == "sqlite" and col_spec.endswith(" STORED"):
+            col_spec = col_spec[: -len(" STORED")] + " VIRTUAL"
+        self.execute(f"ALTER TABLE {table_name} ADD COLUMN {col_spec}")
+        return True
+
+    def create_index(self, index_name, table_name, columns, unique=False):
+        """
+        인덱스 생성. PostgreSQL 은 커밋 후 CONCURRENTLY 로 (운영 중 쓰기 차단 없음),
+        그 외 DB는 현재 트랜잭션에서 IF NOT EXISTS 로 만듭니다.
+        """
+        if not self.has_table(table_name) or self.has_index(table_name, index_name):
+            return False
+        unique_sql = "UNIQUE " if unique else ""
+        cols = ", ".join(columns)
+
+        if self.dialect.name == "postgresql":
+            def _create_concurrently(engine):
+                with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                    # 이전에 CONCURRENTLY 가 중간에 실패했다면 INVALID 인덱스가 남아있으므로 정리 후 재생성
+                    invalid = conn.execute(text(
+                        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                        "WHERE c.relname = :name AND NOT i.indisvalid"), {"name": index_name}).first()
+                    if invalid:
+                        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+                    conn.execute(text(
+                        f"CREATE {unique_sql}INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table_name} ({cols})"))
+            self.deferred.append(_create_concurrently)
+        else:
+            self.execute(f"CREATE {unique_sql}INDEX IF NOT EXISTS {index_name} ON {table_name} ({cols})")
+        return True
+
+    def drop_index(self, index_name, table_name):
+        if not self.has_table(table_name) or not self.has_index(table_name, index_name):
+            return False
+        if self.dialect.name == "postgresql":
+            self.deferred.append(lambda engine: _autocommit(engine, f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+        else:
+            self.execute(f"DROP INDEX IF EXISTS {index_name}")
+        return True
+
+    # ── 데이터 ───────────────────────────────────
+    def backfill(self, table_name, set_sql=None, compute=None, columns=None, where="1=1",
+                 batch_size=DEFAULT_BATCH_SIZE, pk="id"):
+        """
+        새로 만든 비정규화 컬럼 등을 배치 단위로 채웁니다 (커밋 후 실행, 배치마다 커밋).
+
+            set_sql : {"컬럼": "SQL 식"}                       → UPDATE ... SET 컬럼 = 식
+            compute : fn(row: dict) -> {"컬럼": 값} | None      → 파이썬에서 계산 (columns 로 읽을 컬럼 지정)
+            where   : 채울 대상 조건 (예: "seq_provider IS NULL")
+        """
+        if not set_sql and not compute:
+            raise ValueError("backfill 에는 set_sql 또는 compute 가 필요합니다.")
+        self.deferred.append(lambda engine: _run_backfill(
+            engine, table_name, set_sql, compute, columns, where, batch_size, pk))
+
+
+def _autocommit(engine, sql):
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(sql))
+
+
+def _run_backfill(engine, table_name, set_sql, compute, columns, where, batch_size, pk):
+    """PK 커서로 batch_size 건씩 전진하므로 where 조건이 계속 참이어도 반드시 끝납니다."""
+    read_cols = ", ".join([pk] + list(columns or []))
+    last_pk = None
+    total = 0
+    while True:
+        with engine.begin() as conn:
+            cursor_sql = f"AND {pk} > :last_pk " if last_pk is not None else ""
+            rows = conn.execute(text(
+                f"SELECT {read_cols} FROM {table_name} WHERE ({where}) {cursor_sql}"
+                f"ORDER BY {pk} LIMIT :limit"), {"last_pk": last_pk, "limit": batch_size}).mappings().all()
+            if not rows:
+                break
+            last_pk = rows[-1][pk]
+
+            if set_sql:
+                assignments = ", ".join(f"{col} = {expr}" for col, expr in set_sql.items())
+                ids = [row[pk] for row in rows]
+                conn.execute(text(
+                    f"UPDATE {table_name} SET {assignments} WHERE {pk} IN ({', '.join(str(int(i)) for i in ids)})"))
+            else:
+                for row in rows:
+                    values = compute(dict(row))
+                    if not values:
+                        continue
+                    assignments = ", ".join(f"{col} = :{col}" for col in values)
+                    conn.execute(text(f"UPDATE {table_name} SET {assignments} WHERE {pk} = :__pk"),
+                                 {**values, "__pk": row[pk]})
+            total += len(rows)
+    return total
+
+
+# ==========================================
+# [3] 실행 / 이력
+# ==========================================
+def applied_revisions(conn):
+    """적용된 revision 집합. 이력 테이블이 아직 없으면 빈 집합"""
+    if not inspect(conn).has_table(VERSION_TABLE):
+        return set()
+    return {row[0] for row in conn.execute(select(schema_migrations.c.revision))}
+
+
+@contextmanager
+def _migration_lock(engine):
+    """동시에 기동한 워커끼리 마이그레이션이 겹치지 않도록 잠급니다."""
+    if engine.dialect.name == "postgresql":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("SELECT pg_advisory_lock(:k)"), {"k": PG_LOCK_KEY})
+            try:
+                yield
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": PG_LOCK_KEY})
+        return
+
+    db_path = engine.url.database if engine.dialect.name == "sqlite" else None
+    if not db_path or db_path == ":memory:":
+        yield
+        return
+    try:
+        import fcntl
+    except ImportError:  # Windows: 파일 잠금 없이 진행
+        yield
+        return
+    with open(f"{os.path.abspath(db_path)}.migrate.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def upgrade(engine, package, dry_run=False, log=print):
+    """밀린 revision 을 순서대로 적용하고, 적용한(dry_run 이면 적용할) Revision 목록을 반환"""
+    revisions = load_revisions(package)
+    with _migration_lock(engine):
+        with engine.begin() as conn:
+            if not dry_run:
+                _version_metadata.create_all(conn, checkfirst=True)
+            done = applied_revisions(conn)
+
+        pending = [rev for rev in revisions if rev.revision not in done]
+        for rev in pending:
+            if dry_run:
+                log(f"⏳ [{rev.revision}] {rev.description}")
+                continue
+
+            with engine.begin() as conn:
+                op = Operations(conn)
+                rev.upgrade(op)
+                deferred = op.deferred
+            for step in deferred:
+                step(engine)
+            with engine.begin() as conn:
+                conn.execute(schema_migrations.insert().values(
+                    revision=rev.revision, description=rev.description, applied_at=datetime.utcnow()))
+            log(f"✅ [{rev.revision}] {rev.description}")
+    return pending
+
+
+def ensure_schema(engine, package, log=print, maintenance=None):
+    """
+    서버 기동용. 스키마가 최신이면 SELECT 한 번으로 바로 반환합니다.
+    maintenance: 밀린 revision 을 적용할 엔진을 만드는 함수 (db_profile.create_maintenance_engine —
+                 요청 처리용 engine 의 PostgreSQL statement / lock 타임아웃에 DDL·backfill 이 걸리지 않도록).
+    """
+    revisions = load_revisions(package)
+    with engine.connect() as conn:
+        done = applied_revisions(conn)
+    if all(rev.revision in done for rev in revisions):
+        return []
+    if maintenance is None:
+        return upgrade(engine, package, log=log)
+    migration_engine = maintenance()
+    try:
+        return upgrade(migration_engine, package, log=log)
+    finally:
+        migration_engine.dispose()
+
+
+def stamp(engine, package, revision=None):
+    """DDL 없이 revision 까지 '적용됨'으로 기록 (이미 수동으로 맞춰둔 DB를 편입할 때)"""
+    revisions = load_revisions(package)
+    target = revision or (revisions[-1].revision if revisions else None)
+    with engine.begin() as conn:
+        _version_metadata.create_all(conn, checkfirst=True)
+        done = applied_revisions(conn)
+        stamped = []
+        for rev in revisions:
+            if rev.revision > target:
+                break
+            if rev.revision not in done:
+                conn.execute(schema_migrations.insert().values(
+                    revision=rev.revision, description=rev.description, applied_at=datetime.utcnow()))
+                stamped.append(rev)
+    return stamped
+
+
+def history(engine, package):
+    """[(revision, description, applied_at | None)] — 아직 적용 안 된 것은 None"""
+    revisions = load_revisions(package)
+    with engine.connect() as conn:
+        applied = {}
+        if inspect(conn).has_table(VERSION_TABLE):
+            applied = dict(conn.execute(select(schema_migrations.c.revision, schema_migrations.c.applied_at)).all())
+    return [(rev.revision, rev.description, applied.get(rev.revision)) for rev in revisions]
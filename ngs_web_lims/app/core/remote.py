@@ -0,0 +1,242 @@
+# app/core/remote.py
+"""
+분석 서버(39번 등) SSH / SFTP 연결 풀.
+
+버튼을 누를 때마다 SSHClient 를 새로 만들고 (키 교환 + 인증) 폴더마다 exec_command("cat ...") 를
+차례로 돌리던 것을
+    - (host, port, user) 별로 프로세스에 풀 하나 (get_pool)
+    - 연결은 keep-alive 를 켜서 재사용, SFTP 세션도 연결마다 한 번만 열어 재사용
+    - 동시에 빌려줄 연결 수는 size 로 제한 (서버 MaxSessions / MaxStartups 보호)
+    - 여러 파일은 read_files 로 워커(≤ size)마다 연결 하나씩 빌려 SFTP 로 병렬로 읽음
+으로 바꿉니다. 끊긴 연결은 반납 / 대여 시 걸러내고 새로 맺습니다.
+
+paramiko 는 원격 기능을 쓸 때만 import 합니다 (기동 시간 / 선택 의존성).
+
+사용 예:
+    pool = get_pool("192.168.0.39", "gmctso", password="...")
+    status, out, err = pool.run("ls -1 /data/*/RunInfo.xml")
+    contents = pool.read_files(["/data/A/Results.json", "/data/B/Results.json"])   # {경로: bytes | Exception}
+    pool.write_files({"/data/meta/run1/SampleSheet.csv": "..."})
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+POOL_SIZE = int(os.getenv("LIMS_SSH_POOL_SIZE", 4))
+CONNECT_TIMEOUT_S = float(os.getenv("LIMS_SSH_TIMEOUT", 5))
+KEEPALIVE_S = int(os.getenv("LIMS_SSH_KEEPALIVE_S", 30))
+IDLE_TIMEOUT_S = float(os.getenv("LIMS_SSH_IDLE_TIMEOUT_S", 300))   # 이보다 오래 놀던 연결은 버리고 새로
+ACQUIRE_TIMEOUT_S = 60.0
+
+
+class RemoteError(Exception):
+    """SSH 접속 실패 / 연결 대기 초과"""
+
+
+# ==========================================
+# [1] 연결 하나 (SSHClient + 재사용 SFTP)
+# ==========================================
+class _Connection:
+    def __init__(self, client):
+        self.client = client
+        self._sftp = None
+        self.last_used = time.monotonic()
+
+    @property
+    def sftp(self):
+        if self._sftp is None:
+            self._sftp = self.client.open_sftp()
+        return self._sftp
+
+    def alive(self):
+        transport = self.client.get_transport()
+        return transport is not None and transport.is_active()
+
+    def reset_sftp(self):
+        if self._sftp is not None:
+            try: self._sftp.close()
+            except Exception: pass
+            self._sftp = None
+
+    def close(self):
+        self.reset_sftp()
+        try: self.client.close()
+        except Exception: pass
+
+
+def _is_remote_file_error(exc):
+    """SFTP 상태 코드 오류(파일 없음 / 권한 등)는 연결 문제가 아님"""
+    return isinstance(exc, OSError) and getattr(exc, "errno", None) is not None
+
+
+# ==========================================
+# [2] 풀
+# ==========================================
+class SSHPool:
+    def __init__(self, host, username, password=None, key_filename=None, port=22, size=POOL_SIZE,
+                 keepalive_s=KEEPALIVE_S, idle_timeout_s=IDLE_TIMEOUT_S, connect_timeout=CONNECT_TIMEOUT_S):
+        self.host, self.port, self.username = host, port, username
+        self.password, self.key_filename = password, key_filename
+        self.size = size
+        self.keepalive_s = keepalive_s
+        self.idle_timeout_s = idle_timeout_s
+        self.connect_timeout = connect_timeout
+        self._idle = []                                   # 최근 반납한 연결이 끝 (LIFO)
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self.stats = {"connects": 0, "reused": 0, "dropped": 0}
+
+    def _connect(self):
+        import paramiko  # 원격 기능을 쓸 때만 필요
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        try:
+            client.connect(self.host, port=self.port, username=self.username, password=self.password,
+                           key_filename=self.key_filename, timeout=self.connect_timeout,
+                           banner_timeout=self.connect_timeout, auth_timeout=self.connect_timeout)
+        except Exception as e:
+            client.close()
+            raise RemoteError(f"{self.username}@{self.host}:{self.port} SSH 접속 실패: {e}") from e
+        client.get_transport().set_keepalive(self.keepalive_s)
+        with self._lock:
+            self.stats["connects"] += 1
+        return _Connection(client)
+
+    def _checkout(self):
+        with self._lock:
+            while self._idle:
+                conn = self._idle.pop()
+                if conn.alive() and time.monotonic() - conn.last_used < self.idle_timeout_s:
+                    self.stats["reused"] += 1
+                    return conn
+                self.stats["dropped"] += 1
+                conn.close()
+        return self._connect()
+
+    def _checkin(self, conn):
+        if not conn.alive():
+            conn.close()
+            return
+        conn.last_used = time.monotonic()
+        with self._lock:
+            self._idle.append(conn)
+
+    @contextmanager
+    def connection(self):
+        """연결 하나 빌리기 (conn.client = SSHClient, conn.sftp = 재사용 SFTPClient)"""
+        if not self._slots.acquire(timeout=ACQUIRE_TIMEOUT_S):
+            raise RemoteError(f"{self.host} 연결 대기 시간 초과 (동시 {self.size}개 사용 중)")
+        conn = None
+        try:
+            conn = self._checkout()
+            yield conn
+        except Exception as e:
+            if conn is not None and not _is_remote_file_error(e):
+                conn.close()   # 채널 / 전송 오류 → 이 연결은 버림
+            raise
+        finally:
+            if conn is not None:
+                self._checkin(conn)
+            self._slots.release()
+
+    # ── 명령 / 파일 ──────────────────────────────
+    def run(self, command, timeout=None):
+        """원격 명령 실행 → (exit_status, stdout, stderr)"""
+        with self.connection() as conn:
+            _, stdout, stderr = conn.client.exec_command(command, timeout=timeout)
+            out = stdout.read().decode("utf-8", errors="replace")
+            err = stderr.read().decode("utf-8", errors="replace")
+            return stdout.channel.recv_exit_status(), out, err
+
+    @staticmethod
+    def _read(sftp, path):
+        with sftp.open(path, "rb") as f:
+            f.prefetch()   # 읽기 요청을 한꺼번에 보내 왕복 지연을 줄임
+            return f.read()
+
+    def read_file(self, path):
+        with self.connection() as conn:
+            return self._read(conn.sftp, path)
+
+    def read_files(self, paths, workers=None):
+        """
+        여러 파일을 SFTP 로 병렬로 읽음 → {경로: bytes | Exception}.
+        워커마다 연결 하나를 빌려 큐에서 경로를 꺼내 읽으므로 파일 수와 무관하게 연결 수는 workers 이하.
+        """
+        paths = list(dict.fromkeys(paths))
+        if not paths:
+            return {}
+        workers = max(1, min(workers or self.size, self.size, len(paths)))
+        todo = queue.Queue()
+        for path in paths:
+            todo.put(path)
+        results = {}
+
+        def _worker():
+            while not todo.empty():
+                try:
+                    with self.connection() as conn:
+                        while True:
+                            try: path = todo.get_nowait()
+                            except queue.Empty: return
+                            try:
+                                results[path] = self._read(conn.sftp, path)
+                            except Exception as e:
+                                results[path] = e
+                                if not _is_remote_file_error(e):
+                                    raise   # 연결 문제 → 이 연결은 버리고 새로 빌려 계속
+                except RemoteError as e:
+                    # 접속 자체가 안 되면 남은 경로는 모두 같은 오류
+                    while True:
+                        try: results[todo.get_nowait()] = e
+                        except queue.Empty: return
+                except Exception:
+                    continue
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sftp-read") as executor:
+            for _ in range(workers):
+                executor.submit(_worker)
+        return {path: results.get(path, RemoteError("읽지 못함")) for path in paths}
+
+    def write_files(self, files, makedirs=True):
+        """{원격 경로: str | bytes} 를 연결 하나로 씀. makedirs=True 면 상위 폴더 생성"""
+        with self.connection() as conn:
+            sftp = conn.sftp
+            if makedirs:
+                for directory in sorted({os.path.dirname(p) for p in files}):
+                    try:
+                        sftp.stat(directory)
+                    except IOError:
+                        sftp.mkdir(directory)
+            for path, content in files.items():
+                with sftp.open(path, "wb") as f:
+                    f.write(content.encode("utf-8") if isinstance(content, str) else content)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+# ==========================================
+# [3] 프로세스 공용 풀
+# ==========================================
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(host, username, password=None, key_filename=None, port=22, size=POOL_SIZE):
+    """(host, port, user) 별로 프로세스에 하나"""
+    key = (host, port, username)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or (pool.password, pool.key_filename) != (password, key_filename):
+            if pool is not None:
+                pool.close()
+            pool = _pools[key] = SSHPool(host, username, password=password, key_filename=key_filename,
+                                         port=port, size=size)
+        return pool
@@ -0,0 +1,178 @@
+# app/core/repository.py
+"""
+Sample 그래프(Order / WetLabQC / Sequencing / Analysis / ActionLog)를 한 번에 읽어오는
+사전 튜닝된 쿼리 빌더 모음.
+
+페이지 콜백에서 `s.order`, `s.wet_lab` 같은 lazy 관계를 루프 안에서 건드리면
+샘플 1건마다 SELECT가 추가로 나갑니다(N+1). 여기의 빌더를 쓰면
+행 수와 관계없이 쿼리 수가 고정됩니다.
+
+    - N:1 / 1:1 관계(order, wet_lab, sequencing, analysis) → joinedload (같은 SELECT에 JOIN)
+    - 1:N 관계(Order.samples, Sample.logs)                  → selectinload (IN 쿼리 1번)
+"""
+from sqlalchemy import and_, case, desc, func, or_, select
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
+
+from app.models._schema import Order, Sample
+
+
+# ==========================================
+# [0] 인덱스 친화 조건
+# ==========================================
+def prefix_range(column, prefix):
+    """
+    `column LIKE 'prefix%'` 를 `prefix <= column < prefix 다음 문자열` 범위 조건으로 바꿉니다.
+    SQLite 의 LIKE 는 대소문자를 무시하기 때문에 B-tree 인덱스를 타지 못하지만, 범위 조건은 탑니다.
+    """
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return and_(column >= prefix, column < upper)
+
+
+# ==========================================
+# [1] Sample 그래프 로더 옵션
+# ==========================================
+def sample_graph_options(order=True, wet_lab=True, sequencing=True, analysis=True, logs=False):
+    """필요한 관계만 골라 eager loading 옵션 리스트를 만듭니다."""
+    options = []
+    if order: options.append(joinedload(Sample.order))
+    if wet_lab: options.append(joinedload(Sample.wet_lab))
+    if sequencing: options.append(joinedload(Sample.sequencing))
+    if analysis: options.append(joinedload(Sample.analysis))
+    if logs: options.append(selectinload(Sample.logs))
+    return options
+
+
+def sample_query(db, **graph):
+    """db.query(Sample) + 관계 eager loading. graph 키워드는 sample_graph_options 와 동일"""
+    return db.query(Sample).options(*sample_graph_options(**graph))
+
+
+# ==========================================
+# [2] 자주 쓰는 Sample 조회
+# ==========================================
+def samples_by_ids(db, ids, **graph):
+    """PK 목록으로 한 번에 조회 (IN 1회)"""
+    ids = [i for i in ids if i is not None]
+    if not ids:
+        return []
+    return sample_query(db, **graph).filter(Sample.id.in_(ids)).all()
+
+
+def samples_by_sample_ids(db, sample_ids, **graph):
+    """ACC Sample ID 목록으로 한 번에 조회 (IN 1회)"""
+    sample_ids = [sid for sid in sample_ids if sid]
+    if not sample_ids:
+        return []
+    return sample_query(db, **graph).filter(Sample.sample_id.in_(sample_ids)).all()
+
+
+def samples_in_stage(db, statuses, panel=None, **graph):
+    """진행 상태(+패널) 기준 조회. statuses 는 문자열 하나 또는 리스트"""
+    statuses = [statuses] if isinstance(statuses, str) else list(statuses)
+    query = sample_query(db, **graph).filter(Sample.current_status.in_(statuses))
+    if panel:
+        query = query.filter(Sample.target_panel == panel)
+    return query.all()
+
+
+def samples_with_prefix(db, prefix, **graph):
+    """Sample ID 접두어(배치 / DNA·RNA 페어) 기준 조회. prefix 가 없으면 전체"""
+    query = sample_query(db, **graph)
+    if prefix:
+        query = query.filter(prefix_range(Sample.sample_id, prefix))
+    return query.all()
+
+
+def master_board_query(db):
+    """
+    마스터 보드 전용: 정렬/필터를 연관 테이블 컬럼에도 걸 수 있도록 OUTER JOIN 을 직접 걸고,
+    같은 JOIN 결과로 관계를 채웁니다(contains_eager). LIMIT/OFFSET 과 함께 써도 안전합니다(모두 1:1).
+    """
+    return (
+        db.query(Sample)
+        .outerjoin(Sample.order)
+        .outerjoin(Sample.wet_lab)
+        .outerjoin(Sample.sequencing)
+        .outerjoin(Sample.analysis)
+        .options(
+            contains_eager(Sample.order),
+            contains_eager(Sample.wet_lab),
+            contains_eager(Sample.sequencing),
+            contains_eager(Sample.analysis),
+        )
+    )
+
+
+# ==========================================
+# [3] Order 조회
+# ==========================================
+def orders_with_samples(db):
+    """샘플이 1건 이상 있는 Order 전체 + 소속 샘플 (SELECT 2회)"""
+    return (
+        db.query(Order)
+        .join(Order.samples)
+        .options(selectinload(Order.samples))
+        .distinct()
+        .all()
+    )
+
+
+def order_with_samples(db, order_id):
+    """Order ID 하나 + 소속 샘플"""
+    return (
+        db.query(Order)
+        .options(selectinload(Order.samples))
+        .filter(Order.order_id == order_id)
+        .first()
+    )
+
+
+def order_summaries(db):
+    """(Order, 샘플 수) 목록을 접수일 역순으로. 샘플을 읽지 않고 GROUP BY 로 센다"""
+    sample_count = (
+        db.query(Sample.order_pk, func.count(Sample.id).label("n"))
+        .group_by(Sample.order_pk)
+        .subquery()
+    )
+    return (
+        db.query(Order, func.coalesce(sample_count.c.n, 0))
+        .outerjoin(sample_count, sample_count.c.order_pk == Order.id)
+        .order_by(desc(Order.reception_date))
+        .all()
+    )
+
+
+def order_status_counts(db, panel=None, keyword=None):
+    """
+    칸반 카드용 집계 행 목록 (Order.id 순). 행마다
+        id, order_id, facility, client_team, client_name, reception_date, status, n, n_issue
+    샘플 행을 읽지 않고 (order, status) GROUP BY 한 번으로 끝나며,
+    수천 건 보드에서도 빠르도록 ORM 객체 대신 컬럼 튜플을 돌려준다.
+        panel   : 해당 패널 샘플만 센다 (그 패널 샘플이 없는 Order 는 빠짐)
+        keyword : Order ID / 기관 / 팀 / 소속 샘플 프로젝트명 부분 일치 (대소문자 무시)
+    """
+    comment = func.trim(Sample.issue_comment)
+    has_issue = case((and_(comment.isnot(None), comment.notin_(["", "None", "nan"])), 1), else_=0)
+    query = (
+        db.query(
+            Order.id, Order.order_id, Order.facility, Order.client_team, Order.client_name, Order.reception_date,
+            Sample.current_status.label("status"),
+            func.count(Sample.id).label("n"),
+            func.sum(has_issue).label("n_issue"),
+        )
+        .join(Order.samples)
+        .group_by(Order.id, Sample.current_status)
+        .order_by(Order.id)
+    )
+    if panel:
+        query = query.filter(Sample.target_panel == panel)
+    if keyword:
+        kw = keyword.lower()
+        project_match = select(Sample.order_pk).where(func.lower(Sample.project_name).contains(kw, autoescape=True))
+        query = query.filter(or_(
+            func.lower(Order.order_id).contains(kw, autoescape=True),
+            func.lower(Order.facility).contains(kw, autoescape=True),
+            func.lower(Order.client_team).contains(kw, autoescape=True),
+            Order.id.in_(project_match),
+        ))
+    return query.all()
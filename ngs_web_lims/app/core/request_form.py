@@ -0,0 +1,254 @@
+# app/core/request_form.py
+"""
+검사 의뢰서(Excel) 스트리밍 파싱.
+
+openpyxl read_only 모드로 시트를 한 번만 훑습니다.
+    1) 상단 행을 버퍼에 모아 의뢰자 정보(실무자 성명 / 연락처 / e-mail)와 헤더 행(Patient ID)을 찾고
+    2) 헤더 아래 행은 chunk 단위로 dict 로 바꿔 바로 검증 통계에 반영합니다.
+pd.read_excel 로 워크북 전체를 두 번 읽던 방식보다 메모리 / 시간이 적게 듭니다.
+
+파싱 결과 전체는 서버(파일)에 token 으로 보관하고, 브라우저에는 미리보기 일부 + 통계만 보냅니다.
+저장 콜백은 token 으로 전체 행을 다시 읽습니다. 파일로 두기 때문에 Dash 서버가 여러 프로세스여도 됩니다.
+"""
+import io
+import json
+import os
+import re
+import secrets
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+
+from app.core.mapping import SAMPLE_NAME_FALLBACKS, compile_header_plan, get_full_mapping_for_panel, normalize_header
+
+CHUNK_ROWS = 500
+PREVIEW_ROWS = int(os.getenv("LIMS_UPLOAD_PREVIEW_ROWS", 50))
+
+# 헤더 행 탐색 범위 (pd.read_excel(header=None) 기준 행 번호와 같음) / 못 찾으면 기본값
+HEADER_SEARCH = range(5, 25)
+DEFAULT_HEADER_IDX = 15
+CLIENT_INFO_ROWS = range(2, 12)
+
+
+def _cell(value):
+    """Excel 셀 값 → JSON 으로 보낼 수 있는 값 (빈 칸은 "")"""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        return value if value.strip() else ""
+    return value
+
+
+def _texts(row):
+    return [str(v).strip() for v in row if v is not None and str(v).strip() not in ("", "nan")]
+
+
+@dataclass
+class RequestForm:
+    client: dict                      # {"name", "phone", "email"}
+    columns: list                     # 화면에 보여줄 컬럼명 (col_N 제외)
+    rows: list                        # [{컬럼명: 값}, ...]
+    stats: dict = field(default_factory=dict)
+
+
+# ==========================================
+# [1] 읽기
+# ==========================================
+def _client_info(top_rows):
+    name = phone = email = ""
+    for r in CLIENT_INFO_ROWS:
+        if r >= len(top_rows):
+            break
+        row_vals = _texts(top_rows[r])
+        row_nospace = [x.replace(" ", "").lower() for x in row_vals]
+        if "실무자성명" not in row_nospace:
+            continue
+        idx_name = row_nospace.index("실무자성명")
+        if idx_name + 1 < len(row_vals):
+            name = row_vals[idx_name + 1]
+        if "연락처" in row_nospace:
+            idx_phone = row_nospace.index("연락처")
+            if idx_phone + 1 < len(row_vals):
+                phone = row_vals[idx_phone + 1]
+        if r + 1 < len(top_rows):
+            next_vals = _texts(top_rows[r + 1])
+            next_nospace = [x.replace(" ", "").lower() for x in next_vals]
+            for key in ("e-mail", "email"):
+                if key in next_nospace:
+                    idx_email = next_nospace.index(key)
+                    if idx_email + 1 < len(next_vals):
+                        email = next_vals[idx_email + 1]
+                    break
+    return {"name": name, "phone": phone, "email": email}
+
+
+def _header_names(header_row):
+    """빈 헤더 → col_N, 중복 헤더 → 'X.1' (pandas 와 같은 규칙)"""
+    names, seen = [], {}
+    for i, value in enumerate(header_row):
+        name = str(value) if value is not None and str(value).strip() else f"col_{i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def iter_row_chunks(rows_iter, names, chunk_size=CHUNK_ROWS):
+    """헤더 아래 행들을 [{컬럼명: 값}, ...] chunk 로 나눠 yield"""
+    chunk = []
+    width = len(names)
+    for raw in rows_iter:
+        values = [_cell(v) for v in raw[:width]]
+        if not any(v != "" for v in values):
+            continue
+        values += [""] * (width - len(values))
+        chunk.append(dict(zip(names, values)))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ==========================================
+# [2] 검증
+# ==========================================
+def parse_request_form(data, panel_code, chunk_size=CHUNK_ROWS):
+    """의뢰서 bytes → RequestForm (의뢰자 정보 / 샘플 행 / 검증 통계)"""
+    from openpyxl import load_workbook  # 업로드할 때만 필요
+
+    wb = load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    try:
+        rows_iter = wb.worksheets[0].iter_rows(values_only=True)
+        top_rows, header_idx = [], None
+        for row in rows_iter:
+            top_rows.append(row)
+            r = len(top_rows) - 1
+            if r in HEADER_SEARCH and "patientid" in normalize_header("".join(str(v) for v in row)):
+                header_idx = r
+                break
+            if r >= HEADER_SEARCH.stop - 1:
+                break
+
+        client = _client_info(top_rows)
+        if header_idx is None:
+            # 헤더를 못 찾으면 기본 위치 (버퍼에 이미 읽은 행이면 거기서, 아니면 계속 읽어서)
+            header_idx = DEFAULT_HEADER_IDX
+            while len(top_rows) <= header_idx:
+                top_rows.append(next(rows_iter, ()))
+            rest = iter(top_rows[header_idx + 1:])
+            body = (row for source in (rest, rows_iter) for row in source)
+        else:
+            body = rows_iter
+        names = _header_names(top_rows[header_idx])
+
+        pid_col = next((n for n in names if "patient id" in n.lower() or "번호" in n.lower()), None)
+        # 저장할 때와 같은 헤더 플랜으로 검증 (샘플명: Patient ID → 대체 헤더 순)
+        plan = compile_header_plan(names, get_full_mapping_for_panel(panel_code),
+                                   fallbacks={"sample_name": SAMPLE_NAME_FALLBACKS})
+        resolved = {names[i]: target for i, target in zip(plan.indexes, plan.targets)}
+        name_idx = [plan.indexes[plan.targets.index("sample_name")]] if "sample_name" in plan.targets else []
+        name_cols = list(dict.fromkeys(names[i] for i in name_idx + list(plan.fallbacks.get("sample_name", ()))))
+
+        rows, used_cols = [], set()
+        stats = {"rows": 0, "example_rows": 0, "blank_rows": 0, "no_sample_name": 0, "duplicate_names": 0}
+        seen_names = set()
+        for chunk in iter_row_chunks(body, names, chunk_size):
+            for row in chunk:
+                if pid_col:
+                    pid = row.get(pid_col, "")
+                    if pid == "":
+                        stats["blank_rows"] += 1
+                        continue
+                    if str(pid).strip().lower() == "ex":
+                        stats["example_rows"] += 1
+                        continue
+                    if not any(v != "" for k, v in row.items() if k != pid_col):
+                        stats["blank_rows"] += 1  # 번호만 미리 채워진 빈 양식 행
+                        continue
+
+                sample_name = next((str(row[c]).strip() for c in name_cols if str(row.get(c, "")).strip()), "")
+                if not sample_name:
+                    stats["no_sample_name"] += 1
+                elif sample_name in seen_names:
+                    stats["duplicate_names"] += 1
+                else:
+                    seen_names.add(sample_name)
+                used_cols.update(k for k, v in row.items() if v != "")
+                rows.append(row)
+    finally:
+        wb.close()
+
+    # 값이 하나도 없는 컬럼은 버림 (pandas dropna(axis=1, how='all') 와 같음)
+    kept = [n for n in names if n in used_cols]
+    if len(kept) != len(names):
+        rows = [{n: row[n] for n in kept} for row in rows]
+    stats.update({
+        "rows": len(rows),
+        "header_row": header_idx,
+        "mapped_headers": sorted(col for col in resolved if col in used_cols),
+        "missing_headers": list(plan.missing),
+    })
+    return RequestForm(client=client, columns=[n for n in kept if not n.startswith("col_")], rows=rows, stats=stats)
+
+
+# ==========================================
+# [3] 서버 보관 (token)
+# ==========================================
+UPLOAD_DIR = Path(os.getenv("LIMS_UPLOAD_CACHE_DIR", Path(tempfile.gettempdir()) / "lims_uploads"))
+UPLOAD_TTL_S = int(os.getenv("LIMS_UPLOAD_CACHE_TTL", 6 * 3600))
+_TOKEN_RE = re.compile(r"^[A-Za-z0-9_-]{16,64}$")
+
+
+def _purge_expired(now):
+    for path in UPLOAD_DIR.glob("*.json"):
+        try:
+            if now - path.stat().st_mtime > UPLOAD_TTL_S:
+                path.unlink()
+        except OSError:
+            pass
+
+
+def store_form(form):
+    """파싱 결과를 파일로 저장하고 token 을 돌려줍니다 (만료된 파일은 이때 정리)."""
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    _purge_expired(time.time())
+    token = secrets.token_urlsafe(18)
+    tmp_path = UPLOAD_DIR / f"{token}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(asdict(form), f, ensure_ascii=False, default=str)
+    os.replace(tmp_path, UPLOAD_DIR / f"{token}.json")
+    return token
+
+
+def load_form(token):
+    """token → RequestForm (없거나 만료되면 None)"""
+    if not token or not _TOKEN_RE.match(str(token)):
+        return None
+    path = UPLOAD_DIR / f"{token}.json"
+    try:
+        if time.time() - path.stat().st_mtime > UPLOAD_TTL_S:
+            return None
+        with open(path, encoding="utf-8") as f:
+            return RequestForm(**json.load(f))
+    except (OSError, ValueError):
+        return None
+
+
+def discard_form(token):
+    if token and _TOKEN_RE.match(str(token)):
+        try:
+            (UPLOAD_DIR / f"{token}.json").unlink()
+        except OSError:
+            pass
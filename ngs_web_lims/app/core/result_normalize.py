@@ -0,0 +1,134 @@
+# app/core/result_normalize.py
+"""
+분석 결과 정규화 (쓸 때는 펼치기만, 빈 값 정리는 화면에서).
+
+TSO500 Results.json / 39번 서버 webhook 값에는 JSON 안에 JSON 문자열, 작은따옴표 python dict 문자열,
+"NA" / "N/A" / null 같은 빈 값이 섞여 들어옵니다. 예전에는 분석 결과 상세 화면(check_results)이 열 때마다
+parse_json_like 로 복구했는데, dict 값마다 자기 자신을 세 번 부르는 구조라 중첩 깊이 d 에 대해 3^d 로 느려졌습니다.
+
+    expand : 적재 시점(analysis_ingest / tso 원격 수집·메타데이터 업로드)에 저장할 값.
+             { / [ 로 시작하는 문자열만 json.loads → ast.literal_eval 순으로 한 번 파싱해서 펼칩니다.
+             문자열 치환은 하지 않고 ("nanopore", "malignant" 같은 값이 바뀌지 않도록),
+             키 / 값 / NA / 빈 목록도 지우지 않습니다 (임상 결과 원본 보존, 여러 번 적용해도 결과가 같음).
+    clean  : 화면(check_results / clinical_report)에서 읽을 때. NA 등 빈 값과 빈 목록을 빼고,
+             아직 문자열로 남은 예전 행도 같은 파서로 펼칩니다.
+둘 다 모든 노드를 정확히 한 번씩만 방문합니다 (깊이와 무관하게 노드 수에 선형).
+"""
+import ast
+import json
+import math
+
+EMPTY_TOKENS = {"NA", "N/A", "NONE", "NULL"}
+
+
+def _reject_constant(name):
+    raise ValueError(f"JSON 으로 저장할 수 없는 값: {name}")   # NaN / Infinity 는 SQLite json 함수가 못 읽음
+
+
+def _json_native(value):
+    """JSON 으로 저장했다 다시 읽어도 같은 값인지 (tuple 은 list 로 저장)"""
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and _json_native(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return all(_json_native(v) for v in value)
+    if isinstance(value, float):
+        return math.isfinite(value)
+    return value is None or isinstance(value, (str, int, bool))
+
+
+_PARSERS = (
+    lambda s: json.loads(s, parse_constant=_reject_constant),   # 1. 표준 JSON
+    ast.literal_eval,                                             # 2. python dict 문자열 (작은따옴표, None, True)
+)
+
+
+def _parse_text(s):
+    """{ / [ 로 시작하는 문자열 → dict / list (못 읽거나 JSON 으로 그대로 저장할 수 없으면 None)"""
+    for parser in _PARSERS:
+        try:
+            parsed = parser(s)
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            continue
+        if isinstance(parsed, (dict, list, tuple)) and _json_native(parsed):
+            return parsed
+    return None
+
+
+# ==========================================
+# [1] 저장용: 펼치기만 (무손실)
+# ==========================================
+def expand(value):
+    """
+    값 하나를 저장형으로 (재귀, 노드마다 한 번).
+    dict / list 문자열은 파싱해서 다시 펼치고, 나머지 값은 그대로 둡니다 (strip / 빈 값 제거 없음).
+    """
+    if isinstance(value, dict):
+        return {k: expand(v) for k, v in value.items()}
+
+    if isinstance(value, (list, tuple)):
+        return [expand(v) for v in value]
+
+    if isinstance(value, str):
+        s = value.strip()
+        if s[:1] in ("{", "["):
+            parsed = _parse_text(s)
+            if parsed is not None:
+                return expand(parsed)
+
+    return value
+
+
+def expand_results(value):
+    """analysis_results 전체 → 저장형 dict (dict 가 아니면 빈 dict)"""
+    value = expand(value)
+    return value if isinstance(value, dict) else {}
+
+
+def merge_updates(results, refs, updates):
+    """
+    updates 를 펼쳐서 results(인라인 결과)에 덮어씁니다 (제자리 수정, NA 등 빈 값도 그대로 저장).
+    덮어쓴 키는 refs(result_sections)에서도 뗍니다 (blob 에 남은 예전 섹션이 새 값을 가리지 않도록).
+    """
+    for key, value in updates.items():
+        refs.pop(key, None)
+        results[key] = expand(value)
+    return results
+
+
+# ==========================================
+# [2] 화면용: 빈 값 정리
+# ==========================================
+def clean(value):
+    """
+    값 하나를 화면 표시형으로 (재귀, 노드마다 한 번).
+    dict 는 값이 None / [] 인 키를 빼고, list 는 None 항목을 빼고,
+    문자열은 strip 후 빈 값이면 None, dict / list 문자열이면 파싱해서 다시 정리합니다.
+    그 밖의 값(숫자, bool, 날짜 등)은 그대로 둡니다.
+    """
+    if isinstance(value, dict):
+        out = {}
+        for k, v in value.items():
+            v = clean(v)
+            if v is not None and v != []:
+                out[k] = v
+        return out
+
+    if isinstance(value, (list, tuple)):
+        out = []
+        for v in value:
+            v = clean(v)
+            if v is not None:
+                out.append(v)
+        return out
+
+    if isinstance(value, str):
+        s = value.strip()
+        if not s or s.upper() in EMPTY_TOKENS:
+            return None
+        if s[0] in "{[":
+            parsed = _parse_text(s)
+            if parsed is not None:
+                return clean(parsed)
+        return s
+
+    return value
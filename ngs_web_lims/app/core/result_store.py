@@ -0,0 +1,229 @@
+# app/core/result_store.py
+"""
+분석 결과 대용량 섹션 저장소 (analysis_blobs 테이블).
+
+TSO500 / WES / WTS 결과의 variants, fusions, expression_profile 같은 큰 목록을
+Analysis.analysis_results(JSON 한 칸)에 그대로 두면 Sample.analysis 를 읽을 때마다 수 MB 가 딸려오고,
+webhook 의 부분 갱신도 전체를 다시 씁니다. 그래서 쓸 때
+    1) 최상위 키 중 큰 목록 섹션(is_bulky_section: 이름에 variant / fusion / expression 이 들어간 키)이면서
+       JSON 으로 LIMS_RESULT_BLOB_MIN_KB 이상인 값만 골라
+    2) zstd(없으면 zlib)로 압축해 analysis_blobs 에 sha256 digest 를 키로 저장하고 (같은 내용은 한 번만)
+    3) analysis_results 에는 나머지 값, Analysis.result_sections 에는 {키: digest} 만 남깁니다.
+metrics / QC / TMB / MSI 같은 요약 섹션과 tmb_score / msi_status 등 생성 컬럼이 읽는 키는
+크기와 상관없이 항상 analysis_results 에 남아 SQL / 생성 컬럼으로 조회할 수 있습니다.
+읽을 때는 full_results(analysis) 가 필요한 섹션만 IN 한 번으로 가져와 합칩니다.
+blob 은 내용이 바뀌지 않으므로 압축을 푼 원본을 프로세스 안에 LIMS_RESULT_BLOB_CACHE_MB 까지 캐시합니다.
+참조가 끊긴 blob 은 지우지 않습니다 (같은 내용이 다시 오면 그대로 재사용).
+"""
+import hashlib
+import json
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timezone, timedelta
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import object_session
+
+from app.models._schema import AnalysisBlob
+
+try:
+    import zstandard
+except ImportError:  # zstandard 미설치: zlib 으로 저장 (읽기는 행마다 저장된 codec 으로)
+    zstandard = None
+
+MIN_BYTES = int(os.getenv("LIMS_RESULT_BLOB_MIN_KB", 4)) * 1024
+CACHE_BYTES = int(os.getenv("LIMS_RESULT_BLOB_CACHE_MB", 64)) * 1024 * 1024
+ZSTD_LEVEL = 9
+ZLIB_LEVEL = 6
+IN_CHUNK_SIZE = 500
+
+CODEC_ZSTD, CODEC_ZLIB = "zstd", "zlib"
+BULKY_SECTION_WORDS = ("variant", "fusion", "expression")   # blob 으로 뺄 수 있는 섹션 이름 (소문자 부분 일치)
+
+
+def _now():
+    return datetime.now(timezone(timedelta(hours=9))).replace(tzinfo=None)
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _as_dict(value):
+    if isinstance(value, str):
+        return json.loads(value) if value else {}
+    return value or {}
+
+
+def is_bulky_section(key):
+    """variants / Small_Variants / fusions / expression_profile 처럼 큰 목록 섹션인지 (요약 섹션은 False)"""
+    name = str(key).lower()
+    return any(word in name for word in BULKY_SECTION_WORDS)
+
+
+# ==========================================
+# [1] 압축
+# ==========================================
+def compress(raw):
+    """→ (codec, 압축된 bytes)"""
+    if zstandard is not None:
+        return CODEC_ZSTD, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    return CODEC_ZLIB, zlib.compress(raw, ZLIB_LEVEL)
+
+
+def decompress(codec, data):
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data)
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstd 로 저장된 분석 결과입니다. `pip install zstandard` 후 다시 시도하세요.")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"알 수 없는 codec: {codec}")
+
+
+# ==========================================
+# [2] 압축 해제 캐시 (digest → 원본 JSON bytes)
+# ==========================================
+_cache = OrderedDict()
+_cache_size = 0
+_cache_lock = threading.Lock()
+
+
+def _cache_get(digest):
+    with _cache_lock:
+        raw = _cache.get(digest)
+        if raw is not None:
+            _cache.move_to_end(digest)
+        return raw
+
+
+def _cache_put(digest, raw):
+    global _cache_size
+    if len(raw) > CACHE_BYTES:
+        return
+    with _cache_lock:
+        if digest in _cache:
+            return
+        _cache[digest] = raw
+        _cache_size += len(raw)
+        while _cache_size > CACHE_BYTES:
+            _, old = _cache.popitem(last=False)
+            _cache_size -= len(old)
+
+
+# ==========================================
+# [3] 쓰기
+# ==========================================
+def _put_blobs(db, pending):
+    """{digest: 원본 bytes} 중 아직 없는 것만 압축해서 INSERT (flush 까지, commit 은 호출측)"""
+    digests = list(pending)
+    existing = set()
+    for i in range(0, len(digests), IN_CHUNK_SIZE):
+        existing.update(d for (d,) in db.query(AnalysisBlob.digest).filter(
+            AnalysisBlob.digest.in_(digests[i:i + IN_CHUNK_SIZE])))
+
+    now = _now()
+    rows = []
+    for digest in digests:
+        if digest in existing:
+            continue
+        raw = pending[digest]
+        codec, data = compress(raw)
+        rows.append({"digest": digest, "codec": codec, "raw_bytes": len(raw), "stored_bytes": len(data),
+                     "data": data, "created_at": now})
+    if not rows:
+        return 0
+
+    # 같은 내용이 동시에 들어와도 PK 충돌 없이 (이미 있으면 건너뜀)
+    dialect = db.get_bind().dialect.name
+    insert = {"postgresql": pg_insert, "sqlite": sqlite_insert}.get(dialect)
+    if insert is not None:
+        db.execute(insert(AnalysisBlob.__table__).on_conflict_do_nothing(index_elements=["digest"]), rows)
+    else:
+        db.bulk_insert_mappings(AnalysisBlob, rows)
+    return len(rows)
+
+
+def externalize(db, rows):
+    """
+    rows: [(results dict, 기존 result_sections | None)] → 같은 순서로 [(analysis_results, result_sections)]
+    results 에 있는 키는 새 값 기준으로 인라인 / blob 이 다시 정해지고 (큰 목록 섹션만 blob 후보),
+    results 에 없는 키는 기존 참조를 그대로 둡니다 (부분 갱신 시 큰 섹션을 다시 쓰지 않음).
+    """
+    out, pending = [], {}
+    for results, refs in rows:
+        inline, new_refs = {}, dict(_as_dict(refs))
+        for key, value in _as_dict(results).items():
+            bulky = is_bulky_section(key) and isinstance(value, (dict, list, str))
+            raw = _dumps(value) if bulky else b""
+            if len(raw) >= MIN_BYTES:
+                digest = hashlib.sha256(raw).hexdigest()
+                pending.setdefault(digest, raw)
+                new_refs[key] = digest
+            else:
+                inline[key] = value
+                new_refs.pop(key, None)
+        out.append((inline, new_refs))
+    if pending:
+        _put_blobs(db, pending)
+    return out
+
+
+# ==========================================
+# [4] 읽기
+# ==========================================
+def load_sections(db, refs, keys=None):
+    """result_sections({키: digest}) 중 keys(없으면 전부) 섹션을 읽어 {키: 값}"""
+    wanted = {k: d for k, d in _as_dict(refs).items() if keys is None or k in keys}
+    raws, missing = {}, []
+    for digest in set(wanted.values()):
+        raw = _cache_get(digest)
+        if raw is None:
+            missing.append(digest)
+        else:
+            raws[digest] = raw
+    for i in range(0, len(missing), IN_CHUNK_SIZE):
+        for digest, codec, data in db.query(AnalysisBlob.digest, AnalysisBlob.codec, AnalysisBlob.data).filter(
+                AnalysisBlob.digest.in_(missing[i:i + IN_CHUNK_SIZE])):
+            raws[digest] = decompress(codec, data)
+            _cache_put(digest, raws[digest])
+
+    sections = {}
+    for key, digest in wanted.items():
+        if digest in raws:
+            sections[key] = json.loads(raws[digest])
+        else:
+            print(f"⚠️ 분석 결과 섹션 '{key}' 의 blob({digest[:12]}) 을 찾을 수 없습니다.")
+    return sections
+
+
+def full_results(analysis, keys=None, db=None):
+    """
+    analysis_results + 빼낸 섹션을 합친 dict (예전 analysis_results 와 같은 모양).
+    keys 를 주면 빼낸 섹션 중 그 키들만 읽습니다 (인라인 값은 항상 전부).
+    db 가 없으면 analysis 가 붙어 있는 세션을, 그것도 없으면 새 세션을 씁니다.
+    """
+    if analysis is None:
+        return {}
+    results = dict(_as_dict(analysis.analysis_results))
+    refs = _as_dict(analysis.result_sections)
+    if keys is not None:
+        refs = {k: d for k, d in refs.items() if k in keys}
+    if not refs:
+        return results
+
+    session = db or object_session(analysis)
+    if session is not None:
+        results.update(load_sections(session, refs))
+        return results
+    from app.core.database import SessionLocal
+    session = SessionLocal()
+    try:
+        results.update(load_sections(session, refs))
+    finally:
+        session.close()
+    return results
+
@@ -0,0 +1,114 @@
+# app/core/result_summary.py
+"""
+분석 결과 요약 키 (Analysis 생성 컬럼용).
+
+Analysis.analysis_type / msi_status / tmb_score 는 analysis_results 의 최상위 키를 읽는 생성 컬럼인데,
+실제로 들어오는 결과(TSO500 Results.json, 39번 서버 webhook)는 TMB / MSI 를
+{"variants": {"TMB": {"Total_TMB": "7.1"}, "MSI": {"Percent_Unstable_MSI_Sites": "1.80"}}} 처럼
+섹션 안에 두기 때문에 세 컬럼이 늘 비어 있었습니다.
+그래서 쓸 때(analysis_ingest / tso 원격 수집·메타데이터 업로드) apply_summary 로 최상위 키를 채웁니다.
+    tmb_score     : TMB 섹션의 Total_TMB (없으면 TMB / TMB Score / Score) → 숫자
+    msi_status    : MSI 섹션의 Status 가 있으면 그대로,
+                    없으면 Percent_Unstable_MSI_Sites 가 MSI_HIGH_PERCENT 이상이면 "MSI-H", 아니면 "MSS"
+                    (clinical_report 의 MSI-H 판정과 같은 기준)
+    analysis_type : 결과에 없을 때만 검체의 target_panel
+섹션은 최상위 또는 한 단계 아래(metrics / variants 등)에서 찾고, 섹션이 없으면 기존 키를 그대로 둡니다
+(API 가 tmb_score / msi_status 를 직접 보내는 경우, 큰 섹션이 blob 에 있어 이번에 안 온 경우).
+기존 행은 migration v0011 이 한 번 채웁니다.
+"""
+import math
+import re
+
+from app.core.result_normalize import clean
+
+MSI_HIGH_PERCENT = 20.0
+
+_SECTIONS = {"tmb": "tmb", "tumormutationalburden": "tmb", "msi": "msi", "microsatelliteinstability": "msi"}
+_TMB_KEYS = ("totaltmb", "tmb", "tmbscore", "score")
+_MSI_STATUS_KEYS = ("status", "msistatus", "result")
+_MSI_PERCENT_KEYS = ("percentunstablemsisites", "msirate", "rate")
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+def _norm(key):
+    return re.sub(r"[^a-z0-9]", "", str(key).lower())
+
+
+def _number(value):
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if math.isfinite(value) else None
+    match = _NUMBER_RE.search(str(value).replace(",", ""))
+    return float(match.group(0)) if match else None
+
+
+def _first(section, keys):
+    values = {_norm(k): v for k, v in section.items()}
+    return next((values[k] for k in keys if values.get(k) is not None), None)
+
+
+def find_sections(results):
+    """{"tmb": 값, "msi": 값} — 최상위에서 먼저, 없으면 한 단계 아래 dict(문자열이면 파싱)에서"""
+    found, nested = {}, []
+    for key, value in results.items():
+        kind = _SECTIONS.get(_norm(key))
+        if kind:
+            found.setdefault(kind, value)
+        else:
+            nested.append(value)
+    for value in nested:
+        if len(found) == 2:
+            break
+        if isinstance(value, str) and value.strip()[:1] == "{":
+            value = clean(value)
+        if isinstance(value, dict):
+            for key, inner in value.items():
+                kind = _SECTIONS.get(_norm(key))
+                if kind:
+                    found.setdefault(kind, inner)
+    return {kind: clean(value) for kind, value in found.items()}
+
+
+def _tmb_score(section):
+    if isinstance(section, dict):
+        section = _first(section, _TMB_KEYS)
+    return _number(section)
+
+
+def _msi_status(section):
+    if isinstance(section, dict):
+        status = _first(section, _MSI_STATUS_KEYS)
+        if status is not None:
+            return str(status).strip()
+        section = _first(section, _MSI_PERCENT_KEYS)
+    percent = _number(section)
+    if percent is None:
+        return section.strip() if isinstance(section, str) else None
+    return "MSI-H" if percent >= MSI_HIGH_PERCENT else "MSS"
+
+
+# ==========================================
+# [1] 요약 키 채우기
+# ==========================================
+def summarize(results, panel=None):
+    """results 에서 찾은 요약 값 {"tmb_score", "msi_status", "analysis_type"} (찾은 것만)"""
+    sections = find_sections(results)
+    summary = {}
+    if "tmb" in sections:
+        score = _tmb_score(sections["tmb"])
+        if score is not None:
+            summary["tmb_score"] = score
+    if "msi" in sections:
+        status = _msi_status(sections["msi"])
+        if status:
+            summary["msi_status"] = status
+    if panel and not results.get("analysis_type"):
+        summary["analysis_type"] = str(panel).strip()
+    return summary
+
+
+def apply_summary(results, panel=None):
+    """results(저장할 결과 dict)에 요약 키를 덮어씀 (제자리 수정, 섹션이 원본이므로 섹션이 있으면 섹션 값 우선)"""
+    results.update(summarize(results, panel))
+    return results
@@ -0,0 +1,159 @@
+# app/core/transitions.py
+"""
+칸반 단계 이동(상태 전환) 서비스.
+
+한 번의 이동(드래그 / 모달 저장)을 집합 단위로 처리합니다.
+    1) 대상 샘플을 SELECT 한 번으로 읽고
+    2) 게이트키퍼 규칙(입고 확인 / required / pass_value)을 메모리에서 한꺼번에 검사한 뒤
+    3) 목표 상태별 UPDATE ... WHERE id IN (...) 과 ActionLog 일괄 INSERT 로 반영합니다.
+플레이트 단위(96~384 샘플) Order 도 샘플 수와 관계없이 쿼리 몇 번으로 끝납니다.
+커밋은 호출하는 쪽(콜백)이 한 트랜잭션으로 합니다.
+"""
+from sqlalchemy import insert, update
+
+from app.models._schema import ActionLog, Order, Sample, STAGE_SCHEMA_CONFIG
+
+STAGES = ["접수 대기", "접수 완료", "QC 진행", "시퀀싱 진행", "분석 진행", "정산 대기"]
+STATUS_IDX = {s: i for i, s in enumerate(STAGES)}
+HOLD_STATUS = "보류/실패"
+RETEST_STATUS = "재실험"
+
+# IN (...) 바인드 파라미터 한도 (SQLite 기본 999)
+ID_CHUNK = 500
+
+# 게이트키퍼 검사에 필요한 Sample 컬럼 (나머지는 panel_metadata 에서 읽음)
+_GATE_BASE_FIELDS = ["id", "sample_name", "current_status", "sample_received", "receiver_name", "panel_metadata"]
+
+
+# ==========================================
+# [1] 게이트키퍼 규칙
+# ==========================================
+def _normalized(value):
+    return ("" if value is None else str(value)).replace(" ", "")
+
+
+def is_backward(from_status, to_status):
+    """정의된 단계끼리 뒤로 가는 이동인지 (보류/실패 는 어느 단계에서나 허용)"""
+    if to_status == HOLD_STATUS or from_status not in STATUS_IDX or to_status not in STATUS_IDX:
+        return False
+    return STATUS_IDX[to_status] < STATUS_IDX[from_status]
+
+
+def gate_messages(values, from_status, to_status, stage_config=None):
+    """
+    샘플 하나가 from_status → to_status 로 전진할 수 있는지 검사해 오류 메시지 목록을 돌려줍니다.
+    values 는 {필드: 값} (Sample 컬럼 + panel_metadata 를 합친 것). 통과하면 [].
+    stage_config 를 생략하면 STAGE_SCHEMA_CONFIG[from_status] 의 required / pass_value 를 씁니다.
+    """
+    if from_status == to_status or to_status == HOLD_STATUS:
+        return []
+    if stage_config is None:
+        stage_config = STAGE_SCHEMA_CONFIG.get(from_status, {"columns": []})
+
+    name = values.get("sample_name")
+    messages = []
+    # 입고 확인 / 담당자는 단계 설정(pass_value / required)에 이미 있으면 그쪽 메시지만 낸다
+    configured = {col["id"] for col in stage_config["columns"]}
+    if from_status == "접수 대기" and to_status == "접수 완료":
+        if "sample_received" not in configured and _normalized(values.get("sample_received")) != "입고완료":
+            messages.append(f"📦 [{name}] '입고 확인'을 '입고 완료'로 변경해주세요.")
+        if "receiver_name" not in configured and not values.get("receiver_name"):
+            messages.append(f"👤 [{name}] '입고 담당자' 이름이 누락되었습니다.")
+
+    for col in stage_config["columns"]:
+        db_val = _normalized(values.get(col["id"]))
+        if col.get("required") and not db_val:
+            messages.append(f"[{name}] 필수 항목 '{col['name']}' 누락")
+        if col.get("pass_value") and db_val != _normalized(col["pass_value"]):
+            messages.append(
+                f"📦 [{name}] '{col['name']}'을 '{col.get('pass_value')}'로 설정해야 이동 가능합니다."
+            )
+    return messages
+
+
+def sample_values(sample_or_row, meta=None):
+    """
+    Sample 객체(또는 컬럼 행) + panel_metadata → 게이트키퍼용 {필드: 값}.
+    meta 를 주면 (저장 전 편집 중인) 그 panel_metadata 기준으로 검사합니다.
+    """
+    if hasattr(sample_or_row, "_mapping"):
+        mapping = dict(sample_or_row._mapping)
+    else:
+        mapping = {col.key: getattr(sample_or_row, col.key, None) for col in Sample.__table__.columns}
+    values = dict(meta if meta is not None else (mapping.get("panel_metadata") or {}))
+    # Sample 직접 컬럼이 panel_metadata 보다 우선
+    values.update({k: v for k, v in mapping.items() if k != "panel_metadata"})
+    return values
+
+
+def _gate_columns(stage_config):
+    names = list(_GATE_BASE_FIELDS)
+    for col in stage_config["columns"]:
+        if hasattr(Sample, col["id"]) and col["id"] not in names:
+            names.append(col["id"])
+    return [getattr(Sample, name) for name in names]
+
+
+# ==========================================
+# [2] 일괄 반영
+# ==========================================
+def apply_status_changes(db, changes, action_type, details):
+    """
+    changes: [(sample pk, 이전 상태, 새 상태), ...]
+    새 상태별로 UPDATE ... WHERE id IN (...) 를 한 번씩 실행하고, ActionLog 를 한 번에 INSERT 합니다.
+    """
+    changes = [c for c in changes if c[1] != c[2]]
+    by_target = {}
+    for sample_pk, _, new_status in changes:
+        by_target.setdefault(new_status, []).append(sample_pk)
+
+    for new_status, ids in by_target.items():
+        for start in range(0, len(ids), ID_CHUNK):
+            db.execute(
+                update(Sample)
+                .where(Sample.id.in_(ids[start:start + ID_CHUNK]))
+                .values(current_status=new_status)
+                .execution_options(synchronize_session=False)
+            )
+    add_action_logs(db, [
+        {"sample_id": pk, "action_type": action_type, "previous_state": old, "new_state": new, "details": details}
+        for pk, old, new in changes
+    ])
+    return len(changes)
+
+
+def add_action_logs(db, rows):
+    """ActionLog 여러 건을 INSERT 한 번(executemany)으로"""
+    if rows:
+        db.execute(insert(ActionLog), rows)
+
+
+def move_order_stage(db, order_id, from_status, to_status, details="칸반 이동"):
+    """
+    Order 하나에서 from_status 인 샘플 전체를 to_status 로 옮깁니다.
+    반환: (옮긴 샘플 수, 오류 메시지 목록). 오류가 있으면 아무것도 바꾸지 않습니다.
+    """
+    if from_status == to_status:
+        return 0, []
+    if is_backward(from_status, to_status):
+        return 0, [f"🚫 역방향 이동 불가: [{from_status}] → [{to_status}]"]
+
+    stage_config = STAGE_SCHEMA_CONFIG.get(from_status, {"columns": []})
+    rows = (
+        db.query(*_gate_columns(stage_config))
+        .join(Order, Order.id == Sample.order_pk)
+        .filter(Order.order_id == order_id, Sample.current_status == from_status)
+        .all()
+    )
+
+    errors = []
+    for row in rows:
+        errors.extend(gate_messages(sample_values(row), from_status, to_status, stage_config))
+    if errors:
+        return 0, errors
+
+    moved = apply_status_changes(
+        db, [(row.id, from_status, to_status) for row in rows],
+        action_type="상태 변경 (Order 일괄)", details=details,
+    )
+    return moved, []
@@ -0,0 +1,291 @@
+# app/core/variant_index.py
+"""
+분석 결과의 small variant → variants 테이블 색인.
+
+결과를 적재하는 곳(analysis_ingest 의 /api/v1/result · webhook 반영, TSO 원격 수집)에서
+index_variants(db, {Sample PK: 결과 dict}) 를 부르면
+    1) 결과에서 변이 섹션(variants / Small_Variants, 예전 {"variants": {"Small_Variants": [...]}} 구조 포함)을 찾고
+    2) 파이프라인마다 다른 필드 이름(Gene / Chromosome / Genomic_Position / Allele_Frequency ...)을
+       gene / chrom / pos / ref / alt / vaf / depth / consequence 등 타입이 있는 컬럼으로 옮긴 뒤
+    3) 그 샘플의 기존 행을 지우고 새로 넣습니다 (commit 은 호출측).
+변이 섹션이 없는 결과(부분 갱신 등)는 기존 행을 건드리지 않습니다.
+search / samples_with 는 API(/api/v1/variants)와 변이 검색 화면이 같이 씁니다.
+"""
+import ast
+import json
+import re
+from functools import lru_cache
+
+from sqlalchemy import delete, func, insert
+from sqlalchemy.orm import Session
+
+from app.core.result_store import full_results
+from app.models._schema import Analysis, Sample, Variant
+
+IN_CHUNK_SIZE = 500
+INSERT_CHUNK_SIZE = 5000
+MAX_LIMIT = 5000
+CHROM_MAX_LENGTH = 64     # Variant.chrom 길이 (chrUn_KI270742v1 / chr1_KI270706v1_random 같은 contig 포함)
+
+SECTION_KEYS = {"small_variants", "variants"}
+
+# 컬럼 → 원본 필드 후보 (앞쪽 우선, 대소문자 / 공백 / '-' / '.' 무시)
+FIELD_ALIASES = {
+    "gene": ("Gene", "Gene_Name", "Gene_Symbol", "Symbol"),
+    "chrom": ("Chromosome", "Chr", "CHROM", "Contig"),
+    "pos": ("Genomic_Position", "Position", "POS", "Start_Position", "Start"),
+    "ref": ("Reference_Call", "Reference_Allele", "REF"),
+    "alt": ("Alternative_Call", "Alternate_Allele", "ALT"),
+    "vaf": ("Allele_Frequency", "VAF", "AF"),
+    "depth": ("Depth", "DP", "Read_Depth", "Total_Depth"),
+    "consequence": ("Consequences", "Consequence", "Variant_Type"),
+    "hgvs_c": ("C_Dot_Notation", "HGVSc", "HGVS_c", "cDNA_Change"),
+    "hgvs_p": ("P_Dot_Notation", "HGVSp", "HGVS_p", "Protein_Change"),
+    "transcript": ("Transcript", "Transcript_ID", "Feature", "RefSeq"),
+}
+
+AA3 = {
+    "Ala": "A", "Arg": "R", "Asn": "N", "Asp": "D", "Cys": "C", "Gln": "Q", "Glu": "E", "Gly": "G",
+    "His": "H", "Ile": "I", "Leu": "L", "Lys": "K", "Met": "M", "Phe": "F", "Pro": "P", "Ser": "S",
+    "Thr": "T", "Trp": "W", "Tyr": "Y", "Val": "V", "Ter": "*", "Sec": "U", "Xaa": "X",
+}
+_AA3_RE = re.compile("|".join(AA3))
+_BLANK = {"", "-", ".", "na", "n/a", "none", "null", "nan"}
+
+
+@lru_cache(maxsize=1024)
+def _norm(key):
+    return re.sub(r"[\s\-.]+", "_", str(key).strip()).lower()
+
+
+_ALIASES = {column: tuple(_norm(a) for a in aliases) for column, aliases in FIELD_ALIASES.items()}
+
+
+@lru_cache(maxsize=256)
+def _key_plan(keys):
+    """원본 변이 dict 의 키 tuple → {컬럼: 우선순위 순 원본 키들} (같은 섹션의 행은 키가 같으므로 한 번만 계산)"""
+    by_norm = {}
+    for key in keys:
+        by_norm.setdefault(_norm(key), key)
+    return {column: tuple(by_norm[a] for a in aliases if a in by_norm) for column, aliases in _ALIASES.items()}
+
+
+# ==========================================
+# [1] 정규화
+# ==========================================
+def normalize_chrom(value):
+    text = str(value or "").strip()
+    if text.lower() in _BLANK:
+        return None
+    text = re.sub(r"^chr", "", text, flags=re.IGNORECASE)
+    return "chrM" if text.upper() in ("M", "MT") else f"chr{text.upper() if text.isalpha() else text}"
+
+
+def protein_change(hgvs_p):
+    """'NP_004976.2:p.(Gly12Cys)' / 'p.G12C' / 'G12C' → 'G12C' (검색 키)"""
+    text = str(hgvs_p or "").strip()
+    if text.lower() in _BLANK:
+        return None
+    text = text.split(":", 1)[-1].replace("(", "").replace(")", "")
+    if text.startswith("p."):
+        text = text[2:]
+    return _AA3_RE.sub(lambda m: AA3[m.group(0)], text)[:40] or None
+
+
+def _clean(value):
+    """빈 값(None / '' / '-' / 'NA' ...)이면 None, 아니면 그대로 (문자열은 strip)"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        return None if value.lower() in _BLANK else value
+    return value
+
+
+def _text(value):
+    value = _clean(value)
+    return None if value is None else str(value)
+
+
+def _number(value, cast):
+    value = _clean(value)
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            return cast(value)
+        match = re.search(r"-?\d+(?:\.\d+)?(?:[eE]-?\d+)?", str(value).replace(",", ""))
+        return cast(float(match.group(0))) if match else None
+    except (ValueError, OverflowError):
+        return None
+
+
+def _parse(value):
+    """webhook 은 값을 str() 로 저장하므로 JSON / 파이썬 repr 문자열도 풀어봄"""
+    if not isinstance(value, str):
+        return value
+    text = value.strip()
+    if not text.startswith(("[", "{")):
+        return value
+    try:
+        return json.loads(text)
+    except ValueError:
+        try:
+            return ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            return value
+
+
+def find_variant_rows(results):
+    """결과 dict 에서 small variant 목록을 찾음. 변이 섹션 자체가 없으면 None (있는데 비었으면 [])"""
+    if not isinstance(results, dict):
+        return None
+    for key, value in results.items():
+        if _norm(key) not in SECTION_KEYS:
+            continue
+        value = _parse(value)
+        if isinstance(value, dict):
+            nested = find_variant_rows(value)   # 예전 구조: {"variants": {"Small_Variants": [...], "TMB": ...}}
+            if nested is not None:
+                return nested
+            if value and all(isinstance(v, dict) for v in value.values()):
+                return list(value.values())
+            continue
+        if isinstance(value, list):
+            return [row for row in value if isinstance(row, dict)]
+    return None
+
+
+def to_row(sample_pk, variant):
+    """원본 변이 dict → variants 행 mapping (gene 도 위치도 없으면 None)"""
+    plan = _key_plan(tuple(variant))
+
+    def pick(column):
+        for key in plan[column]:
+            value = _clean(variant[key])
+            if value is not None:
+                return value
+        return None
+
+    hgvs_p = _text(pick("hgvs_p"))
+    chrom = normalize_chrom(pick("chrom"))
+    if chrom is not None and len(chrom) > CHROM_MAX_LENGTH:
+        chrom = None   # 잘라 넣으면 다른 contig 와 섞이므로 위치 없이 (샘플 결과 전체가 실패하지 않도록)
+    row = {
+        "sample_id": sample_pk,
+        "gene": (_text(pick("gene")) or "").upper()[:40] or None,   # 검색은 대문자로 맞춰서
+        "chrom": chrom,
+        "pos": _number(pick("pos"), int),
+        "ref": _text(pick("ref")),
+        "alt": _text(pick("alt")),
+        "vaf": _number(pick("vaf"), float),
+        "depth": _number(pick("depth"), int),
+        "consequence": _text(pick("consequence")),
+        "hgvs_c": _text(pick("hgvs_c")),
+        "hgvs_p": hgvs_p,
+        "protein_change": protein_change(hgvs_p),
+        "transcript": _text(pick("transcript")),
+    }
+    if row["gene"] is None and (row["chrom"] is None or row["pos"] is None):
+        return None
+    return row
+
+
+# ==========================================
+# [2] 쓰기
+# ==========================================
+def delete_variants(db, sample_pks):
+    sample_pks = list(sample_pks)
+    for i in range(0, len(sample_pks), IN_CHUNK_SIZE):
+        db.execute(delete(Variant).where(Variant.sample_id.in_(sample_pks[i:i + IN_CHUNK_SIZE])))
+
+
+def insert_variants(db, rows):
+    """행 mapping 목록을 INSERT_CHUNK_SIZE 개씩 executemany (ORM bulk 경로를 거치지 않는 Core INSERT)"""
+    for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+        db.execute(insert(Variant.__table__), rows[i:i + INSERT_CHUNK_SIZE])
+
+
+def index_variants(db, results_by_sample):
+    """{Sample PK: 결과 dict} 중 변이 섹션이 있는 샘플만 variants 행을 교체. 반환: 넣은 행 수"""
+    replaced, rows = [], []
+    for sample_pk, results in results_by_sample.items():
+        variants = find_variant_rows(results)
+        if variants is None:
+            continue
+        replaced.append(sample_pk)
+        rows.extend(row for row in (to_row(sample_pk, v) for v in variants) if row)
+    if replaced:
+        delete_variants(db, replaced)
+        insert_variants(db, rows)
+    return len(rows)
+
+
+def reindex_all(engine, batch_size=200):
+    """analysis 결과 전체를 다시 색인 (색인 규칙을 바꾼 뒤 수동으로, 배치마다 commit — 기존 행은 migration v0007 이 색인)"""
+    total, last_id = 0, 0
+    while True:
+        with Session(bind=engine) as db:
+            analyses = (db.query(Analysis).filter(Analysis.id > last_id)
+                        .order_by(Analysis.id).limit(batch_size).all())
+            if not analyses:
+                break
+            last_id = analyses[-1].id
+            total += index_variants(db, {a.sample_id: full_results(a, db=db) for a in analyses if a.sample_id})
+            db.commit()
+    if total:
+        print(f"🧬 기존 분석 결과에서 변이 {total}건을 색인했습니다.")
+    return total
+
+
+# ==========================================
+# [3] 조회
+# ==========================================
+def _filtered(query, gene=None, protein=None, chrom=None, pos_from=None, pos_to=None, min_vaf=None):
+    if gene:
+        query = query.filter(Variant.gene == gene.strip().upper())
+    if protein:
+        query = query.filter(Variant.protein_change == protein_change(protein))
+    if chrom:
+        query = query.filter(Variant.chrom == normalize_chrom(chrom))
+    if pos_from is not None:
+        query = query.filter(Variant.pos >= pos_from)
+    if pos_to is not None:
+        query = query.filter(Variant.pos <= pos_to)
+    if min_vaf is not None:
+        query = query.filter(Variant.vaf >= min_vaf)
+    return query
+
+
+def search(db, gene=None, protein=None, chrom=None, pos_from=None, pos_to=None, min_vaf=None,
+           sample_id=None, after_id=None, limit=200):
+    """
+    변이 행 조회 (Variant.id 순, after_id 이후부터 limit 개 — 다음 페이지는 마지막 id 를 after_id 로).
+    sample_id 는 ACC Sample ID. 반환: [dict]
+    """
+    query = db.query(Variant, Sample.sample_id.label("acc_id")).join(Sample, Sample.id == Variant.sample_id)
+    query = _filtered(query, gene, protein, chrom, pos_from, pos_to, min_vaf)
+    if sample_id:
+        query = query.filter(Sample.sample_id == sample_id.strip())
+    if after_id is not None:
+        query = query.filter(Variant.id > after_id)
+    rows = query.order_by(Variant.id).limit(max(1, min(limit, MAX_LIMIT))).all()
+    out = []
+    for variant, acc_id in rows:
+        item = {c.name: getattr(variant, c.name) for c in Variant.__table__.columns}
+        item["sample_pk"], item["sample_id"] = item["sample_id"], acc_id
+        out.append(item)
+    return out
+
+
+def samples_with(db, gene=None, protein=None, chrom=None, pos_from=None, pos_to=None, min_vaf=None, limit=1000):
+    """조건에 맞는 변이가 있는 샘플 목록 → [{"sample_id", "target_panel", "variants", "max_vaf"}]"""
+    if not any((gene, protein, chrom)):
+        raise ValueError("gene / protein / chrom 중 하나는 필요합니다.")
+    sub = _filtered(db.query(Variant.sample_id.label("sample_pk"), func.count().label("n"),
+                             func.max(Variant.vaf).label("max_vaf")),
+                    gene, protein, chrom, pos_from, pos_to, min_vaf).group_by(Variant.sample_id).subquery()
+    rows = (db.query(Sample.sample_id, Sample.target_panel, sub.c.n, sub.c.max_vaf)
+            .join(sub, sub.c.sample_pk == Sample.id)
+            .order_by(Sample.sample_id.desc()).limit(max(1, min(limit, MAX_LIMIT))).all())
+    return [{"sample_id": s, "target_panel": panel, "variants": n, "max_vaf": vaf} for s, panel, n, vaf in rows]
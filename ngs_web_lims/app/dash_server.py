@@ -0,0 +1,55 @@
+# app/dash_server.py
+"""
+Dash 서브앱 전용 WSGI 서버 (LIMS_DASH_MODE=proxy 일 때 FastAPI 뒤에서 동작).
+
+무거운 Dash 콜백(PDF 생성, SSH 동기화, LLM 채팅)이 FastAPI 의 webhook / API 처리와
+같은 프로세스를 쓰지 않도록, Dash 앱 11개를 별도의 멀티 프로세스 WSGI 서버로 띄웁니다.
+
+워커는 상주 프로세스여야 합니다 (gunicorn prefork). 다운로드 / MD5 검증 스레드, SSH 커넥션 풀,
+칸반 보드 캐시가 콜백을 처리한 워커 안에 남기 때문에, 요청마다 fork 하는 서버에서는 응답과 함께 사라집니다.
+gunicorn 이 없으면 프로세스 하나 + 스레드 모드로 띄웁니다 (app/core/dash_serving.serve_dash_wsgi).
+
+실행 (ngs_web_lims 디렉터리에서):
+    python -m app.dash_server --port 8050 --workers 4 --threads 8
+    gunicorn -w 4 -k gthread --threads 8 --timeout 300 -b 127.0.0.1:8050 'app.dash_server:create_application()'
+
+FastAPI 쪽:
+    LIMS_DASH_MODE=proxy LIMS_DASH_UPSTREAM=http://127.0.0.1:8050 uvicorn app.main:app
+"""
+import argparse
+
+from app.core.dash_serving import DASH_THREADS, DASH_WORKERS, build_dash_wsgi, serve_dash_wsgi
+
+# 경로 → "모듈:팩토리" (FastAPI 마운트와 Dash 서버가 같은 목록을 씁니다)
+DASH_APPS = {
+    "/reg": "app.pages.registration:create_registration_app",
+    "/data_reg": "app.pages.data_registration:create_data_registry_app",
+    "/pro": "app.pages.project_view:create_project_view_app",
+    "/report": "app.pages.report.base:create_report_view_app",
+    "/kanban": "app.pages.kanban:create_kanban_app",
+    "/analysis": "app.pages.analysis.base:create_analysis_dashboard_app",
+    "/modify": "app.pages.batch_modify:create_batch_modify_app",
+    "/chatbot": "app.pages.chatbot:create_chatbot_app",
+    "/master": "app.pages.master_table:create_master_app",
+    "/check_results": "app.pages.analysis.check_results:create_analysis_results_app",
+    "/variants": "app.pages.analysis.variant_search:create_variant_search_app",
+    # 필요 시 "/billing": "app.pages.biling_dashboard:create_billing_dashboard_app" 추가
+}
+
+
+def create_application(registry=None, lazy=None):
+    """gunicorn 등 WSGI 서버용 진입점 (워커마다 첫 요청 때 앱 생성, LIMS_DASH_LAZY=0 이면 즉시)"""
+    return build_dash_wsgi(registry or DASH_APPS, lazy=lazy)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dash 서브앱 전용 WSGI 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8050)
+    parser.add_argument("--workers", type=int, default=DASH_WORKERS,
+                        help="상주 워커 프로세스 수 (gunicorn 필요, 1 이면 프로세스 하나)")
+    parser.add_argument("--threads", type=int, default=DASH_THREADS, help="워커당 요청 처리 스레드 수")
+    args = parser.parse_args()
+
+    # 워커마다 fork 뒤에 앱을 만든다 (DB 커넥션 / 백그라운드 스레드가 워커 사이에 공유되지 않도록)
+    serve_dash_wsgi(create_application, args.host, args.port, workers=args.workers, threads=args.threads)
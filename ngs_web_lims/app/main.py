@@ -1,27 +1,13 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.responses import RedirectResponse
-from starlette.middleware.wsgi import WSGIMiddleware
-
-from app.pages.project_view import create_project_view_app
-from app.pages.registration import create_registration_app
-from app.pages.biling_dashboard import create_billing_dashboard_app 
-from app.pages.kanban import create_kanban_app 
-from app.pages.data_registration import create_data_registry_app 
-from app.pages.chatbot import create_chatbot_app
-from app.pages.batch_modify import create_batch_modify_app
-from app.pages.master_table import create_master_app
-
-from app.pages.analysis.base import create_analysis_dashboard_app
-from app.pages.analysis.check_results import create_analysis_results_app
-from app.pages.report.base import create_report_view_app
-#from app.pages.report.analysis.clinical_report import create_tso_clinical_report_app
-
-from app.core.database import engine
-from app.models._schema import Base
+from app.core.database import init_db
+from app.core.ingest_queue import get_worker as get_ingest_worker
+from app.core.dash_serving import DASH_MODE, DASH_SPAWN, mount_dash_apps, spawn_dash_server
+from app.dash_server import DASH_APPS
 
 # 🚀 [추가] 분리된 순수 API 라우터 모듈 불러오기
-from app.api import analysis_api
+from app.api import analysis_api, download_api, variant_api
 
 from app.api.webhook import webhook_api
 
@@ -33,39 +19,38 @@ async def lifespan(app: FastAPI):
     
     print("🚀 System Starting: Initializing Database...")
     try:
-        # 🟢 안전한 테이블 생성 코드 (기존 데이터 유지, 없는 테이블만 생성)
-        Base.metadata.create_all(bind=engine)
-        print("✅ DB 체크 완료: 누락된 테이블이 있다면 안전하게 생성되었습니다.")
+        # 🟢 버전 관리형 마이그레이션 (기존 데이터 유지, 밀린 revision 만 적용)
+        applied = init_db()
+        print(f"✅ DB 체크 완료: {len(applied)}개 revision 적용" if applied else "✅ DB 체크 완료: 스키마 최신 상태")
     except Exception as e:
         print(f"❌ DB 연결/초기화 중 치명적 오류 발생: {str(e)}")
         raise e  # DB가 없으면 서버 구동을 중단하는 것이 안전합니다.
+
+    # 📥 분석 결과 수신 큐 워커 (지난 실행에서 남은 '대기' 행부터 처리)
+    get_ingest_worker().start()
+
+    # 🧩 proxy 모드 + LIMS_DASH_SPAWN=1 이면 Dash 전용 서버를 자식 프로세스로 함께 띄운다
+    dash_process = spawn_dash_server() if DASH_MODE == "proxy" and DASH_SPAWN else None
         
     yield
     
     print("🛑 System Shutting Down: Releasing Resources...")
+    get_ingest_worker().stop()
+    for proxy in dash_proxies:
+        await proxy.aclose()
+    if dash_process is not None:
+        dash_process.terminate()
+        dash_process.wait(timeout=10)
     # 필요 시 DB connection pool 해제 로직 추가
 
 app = FastAPI(title="NGS LIMS System", lifespan=lifespan)
 # ==========================================
-# 1. 서브 Dash 앱 마운트 (딕셔너리 기반으로 반복 제거 및 관리 용이성 확보)
+# 1. 서브 Dash 앱 마운트 (목록은 app/dash_server.py 의 DASH_APPS)
+#    - LIMS_DASH_MODE=inprocess (기본): 이 프로세스 안에서 WSGIMiddleware 로 마운트
+#    - LIMS_DASH_MODE=proxy: 별도 Dash WSGI 서버(python -m app.dash_server)로 비동기 프록시
+#      → 무거운 Dash 콜백이 /api/v1, webhook 응답을 막지 않습니다.
 # ==========================================
-dash_apps = {
-    "/reg": create_registration_app,
-    "/data_reg": create_data_registry_app,
-    "/pro": create_project_view_app,
-    "/report": create_report_view_app,
-    "/kanban": create_kanban_app,
-    "/analysis": create_analysis_dashboard_app,
-    "/modify": create_batch_modify_app,
-    "/chatbot": create_chatbot_app,
-    "/master": create_master_app,
-    "/check_results": create_analysis_results_app,
-    # 필요 시 "/billing": create_billing_dashboard_app 추가
-}
-
-for path, app_factory in dash_apps.items():
-    dash_app_instance = app_factory(requests_pathname_prefix=f"{path}/")
-    app.mount(path, WSGIMiddleware(dash_app_instance.server))
+dash_proxies = mount_dash_apps(app, DASH_APPS)
 
 # ==========================================
 # 2. 루트 접속 시 자동 이동 (Redirect)
@@ -81,6 +66,10 @@ def read_root():
 # 🚀 분석 서버에서 LIMS로 데이터를 쏠 때 사용할 API 라우터 등록
 # 이렇게 등록하면 자동으로 /api/v1/analysis/result 주소가 활성화됩니다.
 app.include_router(analysis_api.router, prefix="/api/v1")
+# 📥 Raw Data 다운로드 진행 상황 (SSE 로그 스트림 / 작업 상태)
+app.include_router(download_api.router, prefix="/api/v1")
+# 🧬 샘플 간 변이 검색 (variants 테이블)
+app.include_router(variant_api.router, prefix="/api/v1")
 # 🌟 [추가] 39번 서버가 결과를 던질 Webhook 라우터 등록!
 # webhook_api 안에 이미 '/api/analysis/complete' 경로가 선언되어 있으므로 그냥 추가만 하면 됩니다.
 app.include_router(webhook_api)
\ No newline at end of file
@@ -0,0 +1,9 @@
+"""
+app/migrations
+==============
+스키마 revision 모음. 파일 하나가 revision 하나이며 `vNNNN_<설명>.py` 규칙을 따릅니다.
+실행은 app/core/migrations.py 엔진이 담당합니다.
+
+    python -m app.scripts.migrate            # 밀린 revision 적용
+    python -m app.scripts.migrate --history  # 적용 이력
+"""
@@ -0,0 +1,121 @@
+"""
+기준선: 처음 도입한 6개 테이블 (orders / samples / wet_lab_qc / sequencing / analysis / action_logs).
+
+    - 없는 테이블만 생성. 테이블 모양은 이 revision 을 만들 당시 모델 그대로 아래에 고정해 두었으므로
+      app/models/_schema.py 가 바뀌어도 결과가 같음 (그 뒤에 생긴 컬럼 / 인덱스 / 테이블은 v0002 부터)
+    - 파이썬 쪽 default 는 DDL 에 나오지 않으므로 생략
+"""
+from sqlalchemy import JSON, Column, Date, DateTime, Float, ForeignKey, Integer, MetaData, String, Table
+
+REVISION = "0001"
+DESCRIPTION = "baseline tables"
+
+_meta = MetaData()
+orders = Table(
+    "orders", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("order_id", String, unique=True, index=True, nullable=False),
+    Column("facility", String, nullable=False),
+    Column("client_team", String),
+    Column("client_name", String),
+    Column("client_email", String),
+    Column("client_phone", String),
+    Column("reception_date", Date, nullable=False),
+    Column("reception_type", String),
+    Column("sales_unit_price", Integer),
+)
+samples = Table(
+    "samples", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("order_pk", Integer, ForeignKey("orders.id"), nullable=False),
+    Column("order_id", String, index=True, nullable=False),
+    Column("project_name", String),
+    Column("sample_id", String, unique=True, index=True, nullable=False),
+    Column("target_panel", String, nullable=False),
+    Column("sample_name", String, nullable=False),
+    Column("outside_id_1", String),
+    Column("cancer_type", String),
+    Column("specimen", String),
+    Column("pairing_info", String),
+    Column("sample_received", String),
+    Column("receiver_name", String),
+    Column("visual_inspection", String),
+    Column("storage_location", String),
+    Column("initial_volume", Float),
+    Column("nucleic_acid_type", String),
+    Column("current_status", String),
+    Column("issue_comment", String),
+    Column("panel_metadata", JSON),
+    Column("created_at", DateTime),
+)
+action_logs = Table(
+    "action_logs", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("sample_id", Integer, ForeignKey("samples.id"), nullable=False),
+    Column("action_type", String, nullable=False),
+    Column("previous_state", String),
+    Column("new_state", String),
+    Column("details", String),
+    Column("created_at", DateTime),
+)
+analysis = Table(
+    "analysis", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("sample_id", Integer, ForeignKey("samples.id"), unique=True),
+    Column("analysis_status", String),
+    Column("analyst", String),
+    Column("pipeline", String),
+    Column("pipeline_version", String),
+    Column("raw_data_pathway", String),
+    Column("work_dir_pathway", String),
+    Column("analysis_run_start_date", Date),
+    Column("analysis_run_end_date", Date),
+    Column("standard_report_date_01", Date),
+    Column("advanced_report_date_01", Date),
+    Column("analysis_results", JSON),
+)
+sequencing = Table(
+    "sequencing", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("sample_id", Integer, ForeignKey("samples.id"), unique=True),
+    Column("seq_id", String, unique=True),
+    Column("attempt_num", Integer),
+    Column("seq_facility_type", String),
+    Column("outsourced_facility", String),
+    Column("outsourced_date", Date),
+    Column("received_date", Date),
+    Column("platform", String),
+    Column("run_id", String),
+    Column("flowcell_id", String),
+    Column("target_gb", Float),
+    Column("produced_gb", Float),
+    Column("total_basepair_m", Float),
+    Column("total_reads_m", Float),
+    Column("q30_score", Float),
+    Column("fastq_path", String),
+    Column("seq_qc_status", String),
+    Column("seq_qc_report_date", Date),
+)
+wet_lab_qc = Table(
+    "wet_lab_qc", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("sample_id", Integer, ForeignKey("samples.id"), unique=True),
+    Column("extraction_status", String),
+    Column("dna_qc", String),
+    Column("dna_concentration", Float),
+    Column("dna_volume", Float),
+    Column("dna_total_amount", Float),
+    Column("purity", Float),
+    Column("din", Float),
+    Column("rna_qc", String),
+    Column("rna_concentration", Float),
+    Column("rna_volume", Float),
+    Column("rna_total_amount", Float),
+    Column("dv200", Float),
+    Column("rin", Float),
+    Column("sample_qc_report_date", DateTime),
+)
+
+
+def upgrade(op):
+    op.create_tables(_meta)
@@ -0,0 +1,40 @@
+"""
+자주 쓰는 필터 컬럼 인덱스 + JSON 키 생성 컬럼.
+
+    - samples : current_status / (target_panel, current_status) / (order_pk, current_status)
+    - orders  : reception_date
+    - 생성 컬럼: samples.seq_provider, analysis.analysis_type / msi_status / tmb_score
+    - 컬럼 정의는 아래에 고정 (생성식이 읽는 JSON 컬럼만 같이 선언)
+"""
+from sqlalchemy import JSON, Column, Computed, Float, Integer, MetaData, String, Table
+
+REVISION = "0002"
+DESCRIPTION = "hot filter indexes and generated JSON columns"
+
+_meta = MetaData()
+_samples_json = Table("samples", _meta, Column("id", Integer, primary_key=True), Column("panel_metadata", JSON))
+_analysis_json = Table("analysis", _meta, Column("id", Integer, primary_key=True), Column("analysis_results", JSON))
+
+seq_provider = Column(
+    "seq_provider", String, Computed(_samples_json.c.panel_metadata["seq_provider"].as_string(), persisted=True))
+analysis_type = Column(
+    "analysis_type", String, Computed(_analysis_json.c.analysis_results["analysis_type"].as_string(), persisted=True))
+msi_status = Column(
+    "msi_status", String, Computed(_analysis_json.c.analysis_results["msi_status"].as_string(), persisted=True))
+tmb_score = Column(
+    "tmb_score", Float, Computed(_analysis_json.c.analysis_results["tmb_score"].as_float(), persisted=True))
+
+
+def upgrade(op):
+    op.add_column("samples", seq_provider)
+    for column in (analysis_type, msi_status, tmb_score):
+        op.add_column("analysis", column)
+
+    op.create_index("ix_orders_reception_date", "orders", ["reception_date"])
+    op.create_index("ix_samples_current_status", "samples", ["current_status"])
+    op.create_index("ix_samples_panel_status", "samples", ["target_panel", "current_status"])
+    op.create_index("ix_samples_order_status", "samples", ["order_pk", "current_status"])
+    op.create_index("ix_samples_seq_provider", "samples", ["seq_provider"])
+    op.create_index("ix_analysis_analysis_type", "analysis", ["analysis_type"])
+    op.create_index("ix_analysis_msi_status", "analysis", ["msi_status"])
+    op.create_index("ix_analysis_tmb_score", "analysis", ["tmb_score"])
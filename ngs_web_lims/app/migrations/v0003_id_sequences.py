@@ -0,0 +1,19 @@
+"""ID 발급 카운터 테이블(id_sequences) 추가. 기존 번호는 key 별로 처음 발급할 때 기존 데이터에서 읽어 맞춥니다.
+테이블 모양은 아래에 고정 (app/core/id_allocator.py 의 id_sequences 와 같은 정의)."""
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func
+
+REVISION = "0003"
+DESCRIPTION = "id allocation counters"
+
+_meta = MetaData()
+id_sequences = Table(
+    "id_sequences", _meta,
+    Column("scope", String(30), primary_key=True),
+    Column("key", String(100), primary_key=True),
+    Column("last_value", Integer, nullable=False),
+    Column("updated_at", DateTime, server_default=func.now()),
+)
+
+
+def upgrade(op):
+    op.create_tables(_meta)
@@ -0,0 +1,34 @@
+"""
+Raw Data 다운로드 작업 테이블(download_tasks) 추가. 파일별 진행률 / 이어받기 / MD5 검증 결과를 기록합니다.
+
+    - 테이블 모양은 아래에 고정. bytes_done / bytes_total 은 처음부터 BIGINT
+      (이 revision 을 예전 정의(INTEGER)로 적용한 PostgreSQL DB 는 v0009 가 넓힘)
+"""
+from sqlalchemy import BigInteger, Column, DateTime, Integer, MetaData, String, Table
+
+REVISION = "0004"
+DESCRIPTION = "download tasks"
+
+_meta = MetaData()
+download_tasks = Table(
+    "download_tasks", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("sample_id", String, index=True, nullable=False),
+    Column("read", String, nullable=False),
+    Column("url", String, nullable=False),
+    Column("dest_path", String, unique=True, nullable=False),
+    Column("expected_md5", String),
+    Column("actual_md5", String),
+    Column("status", String, index=True, nullable=False),
+    Column("bytes_done", BigInteger),
+    Column("bytes_total", BigInteger),
+    Column("attempts", Integer),
+    Column("error", String),
+    Column("started_at", DateTime),
+    Column("finished_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+
+def upgrade(op):
+    op.create_tables(_meta)
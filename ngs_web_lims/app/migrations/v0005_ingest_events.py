@@ -0,0 +1,27 @@
+"""분석 결과 수신함 테이블(ingest_events) 추가. webhook / API 결과를 먼저 저장하고 백그라운드에서 반영합니다.
+테이블 모양은 아래에 고정."""
+from sqlalchemy import JSON, Column, DateTime, Integer, MetaData, String, Table
+
+REVISION = "0005"
+DESCRIPTION = "ingest outbox"
+
+_meta = MetaData()
+ingest_events = Table(
+    "ingest_events", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("source", String, nullable=False),
+    Column("idempotency_key", String, unique=True, nullable=False),
+    Column("sample_id", String, index=True),
+    Column("payload", JSON, nullable=False),
+    Column("status", String, index=True, nullable=False),
+    Column("attempts", Integer),
+    Column("error", String),
+    Column("next_attempt_at", DateTime),
+    Column("received_at", DateTime),
+    Column("processed_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+
+def upgrade(op):
+    op.create_tables(_meta)
@@ -0,0 +1,114 @@
+"""
+분석 결과 대용량 섹션 분리.
+
+    - analysis_blobs 테이블 (digest → 압축된 JSON)
+    - analysis.result_sections ({키: digest})
+    - 기존 analysis_results 의 큰 목록 섹션(이름에 variant / fusion / expression 이 들어간 키, JSON 4KB 이상)을
+      blob 으로 옮김 (커밋 후 배치 단위)
+    - 테이블 모양과 옮기는 규칙은 아래에 고정해 두었으므로 app/core/result_store.py 가 바뀌어도 결과가 같음
+      (예전에 크기만 보고 요약 섹션까지 옮긴 DB 는 v0012 가 되돌림)
+"""
+import hashlib
+import json
+import zlib
+from datetime import datetime, timezone, timedelta
+
+from sqlalchemy import JSON, Column, DateTime, Integer, LargeBinary, MetaData, String, Table, select
+
+REVISION = "0006"
+DESCRIPTION = "analysis result blobs"
+BATCH_SIZE = 200
+MIN_BYTES = 4 * 1024
+BULKY_SECTION_WORDS = ("variant", "fusion", "expression")
+
+_meta = MetaData()
+analysis_blobs = Table(
+    "analysis_blobs", _meta,
+    Column("digest", String(64), primary_key=True),
+    Column("codec", String(10), nullable=False),
+    Column("raw_bytes", Integer, nullable=False),
+    Column("stored_bytes", Integer, nullable=False),
+    Column("data", LargeBinary, nullable=False),
+    Column("created_at", DateTime),
+)
+result_sections = Column("result_sections", JSON)
+
+_rows_meta = MetaData()
+analysis = Table(
+    "analysis", _rows_meta,
+    Column("id", Integer, primary_key=True),
+    Column("analysis_results", JSON),
+    Column("result_sections", JSON),
+)
+
+
+def _as_dict(value):
+    if isinstance(value, str):
+        value = json.loads(value) if value else {}
+    return value if isinstance(value, dict) else {}
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _is_bulky(key):
+    name = str(key).lower()
+    return any(word in name for word in BULKY_SECTION_WORDS)
+
+
+def _compress(raw):
+    try:
+        import zstandard
+    except ImportError:  # zstandard 미설치: zlib
+        return "zlib", zlib.compress(raw, 6)
+    return "zstd", zstandard.ZstdCompressor(level=9).compress(raw)
+
+
+def externalize_existing(engine):
+    moved, last_id = 0, 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(analysis.c.id, analysis.c.analysis_results, analysis.c.result_sections)
+                .where(analysis.c.id > last_id).order_by(analysis.c.id).limit(BATCH_SIZE)).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            updates, pending = [], {}
+            for analysis_id, results, refs in rows:
+                inline, new_refs = {}, dict(_as_dict(refs))
+                for key, value in _as_dict(results).items():
+                    raw = _dumps(value) if _is_bulky(key) and isinstance(value, (dict, list, str)) else b""
+                    if len(raw) >= MIN_BYTES:
+                        digest = hashlib.sha256(raw).hexdigest()
+                        pending.setdefault(digest, raw)
+                        new_refs[key] = digest
+                    else:
+                        inline[key] = value
+                if new_refs != _as_dict(refs):
+                    updates.append((analysis_id, inline, new_refs))
+            if pending:
+                existing = {d for (d,) in conn.execute(
+                    select(analysis_blobs.c.digest).where(analysis_blobs.c.digest.in_(list(pending))))}
+                now = datetime.now(timezone(timedelta(hours=9))).replace(tzinfo=None)
+                for digest, raw in pending.items():
+                    if digest in existing:
+                        continue
+                    codec, data = _compress(raw)
+                    conn.execute(analysis_blobs.insert().values(
+                        digest=digest, codec=codec, raw_bytes=len(raw), stored_bytes=len(data), data=data,
+                        created_at=now))
+            for analysis_id, inline, new_refs in updates:
+                conn.execute(analysis.update().where(analysis.c.id == analysis_id)
+                             .values(analysis_results=inline, result_sections=new_refs))
+            moved += len(updates)
+    if moved:
+        print(f"📦 분석 결과 {moved}건의 큰 섹션을 analysis_blobs 로 옮겼습니다.")
+    return moved
+
+
+def upgrade(op):
+    op.create_tables(_meta)
+    op.add_column("analysis", result_sections)
+    op.deferred.append(externalize_existing)
@@ -0,0 +1,255 @@
+"""
+샘플 간 변이 검색용 variants 테이블.
+
+    - variants (gene / chrom / pos / ref / alt / vaf / depth / consequence ...)
+    - 인덱스: (gene, protein_change) / (chrom, pos) / (sample_id)
+    - 기존 분석 결과(인라인 + analysis_blobs)의 변이를 색인 (커밋 후 배치 단위)
+    - 테이블 모양과 색인 규칙은 아래에 고정해 두었으므로 app/core/variant_index.py 가 바뀌어도 결과가 같음.
+      chrom 은 처음부터 VARCHAR(64) (예전 정의 VARCHAR(10) 으로 적용한 PostgreSQL DB 는 v0010 이 넓힘)
+"""
+import ast
+import json
+import re
+import zlib
+
+from sqlalchemy import (
+    JSON, Column, Float, ForeignKey, Index, Integer, LargeBinary, MetaData, String, Table, delete, select,
+)
+
+REVISION = "0007"
+DESCRIPTION = "variant index table"
+BATCH_SIZE = 200
+CHROM_MAX_LENGTH = 64
+
+_meta = MetaData()
+Table("samples", _meta, Column("id", Integer, primary_key=True))   # FK 대상 (생성하지 않음)
+variants = Table(
+    "variants", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("sample_id", Integer, ForeignKey("samples.id"), nullable=False),
+    Column("gene", String(40)),
+    Column("chrom", String(CHROM_MAX_LENGTH)),
+    Column("pos", Integer),
+    Column("ref", String),
+    Column("alt", String),
+    Column("vaf", Float),
+    Column("depth", Integer),
+    Column("consequence", String),
+    Column("hgvs_c", String),
+    Column("hgvs_p", String),
+    Column("protein_change", String(40)),
+    Column("transcript", String),
+    Index("ix_variants_gene_protein", "gene", "protein_change"),
+    Index("ix_variants_chrom_pos", "chrom", "pos"),
+    Index("ix_variants_sample", "sample_id"),
+)
+
+_rows_meta = MetaData()
+analysis = Table(
+    "analysis", _rows_meta,
+    Column("id", Integer, primary_key=True),
+    Column("sample_id", Integer),
+    Column("analysis_results", JSON),
+    Column("result_sections", JSON),
+)
+analysis_blobs = Table(
+    "analysis_blobs", _rows_meta,
+    Column("digest", String(64), primary_key=True),
+    Column("codec", String(10)),
+    Column("data", LargeBinary),
+)
+
+SECTION_KEYS = {"small_variants", "variants"}
+FIELD_ALIASES = {
+    "gene": ("Gene", "Gene_Name", "Gene_Symbol", "Symbol"),
+    "chrom": ("Chromosome", "Chr", "CHROM", "Contig"),
+    "pos": ("Genomic_Position", "Position", "POS", "Start_Position", "Start"),
+    "ref": ("Reference_Call", "Reference_Allele", "REF"),
+    "alt": ("Alternative_Call", "Alternate_Allele", "ALT"),
+    "vaf": ("Allele_Frequency", "VAF", "AF"),
+    "depth": ("Depth", "DP", "Read_Depth", "Total_Depth"),
+    "consequence": ("Consequences", "Consequence", "Variant_Type"),
+    "hgvs_c": ("C_Dot_Notation", "HGVSc", "HGVS_c", "cDNA_Change"),
+    "hgvs_p": ("P_Dot_Notation", "HGVSp", "HGVS_p", "Protein_Change"),
+    "transcript": ("Transcript", "Transcript_ID", "Feature", "RefSeq"),
+}
+AA3 = {
+    "Ala": "A", "Arg": "R", "Asn": "N", "Asp": "D", "Cys": "C", "Gln": "Q", "Glu": "E", "Gly": "G",
+    "His": "H", "Ile": "I", "Leu": "L", "Lys": "K", "Met": "M", "Phe": "F", "Pro": "P", "Ser": "S",
+    "Thr": "T", "Trp": "W", "Tyr": "Y", "Val": "V", "Ter": "*", "Sec": "U", "Xaa": "X",
+}
+_AA3_RE = re.compile("|".join(AA3))
+_BLANK = {"", "-", ".", "na", "n/a", "none", "null", "nan"}
+
+
+def _norm(key):
+    return re.sub(r"[\s\-.]+", "_", str(key).strip()).lower()
+
+
+_ALIASES = {column: tuple(_norm(a) for a in aliases) for column, aliases in FIELD_ALIASES.items()}
+
+
+def _as_dict(value):
+    if isinstance(value, str):
+        value = json.loads(value) if value else {}
+    return value if isinstance(value, dict) else {}
+
+
+def _parse(value):
+    if not isinstance(value, str):
+        return value
+    text = value.strip()
+    if not text.startswith(("[", "{")):
+        return value
+    for parser in (json.loads, ast.literal_eval):
+        try:
+            return parser(text)
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            continue
+    return value
+
+
+def _clean(value):
+    if isinstance(value, str):
+        value = value.strip()
+        return None if value.lower() in _BLANK else value
+    return value
+
+
+def _text(value):
+    value = _clean(value)
+    return None if value is None else str(value)
+
+
+def _number(value, cast):
+    value = _clean(value)
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            return cast(value)
+        match = re.search(r"-?\d+(?:\.\d+)?(?:[eE]-?\d+)?", str(value).replace(",", ""))
+        return cast(float(match.group(0))) if match else None
+    except (ValueError, OverflowError):
+        return None
+
+
+def _chrom(value):
+    text = _text(value)
+    if text is None:
+        return None
+    text = re.sub(r"^chr", "", text, flags=re.IGNORECASE)
+    chrom = "chrM" if text.upper() in ("M", "MT") else f"chr{text.upper() if text.isalpha() else text}"
+    return chrom if len(chrom) <= CHROM_MAX_LENGTH else None
+
+
+def _protein_change(hgvs_p):
+    text = str(hgvs_p or "").strip()
+    if text.lower() in _BLANK:
+        return None
+    text = text.split(":", 1)[-1].replace("(", "").replace(")", "")
+    if text.startswith("p."):
+        text = text[2:]
+    return _AA3_RE.sub(lambda m: AA3[m.group(0)], text)[:40] or None
+
+
+def _find_variant_rows(results):
+    if not isinstance(results, dict):
+        return None
+    for key, value in results.items():
+        if _norm(key) not in SECTION_KEYS:
+            continue
+        value = _parse(value)
+        if isinstance(value, dict):
+            nested = _find_variant_rows(value)   # 예전 구조: {"variants": {"Small_Variants": [...], "TMB": ...}}
+            if nested is not None:
+                return nested
+            if value and all(isinstance(v, dict) for v in value.values()):
+                return list(value.values())
+            continue
+        if isinstance(value, list):
+            return [row for row in value if isinstance(row, dict)]
+    return None
+
+
+def _to_row(sample_pk, variant):
+    by_norm = {}
+    for key in variant:
+        by_norm.setdefault(_norm(key), key)
+
+    def pick(column):
+        for alias in _ALIASES[column]:
+            if alias in by_norm:
+                value = _clean(variant[by_norm[alias]])
+                if value is not None:
+                    return value
+        return None
+
+    hgvs_p = _text(pick("hgvs_p"))
+    row = {
+        "sample_id": sample_pk,
+        "gene": (_text(pick("gene")) or "").upper()[:40] or None,
+        "chrom": _chrom(pick("chrom")),
+        "pos": _number(pick("pos"), int),
+        "ref": _text(pick("ref")),
+        "alt": _text(pick("alt")),
+        "vaf": _number(pick("vaf"), float),
+        "depth": _number(pick("depth"), int),
+        "consequence": _text(pick("consequence")),
+        "hgvs_c": _text(pick("hgvs_c")),
+        "hgvs_p": hgvs_p,
+        "protein_change": _protein_change(hgvs_p),
+        "transcript": _text(pick("transcript")),
+    }
+    if row["gene"] is None and (row["chrom"] is None or row["pos"] is None):
+        return None
+    return row
+
+
+def _decompress(codec, data):
+    if codec == "zlib":
+        return zlib.decompress(data)
+    import zstandard   # zstd 로 저장된 blob 이 있을 때만 필요
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+def reindex_all(engine):
+    total, last_id = 0, 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(analysis.c.id, analysis.c.sample_id, analysis.c.analysis_results, analysis.c.result_sections)
+                .where(analysis.c.id > last_id).order_by(analysis.c.id).limit(BATCH_SIZE)).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            refs_by_row = [_as_dict(refs) for *_, refs in rows]
+            digests = list({d for refs in refs_by_row for d in refs.values()})
+            blobs = {}
+            if digests:
+                blobs = {digest: json.loads(_decompress(codec, data)) for digest, codec, data in conn.execute(
+                    select(analysis_blobs.c.digest, analysis_blobs.c.codec, analysis_blobs.c.data)
+                    .where(analysis_blobs.c.digest.in_(digests)))}
+            replaced, inserts = [], []
+            for (_, sample_pk, inline, _), refs in zip(rows, refs_by_row):
+                if not sample_pk:
+                    continue
+                full = {**_as_dict(inline), **{k: blobs[d] for k, d in refs.items() if d in blobs}}
+                found = _find_variant_rows(full)
+                if found is None:
+                    continue
+                replaced.append(sample_pk)
+                inserts.extend(row for row in (_to_row(sample_pk, v) for v in found) if row)
+            if replaced:
+                conn.execute(delete(variants).where(variants.c.sample_id.in_(replaced)))
+            if inserts:
+                conn.execute(variants.insert(), inserts)
+            total += len(inserts)
+    if total:
+        print(f"🧬 기존 분석 결과에서 변이 {total}건을 색인했습니다.")
+    return total
+
+
+def upgrade(op):
+    op.create_tables(_meta, tables=[variants])
+    op.deferred.append(reindex_all)
@@ -0,0 +1,14 @@
+"""
+분석 결과 정규형 저장 — 스키마 / 데이터 변경 없음 (번호만 유지).
+
+    - 처음에는 기존 analysis_results 를 NA / 빈 목록을 지운 정규형으로 다시 썼지만,
+      임상 결과를 되돌릴 수 없게 바꾸므로 뺐습니다. 이미 적용된 DB 와 이력을 맞추려고 revision 만 남깁니다.
+    - 기존 행은 그대로 두고, 화면(check_results / clinical_report)이 읽을 때
+      app/core/result_normalize.clean 으로 한 번에 펼치고 정리합니다.
+"""
+REVISION = "0008"
+DESCRIPTION = "normalized analysis results (no-op)"
+
+
+def upgrade(op):
+    pass
@@ -0,0 +1,15 @@
+"""
+download_tasks.bytes_done / bytes_total 을 BIGINT 로.
+
+    - 2GB 넘는 FASTQ 의 진행률 / 이어받기 기록이 PostgreSQL int4 를 넘치지 않도록
+    - SQLite 의 INTEGER 는 이미 8바이트라 변경 없음. 지금의 v0004 는 처음부터 BIGINT 로 만들므로
+      예전 정의(INTEGER)로 v0004 를 적용한 PostgreSQL DB 에서만 실제로 바뀜
+"""
+REVISION = "0009"
+DESCRIPTION = "download task byte counters bigint"
+
+
+def upgrade(op):
+    if op.dialect.name == "postgresql":
+        op.execute("ALTER TABLE download_tasks ALTER COLUMN bytes_done TYPE BIGINT, "
+                   "ALTER COLUMN bytes_total TYPE BIGINT")
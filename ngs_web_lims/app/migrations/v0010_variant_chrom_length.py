@@ -0,0 +1,15 @@
+"""
+variants.chrom 을 VARCHAR(64) 로.
+
+    - chrUn_KI270742v1 / chr1_KI270706v1_random 같은 contig 이름이 varchar(10) 을 넘어
+      PostgreSQL 에서 샘플 결과 적재 전체가 실패하지 않도록
+    - SQLite 는 길이를 강제하지 않아 변경 없음. 지금의 v0007 은 처음부터 VARCHAR(64) 로 만들므로
+      예전 정의(VARCHAR(10))로 v0007 을 적용한 PostgreSQL DB 에서만 실제로 바뀜
+"""
+REVISION = "0010"
+DESCRIPTION = "variant chrom length"
+
+
+def upgrade(op):
+    if op.dialect.name == "postgresql":
+        op.execute("ALTER TABLE variants ALTER COLUMN chrom TYPE VARCHAR(64)")
@@ -0,0 +1,170 @@
+"""
+기존 분석 결과에 생성 컬럼용 최상위 요약 키 채우기.
+
+    - analysis.analysis_type / msi_status / tmb_score 는 analysis_results 최상위 키를 읽는데,
+      실제 행은 TMB / MSI 를 {"variants": {"TMB": {...}, "MSI": {...}}} 섹션 안(blob 포함)에만 가지고 있어 늘 비어 있었음
+    - 섹션(인라인 + analysis_blobs)에서 tmb_score / msi_status 를, samples.target_panel 에서 analysis_type 을 꺼내
+      최상위 키로 추가 (기존 키 / 값은 건드리지 않음, 커밋 후 배치 단위)
+    - 새로 쓰는 결과는 app/core/result_summary.py 가 같은 규칙으로 채움.
+      이 revision 은 적용 당시 규칙과 테이블 모양을 아래에 고정해 두었으므로 앱 코드가 바뀌어도 결과가 같음
+"""
+import ast
+import json
+import math
+import re
+import zlib
+
+from sqlalchemy import JSON, Column, Integer, LargeBinary, MetaData, String, Table, select
+
+REVISION = "0011"
+DESCRIPTION = "analysis result summary keys"
+BATCH_SIZE = 200
+
+_meta = MetaData()
+analysis = Table(
+    "analysis", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("sample_id", Integer),
+    Column("analysis_results", JSON),
+    Column("result_sections", JSON),
+)
+samples = Table("samples", _meta, Column("id", Integer, primary_key=True), Column("target_panel", String))
+analysis_blobs = Table(
+    "analysis_blobs", _meta,
+    Column("digest", String(64), primary_key=True),
+    Column("codec", String(8)),
+    Column("data", LargeBinary),
+)
+
+MSI_HIGH_PERCENT = 20.0
+_SECTIONS = {"tmb": "tmb", "tumormutationalburden": "tmb", "msi": "msi", "microsatelliteinstability": "msi"}
+_TMB_KEYS = ("totaltmb", "tmb", "tmbscore", "score")
+_MSI_STATUS_KEYS = ("status", "msistatus", "result")
+_MSI_PERCENT_KEYS = ("percentunstablemsisites", "msirate", "rate")
+_EMPTY = {"", "NA", "N/A", "NONE", "NULL"}
+
+
+def _as_dict(value):
+    if isinstance(value, str):
+        value = json.loads(value) if value else {}
+    return value if isinstance(value, dict) else {}
+
+
+def _parse(value):
+    """{ / [ 문자열 → json.loads → ast.literal_eval (문자열 치환 없음), 빈 값 토큰 → None"""
+    if not isinstance(value, str):
+        return value
+    text = value.strip()
+    if text.upper() in _EMPTY:
+        return None
+    if text[:1] in ("{", "["):
+        for parser in (json.loads, ast.literal_eval):
+            try:
+                return parser(text)
+            except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+                continue
+    return text
+
+
+def _norm(key):
+    return re.sub(r"[^a-z0-9]", "", str(key).lower())
+
+
+def _number(value):
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if math.isfinite(value) else None
+    match = re.search(r"-?\d+(?:\.\d+)?", str(value).replace(",", ""))
+    return float(match.group(0)) if match else None
+
+
+def _first(section, keys):
+    values = {_norm(k): _parse(v) for k, v in section.items()}
+    return next((values[k] for k in keys if values.get(k) is not None), None)
+
+
+def _find_sections(results):
+    found, nested = {}, []
+    for key, value in results.items():
+        kind = _SECTIONS.get(_norm(key))
+        if kind:
+            found.setdefault(kind, _parse(value))
+        else:
+            nested.append(value)
+    for value in nested:
+        value = _parse(value)
+        if isinstance(value, dict):
+            for key, inner in value.items():
+                kind = _SECTIONS.get(_norm(key))
+                if kind:
+                    found.setdefault(kind, _parse(inner))
+    return found
+
+
+def _summary(results, panel):
+    sections = _find_sections(results)
+    summary = {}
+    tmb = sections.get("tmb")
+    score = _number(_first(tmb, _TMB_KEYS) if isinstance(tmb, dict) else tmb)
+    if score is not None:
+        summary["tmb_score"] = score
+    msi, status = sections.get("msi"), None
+    if isinstance(msi, dict):
+        status = _first(msi, _MSI_STATUS_KEYS)
+        msi = _first(msi, _MSI_PERCENT_KEYS)
+    percent = _number(msi)
+    if status is not None:
+        summary["msi_status"] = str(status).strip()
+    elif percent is not None:
+        summary["msi_status"] = "MSI-H" if percent >= MSI_HIGH_PERCENT else "MSS"
+    elif isinstance(msi, str) and msi.strip():
+        summary["msi_status"] = msi.strip()
+    if panel and not results.get("analysis_type"):
+        summary["analysis_type"] = str(panel).strip()
+    return summary
+
+
+def _decompress(codec, data):
+    if codec == "zlib":
+        return zlib.decompress(data)
+    import zstandard   # zstd 로 저장된 blob 이 있을 때만 필요
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+def _load_blobs(conn, digests):
+    if not digests:
+        return {}
+    rows = conn.execute(select(analysis_blobs.c.digest, analysis_blobs.c.codec, analysis_blobs.c.data)
+                        .where(analysis_blobs.c.digest.in_(list(digests))))
+    return {digest: json.loads(_decompress(codec, data)) for digest, codec, data in rows}
+
+
+def fill_summary_keys(engine):
+    changed, last_id = 0, 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(analysis.c.id, analysis.c.analysis_results, analysis.c.result_sections, samples.c.target_panel)
+                .select_from(analysis.outerjoin(samples, samples.c.id == analysis.c.sample_id))
+                .where(analysis.c.id > last_id).order_by(analysis.c.id).limit(BATCH_SIZE)).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            refs_by_row = [_as_dict(refs) for _, _, refs, _ in rows]
+            blobs = _load_blobs(conn, {d for refs in refs_by_row for d in refs.values()})
+            for (analysis_id, inline, _, panel), refs in zip(rows, refs_by_row):
+                inline = _as_dict(inline)
+                full = {**inline, **{k: blobs[d] for k, d in refs.items() if d in blobs}}
+                summary = {k: v for k, v in _summary(full, panel).items() if inline.get(k) != v}
+                if summary:
+                    conn.execute(analysis.update().where(analysis.c.id == analysis_id)
+                                 .values(analysis_results={**inline, **summary}))
+                    changed += 1
+    if changed:
+        print(f"🔎 분석 결과 {changed}건에 요약 키(tmb_score / msi_status / analysis_type)를 채웠습니다.")
+    return changed
+
+
+def upgrade(op):
+    op.deferred.append(fill_summary_keys)
@@ -0,0 +1,89 @@
+"""
+요약 섹션을 analysis_results 로 되돌리기.
+
+    - v0006 은 크기(4KB)만 보고 최상위 값을 blob 으로 뺐기 때문에 metrics 같은 요약 섹션도 analysis_blobs 로 갔음
+    - 이제 blob 은 큰 목록 섹션(이름에 variant / fusion / expression 이 들어간 키)만 →
+      그 밖의 키는 blob 을 읽어 analysis_results 에 다시 넣고 result_sections 참조를 뗌 (커밋 후 배치 단위)
+    - blob 행은 지우지 않음 (app/core/result_store.py 와 같이 같은 내용이 오면 재사용)
+    - 적용 당시 규칙과 테이블 모양을 아래에 고정해 두었으므로 앱 코드가 바뀌어도 결과가 같음
+"""
+import json
+import zlib
+
+from sqlalchemy import JSON, Column, Integer, LargeBinary, MetaData, String, Table, select
+
+REVISION = "0012"
+DESCRIPTION = "inline summary result sections"
+BATCH_SIZE = 200
+BULKY_SECTION_WORDS = ("variant", "fusion", "expression")
+
+_meta = MetaData()
+analysis = Table(
+    "analysis", _meta,
+    Column("id", Integer, primary_key=True),
+    Column("analysis_results", JSON),
+    Column("result_sections", JSON),
+)
+analysis_blobs = Table(
+    "analysis_blobs", _meta,
+    Column("digest", String(64), primary_key=True),
+    Column("codec", String(8)),
+    Column("data", LargeBinary),
+)
+
+
+def _as_dict(value):
+    if isinstance(value, str):
+        value = json.loads(value) if value else {}
+    return value if isinstance(value, dict) else {}
+
+
+def _is_bulky(key):
+    name = str(key).lower()
+    return any(word in name for word in BULKY_SECTION_WORDS)
+
+
+def _decompress(codec, data):
+    if codec == "zlib":
+        return zlib.decompress(data)
+    import zstandard   # zstd 로 저장된 blob 이 있을 때만 필요
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+def inline_summary_sections(engine):
+    moved, last_id = 0, 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(analysis.c.id, analysis.c.analysis_results, analysis.c.result_sections)
+                .where(analysis.c.id > last_id).order_by(analysis.c.id).limit(BATCH_SIZE)).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            targets = []
+            for analysis_id, inline, refs in rows:
+                refs = _as_dict(refs)
+                back = {k: d for k, d in refs.items() if not _is_bulky(k)}
+                if back:
+                    targets.append((analysis_id, _as_dict(inline), refs, back))
+            if not targets:
+                continue
+            digests = list({d for *_, back in targets for d in back.values()})
+            blobs = {digest: json.loads(_decompress(codec, data)) for digest, codec, data in conn.execute(
+                select(analysis_blobs.c.digest, analysis_blobs.c.codec, analysis_blobs.c.data)
+                .where(analysis_blobs.c.digest.in_(digests)))}
+            for analysis_id, inline, refs, back in targets:
+                found = {k: d for k, d in back.items() if d in blobs}
+                if not found:
+                    continue
+                conn.execute(analysis.update().where(analysis.c.id == analysis_id).values(
+                    analysis_results={**inline, **{k: blobs[d] for k, d in found.items()}},
+                    result_sections={k: d for k, d in refs.items() if k not in found}))
+                moved += 1
+    if moved:
+        print(f"📦 분석 결과 {moved}건의 요약 섹션을 analysis_results 로 되돌렸습니다.")
+    return moved
+
+
+def upgrade(op):
+    op.deferred.append(inline_summary_sections)
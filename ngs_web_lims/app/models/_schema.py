@@ -1,6 +1,6 @@
 # app/models/schema.py
 
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, DateTime, JSON
+from sqlalchemy import Column, Integer, BigInteger, String, Float, Date, ForeignKey, DateTime, JSON, Computed, Index, LargeBinary
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime, timezone, timedelta
 
@@ -186,7 +186,7 @@ class Order(Base):
     client_name = Column(String)    
     client_email = Column(String)   
     client_phone = Column(String)   
-    reception_date = Column(Date, nullable=False)
+    reception_date = Column(Date, nullable=False, index=True)
     reception_type = Column(String, default="미정") 
     sales_unit_price = Column(Integer, default=0)
     
@@ -226,6 +226,15 @@ class Sample(Base):
     issue_comment = Column(String)
     panel_metadata = Column(JSON, default={}) # TSO500 등 유동적 QC 데이터 자동 저장소
     created_at = Column(DateTime, default=datetime.utcnow)
+
+    # 🔎 자주 조회되는 JSON 키 → 생성 컬럼(읽기 전용, DB가 자동 계산) + 인덱스
+    seq_provider = Column(String, Computed(panel_metadata["seq_provider"].as_string(), persisted=True), index=True)
+
+    __table_args__ = (
+        Index("ix_samples_current_status", "current_status"),
+        Index("ix_samples_panel_status", "target_panel", "current_status"),
+        Index("ix_samples_order_status", "order_pk", "current_status"),
+    )
     
     # 관계 설정 (1:1 매핑)
     order = relationship("Order", back_populates="samples")
@@ -330,6 +339,15 @@ class Analysis(Base):
     # 🚀 [분석별 규격화된 JSON] TSO, WES, WTS 등 분석 타입에 따라 형태가 보장된 JSON 데이터
     # API에서 pydantic을 통해 엄격하게 검증된 값만 이 컬럼에 저장됩니다.
     analysis_results = Column(JSON, default={}) 
+    # 📦 큰 섹션(variants / fusions / expression_profile 등)은 analysis_blobs 로 빼고 {키: digest} 만 보관
+    # (app/core/result_store.py — 읽을 때는 result_store.full_results 로 합쳐서)
+    result_sections = Column(JSON, default={})
+
+    # 🔎 리포트/검색에서 자주 쓰는 결과 키 → 생성 컬럼 + 인덱스
+    # (최상위 키는 적재 시 app/core/result_summary.py 가 TMB / MSI 섹션과 target_panel 에서 채움)
+    analysis_type = Column(String, Computed(analysis_results["analysis_type"].as_string(), persisted=True), index=True)
+    msi_status = Column(String, Computed(analysis_results["msi_status"].as_string(), persisted=True), index=True)
+    tmb_score = Column(Float, Computed(analysis_results["tmb_score"].as_float(), persisted=True), index=True)
     
     sample = relationship("Sample", back_populates="analysis")
 
@@ -344,4 +362,96 @@ class ActionLog(Base):
     previous_state = Column(String)
     new_state = Column(String)
     details = Column(String)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone(timedelta(hours=9))).replace(tzinfo=None))
\ No newline at end of file
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone(timedelta(hours=9))).replace(tzinfo=None))
+
+# ==========================================
+# 7. Raw Data 다운로드 작업 (Download Task)
+# ==========================================
+class DownloadTask(Base):
+    """FASTQ 파일 1개 = 작업 1행. 목적지 경로(dest_path)가 같으면 같은 작업으로 보고 이어받습니다."""
+    __tablename__ = "download_tasks"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    sample_id = Column(String, index=True, nullable=False)    # Sample.sample_id (ACC-...)
+    read = Column(String, nullable=False)                     # R1 / R2
+    url = Column(String, nullable=False)
+    dest_path = Column(String, unique=True, nullable=False)
+    expected_md5 = Column(String)
+    actual_md5 = Column(String)
+    status = Column(String, nullable=False, default="대기", index=True)
+    bytes_done = Column(BigInteger, default=0)                # FASTQ 는 2GB 초과가 흔함 (PostgreSQL int4 넘침)
+    bytes_total = Column(BigInteger)
+    attempts = Column(Integer, default=0)
+    error = Column(String)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone(timedelta(hours=9))).replace(tzinfo=None))
+
+# ==========================================
+# 8. 분석 결과 수신함 (Ingest Outbox)
+# ==========================================
+class IngestEvent(Base):
+    """
+    webhook / API 로 받은 분석 결과 원본 1건 = 1행. 받자마자 여기에 쓰고 202 를 돌려준 뒤
+    백그라운드 워커(app/core/ingest_queue.py)가 묶어서 Analysis 에 반영합니다.
+    idempotency_key 가 같으면 같은 결과로 보고 다시 반영하지 않습니다.
+    """
+    __tablename__ = "ingest_events"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    source = Column(String, nullable=False)                       # result (/api/v1/result) / webhook (/api/analysis/complete)
+    idempotency_key = Column(String, unique=True, nullable=False)  # {source}:{batch_id}:{sample_id}:{pipeline_version}
+    sample_id = Column(String, index=True)
+    payload = Column(JSON, nullable=False)
+    status = Column(String, nullable=False, default="대기", index=True)   # 대기 / 처리 중 / 완료 / 실패(dead letter)
+    attempts = Column(Integer, default=0)
+    error = Column(String)
+    next_attempt_at = Column(DateTime)
+    received_at = Column(DateTime, default=lambda: datetime.now(timezone(timedelta(hours=9))).replace(tzinfo=None))
+    processed_at = Column(DateTime)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone(timedelta(hours=9))).replace(tzinfo=None))
+
+# ==========================================
+# 9. 분석 결과 대용량 섹션 (Content-addressed Blob)
+# ==========================================
+class AnalysisBlob(Base):
+    """
+    analysis_results 에서 빼낸 큰 섹션 1개 = 1행. digest(압축 전 JSON 의 sha256)가 키라
+    같은 내용은 한 번만 저장되고, 한 번 쓴 행은 바뀌지 않습니다.
+    """
+    __tablename__ = "analysis_blobs"
+    digest = Column(String(64), primary_key=True)
+    codec = Column(String(10), nullable=False)        # zstd / zlib
+    raw_bytes = Column(Integer, nullable=False)       # 압축 전 JSON 크기
+    stored_bytes = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone(timedelta(hours=9))).replace(tzinfo=None))
+
+# ==========================================
+# 10. 변이 (Variant) — 샘플 간 검색용 정규화 테이블
+# ==========================================
+class Variant(Base):
+    """
+    분석 결과의 small variant 1개 = 1행. 결과를 적재할 때(app/core/variant_index.py) 샘플 단위로 통째로 교체됩니다.
+    원본은 여전히 analysis_results(또는 analysis_blobs) 에 있고, 이 테이블은 "KRAS G12C 가 나온 샘플" 같은
+    샘플 간 조회를 인덱스로 하기 위한 사본입니다.
+    """
+    __tablename__ = "variants"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    sample_id = Column(Integer, ForeignKey("samples.id"), nullable=False)
+    gene = Column(String(40))
+    chrom = Column(String(64))                 # chr 접두어 붙여 통일 (예: chr12, chrUn_KI270742v1)
+    pos = Column(Integer)
+    ref = Column(String)
+    alt = Column(String)
+    vaf = Column(Float)
+    depth = Column(Integer)
+    consequence = Column(String)
+    hgvs_c = Column(String)
+    hgvs_p = Column(String)
+    protein_change = Column(String(40))        # hgvs_p 한 글자 약어 (예: p.(Gly12Cys) → G12C)
+    transcript = Column(String)
+
+    __table_args__ = (
+        Index("ix_variants_gene_protein", "gene", "protein_change"),   # gene 단독 조회도 이 인덱스로
+        Index("ix_variants_chrom_pos", "chrom", "pos"),
+        Index("ix_variants_sample", "sample_id"),
+    )
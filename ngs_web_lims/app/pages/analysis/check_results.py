@@ -1,51 +1,13 @@
 from dash import html, dcc, Input, Output
 import dash_bootstrap_components as dbc
 import dash_ag_grid as dag
-import json
-import ast
-import re
-from sqlalchemy.orm import joinedload
 from app.core.database import SessionLocal
+from app.core.repository import samples_with_prefix
+from app.core.result_normalize import clean
+from app.core.result_store import full_results
 from app.models._schema import Sample
 from app.pages.base import LimsDashApp
 
-def parse_json_like(value):
-    """
-    DB에 저장된 analysis_results를 안전하게 복구하고 빈 값이나 NA를 재귀적으로 제거합니다.
-    작은따옴표가 포함된 파이썬 dict 형태의 문자열도 완벽하게 파싱합니다.
-    """
-    if isinstance(value, dict):
-        return {k: parse_json_like(v) for k, v in value.items() if parse_json_like(v) is not None and parse_json_like(v) != []}
-
-    if isinstance(value, list):
-        return [parse_json_like(v) for v in value if parse_json_like(v) is not None]
-
-    if isinstance(value, str):
-        s = value.strip()
-        if not s or s.upper() in ["NA", "N/A", "NONE", "NULL"]:
-            return None
-
-        # dict/list처럼 생긴 문자열만 파싱 시도
-        if s.startswith("{") or s.startswith("["):
-            try:
-                # 1. 표준 JSON 파싱 시도
-                return parse_json_like(json.loads(s))
-            except Exception:
-                try:
-                    # 2. Python dict 문자열(작은따옴표, null, nan 등) 파싱 시도
-                    s_safe = s.replace("null", "None").replace("true", "True").replace("false", "False").replace("nan", "None")
-                    return parse_json_like(ast.literal_eval(s_safe))
-                except Exception:
-                    # 3. 정규식으로 따옴표 강제 교체 후 최후의 JSON 파싱 시도
-                    try:
-                        s_json = re.sub(r"'([^']*)'", r'"\1"', s)
-                        return parse_json_like(json.loads(s_json))
-                    except:
-                        return s
-        return s
-
-    return value
-
 def create_analysis_results_layout():
     return html.Div([
         html.H3("🧬 분석 결과 상세 조회", className="fw-bold text-secondary mb-4"),
@@ -93,7 +55,9 @@ def register_analysis_results_callbacks(dash_app):
         db = SessionLocal()
         try:
             # 🚀 DNA/RNA 매칭: 선택한 Base ID로 시작하는 모든 샘플(-DNA, -RNA) 동시 조회
-            samples = db.query(Sample).options(joinedload(Sample.analysis)).filter(Sample.sample_id.like(f"{sample_id}%")).all()
+            samples = samples_with_prefix(db, sample_id, order=False, wet_lab=False, sequencing=False)
+            # 📦 blob 으로 빠진 큰 섹션까지 합친 결과 (세션이 열려 있을 때 읽어 둠)
+            results_by_sample = {s.id: full_results(s.analysis, db=db) for s in samples if s.analysis}
         finally:
             db.close()
         
@@ -104,15 +68,14 @@ def register_analysis_results_callbacks(dash_app):
         
         for s in samples:
             # 데이터가 아예 없는 경우에도 샘플 탭 형태는 유지
-            if not s.analysis or not s.analysis.analysis_results:
+            if not results_by_sample.get(s.id):
                 all_tabs.append(dcc.Tab(label=f"🔬 {s.sample_id}", children=[
                     html.Div("해당 검체(DNA/RNA)의 분석 결과가 비어 있습니다.", className="p-3 text-warning")
                 ]))
                 continue
                 
-            # 1. JSON 데이터 안전하게 파싱 및 정제
-            raw_data = s.analysis.analysis_results
-            data = parse_json_like(raw_data)
+            # 1. 저장된 결과에서 NA / 빈 값 정리 (남아 있는 JSON 문자열도 함께 펼침, 노드마다 한 번)
+            data = clean(results_by_sample[s.id])
             
             if not data:
                 all_tabs.append(dcc.Tab(label=f"🔬 {s.sample_id}", children=[
@@ -121,12 +84,9 @@ def register_analysis_results_callbacks(dash_app):
                 continue
                 
             # 🚀 과거 구조 호환: {"metrics": {...}, "variants": {...}} 형태 평탄화(Flatten)
-            # 파싱이 완료된 딕셔너리 내부를 샅샅이 뒤져 TMB/MSI를 밖으로 꺼냅니다.
+            # 정리된 딕셔너리 내부를 뒤져 TMB/MSI를 밖으로 꺼냅니다.
             flattened_data = {}
             for k, v in data.items():
-                if isinstance(v, str) and (v.strip().startswith("{") or v.strip().startswith("[")):
-                    v = parse_json_like(v)
-                    
                 if k in ["metrics", "variants"] and isinstance(v, dict):
                     for sub_k, sub_v in v.items():
                         flattened_data[sub_k] = sub_v
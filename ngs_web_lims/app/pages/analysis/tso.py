@@ -8,9 +8,6 @@ import base64
 import traceback
 import json
 
-# 🚀 [MODIFIED] SSH 원격 접속을 위한 라이브러리 추가
-import paramiko 
-
 from app.core.database import SessionLocal
 from app.models._schema import Sample, Analysis
 from app.pages.base import LimsDashApp
@@ -20,11 +17,14 @@ from app.pages.analysis.base import create_shared_analysis_layout
 # ==========================================
 # ⚙️ [MODIFIED] 원격 서버 설정 (환경변수 또는 Config 처리 권장)
 # ==========================================
-REMOTE_HOST = "192.168.0.39"
-REMOTE_USER = "gmctso" # 실제 접속 계정으로 변경 필요
-REMOTE_PW = "tso@gmc!!" # 실제 비밀번호 또는 Key 파일 경로로 변경 필요
-REMOTE_BASE_DIR = "/data/ngs/nextseq550dx_output" # 39번 서버의 분석 결과 최상위 경로
-REMOTE_SAVED_RESOURCES_DIR = "/data/tso/test/metadata"
+REMOTE_HOST = os.getenv("LIMS_TSO_HOST", "192.168.0.39")
+REMOTE_PORT = int(os.getenv("LIMS_TSO_PORT", 22))
+REMOTE_USER = os.getenv("LIMS_TSO_USER", "gmctso") # 실제 접속 계정으로 변경 필요
+REMOTE_PW = os.getenv("LIMS_TSO_PASSWORD", "tso@gmc!!") # 실제 비밀번호 또는 Key 파일 경로로 변경 필요
+REMOTE_KEY_FILE = os.getenv("LIMS_TSO_KEY_FILE") or None
+REMOTE_BASE_DIR = os.getenv("LIMS_TSO_BASE_DIR", "/data/ngs/nextseq550dx_output") # 39번 서버의 분석 결과 최상위 경로
+REMOTE_SAVED_RESOURCES_DIR = os.getenv("LIMS_TSO_METADATA_DIR", "/data/tso/test/metadata")
+REMOTE_RESULT_FILE = "RunInfo.xml" # 폴더 검색 / 수집 대상 파일
 
 
 from dash import html, dcc, Input, Output, State, no_update, ctx
@@ -37,14 +37,22 @@ import base64
 import traceback
 import json
 
-# 🚀 [MODIFIED] SSH 원격 접속 및 제어를 위한 라이브러리 추가
-import paramiko 
-
 from app.core.database import SessionLocal
 from app.models._schema import Sample, Analysis
 from app.pages.base import LimsDashApp
 from app.core.config import BASE_DIR
 from app.pages.analysis.base import create_shared_analysis_layout
+from app.core.remote import RemoteError, get_pool
+from app.core.result_normalize import merge_updates
+from app.core.result_store import externalize
+from app.core.result_summary import apply_summary
+from app.core.variant_index import index_variants
+from app.core.repository import samples_by_ids, samples_by_sample_ids, samples_in_stage
+
+
+def remote_pool():
+    """39번 분석 서버 연결 풀 (클릭마다 새로 접속하지 않고 keep-alive 연결 / SFTP 세션 재사용)"""
+    return get_pool(REMOTE_HOST, REMOTE_USER, password=REMOTE_PW, key_filename=REMOTE_KEY_FILE, port=REMOTE_PORT)
 
 
 def get_tso_setup_layout():
@@ -108,7 +116,7 @@ def register_tso_setup_callbacks(dash_app):
         try:
             df_export = pd.DataFrame(columns=headers)
             db = SessionLocal()
-            samples = db.query(Sample).filter(Sample.target_panel == panel, Sample.current_status == "분석 진행").all()
+            samples = samples_in_stage(db, "분석 진행", panel=panel, order=False, wet_lab=False, sequencing=False)
             
             panel_full_name = "TruSight Oncology 500" if panel == "TSO500" else panel
             
@@ -209,7 +217,7 @@ def register_tso_setup_callbacks(dash_app):
         db = SessionLocal()
         try:
             # 분석 상태와 상관없이 분석 진행 스테이지에 있는 것들을 보여주거나 필요 시 조율 가능
-            samples = db.query(Sample).filter(Sample.target_panel == panel, Sample.current_status == "분석 진행").all()
+            samples = samples_in_stage(db, "분석 진행", panel=panel, order=False, wet_lab=False, sequencing=False)
             data = []
             for s in samples:
                 a_status = s.analysis.analysis_status if s.analysis else "대기중"
@@ -265,6 +273,9 @@ def register_tso_setup_callbacks(dash_app):
         ]
 
         try:
+            sample_map = {s.id: s for s in samples_by_ids(
+                db, [row.get("id") for row in selected_rows],
+                order=False, wet_lab=False, sequencing=False)}
             for row in selected_rows:
                 s_id = row["sample_id"]
                 matching_meta = next((item for item in metadata_list if str(item.get("Sample_ID", "")).strip() == s_id), None)
@@ -273,7 +284,7 @@ def register_tso_setup_callbacks(dash_app):
                     fail_msgs.append(f"• [{s_id}] 업로드 파일에 데이터가 없습니다.")
                     continue
                     
-                sample = db.query(Sample).filter(Sample.id == row["id"]).first()
+                sample = sample_map.get(row["id"])
                 if not sample: continue
                 
                 if not sample.analysis:
@@ -285,10 +296,15 @@ def register_tso_setup_callbacks(dash_app):
                 
                 results_json = sample.analysis.analysis_results or {}
                 if isinstance(results_json, str): results_json = {}
-                for excel_header, excel_val in matching_meta.items():
-                    if excel_header == "Sample_ID" or pd.isna(excel_val): continue
-                    results_json[excel_header.strip()] = str(excel_val) if not isinstance(excel_val, (int, float)) else excel_val
+                sections = dict(sample.analysis.result_sections or {})
+                # 🧹 JSON 문자열만 펼쳐서 병합 (값은 원본 그대로, NA 정리는 화면에서)
+                merge_updates(results_json, sections, {
+                    excel_header.strip(): str(excel_val) if not isinstance(excel_val, (int, float)) else excel_val
+                    for excel_header, excel_val in matching_meta.items()
+                    if excel_header != "Sample_ID" and not pd.isna(excel_val)})
+                apply_summary(results_json, sample.target_panel)   # 🔎 생성 컬럼(tmb_score / msi_status)용 최상위 키
                 sample.analysis.analysis_results = results_json
+                sample.analysis.result_sections = sections
             
                 from sqlalchemy.orm.attributes import flag_modified
                 flag_modified(sample.analysis, "analysis_results")
@@ -372,29 +388,12 @@ def register_tso_setup_callbacks(dash_app):
                 df_meta = pd.DataFrame(metadata_rows)
                 raw_meta_str = df_meta.to_csv(index=False)
                 
-                ssh = paramiko.SSHClient()
-                ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                ssh.connect(REMOTE_HOST, username=REMOTE_USER, password=REMOTE_PW)
-                sftp = ssh.open_sftp()
-                
-                try:
-                    # dir_name 설정 (현재 실험 이름과 동일하게)
-                    remote_dir = f"{REMOTE_SAVED_RESOURCES_DIR}/{dir_name}"
-                    
-                    # 1) 원격 디렉토리 생성 (없으면 생성)
-                    try:
-                        sftp.stat(remote_dir)
-                    except IOError:
-                        sftp.mkdir(remote_dir)
-                    
-                    # 2) 파일 전송 (write)
-                    with sftp.open(f"{remote_dir}/{ss_filename}", "w") as f:
-                        f.write(raw_ss_str)
-                    with sftp.open(f"{remote_dir}/{meta_filename}", "w") as f:
-                        f.write(raw_meta_str)
-                finally:
-                    sftp.close()
-                    ssh.close()
+                # dir_name 설정 (현재 실험 이름과 동일하게) → 원격 디렉토리 생성 후 두 파일을 연결 하나로 전송
+                remote_dir = f"{REMOTE_SAVED_RESOURCES_DIR}/{dir_name}"
+                remote_pool().write_files({
+                    f"{remote_dir}/{ss_filename}": raw_ss_str,
+                    f"{remote_dir}/{meta_filename}": raw_meta_str,
+                })
                     
                 ss_payload = dcc.send_string("\ufeff" + raw_ss_str, ss_filename)
                 meta_payload = dcc.send_string("\ufeff" + raw_meta_str, meta_filename)
@@ -426,24 +425,16 @@ def register_tso_setup_callbacks(dash_app):
         triggered_id = ctx.triggered_id
         if not triggered_id: return no_update, no_update
 
-        ssh = paramiko.SSHClient()
-        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        
-        try:
-            ssh.connect(REMOTE_HOST, username=REMOTE_USER, password=REMOTE_PW, timeout=5)
-        except Exception as e:
-            return no_update, dbc.Alert(f"❌ 39번 분석 서버 SSH 접속 실패: {e}", color="danger")
-            
+        pool = remote_pool()
         try:
             # 1️⃣ 원격 서버 폴더 검색 모드
             if triggered_id == "tso-setup-btn-remote-search":
                 # ls 명령어로 RunInfo.xml이 있는 폴더 목록만 가져오기
-                command = f"ls -1 {REMOTE_BASE_DIR}/*/RunInfo.xml 2>/dev/null"
-                stdin, stdout, stderr = ssh.exec_command(command)
-                lines = stdout.readlines()
+                command = f"ls -1 {REMOTE_BASE_DIR}/*/{REMOTE_RESULT_FILE} 2>/dev/null"
+                _, out, _ = pool.run(command)
                 
                 options = []
-                for line in lines:
+                for line in out.splitlines():
                     line = line.strip()
                     if line:
                         # 경로 예: /data/results/TSO500/ACC-260623-01-001-DNA/Results.json -> ACC-260623-01-001-DNA
@@ -462,52 +453,60 @@ def register_tso_setup_callbacks(dash_app):
             elif triggered_id == "tso-setup-btn-remote-sync":
                 if not selected_dirs:
                     return no_update, dbc.Alert("⚠️ 수집할 폴더를 먼저 선택해주세요.", color="warning")
-                    
+
+                # 🚀 선택 폴더 파일을 SFTP 로 한꺼번에 병렬로 읽고 (폴더마다 cat 하지 않음), 샘플도 IN 한 번으로 조회
+                paths = {dir_name: f"{REMOTE_BASE_DIR}/{dir_name}/{REMOTE_RESULT_FILE}" for dir_name in selected_dirs}
+                contents = pool.read_files(paths.values())
+
                 messages = []
+                collected = []   # (Analysis, 합친 결과, blob 참조, 받은 결과) → 변이 색인 / 큰 섹션 blob 은 마지막에 한꺼번에
                 db = SessionLocal()
                 try:
+                    sample_map = {s.sample_id: s for s in samples_by_sample_ids(
+                        db, list(selected_dirs), order=False, wet_lab=False, sequencing=False)}
                     for dir_name in selected_dirs:
-                        target_file = f"{REMOTE_BASE_DIR}/{dir_name}/RunInfo.xml"
+                        raw = contents.get(paths[dir_name])
                         
-                        # cat 명령어로 JSON 읽기
-                        stdin, stdout, stderr = ssh.exec_command(f"cat {target_file}")
-                        exit_status = stdout.channel.recv_exit_status()
-                        
-                        if exit_status == 0:
-                            raw_json = stdout.read().decode('utf-8')
+                        if isinstance(raw, bytes):
                             try:
-                                parsed_metadata = json.loads(raw_json)
+                                parsed_metadata = json.loads(raw.decode('utf-8'))
                                 
                                 # 폴더명과 동일한 sample_id 찾기
-                                sample = db.query(Sample).filter(Sample.sample_id == dir_name).first()
+                                sample = sample_map.get(dir_name)
                                 if sample and sample.analysis:
                                     sample.analysis.analysis_status = "분석 완료"
                                     existing_results = sample.analysis.analysis_results or {}
                                     if isinstance(existing_results, str): existing_results = json.loads(existing_results)
-                                    existing_results.update(parsed_metadata)
-                                    sample.analysis.analysis_results = existing_results
-                                    
-                                    from sqlalchemy.orm.attributes import flag_modified
-                                    flag_modified(sample.analysis, "analysis_results")
+                                    sections = dict(sample.analysis.result_sections or {})
+                                    merge_updates(existing_results, sections, parsed_metadata)   # 🧹 JSON 문자열만 펼쳐서 병합
+                                    apply_summary(existing_results, sample.target_panel)   # 🔎 생성 컬럼용 최상위 키
+                                    collected.append((sample.analysis, existing_results, sections, parsed_metadata))
                                     
                                     messages.append(html.Div(f"✅ [{dir_name}] 메타데이터 수집 및 DB 업데이트 완료", className="text-success small fw-bold"))
                                 else:
                                     messages.append(html.Div(f"⚠️ [{dir_name}] DB에서 해당 샘플을 찾을 수 없습니다. (폴더명과 Sample ID 불일치)", className="text-danger small"))
-                            except json.JSONDecodeError:
+                            except (json.JSONDecodeError, UnicodeDecodeError):
                                 messages.append(html.Div(f"⚠️ [{dir_name}] JSON 파일 파싱 실패", className="text-warning small"))
                         else:
-                            messages.append(html.Div(f"❌ [{dir_name}] Results.json 파일 읽기 실패", className="text-danger small"))
+                            messages.append(html.Div(f"❌ [{dir_name}] Results.json 파일 읽기 실패 ({raw})", className="text-danger small"))
                     
+                    from sqlalchemy.orm.attributes import flag_modified
+                    index_variants(db, {analysis.sample_id: parsed for analysis, _, _, parsed in collected})
+                    split = externalize(db, [(results, sections) for _, results, sections, _ in collected])
+                    for (analysis, _, _, _), (inline, refs) in zip(collected, split):
+                        analysis.analysis_results = inline
+                        analysis.result_sections = refs
+                        flag_modified(analysis, "analysis_results")
                     db.commit()
                     return no_update, dbc.Alert([html.Strong("📡 데이터 수집 결과:")] + messages, color="info")
                 finally:
                     db.close()
-                    
+
+        except RemoteError as e:
+            return no_update, dbc.Alert(f"❌ 39번 분석 서버 연결 실패: {e}", color="danger")
         except Exception as e:
             traceback.print_exc()
             return no_update, dbc.Alert(f"❌ 원격 동기화 중 에러 발생: {e}", color="danger")
-        finally:
-            ssh.close()
 
 def create_tso_setup_app(requests_pathname_prefix: str):
     lims = LimsDashApp(__name__, requests_pathname_prefix)
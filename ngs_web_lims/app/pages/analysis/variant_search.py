@@ -0,0 +1,118 @@
+from dash import html, dcc, Input, Output, State, no_update
+import dash_bootstrap_components as dbc
+import dash_ag_grid as dag
+
+from app.core.database import SessionLocal
+from app.core import variant_index
+from app.pages.base import LimsDashApp
+
+# 🧬 샘플 간 변이 검색: variants 테이블(인덱스)만 조회하므로 analysis_results JSON 은 읽지 않습니다.
+PAGE_LIMIT = 1000
+
+SAMPLE_COLUMNS = [
+    {"headerName": "Sample ID", "field": "sample_id", "width": 230, "pinned": "left",
+     "cellStyle": {"fontWeight": "bold", "backgroundColor": "#f8fafc"}},
+    {"headerName": "Panel", "field": "target_panel", "width": 130},
+    {"headerName": "변이 수", "field": "variants", "width": 110},
+    {"headerName": "최대 VAF", "field": "max_vaf", "width": 120},
+]
+
+VARIANT_COLUMNS = [
+    {"headerName": "Sample ID", "field": "sample_id", "width": 230, "pinned": "left",
+     "cellStyle": {"fontWeight": "bold", "backgroundColor": "#f8fafc"}},
+    {"headerName": "Gene", "field": "gene", "width": 110},
+    {"headerName": "Protein", "field": "protein_change", "width": 130},
+    {"headerName": "Chrom", "field": "chrom", "width": 100},
+    {"headerName": "Pos", "field": "pos", "width": 130},
+    {"headerName": "Ref", "field": "ref", "width": 90},
+    {"headerName": "Alt", "field": "alt", "width": 90},
+    {"headerName": "VAF", "field": "vaf", "width": 100},
+    {"headerName": "Depth", "field": "depth", "width": 100},
+    {"headerName": "Consequence", "field": "consequence", "width": 200},
+    {"headerName": "HGVSc", "field": "hgvs_c", "width": 220},
+    {"headerName": "HGVSp", "field": "hgvs_p", "width": 220},
+]
+
+
+def _field(label, component):
+    return dbc.Col([html.Label(label, className="small fw-bold text-secondary mb-1"), component], md=2)
+
+
+def create_variant_search_layout():
+    return html.Div([
+        html.H3("🧬 변이 검색", className="fw-bold text-secondary mb-4"),
+
+        dbc.Row([
+            _field("Gene", dbc.Input(id="variant-gene", placeholder="예: KRAS", debounce=True)),
+            _field("Protein", dbc.Input(id="variant-protein", placeholder="예: G12C / p.Gly12Cys", debounce=True)),
+            _field("Chrom", dbc.Input(id="variant-chrom", placeholder="예: chr12", debounce=True)),
+            _field("Pos (from)", dbc.Input(id="variant-pos-from", type="number", debounce=True)),
+            _field("Pos (to)", dbc.Input(id="variant-pos-to", type="number", debounce=True)),
+            _field("최소 VAF", dbc.Input(id="variant-min-vaf", type="number", min=0, max=1, step=0.01, debounce=True)),
+        ], className="g-2 mb-3"),
+
+        dbc.Row([
+            dbc.Col(dbc.RadioItems(
+                id="variant-view",
+                options=[{"label": "샘플별", "value": "samples"}, {"label": "변이 행", "value": "variants"}],
+                value="samples", inline=True,
+            ), md="auto"),
+            dbc.Col(dbc.Button("🔍 검색", id="variant-btn-search", color="primary", size="sm"), md="auto"),
+            dbc.Col(html.Div(id="variant-summary", className="small text-muted pt-1")),
+        ], className="align-items-center mb-3"),
+
+        dag.AgGrid(
+            id="variant-grid",
+            columnDefs=SAMPLE_COLUMNS,
+            rowData=[],
+            defaultColDef={"sortable": True, "filter": True, "resizable": True},
+            dashGridOptions={"pagination": True, "paginationPageSize": 100},
+            style={"height": "640px"},
+            className="ag-theme-alpine",
+        ),
+    ], className="pb-5", style={"padding": "20px"})
+
+
+def register_variant_search_callbacks(dash_app):
+
+    @dash_app.callback(
+        [Output("variant-grid", "rowData"),
+         Output("variant-grid", "columnDefs"),
+         Output("variant-summary", "children")],
+        Input("variant-btn-search", "n_clicks"),
+        [State("variant-gene", "value"),
+         State("variant-protein", "value"),
+         State("variant-chrom", "value"),
+         State("variant-pos-from", "value"),
+         State("variant-pos-to", "value"),
+         State("variant-min-vaf", "value"),
+         State("variant-view", "value")],
+        prevent_initial_call=True,
+    )
+    def run_search(_, gene, protein, chrom, pos_from, pos_to, min_vaf, view):
+        if not any((gene, protein, chrom)):
+            return no_update, no_update, "⚠️ Gene / Protein / Chrom 중 하나는 입력해주세요."
+
+        criteria = dict(gene=gene, protein=protein, chrom=chrom, pos_from=pos_from, pos_to=pos_to, min_vaf=min_vaf)
+        db = SessionLocal()
+        try:
+            if view == "variants":
+                rows = variant_index.search(db, limit=PAGE_LIMIT, **criteria)
+                columns = VARIANT_COLUMNS
+            else:
+                rows = variant_index.samples_with(db, limit=PAGE_LIMIT, **criteria)
+                columns = SAMPLE_COLUMNS
+        finally:
+            db.close()
+
+        unit = "개 변이" if view == "variants" else "개 샘플"
+        more = f" (최대 {PAGE_LIMIT}건만 표시)" if len(rows) >= PAGE_LIMIT else ""
+        return rows, columns, f"{len(rows)}{unit}{more}"
+
+
+def create_variant_search_app(requests_pathname_prefix: str):
+    lims = LimsDashApp(__name__, requests_pathname_prefix)
+    lims.set_content(create_variant_search_layout)
+    app = lims.get_app()
+    register_variant_search_callbacks(app)
+    return app
@@ -6,6 +6,8 @@ from datetime import datetime
 from sqlalchemy import desc
 
 from app.core.database import SessionLocal
+from app.core.id_service import format_order_id, format_sample_id, next_order_seq, peek_order_seq
+from app.core.repository import order_summaries
 from app.models._schema import Sample, Order
 from app.pages.base import LimsDashApp
 
@@ -23,12 +25,11 @@ def get_initial_orders():
     db = SessionLocal()
     try:
         # 🚀 접수일(reception_date) 기준 최신순 정렬
-        orders = db.query(Order).order_by(desc(Order.reception_date)).all()
         return [
             {
-                "label": f"📦 {o.order_id} (샘플 {len(o.samples)}건)", 
+                "label": f"📦 {o.order_id} (샘플 {n}건)", 
                 "value": o.order_id
-            } for o in orders if o.order_id
+            } for o, n in order_summaries(db) if o.order_id
         ]
     except Exception:
         return []
@@ -146,11 +147,10 @@ def register_batch_modify_callbacks(dash_app):
             parts = old_order_id.split('-')
             facility_code = parts[1] if len(parts) >= 2 else "00"
 
-            # 해당 날짜의 총 오더 수 기반으로 새 배치 시퀀스 계산
-            total_orders_today = db.query(Order).filter(Order.order_id.like(f"%{new_today_str}%")).count()
-            batch_seq_str = str(total_orders_today + 1).zfill(2)
+            # 미리보기용 seq (실제 발급은 저장 시점에 카운터에서 — 그사이 다른 등록이 있으면 번호가 바뀜)
+            batch_seq = peek_order_seq(db, new_today_str)
 
-            new_order_id = f"GCX-{facility_code}-{new_today_str}-{batch_seq_str}"
+            new_order_id = format_order_id(facility_code, new_today_str, batch_seq)
 
             if db.query(Order).filter(Order.order_id == new_order_id).first():
                 return [], True, "Order 충돌", "danger", dbc.Alert(f"생성될 Order ID({new_order_id})가 이미 존재합니다.", color="danger")
@@ -160,8 +160,7 @@ def register_batch_modify_callbacks(dash_app):
             
             # 🚀 해당 Order 안의 샘플들만 루프 돌며 ID 재할당
             for idx, s in enumerate(old_order.samples):
-                sample_seq = str(idx + 1).zfill(3)
-                new_sample_id = f"ACC-{new_today_str}-{batch_seq_str}-{sample_seq}"
+                new_sample_id = format_sample_id(new_today_str, batch_seq, idx + 1)
                 
                 is_dup = db.query(Sample).filter(Sample.sample_id == new_sample_id).first()
                 status = "✅ 정상"
@@ -218,10 +217,21 @@ def register_batch_modify_callbacks(dash_app):
 
             # 🚀 단일 Order 복제 및 데이터 갱신
             old_order_id = row_data[0]["old_order_id"]
-            new_order_id = row_data[0]["new_order_id"]
+            preview_order_id = row_data[0]["new_order_id"]
             
             old_order = db.query(Order).filter(Order.order_id == old_order_id).first()
             if not old_order: raise ValueError("기존 오더를 찾을 수 없습니다.")
+
+            # 실제 seq 는 지금 카운터에서 발급 → 미리보기 이후 다른 등록이 있었으면 번호만 바꿔 적용
+            new_today_str = date_obj.strftime("%y%m%d")
+            batch_seq = next_order_seq(db, new_today_str)[0]
+            facility_code = preview_order_id.split("-")[1]
+            new_order_id = format_order_id(facility_code, new_today_str, batch_seq)
+            preview_prefix = f"ACC-{new_today_str}-{preview_order_id.rsplit('-', 1)[-1]}-"
+            new_prefix = f"ACC-{new_today_str}-{batch_seq:02d}-"
+            for row in row_data:
+                if row["new_sample_id"].startswith(preview_prefix):
+                    row["new_sample_id"] = new_prefix + row["new_sample_id"][len(preview_prefix):]
             
             new_order = Order(
                 order_id=new_order_id,
@@ -277,10 +287,9 @@ def register_batch_modify_callbacks(dash_app):
             db.commit()
 
             # 저장 완료 후 최신 오더 목록 다시 로드
-            new_orders = db.query(Order).order_by(desc(Order.reception_date)).all()
             new_options = [
-                {"label": f"📦 {o.order_id} (샘플 {len(o.samples)}건)", "value": o.order_id} 
-                for o in new_orders if o.order_id
+                {"label": f"📦 {o.order_id} (샘플 {n}건)", "value": o.order_id} 
+                for o, n in order_summaries(db) if o.order_id
             ]
 
             return (
@@ -1,34 +1,28 @@
-import os
-import yaml
-import subprocess
-import datetime
 from dash import html, dcc, Input, Output, State, no_update, ctx
 import dash_bootstrap_components as dbc
 import dash_ag_grid as dag
 from dash_iconify import DashIconify
 import traceback
 
+from app.core.config import get_registry_config
 from app.core.database import SessionLocal
+from app.core.downloads import enqueue, get_manager, log_event
+from app.core.fastq_verify import start_verification
+from app.core.repository import samples_in_stage, samples_by_sample_ids
 from app.models._schema import Sample
 from app.pages.base import LimsDashApp
 
+# 다운로드 콘솔: SSE 로그 스트림 주소 (app/api/download_api.py) / 화면에 남길 최대 줄 수
+LOG_STREAM_URL = "/api/v1/downloads/log/stream"
+CONSOLE_MAX_LINES = 300
+
 def load_registry_config():
-    config_path = os.path.join(os.getcwd(), "app", "config", "config.yaml")
-    try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
-            return config.get("data_registry", {})
-    except Exception as e:
-        print(f"⚠️ Config 로드 실패 (기본값 사용): {e}")
-        return {
-            "default_base_path": "/storage/data/raw_data",
-            "seq_providers": ["Macrogen", "Theragen", "Novogene"],
-            "default_project": "Default_Project"
-        }
+    """config.yaml 의 data_registry 섹션 (app.core.config 가 캐시 + 변경 시 자동 리로드)"""
+    return get_registry_config()
 
 def create_data_registry_layout():
     reg_config = load_registry_config()
-    providers = reg_config.get("seq_providers", ["Unknown"])
+    providers = list(reg_config.get("seq_providers", ["Unknown"]))
 
     return html.Div([
         html.H3("🗄️ Raw Data 등록 및 다운로드 관리", className="fw-bold text-secondary mb-4"),
@@ -44,6 +38,8 @@ def create_data_registry_layout():
                         # 🚀 다운로드 실행 버튼 추가!
                         dbc.Button([DashIconify(icon="carbon:cloud-download", className="me-2"), "⬇️ 선택 샘플 데이터 다운로드"], 
                                    id="btn-run-download", color="warning", className="fw-bold me-2 shadow-sm"),
+                        dbc.Button([DashIconify(icon="carbon:data-check", className="me-2"), "🔍 MD5 검증"], 
+                                   id="btn-verify-md5", color="secondary", className="fw-bold me-2 shadow-sm"),
                         dbc.Button([DashIconify(icon="carbon:folder-details", className="me-2"), "📂 기본 경로 자동 생성"], 
                                    id="btn-auto-map-fastq", color="info", className="fw-bold text-white me-2 shadow-sm"),
                         dbc.Button([DashIconify(icon="carbon:save", className="me-2"), "💾 분석 이관 저장"], 
@@ -52,7 +48,9 @@ def create_data_registry_layout():
                 ], className="d-flex justify-content-between align-items-center")
             ),
             dbc.CardBody([
-                html.P("URL 링크가 입력된 샘플을 선택하고 '데이터 다운로드'를 누르면 백그라운드에서 Wget 스크립트가 실행됩니다.", className="text-muted mb-3"),
+                html.P("URL 링크가 입력된 샘플을 선택하고 '데이터 다운로드'를 누르면 백그라운드에서 여러 파일을 동시에 받습니다. "
+                       "링크 칸에 URL 을 두 개 넣으면 R1 / R2 로 받고, MD5 가 있으면 받으면서 검증합니다. 끊긴 파일은 다시 누르면 이어받습니다. "
+                       "'MD5 검증'은 저장된 R1 / R2 로컬 파일을 다시 읽어 기록된 MD5 와 비교합니다 (지난 검증 뒤 바뀌지 않은 파일은 건너뜀).", className="text-muted mb-3"),
                 
                 dbc.Tabs(
                     id="panel-tabs",
@@ -109,12 +107,12 @@ def create_data_registry_layout():
         # 2. 다운로드 진행 상태 콘솔 모니터 (신규 추가!)
         # ---------------------------------------------------------
         dbc.Card([
-            dbc.CardHeader(html.H5("🖥️ Wget 다운로드 실시간 로그 (Console Output)", className="fw-bold mb-0 text-white"), className="bg-dark"),
+            dbc.CardHeader(html.H5("🖥️ 다운로드 진행 상황 (파일별)", className="fw-bold mb-0 text-white"), className="bg-dark"),
             dbc.CardBody([
-                html.Pre(id="download-console-log", children="대기 중...\n[선택 샘플 다운로드 실행]을 클릭하면 로그 스트리밍이 시작됩니다.", 
+                html.Pre(id="download-console-log", children="대기 중...\n[선택 샘플 데이터 다운로드]를 클릭하면 파일별 진행 상황이 표시됩니다.", 
                          style={"backgroundColor": "#1e1e1e", "color": "#00ff00", "padding": "15px", "borderRadius": "8px", "minHeight": "250px", "maxHeight": "350px", "overflowY": "auto", "fontFamily": "monospace"}),
-                # 🚀 핵심: 2초마다 로그 파일을 읽어오는 백그라운드 타이머
-                dcc.Interval(id="download-log-interval", interval=2000, n_intervals=0, disabled=True) 
+                # 🚀 핵심: 주기 폴링 대신 SSE(/api/v1/downloads/log/stream)로 새 로그 줄만 push 받음
+                html.Div(id="download-log-js", style={"display": "none"})
             ], className="bg-dark")
         ], className="border-0 shadow-sm rounded-4")
         
@@ -134,10 +132,12 @@ def register_registry_callbacks(dash_app):
         default_proj = reg_config.get("default_project", "Default_Project")
         try:
             target_statuses = ["시퀀싱 완료", "해독 완료", "분석 대기", "분석 진행"]
-            all_samples = db.query(Sample).filter(Sample.current_status.in_(target_statuses)).all()
+            # 이 화면은 panel_metadata 만 읽으므로 관계 테이블은 붙이지 않음
+            no_graph = {"order": False, "wet_lab": False, "sequencing": False, "analysis": False}
+            panel = active_tab if active_tab not in ["ALL", "ETC"] else None
+            all_samples = samples_in_stage(db, target_statuses, panel=panel, **no_graph)
             
             if active_tab == "ETC": filtered_samples = [s for s in all_samples if s.target_panel not in ["WES", "WGS", "WTS"]]
-            elif active_tab != "ALL": filtered_samples = [s for s in all_samples if s.target_panel == active_tab]
             else: filtered_samples = all_samples
             
             data = []
@@ -181,82 +181,83 @@ def register_registry_callbacks(dash_app):
             updated_data.append(row)
         return updated_data
 
-    # 🚀 3. 데이터 다운로드 Bash 스크립트 생성 및 백그라운드 실행
+    # 🚀 3. 선택 샘플 다운로드 작업 등록 → 워커 풀에서 병렬로 받기 (app/core/downloads.py)
     @dash_app.callback(
-        [Output("registry-save-msg", "children", allow_duplicate=True),
-         Output("download-log-interval", "disabled")], # 스크립트 시작 시 타이머 활성화
+        Output("registry-save-msg", "children", allow_duplicate=True),
         Input("btn-run-download", "n_clicks"),
         State("registry-ag-grid", "selectedRows"),
         prevent_initial_call=True
     )
-    def start_wget_downloads(n_clicks, selected_rows):
+    def start_downloads(n_clicks, selected_rows):
         if not selected_rows: 
-            return dbc.Alert("⚠️ 다운로드할 검체를 체크박스로 선택해주세요.", color="warning"), True
+            return dbc.Alert("⚠️ 다운로드할 검체를 체크박스로 선택해주세요.", color="warning")
         
-        valid_rows = [r for r in selected_rows if r.get("sample_id") and r.get("download_link")]
+        valid_rows = [r for r in selected_rows if r.get("sample_id") and str(r.get("download_link") or "").strip()]
         if not valid_rows:
-            return dbc.Alert("⚠️ 선택된 샘플 중 '다운로드 링크(URL)'가 입력된 데이터가 없습니다.", color="danger"), True
-
-        # 스크립트 및 로그 파일 경로 정의
-        script_path = os.path.join(os.getcwd(), "run_wget_download.sh")
-        log_path = os.path.join(os.getcwd(), "download_log.txt")
+            return dbc.Alert("⚠️ 선택된 샘플 중 '다운로드 링크(URL)'가 입력된 데이터가 없습니다.", color="danger")
 
+        db = SessionLocal()
         try:
-            # 1️⃣ Bash 스크립트(.sh) 파일 작성
-            with open(script_path, "w", encoding="utf-8") as f:
-                f.write("#!/bin/bash\n\n")
-                f.write(f"echo '=================================================='\n")
-                f.write(f"echo '🚀 LIMS Wget Download Job Started: $(date)'\n")
-                f.write(f"echo '=================================================='\n\n")
-                
-                for row in valid_rows:
-                    sid = row["sample_id"]
-                    link = row["download_link"].strip()
-                    r1_path = row.get("fastq_r1", f"./{sid}_R1.fastq.gz")
-                    
-                    target_dir = os.path.dirname(r1_path)
-                    f.write(f"echo '[{sid}] 경로 준비: {target_dir}'\n")
-                    f.write(f"mkdir -p '{target_dir}'\n")
-                    
-                    # wget 명령어 (이어받기 -c, 진행상황 로그 덤프)
-                    f.write(f"echo '▶ Downloading {sid} data...'\n")
-                    f.write(f"wget -c '{link}' -O '{r1_path}' 2>&1 | stdbuf -o0 awk '/[.] +[0-9]+%/ {{print $0}} ORS=\"\"' | awk '{{print $0; fflush();}}'\n")
-                    f.write(f"echo '✅ [{sid}] Download Completed.'\n\n")
-                
-                f.write(f"echo '=================================================='\n")
-                f.write(f"echo '🎉 All Download Jobs Finished: $(date)'\n")
-                f.write(f"echo '=================================================='\n")
-
-            os.chmod(script_path, 0o755)
-
-            # 2️⃣ 백그라운드로 서브프로세스 실행 (UI 멈춤 방지!)
-            with open(log_path, "w") as log_f:
-                subprocess.Popen(["bash", script_path], stdout=log_f, stderr=subprocess.STDOUT)
-
-            return dbc.Alert("🚀 백그라운드 다운로드 스크립트가 성공적으로 시작되었습니다. 하단 콘솔에서 진행 상황을 확인하세요.", color="info"), False # False = interval 타이머 켜기
-
+            summary = enqueue(db, valid_rows)
+            db.commit()
         except Exception as e:
-            return dbc.Alert(f"🚨 스크립트 실행 오류: {e}", color="danger"), True
+            db.rollback()
+            return dbc.Alert(f"🚨 다운로드 작업 등록 오류: {e}", color="danger")
+        finally:
+            db.close()
+
+        skipped = []
+        if summary["done"]: skipped.append(f"이미 받은 파일 {summary['done']}개")
+        if summary["running"]: skipped.append(f"진행 중인 파일 {summary['running']}개")
+        if not summary["queued"]:
+            return dbc.Alert(f"✅ 새로 받을 파일이 없습니다 ({', '.join(skipped)}).", color="success")
+        skipped_msg = f" ({', '.join(skipped)} 제외)" if skipped else ""
+        log_event(f"🚀 파일 {len(summary['queued'])}개 다운로드 등록{skipped_msg} (워커 {get_manager().workers}개)")
+        get_manager().submit(summary["queued"])
+        return dbc.Alert(f"🚀 파일 {len(summary['queued'])}개 다운로드를 시작했습니다{skipped_msg}. 하단 콘솔에서 진행 상황을 확인하세요.",
+                         color="info")
 
 
-    # 🚀 4. 실시간 로그 읽기 (Interval Polling)
+    # 🔍 MD5 검증: 저장된 경로 기준으로 백그라운드 검증, 결과는 콘솔 로그 + panel_metadata["fastq_check"]
     @dash_app.callback(
-        Output("download-console-log", "children"),
-        Input("download-log-interval", "n_intervals"),
+        Output("registry-save-msg", "children", allow_duplicate=True),
+        Input("btn-verify-md5", "n_clicks"),
+        State("registry-ag-grid", "selectedRows"),
         prevent_initial_call=True
     )
-    def update_console_log(n):
-        log_path = os.path.join(os.getcwd(), "download_log.txt")
-        if os.path.exists(log_path):
-            try:
-                with open(log_path, "r", encoding="utf-8") as f:
-                    # 브라우저 과부하를 막기 위해 마지막 50줄만 가져와서 출력
-                    lines = f.readlines()
-                    if not lines: return "로그를 기다리는 중..."
-                    return "".join(lines[-50:])
-            except Exception:
-                return "로그 파일을 읽는 중 일시적인 오류..."
-        return "진행 중인 작업 또는 로그 파일이 없습니다."
+    def verify_md5(n_clicks, selected_rows):
+        sample_ids = [r["sample_id"] for r in selected_rows or [] if r.get("sample_id")]
+        if not sample_ids:
+            return dbc.Alert("⚠️ 검증할 검체를 체크박스로 선택해주세요.", color="warning")
+        if not start_verification(SessionLocal, sample_ids):
+            return dbc.Alert("⏳ 이미 MD5 검증이 진행 중입니다. 하단 콘솔에서 진행 상황을 확인하세요.", color="warning")
+        return dbc.Alert(f"🔍 샘플 {len(sample_ids)}개의 FASTQ MD5 검증을 시작했습니다. 저장된 경로 기준이며 결과는 하단 콘솔에 표시됩니다.",
+                         color="info")
+
+
+    # 🚀 4. 진행 로그: 페이지가 열리면 EventSource 하나를 열어 새 줄만 받아 붙임 (서버 폴링 / 파일 전체 읽기 없음)
+    dash_app.clientside_callback(
+        """
+        function(_) {
+            if (window.limsDownloadLog || !window.EventSource) { return ""; }
+            var pre = document.getElementById('download-console-log');
+            if (!pre) { return ""; }
+            var lines = [], started = false;
+            var source = new EventSource('%s');
+            source.onmessage = function(e) {
+                if (!started) { lines = []; started = true; }
+                lines = lines.concat(e.data.split('\\n'));
+                if (lines.length > %d) { lines = lines.slice(-%d); }
+                pre.textContent = lines.join('\\n');
+                pre.scrollTop = pre.scrollHeight;
+            };
+            window.limsDownloadLog = source;
+            return "";
+        }
+        """ % (LOG_STREAM_URL, CONSOLE_MAX_LINES, CONSOLE_MAX_LINES),
+        Output("download-log-js", "children"),
+        Input("download-console-log", "id")
+    )
 
 
     # 5. DB 저장 및 이관
@@ -280,8 +281,11 @@ def register_registry_callbacks(dash_app):
         db = SessionLocal()
         try:
             success_cnt = 0
+            sample_map = {s.sample_id: s for s in samples_by_sample_ids(
+                db, [d["sample_id"] for d in target_data],
+                order=False, wet_lab=False, sequencing=False, analysis=False)}
             for data in target_data:
-                sample = db.query(Sample).filter(Sample.sample_id == data["sample_id"]).first()
+                sample = sample_map.get(data["sample_id"])
                 if sample:
                     meta = sample.panel_metadata or {}
                     for k in ["seq_provider", "download_link", "fastq_r1", "md5_r1", "fastq_r2", "md5_r2"]:
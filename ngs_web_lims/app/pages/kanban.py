@@ -1,4 +1,4 @@
-from dash import html, dcc, Input, Output, State, ALL, ctx, no_update
+from dash import html, dcc, Input, Output, State, ALL, ctx, no_update, Patch
 import dash_bootstrap_components as dbc
 import dash_ag_grid as dag
 import pandas as pd
@@ -6,14 +6,25 @@ import base64
 import io
 import json
 import traceback
-import re
+import difflib
+import hashlib
+import sys
+import threading
+import uuid
 from datetime import datetime
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 
 import os
 from pathlib import Path
 from app.core.database import SessionLocal
-from app.models._schema import Order, Sample, Analysis, ActionLog, STAGE_SCHEMA_CONFIG, ANALYSIS_SCHEMA_CONFIG
+from app.core.id_service import allocate_retest_ids
+from app.core.excel_merge import REPORT_LIMIT, merge_excel_rows
+from app.core.repository import order_status_counts, order_with_samples, samples_by_ids
+from app.core.transitions import (
+    HOLD_STATUS, RETEST_STATUS, STAGES, STATUS_IDX,
+    add_action_logs, apply_status_changes, gate_messages, is_backward, move_order_stage, sample_values,
+)
+from app.models._schema import Order, Sample, Analysis, STAGE_SCHEMA_CONFIG, ANALYSIS_SCHEMA_CONFIG
 from app.pages.base import LimsDashApp
 from app.core.rules import LimsRules
 from app.ui.shared_ui import create_project_summary_card
@@ -27,8 +38,8 @@ from dash_iconify import DashIconify
 # ============================================================
 # 상수 정의
 # ============================================================
-STAGES = ["접수 대기", "접수 완료", "QC 진행", "시퀀싱 진행", "분석 진행", "정산 대기"]
-STATUS_IDX = {s: i for i, s in enumerate(STAGES)}
+# 단계 목록 / 순서는 상태 전환 서비스(app/core/transitions.py)와 공유
+HOLD_STATUSES = [HOLD_STATUS, RETEST_STATUS]
 
 STATUS_THEME = {
     "접수 대기":   {"border": "border-secondary", "text": "text-secondary"},
@@ -67,6 +78,58 @@ def _write_field(s: Sample, col_id: str, val, new_meta: dict) -> bool:
         return False
 
 
+def _overwrite_report(report):
+    """엑셀 덮어쓰기 병합 리포트 → 모달 툴바 아래 알림"""
+    if report["error"]:
+        return dbc.Alert(f"❌ {report['error']}", color="danger", className="py-2 mb-3 small")
+
+    def sample(items):
+        items = [str(x) for x in items]
+        more = f" 외 {len(items) - REPORT_LIMIT}건" if len(items) > REPORT_LIMIT else ""
+        return ", ".join(items[:REPORT_LIMIT]) + more
+
+    lines = [html.Div(f"✅ {report['key']} 기준 {report['matched']}건 매칭 · {report['changed_cells']}개 셀 변경")]
+    if report["unmatched"]:
+        lines.append(html.Div(f"❓ 모달에 없는 샘플 {len(report['unmatched'])}건 (무시): {sample(report['unmatched'])}"))
+    if report["duplicates"]:
+        lines.append(html.Div(f"⚠️ 엑셀 중복 {len(report['duplicates'])}건 (첫 행만 반영): {sample(report['duplicates'])}"))
+    if report["ambiguous"]:
+        lines.append(html.Div(f"⚠️ 같은 샘플명 여러 행에 동일 적용: {sample(report['ambiguous'])}"))
+    if report["invalid"]:
+        lines.append(html.Div(f"🚫 형식 오류 {len(report['invalid'])}건 (기존 값 유지): "
+                              + sample(f"{k}/{name}={value}" for k, name, value in report["invalid"])))
+    conflicts = report["unmatched"] or report["duplicates"] or report["ambiguous"] or report["invalid"]
+    return dbc.Alert(lines, color="warning" if conflicts else "success", dismissable=True,
+                     className="py-2 mb-3 small")
+
+
+# 재실험 파생 샘플에 복사할 보조 필드 (모델에 있는 것만 복사)
+RETEST_COPY_FIELDS = [
+    "sample_name", "cancer_type", "specimen", "project_name",
+    "pairing_info", "outside_id_1", "outside_id_2",
+    "panel_metadata", "sample_received", "receiver_name",
+]
+
+
+def _derive_retest_sample(s: Sample, new_s_id: str, stage: str) -> Sample:
+    """원본 샘플 s 에서 '접수 대기' 상태의 재실험 샘플(new_s_id)을 만든다"""
+    new_s = Sample(
+        order_pk=s.order_pk,
+        order_id=s.order_id,
+        sample_id=new_s_id,
+        target_panel=s.target_panel,
+        current_status="접수 대기",
+    )
+    for field in RETEST_COPY_FIELDS:
+        if hasattr(Sample, field) and hasattr(s, field):
+            value = getattr(s, field)
+            if field == "panel_metadata" and isinstance(value, dict):
+                value = dict(value)
+            setattr(new_s, field, value)
+    new_s.issue_comment = f"[{stage} 단계에서 재실험 요청됨 (원본: {s.sample_id})]"
+    return new_s
+
+
 # ============================================================
 # [1] 레이아웃
 # ============================================================
@@ -131,6 +194,8 @@ def create_kanban_layout():
         dcc.Store(id="current-modal-order-id"),
         dcc.Store(id="current-modal-stage"),
         dcc.Store(id="kanban-update-trigger", data=0),
+        # 보드 상태 토큰 + 컬럼 digest (바뀐 컬럼 / 카드만 다시 그리기 위함)
+        dcc.Store(id="kanban-board-state", data=None),
         dcc.Store(id="drag-drop-store", data=None),
         # cellValueChanged echo-back → 저장 시점 rowData 동기화 보장
         dcc.Store(id="modal-rowdata-synced", data=[]),
@@ -191,6 +256,8 @@ def create_kanban_layout():
                     ], className="d-flex align-items-center")
                 ], className="d-flex justify-content-between align-items-center p-3 mb-3 rounded-4 border",
                    style={"backgroundColor": "#f8fafc", "borderColor": "#e2e8f0"}),
+                # 엑셀 덮어쓰기 병합 리포트 (매칭 / 중복 / 형식 오류)
+                html.Div(id="overwrite-report"),
 
                 dag.AgGrid(
                     id="modal-datatable", rowData=[], columnDefs=[],
@@ -235,15 +302,63 @@ def create_kanban_layout():
 # ============================================================
 # [2] 카드 생성
 # ============================================================
-def _sample_status_bar(samples_in_order):
-    """Order 안의 샘플들을 상태별로 집계해 미니 배지 바를 반환."""
-    counts = defaultdict(int)
-    for s in samples_in_order:
-        counts[s.current_status] += 1
-
+def build_board_columns(count_rows):
+    """
+    order_status_counts() 집계 행 → 6개 컬럼의 카드 요약(dict) 목록.
+    카드 하나 = (Order, 단계). 카드에 그려지는 값은 모두 이 dict 에 들어 있으므로
+    dict 가 같으면 카드 모양도 같습니다 (fingerprint 비교의 근거).
+    키 순서가 항상 같으므로 card_fingerprint 는 값 튜플만 해시합니다.
+    """
+    per_order = {}
+    # Row 속성 접근보다 튜플 언패킹이 훨씬 빠르다 (수만 행)
+    for order_pk, order_id, facility, team, client, received, status, n, n_issue in count_rows:
+        entry = per_order.get(order_pk)
+        if entry is None:
+            entry = per_order[order_pk] = ((order_id, facility, team, client, str(received)), {}, {})
+        entry[1][status] = n
+        entry[2][status] = n_issue or 0
+
+    columns = [[] for _ in STAGES]
+    for (order_id, facility, team, client, received), counts, issues in per_order.values():
+        # 한 order의 샘플들이 여러 단계에 있거나 보류/재실험 샘플이 있으면 분리 상태로 표시
+        is_split = len(counts) > 1 or any(st in HOLD_STATUSES for st in counts)
+        status_counts = dict(sorted(counts.items())) if is_split else None
+        by_stage = {}
+        for status, n in counts.items():
+            stage = status if status in STATUS_IDX else "접수 대기"
+            n_total, n_issue = by_stage.get(stage, (0, 0))
+            by_stage[stage] = (n_total + n, n_issue + issues[status])
+
+        for stage, (n, n_issue) in by_stage.items():
+            columns[STATUS_IDX[stage]].append({
+                "order_id": order_id,
+                "facility": facility,
+                "client_team": team,
+                "client_name": client,
+                "reception_date": received,
+                "status": stage,
+                "count": n,
+                "has_issue": n_issue > 0,
+                "is_split": is_split,
+                "status_counts": status_counts,
+            })
+    return columns
+
+
+def card_key(card):
+    return f"{card['order_id']}___{card['status']}"
+
+
+def card_fingerprint(card):
+    """카드 내용 해시 8바이트 (워커 프로세스가 달라도 같은 값이 나오도록 hash() 대신 blake2b)"""
+    return hashlib.blake2b(repr(tuple(card.values())).encode("utf-8"), digest_size=8).digest()
+
+
+def _sample_status_bar(status_counts):
+    """Order 안의 샘플 상태별 건수로 미니 배지 바를 반환."""
     badges = []
     for stage in STAGES:
-        n = counts.get(stage, 0)
+        n = status_counts.get(stage, 0)
         if n:
             theme = STATUS_THEME.get(stage, {})
             badges.append(
@@ -254,8 +369,8 @@ def _sample_status_bar(samples_in_order):
                 )
             )
 
-    held = counts.get("보류/실패", 0)
-    retest = counts.get("재실험", 0)
+    held = status_counts.get("보류/실패", 0)
+    retest = status_counts.get("재실험", 0)
     if held:
         badges.append(html.Span(f"보류 {held}", className="badge bg-danger me-1", style={"fontSize": "0.68rem"}))
     if retest:
@@ -266,51 +381,47 @@ def _sample_status_bar(samples_in_order):
     return html.Div(badges, className="mb-2")
 
 
-def make_order_card(order_obj, status, samples_in_status, all_samples_in_order=None, is_split=False):
-    group_id = f"{order_obj.order_id}___{status}"
+def make_order_card(card):
+    status = card["status"]
+    group_id = card_key(card)
     theme = STATUS_THEME.get(status,
                              {"border": "border-secondary", "text": "text-secondary"})
-    all_samples_in_order = all_samples_in_order or samples_in_status
-    has_issue = any(
-        s.issue_comment and str(s.issue_comment).strip() not in ["", "None", "nan"]
-        for s in samples_in_status
-    )
     return html.Div([
         dbc.Card([
             dbc.CardBody([
                 # GCX 코드
                 html.Div(
-                    order_obj.order_id,
+                    card["order_id"],
                     className=f"fw-bold {theme['text']} mb-1",
                     style={"fontSize": "0.92rem", "wordBreak": "break-all",
                            "lineHeight": "1.3"}
                 ),
                 # 기관·담당자
                 html.Div(
-                    f"{order_obj.facility}-{order_obj.client_team}: {order_obj.client_name or '-'}",
+                    f"{card['facility']}-{card['client_team']}: {card['client_name'] or '-'}",
                     className="text-muted mb-1",
                     style={"fontSize": "0.78rem"}
                 ),
                 # 접수일
                 html.Div(
-                    f"접수일: {order_obj.reception_date}",
+                    f"접수일: {card['reception_date']}",
                     className="text-muted mb-2",
                     style={"fontSize": "0.78rem"}
                 ),
                 # 건수 + 이슈/분리 배지
                 html.Div([
-                    html.Span(f"{len(samples_in_status)}건",
+                    html.Span(f"{card['count']}건",
                               className="badge bg-secondary me-1"),
-                    html.Span("⚠️ 이슈", className="badge bg-danger me-1") if has_issue else None,
-                    html.Span("🔀 분리됨", className="badge bg-warning text-dark") if is_split else None,
+                    html.Span("⚠️ 이슈", className="badge bg-danger me-1") if card["has_issue"] else None,
+                    html.Span("🔀 분리됨", className="badge bg-warning text-dark") if card["is_split"] else None,
                 ], className="mb-2"),
 
                 # Order 안에서 샘플들이 흩어진 현황
-                _sample_status_bar(all_samples_in_order) if is_split else None,
+                _sample_status_bar(card["status_counts"]) if card["is_split"] else None,
 
                 dbc.Button("상세 / 개별 샘플 분리",
                            id={"type": "btn-open-modal",
-                               "order_id": order_obj.order_id, "stage": status},
+                               "order_id": card["order_id"], "stage": status},
                            color="light", size="sm",
                            className="w-100 fw-bold border text-secondary",
                            style={"fontSize": "0.8rem"})
@@ -320,78 +431,126 @@ def make_order_card(order_obj, status, samples_in_status, all_samples_in_order=N
        style={"cursor": "grab"}, className="mb-2")
 
 
+def _empty_column():
+    return [html.Div("빈 단계", className="text-center text-muted small mt-5")]
+
+
+def column_state(cards):
+    """컬럼 하나의 (카드 key 튜플, fingerprint 를 이어 붙인 bytes) ─ 메모리를 적게 쓰는 비교용 형태"""
+    keys = tuple(sys.intern(card_key(c)) for c in cards)
+    return keys, b"".join(card_fingerprint(c) for c in cards)
+
+
+def column_digest(state):
+    return hashlib.blake2b(state[1], digest_size=8).hexdigest()
+
+
+def diff_column(prev, new, cards):
+    """
+    이전 / 현재 column_state 를 비교해 컬럼 children 갱신값을 만든다.
+        - 일부 카드만 바뀌었으면 Patch (해당 카드만 교체 / 삽입 / 삭제)
+        - 처음 그리거나 대부분 바뀌었으면 컬럼 전체
+    """
+    if not cards:
+        return _empty_column()
+    if prev is None or not prev[0]:
+        return [make_order_card(c) for c in cards]
+
+    (prev_keys, prev_fps), (new_keys, new_fps) = prev, new
+    opcodes = difflib.SequenceMatcher(a=prev_keys, b=new_keys, autojunk=False).get_opcodes()
+
+    patch, n_ops = Patch(), 0
+    # 뒤에서부터 적용해야 앞쪽 인덱스가 밀리지 않는다
+    for tag, i1, i2, j1, j2 in reversed(opcodes):
+        if tag == "equal":
+            if prev_fps[i1 * 8:i2 * 8] == new_fps[j1 * 8:j2 * 8]:
+                continue
+            for offset in range(i2 - i1):
+                i, j = (i1 + offset) * 8, (j1 + offset) * 8
+                if prev_fps[i:i + 8] != new_fps[j:j + 8]:
+                    patch[i1 + offset] = make_order_card(cards[j1 + offset])
+                    n_ops += 1
+            continue
+        for i in range(i2 - 1, i1 - 1, -1):
+            del patch[i]
+            n_ops += 1
+        for j in range(j2 - 1, j1 - 1, -1):
+            patch.insert(i1, make_order_card(cards[j]))
+            n_ops += 1
+
+    if n_ops > len(cards) // 2:
+        return [make_order_card(c) for c in cards]
+    return patch
+
+
+# 카드별 fingerprint 는 서버 메모리에만 두고 (수천 장이면 브라우저 왕복이 무거움),
+# 브라우저에는 {"token", "columns": 컬럼 digest 6개} 만 보낸다.
+# 토큰이 없는 워커 / 재시작 후에는 digest 가 다른 컬럼만 통째로 다시 그린다.
+_BOARD_STATES = OrderedDict()
+_BOARD_STATES_LOCK = threading.Lock()
+BOARD_STATE_CACHE_SIZE = int(os.getenv("LIMS_KANBAN_STATE_CACHE", 32))
+
+
+def _remember_board(states):
+    token = uuid.uuid4().hex
+    with _BOARD_STATES_LOCK:
+        _BOARD_STATES[token] = states
+        while len(_BOARD_STATES) > BOARD_STATE_CACHE_SIZE:
+            _BOARD_STATES.popitem(last=False)
+    return token
+
+
+def _recall_board(token):
+    with _BOARD_STATES_LOCK:
+        return _BOARD_STATES.get(token)
+
+
+def render_board_update(columns, prev_board):
+    """(컬럼별 children 갱신값 6개, 브라우저에 저장할 보드 상태)"""
+    prev_board = prev_board or {}
+    prev_digests = prev_board.get("columns") or [None] * len(columns)
+    prev_states = _recall_board(prev_board.get("token")) or [None] * len(columns)
+
+    outputs, states, digests = [], [], []
+    for cards, prev_digest, prev_state in zip(columns, prev_digests, prev_states):
+        state = column_state(cards)
+        digest = column_digest(state)
+        outputs.append(no_update if digest == prev_digest else diff_column(prev_state, state, cards))
+        states.append(state)
+        digests.append(digest)
+    return outputs, {"token": _remember_board(states), "columns": digests}
+
+
 # ============================================================
 # [3] 콜백
 # ============================================================
 def register_kanban_callbacks(dash_app):
 
-    # ── 보드 렌더 ────────────────────────────────────────────
+    # ── 보드 렌더 (바뀐 컬럼 / 카드만 전송) ─────────────────
     @dash_app.callback(
-        [Output(f"kanban-col-{i}", "children") for i in range(6)],
+        [Output(f"kanban-col-{i}", "children") for i in range(6)]
+        + [Output("kanban-board-state", "data")],
         [Input("kanban-update-trigger", "data"),
          Input("kanban-search-input", "value"),
-         Input("kanban-panel-filter", "value")]
+         Input("kanban-panel-filter", "value")],
+        State("kanban-board-state", "data")
     )
-    def render_kanban_board(trigger, search_kw, panel_filter):
-        cols = [[] for _ in range(6)]
+    def render_kanban_board(trigger, search_kw, panel_filter, prev_board):
         db = SessionLocal()
         try:
-            all_orders = db.query(Order).join(Sample).all()
-
-            kw = (search_kw or "").strip().lower()
-            filtered_orders = []
-            for o in all_orders:
-                if kw and not any([
-                    kw in (o.order_id or "").lower(),
-                    kw in (o.facility or "").lower(),
-                    kw in (o.client_team or "").lower(),
-                    any(kw in (s.project_name or "").lower() for s in o.samples),
-                ]):
-                    continue
-                if panel_filter and panel_filter != "ALL":
-                    if not any(s.target_panel == panel_filter for s in o.samples):
-                        continue
-                filtered_orders.append(o)
-
-            for o in filtered_orders:
-                samples = [s for s in o.samples
-                           if panel_filter == "ALL" or not panel_filter
-                           or s.target_panel == panel_filter]
-                if not samples:
-                    continue
-                by_stage = defaultdict(list)
-                for s in samples:
-                    stage = s.current_status if s.current_status in STATUS_IDX else "접수 대기"
-                    by_stage[stage].append(s)
-
-                # 한 order의 샘플들이 여러 단계에 있거나 보류/재실험 샘플이 있으면 분리 상태로 표시
-                is_split = (
-                    len({s.current_status for s in samples}) > 1
-                    or any(s.current_status in ["보류/실패", "재실험"] for s in samples)
-                )
-
-                for stage, stage_samples in by_stage.items():
-                    cols[STATUS_IDX[stage]].append(
-                        make_order_card(
-                            o, stage, stage_samples,
-                            all_samples_in_order=samples,
-                            is_split=is_split,
-                        )
-                    )
-
-            for i in range(6):
-                if not cols[i]:
-                    cols[i] = [html.Div("빈 단계",
-                                        className="text-center text-muted small mt-5")]
-            return cols
-
+            panel = panel_filter if panel_filter and panel_filter != "ALL" else None
+            rows = order_status_counts(db, panel=panel, keyword=(search_kw or "").strip())
+            columns = build_board_columns(rows)
         except Exception as e:
             print(f"Kanban Load Error: {e}")
             traceback.print_exc()
-            return cols
+            return [no_update] * 7
         finally:
             db.close()
 
+        outputs, board = render_board_update(columns, prev_board)
+        return outputs + [board]
+
     # ── 모달 열기 / 닫기 ─────────────────────────────────────
     @dash_app.callback(
         [Output("sample-detail-modal",        "is_open"),
@@ -433,7 +592,7 @@ def register_kanban_callbacks(dash_app):
 
             if not oid:
                 return [no_update] * 9
-            order = db.query(Order).filter(Order.order_id == oid).first()
+            order = order_with_samples(db, oid)
             if not order:
                 return [no_update] * 9
 
@@ -569,48 +728,47 @@ def register_kanban_callbacks(dash_app):
     # ── 일괄 변경 & 엑셀 덮어쓰기 ───────────────────────────
     @dash_app.callback(
     [Output("modal-datatable", "rowData", allow_duplicate=True),
-     Output("modal-rowdata-synced", "data", allow_duplicate=True)],   # ← 추가
+     Output("modal-rowdata-synced", "data", allow_duplicate=True),   # ← 추가
+     Output("overwrite-report", "children")],
     [Input("btn-bulk-apply",         "n_clicks"),
      Input("upload-overwrite-excel", "contents")],
     [State("bulk-col-select",   "value"),
      State("bulk-val-input",    "value"),
-     State("modal-datatable",   "rowData")],
+     State("modal-datatable",   "rowData"),
+     State("current-modal-stage", "data")],
     prevent_initial_call=True
     )
-    def bulk_and_overwrite(_, upload_contents, col, val, row_data):
+    def bulk_and_overwrite(_, upload_contents, col, val, row_data, modal_stage):
         if not row_data:
-            return no_update, no_update
+            return no_update, no_update, no_update
 
         tid = ctx.triggered[0]["prop_id"].split(".")[0]
 
         if tid == "btn-bulk-apply":
             if not col or val is None:
-                return no_update, no_update
+                return no_update, no_update, no_update
             val_str = str(val).strip()
             new_data = [{**row, col: val_str} for row in row_data]
-            return new_data, new_data          # ← 동일 데이터 두 곳에 반영
+            return new_data, new_data, None    # ← 동일 데이터 두 곳에 반영
 
         if tid == "upload-overwrite-excel" and upload_contents:
             _, content_string = upload_contents.split(",")
             decoded = base64.b64decode(content_string)
             df_up   = pd.read_excel(io.BytesIO(decoded))
-            up_dict = df_up.to_dict("records")
-            new_data = []
-            for row in row_data:
-                new_row = row.copy()
-                match = next(
-                    (u for u in up_dict
-                    if str(u.get("sample_name")) == str(row.get("sample_name"))),
-                    None)
-                if match:
-                    for k, v in match.items():
-                        if (k in new_row and pd.notna(v)
-                                and k not in ["id", "sample_name", "target_panel"]):
-                            new_row[k] = str(v).strip()
-                new_data.append(new_row)
-            return new_data, new_data          # ← 동일 데이터 두 곳에 반영
-
-        return no_update, no_update
+            columns  = STAGE_SCHEMA_CONFIG.get(modal_stage or "", {"columns": []})["columns"]
+            new_data, report = merge_excel_rows(row_data, df_up, columns)
+            return new_data, new_data, _overwrite_report(report)
+
+        return no_update, no_update, no_update
+
+    # 다른 카드 모달을 열면 이전 덮어쓰기 리포트는 지운다
+    @dash_app.callback(
+        Output("overwrite-report", "children", allow_duplicate=True),
+        Input("modal-detail-title", "children"),
+        prevent_initial_call=True
+    )
+    def clear_overwrite_report(_):
+        return None
 
     # ── 저장 / 드래그&드롭 ──────────────────────────────────
     @dash_app.callback(
@@ -651,19 +809,22 @@ def register_kanban_callbacks(dash_app):
 
                 # 선택된 row는 current_status를 직접 바꾸지 않아도 다음 단계로 부분 이동할 수 있게 유지
                 selected_ids = [r.get("id") for r in (selected_rows or []) if r.get("id")]
-                try:
-                    curr_idx = STAGES.index(stage)
-                    next_stage = STAGES[curr_idx + 1] if curr_idx + 1 < len(STAGES) else stage
-                except ValueError:
+                curr_idx = STATUS_IDX.get(stage)
+                if curr_idx is not None and curr_idx + 1 < len(STAGES):
+                    next_stage = STAGES[curr_idx + 1]
+                else:
                     next_stage = stage
 
-                allowed_statuses = STAGES + ["보류/실패", "재실험"]
+                allowed_statuses = STAGES + HOLD_STATUSES
 
-                for row in table_data:
-                    if not str(row.get("sample_name", "")).strip():
-                        continue
+                # 편집된 샘플을 한 번에 읽어 온다 (행마다 SELECT 하지 않음)
+                edit_rows = [r for r in table_data if str(r.get("sample_name", "")).strip()]
+                no_graph = {"order": False, "wet_lab": False, "sequencing": False, "analysis": False}
+                samples = {s.id: s for s in samples_by_ids(db, [r.get("id") for r in edit_rows], **no_graph)}
+                status_changes, logs, retests = [], [], []
 
-                    s = db.query(Sample).filter(Sample.id == row.get("id")).first()
+                for row in edit_rows:
+                    s = samples.get(row.get("id"))
                     if not s:
                         continue
 
@@ -691,7 +852,7 @@ def register_kanban_callbacks(dash_app):
                         val = row[c_id]
 
                         if isinstance(val, str):
-                            val = val.strip(" \t\r") if col.get("type") != "memo" else val.strip(" \t\r")
+                            val = val.strip(" \t\r")
                         if val == "":
                             val = None
                         if col.get("type") == "numeric" and val is not None:
@@ -703,131 +864,61 @@ def register_kanban_callbacks(dash_app):
                         if _write_field(s, c_id, val, new_meta):
                             has_field_change = True
 
-                    # ── 재실험 파생 ──
-                    if new_status == "재실험":
-                        base_id = str(s.sample_id or "UNKNOWN")
-                        m = re.search(r"-R(\d+)$", base_id)
-                        if m:
-                            prefix = base_id[:m.start()]
-                            new_s_id = f"{prefix}-R{int(m.group(1)) + 1}"
-                        else:
-                            new_s_id = f"{base_id}-R1"
-
-                        # 혹시 이미 같은 ID가 있으면 다음 번호로 증가
-                        while db.query(Sample).filter(Sample.sample_id == new_s_id).first():
-                            m2 = re.search(r"-R(\d+)$", new_s_id)
-                            if m2:
-                                new_s_id = f"{new_s_id[:m2.start()]}-R{int(m2.group(1)) + 1}"
-                            else:
-                                new_s_id = f"{new_s_id}-R1"
-
-                        new_s = Sample(
-                            order_pk=s.order_pk,
-                            order_id=s.order_id,
-                            sample_id=new_s_id,
-                            target_panel=s.target_panel,
-                            current_status="접수 대기",
-                        )
-
-                        # 모델에 존재하는 보조 필드만 복사
-                        copy_fields = [
-                            "sample_name", "cancer_type", "specimen", "project_name",
-                            "pairing_info", "outside_id_1", "outside_id_2",
-                            "panel_metadata", "sample_received", "receiver_name",
-                        ]
-                        for field in copy_fields:
-                            if hasattr(Sample, field) and hasattr(s, field):
-                                value = getattr(s, field)
-                                if field == "panel_metadata" and isinstance(value, dict):
-                                    value = dict(value)
-                                setattr(new_s, field, value)
-
-                        new_s.issue_comment = f"[{stage} 단계에서 재실험 요청됨 (원본: {base_id})]"
-                        db.add(new_s)
-
-                        s.current_status = "보류/실패"
+                    # ── 재실험: 원본은 종료, 파생 샘플은 루프 뒤에 ID를 한 번에 발급받아 생성 ──
+                    if new_status == RETEST_STATUS:
+                        s.current_status = HOLD_STATUS
                         s.panel_metadata = new_meta
                         s.issue_comment = f"[재실험 진행으로 인한 종료] {new_issue}" if new_issue else "[재실험 진행으로 인한 종료]"
-                        db.add(s)
-                        db.add(ActionLog(
-                            sample_id      = s.id,
-                            action_type    = "재실험 요청",
-                            previous_state = old_status,
-                            new_state      = "보류/실패",
-                            details        = f"새 샘플 {new_s_id} 파생됨",
-                        ))
+                        retests.append((s, old_status))
                         upd += 1
                         continue
 
                     # ── 역방향 이동 차단 ──
-                    try:
-                        old_idx = STAGES.index(old_status)
-                        new_idx = STAGES.index(new_status)
-                    except ValueError:
-                        old_idx = new_idx = 0
-
-                    if new_status not in ["보류/실패"] and new_idx < old_idx:
+                    if is_backward(old_status, new_status):
                         error_msgs.append(f"🚫 [{s.sample_name}] 역방향 이동 불가 (현재: {old_status})")
                         new_status = old_status
 
-                    # ── 단계 전진 조건(pass_value) 검증 ──
-                    if new_status != old_status and new_status not in ["보류/실패"]:
-                        is_passed = True
-                        if old_status == "접수 대기" and new_status == "접수 완료":
-                            recv = str(getattr(s, "sample_received", "")).replace(" ", "")
-                            if recv != "입고완료":
-                                error_msgs.append(f"📦 [{s.sample_name}] '입고 확인'을 '입고 완료'로 변경해주세요.")
-                                is_passed = False
-                            if not getattr(s, "receiver_name", ""):
-                                error_msgs.append(f"👤 [{s.sample_name}] '입고 담당자' 이름이 누락되었습니다.")
-                                is_passed = False
-
-                        for col in stage_config["columns"]:
-                            db_val = _read_field(s, col["id"])
-                            db_val = "" if db_val is None else str(db_val)
-                            db_val = db_val.replace(" ", "")
-                            target_val = str(col.get("pass_value", "")).replace(" ", "")
-
-                            if col.get("required") and not db_val:
-                                error_msgs.append(f"[{s.sample_name}] 필수 항목 '{col['name']}' 누락")
-                                is_passed = False
-                            if col.get("pass_value") and db_val != target_val:
-                                error_msgs.append(
-                                    f"📦 [{s.sample_name}] '{col['name']}'을 "
-                                    f"'{col.get('pass_value')}'로 설정해야 이동 가능합니다."
-                                )
-                                is_passed = False
-
-                        if not is_passed:
+                    # ── 단계 전진 조건(입고 확인 / required / pass_value) 검증 ──
+                    #    이번 저장에서 고친 값까지 반영한 상태로 검사
+                    if new_status != old_status:
+                        gate_errors = gate_messages(sample_values(s, meta=new_meta), old_status, new_status, stage_config)
+                        if gate_errors:
+                            error_msgs.extend(gate_errors)
                             new_status = old_status
 
                     status_changed = old_status != new_status
                     if status_changed:
-                        s.current_status = new_status
-
-                    if has_field_change or status_changed:
+                        # 상태는 아래에서 목표 상태별 UPDATE ... WHERE id IN (...) 한 번으로 반영
+                        status_changes.append((s.id, old_status, new_status))
+                    if has_field_change:
                         s.panel_metadata = new_meta
-                        db.add(s)
-                        db.add(ActionLog(
-                            sample_id      = s.id,
-                            action_type    = "개별 샘플 분리 이동" if status_changed else "데이터 갱신",
-                            previous_state = old_status,
-                            new_state      = s.current_status,
-                            details        = "모달 저장",
-                        ))
+                        if not status_changed:
+                            logs.append({
+                                "sample_id": s.id, "action_type": "데이터 갱신", "previous_state": old_status,
+                                "new_state": old_status, "details": "모달 저장",
+                            })
+                    if has_field_change or status_changed:
                         upd += 1
 
-                    if old_issue != new_issue and new_status != "재실험":
+                    if old_issue != new_issue:
                         s.issue_comment = new_issue
-                        db.add(ActionLog(
-                            sample_id      = s.id,
-                            action_type    = "특이사항 갱신",
-                            previous_state = old_status,
-                            new_state      = s.current_status,
-                            details        = f"{old_issue or '없음'} → 변경됨"
-                        ))
+                        logs.append({
+                            "sample_id": s.id, "action_type": "특이사항 갱신", "previous_state": old_status,
+                            "new_state": new_status, "details": f"{old_issue or '없음'} → 변경됨",
+                        })
                         upd += 1
 
+                if not error_msgs:
+                    new_ids = allocate_retest_ids(db, [src.sample_id for src, _ in retests])
+                    for (src, prev_status), new_s_id in zip(retests, new_ids):
+                        db.add(_derive_retest_sample(src, new_s_id, stage))
+                        logs.append({
+                            "sample_id": src.id, "action_type": "재실험 요청", "previous_state": prev_status,
+                            "new_state": HOLD_STATUS, "details": f"새 샘플 {new_s_id} 파생됨",
+                        })
+                    apply_status_changes(db, status_changes, action_type="개별 샘플 분리 이동", details="모달 저장")
+                    add_action_logs(db, logs)
+
             # ── 2. 드래그&드롭 (Order 단위 일괄 단계 이동) ──────────
             else:
                 group_id = next_s = None
@@ -843,42 +934,11 @@ def register_kanban_callbacks(dash_app):
                     if curr_s == next_s:
                         return no_update, False, no_update
 
-                    try:
-                        curr_idx = STAGES.index(curr_s)
-                        next_idx = STAGES.index(next_s)
-                    except ValueError:
-                        curr_idx = next_idx = 0
-
-                    if next_idx < curr_idx:
-                        error_msgs.append(
-                            f"🚫 역방향 이동 불가: [{curr_s}] → [{next_s}]")
-                    else:
-                        samples = (db.query(Sample).join(Order)
-                                   .filter(Order.order_id == oid,
-                                           Sample.current_status == curr_s).all())
-
-                        # 접수 대기 → 접수 완료 이동 시 게이트키퍼 검증
-                        if curr_s == "접수 대기":
-                            for s in samples:
-                                recv = str(getattr(s, "sample_received", "")).replace(" ", "")
-                                if recv != "입고완료":
-                                    error_msgs.append(
-                                        f"📦 [{s.sample_name}] '입고 확인'을 '입고 완료'로 변경해주세요.")
-                                if not getattr(s, "receiver_name", ""):
-                                    error_msgs.append(
-                                        f"👤 [{s.sample_name}] '입고 담당자' 이름이 누락되었습니다.")
-
-                        if not error_msgs:
-                            for s in samples:
-                                old_status      = s.current_status
-                                s.current_status = next_s
-                                db.add(ActionLog(
-                                    sample_id      = s.id,
-                                    action_type    = "상태 변경 (Order 일괄)",
-                                    previous_state = old_status,
-                                    new_state      = next_s,
-                                    details        = "칸반 이동"))
-                            upd += 1
+                    # 게이트키퍼 일괄 검증 → UPDATE ... WHERE id IN (...) + ActionLog 일괄 INSERT
+                    moved, gate_errors = move_order_stage(db, oid, curr_s, next_s)
+                    error_msgs.extend(gate_errors)
+                    if moved:
+                        upd += 1
 
             # ── 결과 처리 ──
             if error_msgs:
@@ -895,41 +955,43 @@ def register_kanban_callbacks(dash_app):
             db.close()
 
     # ── 클라이언트사이드: 드래그 이벤트 바인딩 ──────────────
+    # 카드는 부분 갱신(Patch)으로 바뀌므로 카드마다 핸들러를 다시 붙이지 않고
+    # 문서 / 컬럼에 한 번만 위임(delegation) 방식으로 붙인다.
     dash_app.clientside_callback(
         """
-        function(trigger) {
-            setTimeout(function() {
-                var cards = document.querySelectorAll('[draggable="true"]');
-                cards.forEach(function(card) {
-                    card.ondragstart = function(e) {
-                        e.dataTransfer.setData('text', card.id);
-                    };
-                });
-                // 🚀 "분석 완료" 추가 (총 7단계)
-                var stages = ["접수 대기","접수 완료","QC 진행",
-                              "시퀀싱 진행","분석 진행","분석 완료","정산 대기"];
-                // 🚀 6까지 인덱스 순회하도록 변경
-                for (let i = 0; i <= 6; i++) {
-                    let col = document.getElementById('kanban-col-' + i);
-                    if (!col) continue;
-                    col.ondragover = function(e) { e.preventDefault(); };
-                    col.ondrop = function(e) {
-                        e.preventDefault();
-                        var id = e.dataTransfer.getData('text');
-                        if (id) {
-                            window.latestDropData = {
-                                card_id: id, new_stage: stages[i], ts: Date.now()
-                            };
-                            document.getElementById('btn-hidden-drop').click();
-                        }
-                    };
+        function(boardState) {
+            if (window.kanbanDnDBound) { return ""; }
+            var stages = %s;
+            for (let i = 0; i < stages.length; i++) {
+                // 레이아웃이 아직 없으면 다음 갱신 때 다시 시도
+                if (!document.getElementById('kanban-col-' + i)) { return ""; }
+            }
+            document.addEventListener('dragstart', function(e) {
+                var card = e.target.closest && e.target.closest('[draggable="true"]');
+                if (card && card.id.indexOf('drag-card-') === 0) {
+                    e.dataTransfer.setData('text', card.id);
                 }
-            }, 800);
+            });
+            for (let i = 0; i < stages.length; i++) {
+                let col = document.getElementById('kanban-col-' + i);
+                col.addEventListener('dragover', function(e) { e.preventDefault(); });
+                col.addEventListener('drop', function(e) {
+                    e.preventDefault();
+                    var id = e.dataTransfer.getData('text');
+                    if (id) {
+                        window.latestDropData = {
+                            card_id: id, new_stage: stages[i], ts: Date.now()
+                        };
+                        document.getElementById('btn-hidden-drop').click();
+                    }
+                });
+            }
+            window.kanbanDnDBound = true;
             return "";
         }
-        """,
+        """ % json.dumps(STAGES, ensure_ascii=False),
         Output("dummy-js-output", "children"),
-        Input("kanban-update-trigger", "data")
+        Input("kanban-board-state", "data")
     )
 
     dash_app.clientside_callback(
@@ -6,9 +6,15 @@ from datetime import datetime
 from sqlalchemy import desc
 
 from app.core.database import SessionLocal
+from app.core.repository import master_board_query, samples_by_ids
+from app.core.bulk_update import apply_sample_changes
+from app.core.variant_index import delete_variants
+from app.core.grid_query import (
+    DEFAULT_BLOCK_SIZE, get_block_range, build_rows_response,
+    keyword_clause, apply_sort_model, apply_filter_model,
+)
 # 🚀 필수 모델들 및 스키마 설정(STAGE_SCHEMA_CONFIG) 불러오기
 from app.models._schema import Sample, Order, WetLabQC, Sequencing, Analysis, ActionLog, STAGE_SCHEMA_CONFIG
-from sqlalchemy.orm.attributes import flag_modified
 from app.pages.base import LimsDashApp
 
 # =========================================================
@@ -18,6 +24,9 @@ from app.pages.base import LimsDashApp
 # [A] 기본 고정 컬럼 (프로젝트 및 샘플 식별자)
 base_columns = LimsDashApp.get_base_grid_columns(include_project=True)
 for col in base_columns:
+    # Infinite Row Model 에서는 Row Grouping(Enterprise)을 쓸 수 없으므로 Project 열을 일반 컬럼으로 노출
+    if col.pop("rowGroup", False):
+        col["hide"] = False
     if col["field"] in ["project_name", "sample_name", "target_panel"]:
         col["editable"] = True
         col["cellStyle"] = {"backgroundColor": "#fffbeb", "cursor": "text"} # 직접 수정 가능 (연노랑)
@@ -26,8 +35,8 @@ for col in base_columns:
 
 # 체크박스 다중 선택 기능을 첫 번째 고정 열에 추가
 if base_columns:
+    # (Infinite Row Model 은 헤더 전체 선택을 지원하지 않으므로 행 체크박스만 사용)
     base_columns[0]["checkboxSelection"] = True
-    base_columns[0]["headerCheckboxSelection"] = True
     base_columns[0]["width"] = 200
 
 # [B] 수동 확장 컬럼 (상태 및 Order 전용)
@@ -76,12 +85,76 @@ for stage, config in STAGE_SCHEMA_CONFIG.items():
 MASTER_COLUMN_DEFS = base_columns + order_columns + dynamic_columns
 
 
+# [D] 🌟 그리드 field → SQL 컬럼 매핑 (서버 사이드 정렬/필터용)
+# 화면에 값을 채우는 순서(Sample → Order → WetLab → Seq → Analysis → JSON)와 동일하게 라우팅합니다.
+def _resolve_field_column(col_id):
+    for model in (Sample, Order, WetLabQC, Sequencing, Analysis):
+        if hasattr(model, col_id):
+            return getattr(model, col_id)
+    json_field = Sample.panel_metadata[col_id]
+    return json_field.as_float() if FIELD_TYPES.get(col_id) == "numeric" else json_field.as_string()
+
+# 저장 시 반영을 허용하는 field (editable 컬럼만)
+EDITABLE_FIELDS = {col["field"] for col in MASTER_COLUMN_DEFS if col.get("editable")}
+
+MASTER_FIELD_COLUMNS = {
+    col["field"]: _resolve_field_column(col["field"])
+    for col in MASTER_COLUMN_DEFS
+}
+
+# 통합 검색창이 훑는 컬럼들
+SEARCH_COLUMNS = [
+    Sample.order_id, Sample.sample_id, Sample.sample_name, Sample.project_name,
+    Order.facility, Order.client_name,
+]
+
+MASTER_DEFAULT_ORDER = [desc(Sample.created_at), desc(Sample.id)]
+
+
+def _build_master_row(s):
+    """Sample 1건(+ 연관 테이블)을 마스터 그리드 한 줄로 변환"""
+    row = {
+        "id": s.id,
+        "project_name": s.project_name,
+        "order_id": s.order_id,
+        "sample_id": s.sample_id,
+        "sample_name": s.sample_name,
+        "target_panel": s.target_panel,
+        "current_status": s.current_status,
+        "facility": s.order.facility if s.order else "-",
+        "client_team": s.order.client_team if s.order else "-",
+        "client_name": s.order.client_name if s.order else "-",
+        "client_phone": s.order.client_phone if s.order else "-",
+        "client_email": s.order.client_email if s.order else "-",
+    }
+
+    # 🌟 동적 컬럼(STAGE_SCHEMA_CONFIG) 자동 추출 로직
+    for col_id in DYNAMIC_FIELD_IDS:
+        val = None
+        # 각 DB 모델을 순회하며 값이 있는지 탐색
+        if hasattr(s, col_id): val = getattr(s, col_id)
+        elif s.order and hasattr(s.order, col_id): val = getattr(s.order, col_id)
+        elif s.wet_lab and hasattr(s.wet_lab, col_id): val = getattr(s.wet_lab, col_id)
+        elif s.sequencing and hasattr(s.sequencing, col_id): val = getattr(s.sequencing, col_id)
+        elif s.analysis and hasattr(s.analysis, col_id): val = getattr(s.analysis, col_id)
+
+        # 그래도 없으면 JSON 메타데이터에서 탐색
+        if val is None and s.panel_metadata:
+            val = s.panel_metadata.get(col_id, "")
+
+        row[col_id] = val if val is not None else ""
+    return row
+
+
 # =========================================================
 # 🚀 2. 레이아웃
 # =========================================================
 def create_master_table_layout():
     return html.Div([
         dcc.Store(id="master-table-refresh-trigger", data=0),
+        # 편집된 셀만 모아두는 저장소 {행 id: {field: 새 값}} (Infinite 모델에서는 rowData 전체를 State로 받을 수 없음)
+        dcc.Store(id="master-table-dirty-rows", data={}),
+        dcc.Store(id="master-table-purge-dummy"),
 
         html.Div([
             html.Div([
@@ -96,7 +169,7 @@ def create_master_table_layout():
                     dbc.Col([
                         dbc.InputGroup([
                             dbc.InputGroupText(DashIconify(icon="carbon:search")),
-                            dbc.Input(id="master-table-search", placeholder="Order ID, Sample ID, Patient ID, 기관 등 통합 검색...", className="rounded-end-3")
+                            dbc.Input(id="master-table-search", placeholder="Order ID, Sample ID, Patient ID, 기관 등 통합 검색...", className="rounded-end-3", debounce=True)
                         ], className="shadow-sm")
                     ], lg=4),
                     
@@ -133,11 +206,16 @@ def create_master_table_layout():
                 dag.AgGrid(
                     id="master-master-grid",
                     columnDefs=MASTER_COLUMN_DEFS,
-                    rowData=[],  
+                    # 🚀 서버 사이드(Infinite) Row Model: 화면에 보이는 블록만 SQL LIMIT/OFFSET 으로 요청
+                    rowModelType="infinite",
+                    getRowId="params.data.id",
                     defaultColDef={"sortable": True, "filter": True, "resizable": True},
                     dashGridOptions={
                         "rowSelection": "multiple",          
                         "suppressRowClickSelection": True,   
+                        "cacheBlockSize": DEFAULT_BLOCK_SIZE,
+                        "maxBlocksInCache": 20,
+                        "infiniteInitialRowCount": DEFAULT_BLOCK_SIZE,
                     },
                     style={"height": "70vh", "width": "100%"},
                     className="ag-theme-alpine border-0"
@@ -152,149 +230,93 @@ def create_master_table_layout():
 # =========================================================
 def register_master_table_callbacks(dash_app):
 
-    # 🚀 [콜백 1] 데이터 동적 로딩
+    # 🚀 [콜백 1] 데이터 동적 로딩 (서버 사이드 블록 단위 조회)
     @dash_app.callback(
-        Output("master-master-grid", "rowData"),
-        [Input("master-table-search", "value"),
-         Input("master-table-refresh-trigger", "data")]
+        Output("master-master-grid", "getRowsResponse"),
+        Input("master-master-grid", "getRowsRequest"),
+        State("master-table-search", "value"),
     )
-    def update_grid_rows(search_value, refresh_count):
+    def update_grid_rows(request, search_value):
+        if not request:
+            return no_update
+
         db = SessionLocal()
         try:
-            query = db.query(Sample).order_by(desc(Sample.created_at))
-            samples = query.all()
-            
-            kw = (search_value or "").strip().lower()
-            data = []
-            
-            for s in samples:
-                if kw and not any([
-                    kw in (s.order_id or "").lower(),
-                    kw in (s.sample_id or "").lower(),
-                    kw in (s.sample_name or "").lower(),
-                    kw in (s.project_name or "").lower(),
-                    kw in (s.order.facility or "").lower() if s.order else False,
-                    kw in (s.order.client_name or "").lower() if s.order else False
-                ]):
-                    continue
-
-                # 기본 데이터 세팅
-                row = {
-                    "id": s.id, 
-                    "project_name": s.project_name,
-                    "order_id": s.order_id,
-                    "sample_id": s.sample_id,
-                    "sample_name": s.sample_name,
-                    "target_panel": s.target_panel,
-                    "current_status": s.current_status,
-                    "facility": s.order.facility if s.order else "-",
-                    "client_team": s.order.client_team if s.order else "-",
-                    "client_name": s.order.client_name if s.order else "-",
-                    "client_phone": s.order.client_phone if s.order else "-",
-                    "client_email": s.order.client_email if s.order else "-",
-                }
-                
-                # 🌟 동적 컬럼(STAGE_SCHEMA_CONFIG) 자동 추출 로직
-                for col_id in DYNAMIC_FIELD_IDS:
-                    val = None
-                    # 각 DB 모델을 순회하며 값이 있는지 탐색
-                    if hasattr(s, col_id): val = getattr(s, col_id)
-                    elif s.order and hasattr(s.order, col_id): val = getattr(s.order, col_id)
-                    elif s.wet_lab and hasattr(s.wet_lab, col_id): val = getattr(s.wet_lab, col_id)
-                    elif s.sequencing and hasattr(s.sequencing, col_id): val = getattr(s.sequencing, col_id)
-                    elif s.analysis and hasattr(s.analysis, col_id): val = getattr(s.analysis, col_id)
-                    
-                    # 그래도 없으면 JSON 메타데이터에서 탐색
-                    if val is None and s.panel_metadata:
-                        val = s.panel_metadata.get(col_id, "")
-                        
-                    row[col_id] = val if val is not None else ""
-
-                data.append(row)
-            return data
+            query = master_board_query(db)
+
+            kw_clause = keyword_clause(search_value, SEARCH_COLUMNS)
+            if kw_clause is not None:
+                query = query.filter(kw_clause)
+            query = apply_filter_model(query, request.get("filterModel"), MASTER_FIELD_COLUMNS)
+
+            start, limit = get_block_range(request, DEFAULT_BLOCK_SIZE)
+            samples = (
+                apply_sort_model(query, request.get("sortModel"), MASTER_FIELD_COLUMNS, MASTER_DEFAULT_ORDER)
+                .offset(start)
+                .limit(limit)
+                .all()
+            )
+            return build_rows_response([_build_master_row(s) for s in samples], start, limit, count_query=query)
         finally:
             db.close()
 
-    # 🚀 [콜백 2] DB 일괄 저장 (스마트 라우팅 및 타입 자동 변환)
+    # 검색어 변경 / 삭제 후 → 캐시된 블록을 버리고 현재 조건으로 다시 요청
+    dash_app.clientside_callback(
+        """
+        function(search, refresh) {
+            dash_ag_grid.getApiAsync("master-master-grid").then(function(api) {
+                api.purgeInfiniteCache();
+            });
+            return window.dash_clientside.no_update;
+        }
+        """,
+        Output("master-table-purge-dummy", "data"),
+        [Input("master-table-search", "value"),
+         Input("master-table-refresh-trigger", "data")],
+        prevent_initial_call=True
+    )
+
+    # 셀 편집 시 바뀐 셀만 {행 id: {field: 새 값}} 으로 누적 (저장 버튼에서 이 diff 만 반영)
+    @dash_app.callback(
+        Output("master-table-dirty-rows", "data", allow_duplicate=True),
+        Input("master-master-grid", "cellValueChanged"),
+        State("master-table-dirty-rows", "data"),
+        prevent_initial_call=True
+    )
+    def track_dirty_rows(changes, dirty_rows):
+        if not changes: return no_update
+        changes = changes if isinstance(changes, list) else [changes]
+        dirty_rows = dict(dirty_rows or {})
+        for change in changes:
+            row_id = (change.get("data") or {}).get("id", change.get("rowId"))
+            col_id = change.get("colId")
+            if row_id is None or col_id not in EDITABLE_FIELDS: continue
+            if change.get("value") == change.get("oldValue"): continue
+            cells = dict(dirty_rows.get(str(row_id), {}))
+            cells[col_id] = change.get("value")
+            dirty_rows[str(row_id)] = cells
+        return dirty_rows
+
+    # 🚀 [콜백 2] DB 일괄 저장 (바뀐 셀만 테이블별 bulk update)
     @dash_app.callback(
-        Output("master-table-status-message", "children", allow_duplicate=True),
+        [Output("master-table-status-message", "children", allow_duplicate=True),
+         Output("master-table-dirty-rows", "data", allow_duplicate=True)],
         Input("btn-save-master-table", "n_clicks"),
-        State("master-master-grid", "rowData"),
+        State("master-table-dirty-rows", "data"),
         prevent_initial_call=True
     )
-    def save_master_table_data(n_clicks, row_data):
-        if not row_data: return no_update
+    def save_master_table_data(n_clicks, dirty_rows):
+        if not dirty_rows: return dbc.Alert("변경된 데이터가 없습니다.", color="secondary", className="shadow-sm rounded-3"), no_update
 
         db = SessionLocal()
         try:
-            for row in row_data:
-                sample = db.query(Sample).filter(Sample.id == row.get("id")).first()
-                if not sample: continue
-
-                # 1. 고정 정보 업데이트
-                sample.project_name = row.get("project_name")
-                sample.sample_name = row.get("sample_name")
-                sample.target_panel = row.get("target_panel")
-                sample.current_status = row.get("current_status")
-
-                if sample.order:
-                    sample.order.facility = row.get("facility")
-                    sample.order.client_team = row.get("client_team")
-                    sample.order.client_name = row.get("client_name")
-                    sample.order.client_phone = row.get("client_phone")
-                    sample.order.client_email = row.get("client_email")
-
-                # 2. 껍데기 자동 생성 (Lazy Initialization)
-                if not sample.wet_lab:
-                    sample.wet_lab = WetLabQC(sample_id=sample.id)
-                    db.add(sample.wet_lab)
-                if not sample.sequencing:
-                    sample.sequencing = Sequencing(sample_id=sample.id)
-                    db.add(sample.sequencing)
-                if not sample.analysis:
-                    sample.analysis = Analysis(sample_id=sample.id)
-                    db.add(sample.analysis)
-
-                # 3. 🌟 동적 데이터 자동 배달 로직
-                new_meta = dict(sample.panel_metadata) if sample.panel_metadata else {}
-                has_meta_change = False
-
-                for col_id in DYNAMIC_FIELD_IDS:
-                    if col_id not in row: continue
-                    
-                    val = row[col_id]
-                    if val == "": val = None
-                    
-                    # 숫자형으로 지정된 경우 float 변환 방어코드
-                    if val is not None and FIELD_TYPES.get(col_id) == "numeric":
-                        try: val = float(val)
-                        except ValueError: val = None
-
-                    # 알아서 제 위치 찾아가기
-                    if hasattr(Sample, col_id) and col_id != "panel_metadata":
-                        setattr(sample, col_id, val)
-                    elif hasattr(Order, col_id) and sample.order:
-                        setattr(sample.order, col_id, val)
-                    elif hasattr(WetLabQC, col_id):
-                        setattr(sample.wet_lab, col_id, val)
-                    elif hasattr(Sequencing, col_id):
-                        setattr(sample.sequencing, col_id, val)
-                    elif hasattr(Analysis, col_id) and col_id not in ["analysis_results", "analysis_metadata"]:
-                        setattr(sample.analysis, col_id, val)
-                    else:
-                        if new_meta.get(col_id) != val:
-                            new_meta[col_id] = val
-                            has_meta_change = True
-
-                if has_meta_change:
-                    sample.panel_metadata = new_meta
-                    flag_modified(sample, "panel_metadata")
-
+            saved_count = apply_sample_changes(db, dirty_rows, field_types=FIELD_TYPES)
             db.commit()
-            return dbc.Alert("🎉 전역 보드의 모든 수정사항이 데이터베이스에 완벽히 반영되었습니다!", color="success", className="shadow-sm rounded-3")
+            cell_count = sum(len(cells) for cells in dirty_rows.values())
+            return dbc.Alert(f"🎉 전역 보드의 수정사항 {saved_count}건(셀 {cell_count}개)이 데이터베이스에 완벽히 반영되었습니다!", color="success", className="shadow-sm rounded-3"), {}
         except Exception as e:
             db.rollback()
-            return dbc.Alert(f"❌ 데이터 저장 실패: {str(e)}", color="danger", className="shadow-sm rounded-3")
+            return dbc.Alert(f"❌ 데이터 저장 실패: {str(e)}", color="danger", className="shadow-sm rounded-3"), no_update
         finally:
             db.close()
 
@@ -326,8 +348,9 @@ def register_master_table_callbacks(dash_app):
             orders_to_check = set()
             deleted_count = 0
             
-            for row in selected_rows:
-                sample = db.query(Sample).filter(Sample.id == row.get("id")).first()
+            samples = samples_by_ids(db, [row.get("id") for row in selected_rows], logs=True)
+            delete_variants(db, [s.id for s in samples if s])
+            for sample in samples:
                 if sample:
                     if sample.order:
                         orders_to_check.add(sample.order)
@@ -2,6 +2,7 @@ from dash import html, dcc, Input, Output, State, ctx
 import dash_bootstrap_components as dbc
 import dash_ag_grid as dag
 from app.core.database import SessionLocal
+from app.core.repository import order_summaries, order_with_samples
 from app.models._schema import Order, Sample
 from app.pages.base import LimsDashApp
 from app.ui.shared_ui import create_project_summary_card # 기존 카드 생성 함수 활용
@@ -62,13 +63,12 @@ def register_project_callbacks(dash_app):
     def load_order_list(_):
         db = SessionLocal()
         try:
-            orders = db.query(Order).order_by(Order.reception_date.desc()).all()
             return [
                 {
                     "order_id": o.order_id, 
                     "reception_date": str(o.reception_date), 
-                    "sample_count": len(o.samples)
-                } for o in orders
+                    "sample_count": n
+                } for o, n in order_summaries(db)
             ]
         finally:
             db.close()
@@ -89,7 +89,7 @@ def register_project_callbacks(dash_app):
 
         db = SessionLocal()
         try:
-            order = db.query(Order).filter(Order.order_id == order_id).first()
+            order = order_with_samples(db, order_id)
             if not order: return html.Div("데이터를 찾을 수 없습니다.")
 
             cols = ["sample_id", "sample_name", "target_panel", "current_status", "issue_comment"]
@@ -7,12 +7,13 @@ import io
 import os
 import traceback
 from pathlib import Path
-import openpyxl # 🚀 엑셀 템플릿 수정을 위한 라이브러리 추가
 
 from app.pages.base import LimsDashApp  
 from app.core.database import SessionLocal
+from app.core.id_service import format_order_id, format_sample_id, next_order_seq
 from app.models._schema import Order, Sample
-from app.core.mapping import FACILITY_MAPPING, get_full_mapping_for_panel
+from app.core.mapping import FACILITY_MAPPING, SAMPLE_NAME_FALLBACKS, compile_header_plan, get_full_mapping_for_panel
+from app.core.request_form import PREVIEW_ROWS, discard_form, load_form, parse_request_form, store_form
 
 # 🚀 검사 선택값에 따른 엑셀 양식 파일명 매핑 사전
 TEMPLATE_MAP = {
@@ -153,7 +154,8 @@ def register_registration_callbacks(dash_app):
             return dcc.send_data_frame(pd.DataFrame().to_excel, f"{template_name}.xlsx", index=False)
             
         try:
-            # openpyxl을 통해 기존 템플릿 오픈
+            # openpyxl을 통해 기존 템플릿 오픈 (템플릿 다운로드 때만 필요하므로 여기서 import)
+            import openpyxl
             wb = openpyxl.load_workbook(excel_file_path)
             ws = wb.active
             
@@ -189,76 +191,55 @@ def register_registration_callbacks(dash_app):
     # 🚀 엑셀 파싱 시, 기존 엑셀에 있던 의뢰자 정보도 추출하여 화면(Input)에 반영
     @dash_app.callback(
         [Output("parsed-data-container", "style"), Output("upload-filename-display", "children"), Output("order-info-alert", "children"), Output("parsed-sample-table", "columns"), Output("parsed-sample-table", "data"),
-         Output("reg-client-name", "value"), Output("reg-client-phone", "value"), Output("reg-client-email", "value")],
+         Output("parsed-order-store", "data"), Output("reg-client-name", "value"), Output("reg-client-phone", "value"), Output("reg-client-email", "value")],
         Input("upload-excel-data", "contents"), [State("upload-excel-data", "filename"), State("reg-facility-select", "value"), State("reg-panel-select", "value")], prevent_initial_call=True
     )
     def parse_and_preview_excel(contents, filename, facility_code, panel_code):
-        if not contents: return {"display": "none"}, "", "", [], [], no_update, no_update, no_update
-        if not facility_code or not panel_code: return {"display": "none"}, dbc.Alert("🚨 업로드 전 1-1(기관)과 1-2(검사 종류)를 선택해주세요.", color="danger", className="py-2 mb-0"), "", [], [], no_update, no_update, no_update
+        if not contents: return {"display": "none"}, "", "", [], [], None, no_update, no_update, no_update
+        if not facility_code or not panel_code: return {"display": "none"}, dbc.Alert("🚨 업로드 전 1-1(기관)과 1-2(검사 종류)를 선택해주세요.", color="danger", className="py-2 mb-0"), "", [], [], None, no_update, no_update, no_update
 
         try:
             content_type, content_string = contents.split(',')
             decoded = base64.b64decode(content_string)
             fac_info = FACILITY_MAPPING.get(facility_code, {"facility": "Unknown", "team": "Unknown"})
-            
-            df_raw = pd.read_excel(io.BytesIO(decoded), header=None)
-            
-            # 🚀 엑셀 상단 영역에서 의뢰자 정보(성명, 폰, 이메일) 파싱
-            client_name, client_phone, client_email = "", "", ""
-            for r in range(2, min(12, len(df_raw))): 
-                row_vals = df_raw.iloc[r].dropna().astype(str).str.strip().tolist()
-                row_nospace = [x.replace(" ", "").lower() for x in row_vals]
-                
-                if "실무자성명" in row_nospace:
-                    idx_name = row_nospace.index("실무자성명")
-                    if idx_name + 1 < len(row_vals): client_name = row_vals[idx_name + 1]
-                    
-                    if "연락처" in row_nospace:
-                        idx_phone = row_nospace.index("연락처")
-                        if idx_phone + 1 < len(row_vals): client_phone = row_vals[idx_phone + 1]
-                        
-                    if r + 1 < len(df_raw):
-                        next_row_vals = df_raw.iloc[r+1].dropna().astype(str).str.strip().tolist()
-                        next_row_nospace = [x.replace(" ", "").lower() for x in next_row_vals]
-                        if "e-mail" in next_row_nospace or "email" in next_row_nospace:
-                            idx_email = next_row_nospace.index("e-mail") if "e-mail" in next_row_nospace else next_row_nospace.index("email")
-                            if idx_email + 1 < len(next_row_vals): client_email = next_row_vals[idx_email + 1]
 
-            client_name = client_name if client_name.lower() != 'nan' else ""
-            client_phone = client_phone if client_phone.lower() != 'nan' else ""
-            client_email = client_email if client_email.lower() != 'nan' else ""
+            # 🚀 openpyxl read_only 로 한 번만 훑으며 의뢰자 정보 / 헤더 / 샘플 행 추출 + 매핑 검증
+            form = parse_request_form(decoded, panel_code)
+            client_name, client_phone, client_email = form.client["name"], form.client["phone"], form.client["email"]
 
-            # 샘플 데이터 테이블 파싱
-            header_idx = next((r for r in range(5, min(25, len(df_raw))) if "patientid" in "".join(df_raw.iloc[r].astype(str).tolist()).replace(" ", "").lower()), 15)
-            df_samples = pd.read_excel(io.BytesIO(decoded), header=header_idx).dropna(axis=1, how='all')
-            df_samples.columns = [str(c) if not str(c).startswith('Unnamed') else f"col_{i}" for i, c in enumerate(df_samples.columns)]
-            
-            pid_col = next((col for col in df_samples.columns if "patient id" in col.lower() or "번호" in col.lower()), None)
-            if pid_col:
-                df_samples = df_samples.dropna(subset=[pid_col])
-                df_samples = df_samples[df_samples[pid_col].astype(str).str.lower() != 'ex']
-            
-            df_samples = df_samples.fillna("")
-            dynamic_cols = [{"name": c, "id": c} for c in df_samples.columns if "col_" not in c]
-            table_data = df_samples.to_dict('records')
-            
+            # 전체 행은 서버에 보관하고, 화면에는 미리보기 일부와 통계만 보낸다
+            token = store_form(form)
+            dynamic_cols = [{"name": c, "id": c} for c in form.columns]
+            preview_rows = form.rows[:PREVIEW_ROWS]
+
+            stats = form.stats
             alert_ui = html.Div([
-                html.Strong("📂 타겟: "), html.Span(f"[{facility_code}] {fac_info['facility']} ({fac_info['team']}) / {panel_code}", className="me-3 text-primary"),
-                html.Strong("📊 추출: "), html.Span(f"{len(table_data)}건")
+                html.Div([
+                    html.Strong("📂 타겟: "), html.Span(f"[{facility_code}] {fac_info['facility']} ({fac_info['team']}) / {panel_code}", className="me-3 text-primary"),
+                    html.Strong("📊 추출: "), html.Span(f"{stats['rows']}건", className="me-3"),
+                    html.Span(f"(미리보기 {len(preview_rows)}건 표시)", className="text-muted small") if len(preview_rows) < stats["rows"] else None,
+                ]),
+                html.Div([
+                    html.Span(f"매핑된 항목 {len(stats['mapped_headers'])}개", className="me-3"),
+                    html.Span(f"⚠️ 샘플명 없음 {stats['no_sample_name']}건 (등록 제외)", className="me-3 text-danger") if stats["no_sample_name"] else None,
+                    html.Span(f"⚠️ 샘플명 중복 {stats['duplicate_names']}건", className="me-3 text-danger") if stats["duplicate_names"] else None,
+                    html.Span(f"양식에 없는 항목: {', '.join(stats['missing_headers'])}", className="text-muted") if stats["missing_headers"] else None,
+                ], className="small mt-1"),
             ])
-            
+
             # 🚀 의뢰자 정보를 3개의 UI Input으로 동시에 던져줍니다. (입력 안 한 항목만 채우려면 수정 가능하나 현재는 덮어씀)
-            return {"display": "block"}, f"✅ {filename} 파싱 성공!", alert_ui, dynamic_cols, table_data, client_name, client_phone, client_email
+            store = {"token": token, "rows": stats["rows"], "filename": filename}
+            return {"display": "block"}, f"✅ {filename} 파싱 성공!", alert_ui, dynamic_cols, preview_rows, store, client_name, client_phone, client_email
             
         except Exception as e:
             print(traceback.format_exc())
-            return {"display": "none"}, dbc.Alert(f"🚨 파싱 오류: {e}", color="danger", className="py-2 mb-0"), "", [], [], no_update, no_update, no_update
+            return {"display": "none"}, dbc.Alert(f"🚨 파싱 오류: {e}", color="danger", className="py-2 mb-0"), "", [], [], None, no_update, no_update, no_update
 
     # 🚀 최종 DB 저장
     @dash_app.callback(
         Output("save-new-message", "children"),
         Input("btn-save-new", "n_clicks"),
-        [State("parsed-sample-table", "data"), 
+        [State("parsed-order-store", "data"), 
          State("reg-facility-select", "value"), 
          State("reg-panel-select", "value"),
          State("reg-client-name", "value"),
@@ -266,8 +247,12 @@ def register_registration_callbacks(dash_app):
          State("reg-client-email", "value")], 
         prevent_initial_call=True
     )
-    def save_final_data_to_db(n_clicks, sample_data, facility_code, panel_code, client_name, client_phone, client_email):
+    def save_final_data_to_db(n_clicks, parsed_store, facility_code, panel_code, client_name, client_phone, client_email):
         if not n_clicks: return no_update
+        form = load_form((parsed_store or {}).get("token"))
+        if form is None:
+            return dbc.Alert("⚠️ 업로드한 의뢰서 데이터가 없습니다 (이미 등록했거나 만료됨). 파일을 다시 업로드해 주세요.", color="warning")
+        sample_data = form.rows
         if not sample_data or not facility_code or not panel_code: 
             return dbc.Alert("⚠️ 필수 정보 누락 또는 파싱된 데이터가 없습니다.", color="warning")
         
@@ -275,23 +260,15 @@ def register_registration_callbacks(dash_app):
         final_client_phone = client_phone if client_phone else "-"
         final_client_email = client_email if client_email else "-"
 
-        def get_fuzzy_val(raw_dict, target_key):
-            if target_key in raw_dict: return raw_dict[target_key]
-            clean_target = str(target_key).lower().replace(" ", "").replace("\n", "")
-            for k, v in raw_dict.items():
-                if clean_target in str(k).lower().replace(" ", "").replace("\n", ""):
-                    return v
-            return None
-
         db = SessionLocal()
         try:
             today_str = datetime.now().strftime("%y%m%d")
             fac_info = FACILITY_MAPPING.get(facility_code, {"facility": "Unknown", "team": "Unknown"})
             
-            total_orders_today = db.query(Order).filter(Order.order_id.like(f"%{today_str}%")).count()
-            batch_seq = str(total_orders_today + 1).zfill(2)
+            # 당일 Order seq 는 카운터 행에서 원자적으로 발급 (동시 등록 시에도 중복 없음)
+            batch_seq = next_order_seq(db, today_str)[0]
 
-            new_order_id = f"GCX-{facility_code}-{today_str}-{batch_seq}"
+            new_order_id = format_order_id(facility_code, today_str, batch_seq)
             
             new_order = Order(
                 order_id=new_order_id, 
@@ -306,35 +283,26 @@ def register_registration_callbacks(dash_app):
             db.add(new_order)
             db.flush() 
             
-            mapping_rule = get_full_mapping_for_panel(panel_code)
+            # 🚀 헤더 → DB 컬럼 플랜을 파일당 한 번만 만들고, 변환은 DataFrame 단위로
+            df_rows = pd.DataFrame(sample_data, columns=list(sample_data[0].keys()))
+            header = list(df_rows.columns)
+            plan = compile_header_plan(header, get_full_mapping_for_panel(panel_code),
+                                       fallbacks={"sample_name": SAMPLE_NAME_FALLBACKS})
+            na_plan = compile_header_plan(header, {"Nucleic Acid Type": "na_raw"}, fallbacks={"na_raw": ["검사물질"]})
+            records = plan.split_records(df_rows)
+            na_column = na_plan.apply(df_rows).get("na_raw")
+            na_values = na_column.tolist() if na_column is not None else [None] * len(records)
             
             sample_seq_counter = 0  # 🌟 엑셀 행(고유 검체) 기준 카운터 (001, 002...)
             db_insert_count = 0     # 🌟 실제 DB에 쪼개져서 들어간 총 레코드 수
             
-            for raw_row in sample_data:
-                base_data, extra_metadata = {}, {}
-                for excel_col, map_info in mapping_rule.items():
-                    val = get_fuzzy_val(raw_row, excel_col) 
-                    clean_val = str(val).strip() if val is not None and str(val).strip() not in ["nan", "NaT", ""] else None
-                    if map_info["is_extra"]: extra_metadata[map_info["db_col"]] = clean_val
-                    else: base_data[map_info["db_col"]] = clean_val
-
-                if not base_data.get("sample_name"):
-                    fallback_val = (get_fuzzy_val(raw_row, "Patient ID") or 
-                                    get_fuzzy_val(raw_row, "Sample ID") or 
-                                    get_fuzzy_val(raw_row, "환자번호") or 
-                                    get_fuzzy_val(raw_row, "검체번호") or
-                                    get_fuzzy_val(raw_row, "Patient ID/ Sample ID"))
-                    if fallback_val and str(fallback_val).strip() not in ["", "nan", "NaT"]:
-                        base_data["sample_name"] = str(fallback_val).strip()
-
+            for (base_data, extra_metadata), na_value in zip(records, na_values):
                 if not base_data.get("sample_name"): 
                     continue
 
                 sample_seq_counter += 1
-                sample_seq = str(sample_seq_counter).zfill(3) 
 
-                na_raw = str(get_fuzzy_val(raw_row, "Nucleic Acid Type") or get_fuzzy_val(raw_row, "검사물질") or "").upper().replace(" ", "")
+                na_raw = str(na_value or "").upper().replace(" ", "")
                 
                 if "DNA/RNA" in na_raw or "BOTH" in na_raw:
                     types_to_create = ["DNA", "RNA"]
@@ -346,7 +314,7 @@ def register_registration_callbacks(dash_app):
                     types_to_create = ["DNA", "RNA"] if panel_code == "TSO500" else ["DNA"]
 
                 for na_type in types_to_create:
-                    internal_sample_id = f"ACC-{today_str}-{batch_seq}-{sample_seq}-{na_type}"
+                    internal_sample_id = format_sample_id(today_str, batch_seq, sample_seq_counter, na_type)
                     
                     new_sample = Sample(
                         order_pk=new_order.id,               
@@ -372,6 +340,7 @@ def register_registration_callbacks(dash_app):
                 return dbc.Alert("🚨 엑셀에서 유효한 검체 정보(Patient ID)를 찾지 못했습니다. 매핑 양식을 확인해 주세요.", color="danger")
 
             db.commit() 
+            discard_form(parsed_store.get("token"))
             return dbc.Alert(f"🎉 성공! 의뢰자[{final_client_name}]님의 원본 검체 {sample_seq_counter}건 (DNA/RNA 분할 총 {db_insert_count}건) 등록이 완료되었습니다.", color="success")
         
         except Exception as e:
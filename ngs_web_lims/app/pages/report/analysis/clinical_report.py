@@ -1,10 +1,12 @@
 from dash import html, dcc, Input, Output, State, no_update, ctx
 import dash_bootstrap_components as dbc
 from datetime import datetime
-import os, json, ast, re, traceback, base64
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+import os, json, re, traceback, base64
 
 from app.core.database import SessionLocal
+from app.core.repository import sample_query, samples_with_prefix
+from app.core.result_normalize import clean
+from app.core.result_store import full_results
 from app.models._schema import Sample, REPORT_SCHEMA_CONFIG
 from app.pages.base import LimsDashApp
 from app.core.config import BASE_DIR
@@ -15,32 +17,8 @@ from app.pages.report.base import create_shared_report_layout
 # 섹션 1: 공통 유틸
 # ============================================================
 
-def _parse_json_like(value):
-    """DB 저장값을 재귀적으로 파싱하고 빈 값을 None으로 정규화합니다."""
-    if isinstance(value, dict):
-        result = {k: _parse_json_like(v) for k, v in value.items()}
-        return {k: v for k, v in result.items() if v is not None and v != []}
-    if isinstance(value, list):
-        return [_parse_json_like(v) for v in value if _parse_json_like(v) is not None]
-    if isinstance(value, str):
-        s = value.strip()
-        if not s or s.upper() in {"NA", "N/A", "NONE", "NULL"}:
-            return None
-        if s.startswith(("{", "[")):
-            for parser in [
-                lambda x: json.loads(x),
-                lambda x: ast.literal_eval(
-                    x.replace("null", "None").replace("true", "True")
-                     .replace("false", "False").replace("nan", "None")
-                ),
-                lambda x: json.loads(re.sub(r"'([^']*)'", r'"\1"', x)),
-            ]:
-                try:
-                    return _parse_json_like(parser(s))
-                except Exception:
-                    continue
-        return s
-    return value
+# DB 저장값 / 패널 메타데이터 정리 (분석 결과 화면과 같은 규칙, 노드마다 한 번만 방문)
+_parse_json_like = clean
 
 
 def _display(value, default="-"):
@@ -148,11 +126,12 @@ def _modality_from_sample_id(sample_id):
     return match.group(1).upper() if match else ""
 
 
+SAMPLE_INFO_KEYS = ("Sample_Info", "sample_info")
+
+
 def _sample_modality(sample):
-    """Sample 객체에서 DNA/RNA modality를 결정합니다."""
-    flat = _flatten_analysis_data(
-        sample.analysis.analysis_results if getattr(sample, "analysis", None) else {}
-    )
+    """Sample 객체에서 DNA/RNA modality를 결정합니다. (큰 섹션은 읽지 않음)"""
+    flat = _flatten_analysis_data(full_results(getattr(sample, "analysis", None), keys=SAMPLE_INFO_KEYS))
     extraction = _extraction_type_from_info(flat)
     if extraction in {"DNA", "RNA"}:
         return extraction
@@ -196,7 +175,8 @@ def _split_by_modality(samples):
     dna_flat, rna_flat = {}, {}
 
     for sample in _sort_by_modality(samples):
-        raw = sample.analysis.analysis_results if getattr(sample, "analysis", None) else {}
+        # 📦 variants / fusions 등 blob 으로 빠진 섹션은 리포트를 만들 때만 읽음
+        raw = full_results(getattr(sample, "analysis", None))
         flat = _flatten_analysis_data(raw)
         modality = _sample_modality(sample)
 
@@ -871,6 +851,8 @@ def _logo_data_uri(template_type=None):
 
 
 def _render_template(context, template_type=None):
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+
     template_dir, template_name = _resolve_template(template_type)
     env = Environment(
         loader=FileSystemLoader(template_dir),
@@ -913,7 +895,7 @@ def _query_samples(db, sample_ids):
     ids = list(dict.fromkeys(sid for sid in sample_ids if sid))
     if not ids:
         return []
-    return _sort_by_modality(db.query(Sample).filter(Sample.sample_id.in_(ids)).all())
+    return _sort_by_modality(sample_query(db).filter(Sample.sample_id.in_(ids)).all())
 
 
 def _resolve_selected_samples(db, selected_row):
@@ -940,7 +922,7 @@ def _resolve_selected_samples(db, selected_row):
     if paired:
         return paired
 
-    exact = db.query(Sample).filter(Sample.sample_id == selected_id).first()
+    exact = sample_query(db).filter(Sample.sample_id == selected_id).first()
     return [exact] if exact else []
 
 
@@ -1063,10 +1045,8 @@ def register_clinical_callbacks(dash_app):
 
         db = SessionLocal()
         try:
-            query   = db.query(Sample)
-            if selected_batch and selected_batch != "ALL":
-                query = query.filter(Sample.sample_id.like(f"{selected_batch}-%"))
-            samples = query.all()
+            prefix  = f"{selected_batch}-" if selected_batch and selected_batch != "ALL" else None
+            samples = samples_with_prefix(db, prefix, wet_lab=False, sequencing=False)
 
             tso_groups   = {}
             standalone   = []
@@ -6,6 +6,7 @@ import base64
 import traceback
 
 from app.core.database import SessionLocal
+from app.core.repository import samples_with_prefix
 from app.models._schema import Sample, REPORT_SCHEMA_CONFIG
 from app.pages.base import LimsDashApp
 from app.core.config import BASE_DIR
@@ -176,10 +177,8 @@ def register_qc_callbacks(dash_app):
         # 🚀 3. 스마트 데이터 로딩
         db = SessionLocal()
         try:
-            query = db.query(Sample)
-            if selected_batch and selected_batch != "ALL": 
-                query = query.filter(Sample.sample_id.like(f"{selected_batch}-%"))
-            samples = query.all()
+            prefix = f"{selected_batch}-" if selected_batch and selected_batch != "ALL" else None
+            samples = samples_with_prefix(db, prefix)
             
             data = []
             for s in samples:
@@ -0,0 +1,171 @@
+"""
+분석 결과 수신 측정: 샘플마다 POST /api/v1/result vs 한 번에 POST /api/v1/analysis/results:batch.
+
+임시 SQLite DB 에 run 하나(--samples 개, 절반은 이미 Analysis 행이 있음)를 만들고
+    1) single : 샘플마다 요청 (요청마다 수신함에 1건)
+    2) batch  : JSON 배열 한 번 (항목마다 수신함에 1건, 한 트랜잭션)
+    3) ndjson : NDJSON 한 번 (+ 없는 샘플 / 잘못된 항목 하나씩 섞어 항목별 status 확인)
+    4) retry  : batch 를 그대로 다시 보냄 → 새 이벤트 없이 같은 event_id 가 duplicate 로 와야 함
+두 엔드포인트 모두 수신함(ingest_events)에 저장하고 202 를 돌려주며, 반영은 백그라운드 워커가 합니다.
+수신에 걸린 시간, 실행된 SQL 수, commit 수와 워커가 반영을 마칠 때까지 걸린 시간을 출력하고,
+저장된 결과가 입력과 다르거나 재전송이 다시 쌓이면 종료 코드 1 로 끝납니다.
+
+실행 (ngs_web_lims 디렉터리에서):
+    python -m app.scripts.bench_analysis_batch
+    python -m app.scripts.bench_analysis_batch --samples 96 --variants 500
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+WORK_DIR = tempfile.mkdtemp(prefix="lims_batch_")
+os.environ["LIMS_DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIR, 'batch.db')}"
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.api import analysis_api
+from app.core import ingest_queue
+from app.core.database import SessionLocal, engine, init_db
+from app.models._schema import Analysis, IngestEvent, Order, Sample
+
+ORDER_ID = "GCX-C01-260101-01"
+
+
+def seed(n_samples):
+    with SessionLocal() as db:
+        order = Order(order_id=ORDER_ID, facility="GCX", client_team="NGS", client_name="bench",
+                      reception_date=date(2026, 1, 1))
+        db.add(order)
+        db.flush()
+        for i in range(n_samples):
+            s = Sample(order_pk=order.id, order_id=ORDER_ID, sample_id=f"ACC-260101-01-{i + 1:03d}-DNA",
+                       sample_name=f"S{i}", target_panel="TSO500", current_status="분석 대기", panel_metadata={})
+            db.add(s)
+            db.flush()
+            if i % 2:
+                db.add(Analysis(sample_id=s.id, analysis_status="분석 준비", analysis_results={}))
+        db.commit()
+
+
+def payload(i, run, variants):
+    return {
+        "batch_id": f"RUN-{run}", "order_id": ORDER_ID, "sample_id": f"ACC-260101-01-{i + 1:03d}-DNA",
+        "pipeline_version": "v2.2.0",
+        "results": {"analysis_type": "TSO500", "tumor_purity": 0.4, "tmb_score": round(i / 10 + run, 2),
+                    "msi_status": "MSS", "mapped_reads_pct": 98.1,
+                    "variants": [{"gene": "KRAS", "hgvs_p": f"p.G12{k}", "vaf": 0.12} for k in range(variants)]},
+    }
+
+
+def make_client():
+    app = FastAPI()
+    app.include_router(analysis_api.router, prefix="/api/v1")
+    return TestClient(app)
+
+
+def wait_applied(timeout_s=60):
+    """수신함에 '대기' / '처리 중' 이 없어질 때까지 → 걸린 초"""
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < timeout_s:
+        with SessionLocal() as db:
+            pending = db.query(IngestEvent).filter(
+                IngestEvent.status.in_([ingest_queue.QUEUED, ingest_queue.RUNNING])).count()
+        if not pending:
+            break
+        time.sleep(0.02)
+    return time.perf_counter() - t0
+
+
+def check(items):
+    with SessionLocal() as db:
+        saved = dict(db.query(Sample.sample_id, Analysis.tmb_score).join(Analysis, Analysis.sample_id == Sample.id).all())
+    return all(saved.get(p["sample_id"]) == p["results"]["tmb_score"] for p in items)
+
+
+def event_count():
+    with SessionLocal() as db:
+        return db.query(IngestEvent).count()
+
+
+def main(args):
+    init_db()
+    seed(args.samples)
+    client = make_client()
+
+    counter = {"sql": 0, "commit": 0}
+
+    def count(key):
+        # 수신(요청) 쪽 SQL 만 셈 — 워커 스레드(ingest-N)가 반영하며 실행하는 SQL 은 제외
+        if not threading.current_thread().name.startswith("ingest-"):
+            counter[key] += 1
+
+    event.listen(engine, "before_cursor_execute", lambda *a: count("sql"))
+    event.listen(engine, "commit", lambda *a: count("commit"))
+
+    def measure(label, fn, items):
+        counter.update(sql=0, commit=0)
+        t0 = time.perf_counter()
+        fn()
+        ms = (time.perf_counter() - t0) * 1000
+        sql, commits = counter["sql"], counter["commit"]
+        applied_s = wait_applied()
+        ok = check(items)
+        print(f"{label:<7} {ms:9.1f} ms   sql={sql:<5} commit={commits:<4} applied +{applied_s:.2f} s "
+              f"{'✅' if ok else '❌'}")
+        return ok, ms
+
+    print(f"{args.samples} samples × {args.variants} variants\n")
+    single_items = [payload(i, 1, args.variants) for i in range(args.samples)]
+    ok1, single_ms = measure("single", lambda: [client.post("/api/v1/result", json=p).raise_for_status()
+                                                for p in single_items], single_items)
+
+    batch_items = [payload(i, 2, args.variants) for i in range(args.samples)]
+    batch_response = {}
+    ok2, batch_ms = measure("batch", lambda: batch_response.update(client.post(
+        "/api/v1/analysis/results:batch", json=batch_items).json()), batch_items)
+    ok2 &= batch_response["counts"] == {ingest_queue.QUEUED: args.samples}
+
+    nd_items = [payload(i, 3, args.variants) for i in range(args.samples)]
+    extra = [dict(payload(0, 3, 0), sample_id="ACC-999999-01-001-DNA"), {"sample_id": "broken", "results": {}}]
+    body = "\n".join(json.dumps(p) for p in nd_items + extra)
+    response = {}
+    ok3, _ = measure("ndjson", lambda: response.update(client.post(
+        "/api/v1/analysis/results:batch", content=body,
+        headers={"content-type": "application/x-ndjson"}).json()), nd_items)
+    ok3 &= response["counts"] == {ingest_queue.QUEUED: args.samples + 1, "invalid": 1}
+    unknown_event = response["items"][args.samples]["event_id"]
+    with SessionLocal() as db:
+        ok3 &= db.get(IngestEvent, unknown_event).status == ingest_queue.DEAD   # 없는 샘플은 dead letter
+    print(f"          {response['counts']}")
+
+    # 같은 배치 재전송: 새 이벤트 없이 기존 event_id, 결과도 run 3 그대로
+    before = event_count()
+    retry = client.post("/api/v1/analysis/results:batch", json=batch_items)
+    items = retry.json()["items"]
+    ok4 = (retry.status_code == 202 and event_count() == before
+           and all(item["duplicate"] for item in items)
+           and [item["event_id"] for item in items] == [item["event_id"] for item in batch_response["items"]])
+    wait_applied()
+    ok4 &= check(nd_items)
+    print(f"retry   {len(items)} items → duplicate, ingest_events {before} → {event_count()} "
+          f"{'✅' if ok4 else '❌'}")
+
+    print(f"\nbatch / single = x{single_ms / batch_ms:.1f}")
+    ingest_queue.get_worker().stop()
+    engine.dispose()
+    if not (ok1 and ok2 and ok3 and ok4):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="분석 결과 수신: 샘플별 요청 vs 배치 엔드포인트")
+    parser.add_argument("--samples", type=int, default=48, help="run 하나의 샘플 수")
+    parser.add_argument("--variants", type=int, default=200, help="샘플당 변이 수 (결과 JSON 크기)")
+    main(parser.parse_args())
@@ -0,0 +1,108 @@
+"""
+FASTQ MD5 검증 측정: 작은 버퍼로 한 파일씩 vs app.core.checksum (큰 버퍼 + 프로세스 풀 + 변경 없는 파일 건너뛰기).
+
+임시 폴더에 --files 개 × --size-mb MB 파일을 만들고
+    1) serial  : 64 KB 씩 read() 하며 파일 하나씩 해시 (워커 1개)
+    2) pool    : checksum.verify_files (--buffer-mb 버퍼, --workers 프로세스)
+    3) re-run  : 2) 의 size / mtime 을 기록값으로 넘겨 다시 실행 (전부 '변경 없음' 이어야 함)
+    4) touched : 파일 --touch 개만 mtime 을 바꾼 뒤 다시 실행 (그 파일만 다시 읽어야 함)
+각 단계 시간과 결과 개수를 출력하고, MD5 가 원본과 다르거나 건너뛰기가 맞지 않으면 종료 코드 1 로 끝납니다.
+(페이지 캐시에 올라간 파일로 재므로 실제 디스크보다 CPU 비중이 큽니다. --size-mb 를 메모리보다 크게 주면 디스크 기준)
+
+실행 (ngs_web_lims 디렉터리에서):
+    python -m app.scripts.bench_checksum
+    python -m app.scripts.bench_checksum --files 16 --size-mb 256 --workers 8
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from app.core import checksum
+
+
+def build_files(work_dir, count, size_mb):
+    block = os.urandom(1024 * 1024)
+    paths, md5s = [], []
+    for i in range(count):
+        path = os.path.join(work_dir, f"ACC-260101-01-{i // 2 + 1:03d}-DNA_R{i % 2 + 1}.fastq.gz")
+        digest = hashlib.md5()
+        with open(path, "wb") as f:
+            for n in range(int(size_mb)):
+                chunk = block[n % 7:] + block[:n % 7] if n else block   # 파일마다 내용이 다르게
+                chunk = bytes([i % 256]) + chunk[1:]
+                f.write(chunk)
+                digest.update(chunk)
+        paths.append(path)
+        md5s.append(digest.hexdigest())
+    return paths, md5s
+
+
+def legacy_verify(paths):
+    out = []
+    for path in paths:
+        digest = hashlib.md5()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(64 * 1024), b""):
+                digest.update(chunk)
+        out.append(digest.hexdigest())
+    return out
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def main(args):
+    work_dir = tempfile.mkdtemp(prefix="lims_checksum_")
+    try:
+        paths, md5s = build_files(work_dir, args.files, args.size_mb)
+        total_mb = args.files * args.size_mb
+        print(f"{args.files} files × {args.size_mb} MB = {total_mb:,.0f} MB, "
+              f"workers {args.workers}, buffer {args.buffer_mb} MB\n")
+        buffer_bytes = int(args.buffer_mb * 1024 * 1024)
+        items = [{"key": i, "path": p, "md5": m} for i, (p, m) in enumerate(zip(paths, md5s))]
+        ok = True
+
+        legacy, serial_s = timed(lambda: legacy_verify(paths))
+        ok &= legacy == md5s
+        print(f"serial   {serial_s:7.2f} s  {total_mb / serial_s:8.1f} MB/s")
+
+        results, pool_s = timed(lambda: checksum.verify_files(items, workers=args.workers, buffer_bytes=buffer_bytes))
+        ok &= all(r["status"] == checksum.MATCH for r in results)
+        print(f"pool     {pool_s:7.2f} s  {total_mb / pool_s:8.1f} MB/s  {checksum.summarize(results)}")
+
+        recorded = [{**item, "size": r["size"], "mtime_ns": r["mtime_ns"], "status": r["status"],
+                     "verified_md5": r["md5"]} for item, r in zip(items, results)]
+        rerun, rerun_s = timed(lambda: checksum.verify_files(recorded, workers=args.workers, buffer_bytes=buffer_bytes))
+        ok &= all(r["status"] == checksum.UNCHANGED for r in rerun)
+        print(f"re-run   {rerun_s:7.2f} s  {checksum.summarize(rerun)}")
+
+        touched = min(args.touch, len(paths))
+        for path in paths[:touched]:
+            st = os.stat(path)
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        again, again_s = timed(lambda: checksum.verify_files(recorded, workers=args.workers, buffer_bytes=buffer_bytes))
+        ok &= sum(r["status"] == checksum.MATCH for r in again) == touched
+        print(f"touched  {again_s:7.2f} s  {checksum.summarize(again)}")
+
+        print(f"\npool / serial = x{serial_s / pool_s:.1f}   {'✅' if ok else '❌'}")
+        if not ok:
+            sys.exit(1)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FASTQ MD5 검증: 직렬 작은 버퍼 vs 큰 버퍼 + 프로세스 풀 + 건너뛰기")
+    parser.add_argument("--files", type=int, default=8, help="파일 수")
+    parser.add_argument("--size-mb", type=int, default=128, help="파일 크기 (MB)")
+    parser.add_argument("--workers", type=int, default=checksum.WORKERS, help="프로세스 수")
+    parser.add_argument("--buffer-mb", type=float, default=checksum.BUFFER_BYTES / 1024 / 1024, help="읽기 버퍼 (MB)")
+    parser.add_argument("--touch", type=int, default=2, help="mtime 을 바꿀 파일 수 (touched 단계)")
+    main(parser.parse_args())
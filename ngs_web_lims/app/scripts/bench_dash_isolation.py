@@ -0,0 +1,241 @@
+"""
+Dash 서빙 모드(LIMS_DASH_MODE) 비교: Dash 페이지가 바쁠 때 /api/v1/result 지연 시간.
+
+임시 SQLite DB 를 만들고, 모드마다 서버를 자식 프로세스로 띄웁니다.
+    - inprocess : uvicorn 1개 안에 FastAPI + Dash (WSGIMiddleware)
+    - proxy     : uvicorn(FastAPI + DashProxy) + 별도 Dash WSGI 서버 (멀티 프로세스)
+Dash 쪽에는 PDF 생성 / SSH 동기화를 흉내 낸 느린 콜백(CPU 점유 + I/O 대기)이 하나 있고,
+여러 클라이언트가 이 콜백을 계속 호출하는 동안 분석 서버처럼 /api/v1/result 를 주기적으로 POST 하여
+p50 / p99 를 잽니다. (idle = Dash 부하 없이 같은 측정)
+
+실행 (ngs_web_lims 디렉터리에서):
+    python -m app.scripts.bench_dash_isolation
+    python -m app.scripts.bench_dash_isolation --busy-clients 32 --busy-cpu-ms 200 --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+# 벤치용 Dash 앱 (실제 페이지 대신 느린 콜백 하나)
+BENCH_DASH_APPS = {"/busy": "app.scripts.bench_dash_isolation:create_busy_app"}
+BUSY_CALLBACK_BODY = {
+    "output": "busy-out.children",
+    "outputs": {"id": "busy-out", "property": "children"},
+    "inputs": [{"id": "busy-btn", "property": "n_clicks", "value": 1}],
+    "changedPropIds": ["busy-btn.n_clicks"],
+    "state": [],
+}
+
+
+# ==========================================
+# [1] 서버 쪽 (자식 프로세스에서 실행)
+# ==========================================
+def create_busy_app(requests_pathname_prefix="/"):
+    import dash
+    from dash import Input, Output, html
+
+    cpu_s = float(os.environ.get("BENCH_BUSY_CPU_MS", 150)) / 1000
+    io_s = float(os.environ.get("BENCH_BUSY_IO_MS", 200)) / 1000
+
+    app = dash.Dash(__name__, requests_pathname_prefix=requests_pathname_prefix)
+    app.layout = html.Div([html.Button("run", id="busy-btn"), html.Div(id="busy-out")])
+
+    @app.callback(Output("busy-out", "children"), Input("busy-btn", "n_clicks"))
+    def heavy_export(n_clicks):
+        # PDF 렌더링처럼 GIL 을 잡고 도는 구간
+        deadline = time.perf_counter() + cpu_s
+        acc = 0
+        while time.perf_counter() < deadline:
+            acc += sum(i * i for i in range(500))
+        # SSH / LLM 응답 대기처럼 스레드를 점유한 채 기다리는 구간
+        time.sleep(io_s)
+        return f"done {acc % 7}"
+
+    return app
+
+
+def serve_api(port, mode, upstream):
+    import uvicorn
+    from fastapi import FastAPI
+
+    from app.api import analysis_api
+    from app.core.dash_serving import mount_dash_apps
+
+    app = FastAPI()
+    app.include_router(analysis_api.router, prefix="/api/v1")
+    mount_dash_apps(app, BENCH_DASH_APPS, mode=mode, upstream=upstream)
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def serve_dash(port, workers):
+    import logging
+
+    from app.core.dash_serving import build_dash_wsgi, serve_dash_wsgi
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    serve_dash_wsgi(lambda: build_dash_wsgi(BENCH_DASH_APPS), "127.0.0.1", port, workers=workers)
+
+
+# ==========================================
+# [2] 클라이언트 쪽 (측정)
+# ==========================================
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def prepare_db(url):
+    from sqlalchemy.orm import sessionmaker
+
+    from app.core.db_profile import create_lims_engine
+    from app.core.migrations import upgrade
+    from app.models._schema import Sample
+    from app.scripts.bench_query_count import seed
+
+    engine = create_lims_engine(url)
+    upgrade(engine, "app.migrations", log=lambda msg: None)
+    with sessionmaker(bind=engine)() as db:
+        seed(db, 20)
+        sample = db.query(Sample).first()
+        key = (sample.sample_id, sample.order_id)
+    engine.dispose()
+    return key
+
+
+def result_payload(sample_id, order_id):
+    return {
+        "batch_id": "BENCH", "order_id": order_id, "sample_id": sample_id, "pipeline_version": "bench",
+        "results": {"analysis_type": "TSO500", "tumor_purity": 0.5, "tmb_score": 10.0, "msi_status": "MSS",
+                    "mapped_reads_pct": 99.0, "variants": []},
+    }
+
+
+async def wait_ready(client, url, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if (await client.get(url)).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"server not ready: {url}")
+
+
+async def busy_loop(client, base, stop, counter):
+    while not stop.is_set():
+        try:
+            resp = await client.post(f"{base}/busy/_dash-update-component", json=BUSY_CALLBACK_BODY)
+            counter["ok" if resp.status_code == 200 else "fail"] += 1
+        except httpx.HTTPError:
+            counter["fail"] += 1
+
+
+async def probe(client, base, payload, seconds, interval):
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        try:
+            resp = await client.post(f"{base}/api/v1/result", json=payload)
+            if resp.status_code != 200:
+                errors += 1
+        except httpx.HTTPError:
+            errors += 1
+        latencies.append((time.perf_counter() - t0) * 1000)
+        await asyncio.sleep(interval)
+    return latencies, errors
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)] if ordered else 0.0
+
+
+async def measure(base, payload, busy_clients, seconds, interval):
+    timeout = httpx.Timeout(120.0)
+    limits = httpx.Limits(max_connections=busy_clients + 10)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        await wait_ready(client, f"{base}/busy/")
+        stop, counter = asyncio.Event(), {"ok": 0, "fail": 0}
+        workers = [asyncio.create_task(busy_loop(client, base, stop, counter)) for _ in range(busy_clients)]
+        await asyncio.sleep(0.5 if busy_clients else 0)  # 부하가 차오를 때까지
+        latencies, errors = await probe(client, base, payload, seconds, interval)
+        stop.set()
+        await asyncio.gather(*workers)
+    return statistics.median(latencies), percentile(latencies, 0.99), errors, counter["ok"] / seconds
+
+
+def run_mode(mode, env, payload, args):
+    api_port = free_port()
+    procs = []
+    if mode == "proxy":
+        dash_port = free_port()
+        procs.append(subprocess.Popen([sys.executable, "-m", "app.scripts.bench_dash_isolation",
+                                       "--serve-dash", str(dash_port), "--workers", str(args.workers)], env=env))
+        upstream = f"http://127.0.0.1:{dash_port}"
+    else:
+        upstream = ""
+    procs.append(subprocess.Popen([sys.executable, "-m", "app.scripts.bench_dash_isolation",
+                                   "--serve-api", str(api_port), "--mode", mode, "--upstream", upstream], env=env))
+    base = f"http://127.0.0.1:{api_port}"
+    try:
+        rows = []
+        for busy in (0, args.busy_clients):
+            rows.append((busy, *asyncio.run(measure(base, payload, busy, args.seconds, args.interval))))
+        return rows
+    finally:
+        for proc in procs:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+
+def main(args):
+    tmp_dir = tempfile.mkdtemp(prefix="lims_bench_")
+    url = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+    sample_id, order_id = prepare_db(url)
+    payload = result_payload(sample_id, order_id)
+
+    env = {**os.environ, "LIMS_DATABASE_URL": url,
+           "BENCH_BUSY_CPU_MS": str(args.busy_cpu_ms), "BENCH_BUSY_IO_MS": str(args.busy_io_ms)}
+    print(f"DB: {url}")
+    print(f"busy callback: {args.busy_cpu_ms}ms CPU + {args.busy_io_ms}ms wait, "
+          f"proxy workers: {args.workers}, {args.seconds}s per run\n")
+    print(f"{'mode':<10} {'dash load':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7} {'dash cb/s':>10}")
+    for mode in args.modes:
+        for busy, p50, p99, errors, cb_rate in run_mode(mode, env, payload, args):
+            load = f"{busy} cli" if busy else "idle"
+            print(f"{mode:<10} {load:>9} {p50:>8.1f} {p99:>8.1f} {errors:>7} {cb_rate:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dash 서빙 모드별 API 지연 시간 비교")
+    parser.add_argument("--modes", nargs="+", default=["inprocess", "proxy"], choices=["inprocess", "proxy"])
+    parser.add_argument("--busy-clients", type=int, default=16, help="느린 Dash 콜백을 계속 호출하는 클라이언트 수")
+    parser.add_argument("--busy-cpu-ms", type=float, default=150, help="콜백 1회의 CPU 점유 시간")
+    parser.add_argument("--busy-io-ms", type=float, default=200, help="콜백 1회의 대기(I/O) 시간")
+    parser.add_argument("--workers", type=int, default=4, help="proxy 모드 Dash 서버 워커 프로세스 수")
+    parser.add_argument("--seconds", type=float, default=5.0, help="측정 시간(초)")
+    parser.add_argument("--interval", type=float, default=0.05, help="/api/v1/result 호출 간격(초)")
+    # 내부용: 자식 프로세스 진입점
+    parser.add_argument("--serve-api", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--serve-dash", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--mode", default="inprocess", help=argparse.SUPPRESS)
+    parser.add_argument("--upstream", default="", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_api:
+        serve_api(args.serve_api, args.mode, args.upstream)
+    elif args.serve_dash:
+        serve_dash(args.serve_dash, args.workers)
+    else:
+        main(args)
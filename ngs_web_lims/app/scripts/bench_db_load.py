@@ -0,0 +1,136 @@
+"""
+동시 편집자 부하 테스트 (DB 엔진 프로파일 비교).
+
+임시 DB에 샘플을 채운 뒤, 정해진 시간 동안
+    - N 명의 "편집자" 스레드: 샘플 목록 조회 → 샘플 1건 상태 변경 + ActionLog 1건 추가 → commit
+    - R 개의 "리포트" 스레드: 전체 샘플 + 연관 테이블을 읽는 무거운 조회 (보드/리포트 화면 새로고침)
+를 반복합니다. Dash 콜백이 WSGI 스레드에서 동시에 도는 상황을 흉내 낸 것입니다.
+rollback journal 에서는 긴 읽기가 쓰기 commit 을 막아 "database is locked" 가 나고, WAL 에서는 막지 않습니다.
+
+    - legacy : 예전 설정 (create_engine + check_same_thread=False, rollback journal)
+    - tuned  : app/core/db_profile.create_lims_engine (WAL + busy_timeout 등)
+
+실행 (ngs_web_lims 디렉터리에서):
+    python -m app.scripts.bench_db_load
+    python -m app.scripts.bench_db_load --editors 1 8 32 --readers 4 --seconds 5
+    python -m app.scripts.bench_db_load --url postgresql+psycopg2://user:pw@host/lims_bench --profiles tuned
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db_profile import create_lims_engine
+from app.core.repository import sample_query
+from app.models._schema import ActionLog, Base, Sample
+from app.scripts.bench_query_count import STATUSES, seed
+
+N_SAMPLES = 2000
+
+
+def make_engine(profile, url):
+    if profile == "legacy":
+        connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+        return create_engine(url, connect_args=connect_args, pool_pre_ping=True)
+    return create_lims_engine(url)
+
+
+def editor(Session, sample_ids, deadline, stats, lock):
+    rnd = random.Random(threading.get_ident())
+    commits, errors, latencies = 0, 0, []
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        db = Session()
+        try:
+            # 화면 새로고침 (읽기) + 셀 하나 수정 + 로그 (쓰기)
+            db.query(Sample.id, Sample.current_status).filter(Sample.target_panel == "WES").limit(100).all()
+            sid = rnd.choice(sample_ids)
+            new_status = rnd.choice(STATUSES)
+            db.query(Sample).filter(Sample.id == sid).update({"current_status": new_status})
+            db.add(ActionLog(sample_id=sid, action_type="STATUS_CHANGE", new_state=new_status, details="load test"))
+            db.commit()
+            commits += 1
+            latencies.append((time.perf_counter() - t0) * 1000)
+        except OperationalError:
+            db.rollback()
+            errors += 1
+        finally:
+            db.close()
+    with lock:
+        stats["commits"] += commits
+        stats["errors"] += errors
+        stats["latencies"].extend(latencies)
+
+
+def reporter(Session, deadline, stats, lock):
+    reads = 0
+    while time.perf_counter() < deadline:
+        db = Session()
+        try:
+            # 트랜잭션을 열어 둔 채 전체 보드를 훑는다 (SQLite 는 이 동안 SHARED 잠금 유지)
+            with db.begin():
+                for s in sample_query(db).yield_per(200):
+                    _ = (s.order, s.wet_lab, s.analysis)
+            reads += 1
+        except OperationalError:
+            pass
+        finally:
+            db.close()
+    with lock:
+        stats["reads"] += reads
+
+
+def run(profile, url, n_editors, n_readers, seconds, sample_ids):
+    engine = make_engine(profile, url)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    stats = {"commits": 0, "errors": 0, "reads": 0, "latencies": []}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    threads = [threading.Thread(target=editor, args=(Session, sample_ids, deadline, stats, lock))
+               for _ in range(n_editors)]
+    threads += [threading.Thread(target=reporter, args=(Session, deadline, stats, lock)) for _ in range(n_readers)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    engine.dispose()
+
+    lat = sorted(stats["latencies"])
+    p50 = statistics.median(lat) if lat else 0
+    p95 = lat[int(len(lat) * 0.95) - 1] if lat else 0
+    return stats["commits"] / seconds, stats["errors"], stats["reads"] / seconds, p50, p95
+
+
+def main(url, profiles, editor_counts, n_readers, seconds):
+    if not url:
+        url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='lims_bench_'), 'bench.db')}"
+    setup_engine = create_lims_engine(url)
+    Base.metadata.drop_all(bind=setup_engine)
+    Base.metadata.create_all(bind=setup_engine)
+    with sessionmaker(bind=setup_engine)() as db:
+        seed(db, N_SAMPLES)
+        sample_ids = [row[0] for row in db.query(Sample.id).all()]
+    setup_engine.dispose()
+
+    print(f"DB: {url}  ({N_SAMPLES} samples, {n_readers} report readers, {seconds}s per run)\n")
+    print(f"{'profile':<8} {'editors':>7} {'commits/s':>10} {'locked':>7} {'reads/s':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for profile in profiles:
+        for n in editor_counts:
+            tps, errors, rps, p50, p95 = run(profile, url, n, n_readers, seconds, sample_ids)
+            print(f"{profile:<8} {n:>7} {tps:>10.1f} {errors:>7} {rps:>8.1f} {p50:>8.1f} {p95:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="동시 편집자 쓰기 부하 테스트")
+    parser.add_argument("--url", default=None, help="대상 DB URL (기본: 임시 SQLite 파일). 테이블을 지우고 다시 만듭니다!")
+    parser.add_argument("--profiles", nargs="+", default=["legacy", "tuned"], choices=["legacy", "tuned"])
+    parser.add_argument("--editors", type=int, nargs="+", default=[1, 4, 16, 32], help="동시 편집자 수 목록")
+    parser.add_argument("--readers", type=int, default=2, help="동시에 도는 무거운 조회(리포트) 스레드 수")
+    parser.add_argument("--seconds", type=float, default=3.0, help="실행 시간(초)")
+    args = parser.parse_args()
+    main(args.url, args.profiles, args.editors, args.readers, args.seconds)
@@ -0,0 +1,125 @@
+"""
+엑셀 헤더 매핑 측정: 행마다 퍼지 매칭(get_fuzzy_val) vs 파일당 1회 헤더 플랜(compile_header_plan).
+
+    1) register : 의뢰서 행(기본 10,000건) → (Sample 직접 컬럼, panel_metadata) 변환
+                  legacy = 행 × 매핑 키 × 헤더 문자열 정규화 / plan = 컬럼 선택 + 이름 변경
+    2) overwrite: 칸반 모달 엑셀 덮어쓰기 (기본 2,000행)
+                  legacy = 행마다 업로드 전체에서 sample_name 선형 탐색 / plan = merge_excel_rows (키 색인 + reindex)
+각 단계의 처리 시간(중앙값)을 출력하고, 두 방식의 결과가 같은지 확인합니다.
+
+실행 (ngs_web_lims 디렉터리에서):
+    python -m app.scripts.bench_header_plan
+    python -m app.scripts.bench_header_plan --rows 50000 --overwrite-rows 5000
+"""
+import argparse
+import statistics
+import time
+
+import pandas as pd
+
+from app.core.mapping import SAMPLE_NAME_FALLBACKS, compile_header_plan, get_full_mapping_for_panel
+from app.core.excel_merge import merge_excel_rows
+
+PANEL = "TSO500"
+# 실제 TSO500 의뢰서 헤더 (줄바꿈 / 공백이 섞여 있음)
+FORM_HEADER = ["번호", "Tumor\n Type", "Patient ID/ Sample ID", "Specimen Type", "Remarks", "Sample Group",
+               "Pairing\nInfo.", "Sample Label\n(of tube)", "Extraction 필요 유무", "특이사항",
+               "Nucleic\nAcid\nType", "Clinical \nReport", "Advanced Analysis Report"]
+
+
+def timed(fn, repeat):
+    timings, result = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(timings), result
+
+
+# ==========================================
+# [1] 의뢰서 행 변환
+# ==========================================
+def form_rows(n):
+    return [dict(zip(FORM_HEADER, [i + 1, "hLC", f"P{i:05d}", "FFPE", "", "G1", "-", f"T{i}", "O", "",
+                                   "DNA/RNA", "Y", ""])) for i in range(n)]
+
+
+def legacy_convert(rows):
+    def get_fuzzy_val(raw_dict, target_key):
+        if target_key in raw_dict: return raw_dict[target_key]
+        clean_target = str(target_key).lower().replace(" ", "").replace("\n", "")
+        for k, v in raw_dict.items():
+            if clean_target in str(k).lower().replace(" ", "").replace("\n", ""):
+                return v
+        return None
+
+    mapping_rule = get_full_mapping_for_panel(PANEL)
+    out = []
+    for raw_row in rows:
+        base_data, extra_metadata = {}, {}
+        for excel_col, map_info in mapping_rule.items():
+            val = get_fuzzy_val(raw_row, excel_col)
+            clean_val = str(val).strip() if val is not None and str(val).strip() not in ["nan", "NaT", ""] else None
+            if map_info["is_extra"]: extra_metadata[map_info["db_col"]] = clean_val
+            else: base_data[map_info["db_col"]] = clean_val
+        out.append((base_data, extra_metadata))
+    return out
+
+
+def plan_convert(rows):
+    df = pd.DataFrame(rows, columns=list(rows[0].keys()))
+    plan = compile_header_plan(list(df.columns), get_full_mapping_for_panel(PANEL),
+                               fallbacks={"sample_name": SAMPLE_NAME_FALLBACKS})
+    return plan.split_records(df)
+
+
+def same_conversion(a, b):
+    drop_none = lambda d: {k: v for k, v in d.items() if v is not None}
+    return all(drop_none(x[0]) == drop_none(y[0]) and drop_none(x[1]) == drop_none(y[1]) for x, y in zip(a, b))
+
+
+# ==========================================
+# [2] 칸반 엑셀 덮어쓰기
+# ==========================================
+def modal_rows(n):
+    return [{"id": i, "sample_name": f"P{i:05d}", "target_panel": PANEL, "dna_qc": "", "dna_concentration": "",
+             "storage_location": "", "issue_comment": ""} for i in range(n)]
+
+
+def legacy_overwrite(row_data, df_up):
+    up_dict = df_up.to_dict("records")
+    new_data = []
+    for row in row_data:
+        new_row = row.copy()
+        match = next((u for u in up_dict if str(u.get("sample_name")) == str(row.get("sample_name"))), None)
+        if match:
+            for k, v in match.items():
+                if k in new_row and pd.notna(v) and k not in ["id", "sample_name", "target_panel"]:
+                    new_row[k] = str(v).strip()
+        new_data.append(new_row)
+    return new_data
+
+
+def main(args):
+    rows = form_rows(args.rows)
+    legacy_ms, legacy_out = timed(lambda: legacy_convert(rows), args.repeat)
+    plan_ms, plan_out = timed(lambda: plan_convert(rows), args.repeat)
+    print(f"■ 의뢰서 {args.rows:,}행 변환 (매핑 키 {len(get_full_mapping_for_panel(PANEL))}개 / 헤더 {len(FORM_HEADER)}개)")
+    print(f"    legacy {legacy_ms:9.1f} ms")
+    print(f"    plan   {plan_ms:9.1f} ms   (x{legacy_ms / plan_ms:.1f}, 결과 동일: {same_conversion(legacy_out, plan_out)})")
+
+    row_data = modal_rows(args.overwrite_rows)
+    df_up = pd.DataFrame([{**r, "dna_qc": "PASS", "dna_concentration": 12.5} for r in reversed(row_data)])
+    legacy_ms, legacy_out = timed(lambda: legacy_overwrite(row_data, df_up), args.repeat)
+    plan_ms, plan_out = timed(lambda: merge_excel_rows(row_data, df_up)[0], args.repeat)
+    print(f"\n■ 칸반 엑셀 덮어쓰기 {args.overwrite_rows:,}행")
+    print(f"    legacy {legacy_ms:9.1f} ms")
+    print(f"    plan   {plan_ms:9.1f} ms   (x{legacy_ms / plan_ms:.1f}, 결과 동일: {legacy_out == plan_out})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="엑셀 헤더 매핑: 행별 퍼지 매칭 vs 헤더 플랜")
+    parser.add_argument("--rows", type=int, default=10000, help="의뢰서 행 수")
+    parser.add_argument("--overwrite-rows", type=int, default=2000, help="칸반 덮어쓰기 행 수")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (중앙값 사용)")
+    main(parser.parse_args())
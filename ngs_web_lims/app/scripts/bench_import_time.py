@@ -0,0 +1,143 @@
+"""
+서버 콜드 스타트(import app.main) 시간 측정 스크립트.
+
+새 파이썬 프로세스에서 `python -X importtime` 으로 app.main 을 import 하고
+    - 전체 소요 시간 (LIMS_DASH_LAZY=1 지연 생성 vs 0 즉시 생성)
+    - 패키지별 import 시간 상위 N 개 (self 시간 합계)
+    - 각 Dash 앱을 처음 만들 때 드는 시간 (= 지연 모드에서 첫 방문 요청에 얹히는 비용)
+을 출력합니다. --save 로 결과를 JSON 으로 저장해 두고, 이후 --compare 로 비교하면
+기준보다 허용 범위 이상 느려졌을 때 종료 코드 1 로 끝납니다 (CI / 릴리스 전 점검용).
+
+실행 (ngs_web_lims 디렉터리에서):
+    python -m app.scripts.bench_import_time
+    python -m app.scripts.bench_import_time --save importtime_baseline.json
+    python -m app.scripts.bench_import_time --compare importtime_baseline.json --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+# 자식 프로세스에서 실행할 코드: app.main import 시간 + (옵션) Dash 앱별 생성 시간
+CHILD_CODE = """
+import json, time
+t0 = time.perf_counter()
+import app.main
+wall = time.perf_counter() - t0
+builds = {}
+if %(per_app)r:
+    from app.core.dash_serving import create_dash_app
+    from app.dash_server import DASH_APPS
+    for path, spec in DASH_APPS.items():
+        t1 = time.perf_counter()
+        try:
+            create_dash_app(path, spec)
+            builds[path] = (time.perf_counter() - t1) * 1000
+        except Exception as e:
+            builds[path] = repr(e)
+print("BENCH_RESULT " + json.dumps({"wall_ms": wall * 1000, "builds": builds}))
+"""
+
+
+# ==========================================
+# [1] 자식 프로세스 실행 + -X importtime 파싱
+# ==========================================
+def parse_importtime(stderr):
+    """[(self_us, cumulative_us, depth, module)] ─ depth 0 이 최상위 import"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        rows.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return rows
+
+
+def run_once(lazy, per_app=False):
+    env = {**os.environ, "LIMS_DASH_LAZY": "1" if lazy else "0", "LIMS_DASH_MODE": "inprocess"}
+    env.setdefault("LIMS_DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='lims_bench_'), 'bench.db')}")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD_CODE % {"per_app": per_app}],
+        env=env, capture_output=True, text=True,
+    )
+    result_line = next((l for l in proc.stdout.splitlines() if l.startswith("BENCH_RESULT ")), None)
+    if proc.returncode != 0 or result_line is None:
+        sys.stderr.write(proc.stderr[-3000:])
+        raise SystemExit(f"import app.main 실패 (LIMS_DASH_LAZY={int(lazy)})")
+    return json.loads(result_line[len("BENCH_RESULT "):]), parse_importtime(proc.stderr)
+
+
+def by_package(rows, top):
+    totals = defaultdict(int)
+    for self_us, _, _, module in rows:
+        totals[module.split(".")[0]] += self_us
+    return sorted(totals.items(), key=lambda kv: kv[1], reverse=True)[:top]
+
+
+# ==========================================
+# [2] 측정 / 비교
+# ==========================================
+def measure(repeat, top):
+    report = {}
+    for label, lazy in (("lazy", True), ("eager", False)):
+        walls, last_rows = [], []
+        for _ in range(repeat):
+            result, last_rows = run_once(lazy)
+            walls.append(result["wall_ms"])
+        report[label] = {
+            "wall_ms": statistics.median(walls),
+            "modules": len(last_rows),
+            "packages_ms": {name: us / 1000 for name, us in by_package(last_rows, top)},
+        }
+    report["first_request_build_ms"] = run_once(True, per_app=True)[0]["builds"]
+    return report
+
+
+def print_report(report):
+    for label in ("lazy", "eager"):
+        item = report[label]
+        print(f"■ {label:<5} import app.main: {item['wall_ms']:8.1f} ms  ({item['modules']} modules)")
+        for name, ms in item["packages_ms"].items():
+            print(f"    {name:<28} {ms:8.1f} ms")
+    print("\n■ Dash 앱별 생성 시간 (지연 모드에서 첫 요청에 추가되는 비용)")
+    for path, ms in report["first_request_build_ms"].items():
+        print(f"    {path:<16} {ms:8.1f} ms" if isinstance(ms, (int, float)) else f"    {path:<16} 실패: {ms}")
+
+
+def compare(report, baseline_path, tolerance):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    failed = False
+    print(f"\n■ 기준({baseline_path}) 대비 (허용 +{tolerance:.0%})")
+    for label in ("lazy", "eager"):
+        before, now = baseline[label]["wall_ms"], report[label]["wall_ms"]
+        regressed = now > before * (1 + tolerance)
+        failed |= regressed
+        print(f"    {label:<5} {before:8.1f} ms → {now:8.1f} ms  {'❌ 느려짐' if regressed else '✅'}")
+    return failed
+
+
+def main(args):
+    report = measure(args.repeat, args.top)
+    print_report(report)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n저장: {args.save}")
+    if args.compare and compare(report, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="서버 콜드 스타트(import app.main) 시간 측정")
+    parser.add_argument("--repeat", type=int, default=3, help="모드별 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--top", type=int, default=15, help="출력할 패키지 수")
+    parser.add_argument("--save", metavar="JSON", help="결과를 기준 파일로 저장")
+    parser.add_argument("--compare", metavar="JSON", help="기준 파일과 비교 (느려지면 종료 코드 1)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용 증가 비율 (기본 25%%)")
+    main(parser.parse_args())
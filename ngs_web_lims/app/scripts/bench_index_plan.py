@@ -0,0 +1,172 @@
+"""
+인덱스 / 생성 컬럼 계획(app/migrations/v0002_query_indexes.py) 효과 측정 스크립트.
+
+임시 SQLite DB에 합성 샘플(기본 100,000건)을 넣고,
+    1) 계획 적용 전: 기존 인덱스(order_id, sample_id)만 있는 상태 + 기존 쿼리 형태(LIKE, JSON_EXTRACT)
+    2) 계획 적용 후: 새 인덱스 + 범위 조건 / 생성 컬럼 쿼리
+각각의 EXPLAIN QUERY PLAN 과 실행 시간(중앙값)을 나란히 출력합니다.
+
+실행 (ngs_web_lims 디렉터리에서):
+    python -m app.scripts.bench_index_plan
+    python -m app.scripts.bench_index_plan --samples 20000 --repeat 3
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, text
+
+from app.core.migrations import upgrade
+from app.models._schema import Analysis, Base, Order, Sample
+
+# 계획 이전부터 있던 인덱스 (이것만 남기고 나머지를 지워 "적용 전" 상태를 만든다)
+LEGACY_INDEXES = {"ix_orders_order_id", "ix_samples_order_id", "ix_samples_sample_id"}
+
+PANELS = ["TSO500", "WES", "WGS", "WTS", "Panel_A"]
+STATUSES = ["접수 대기", "접수 완료", "QC 진행", "시퀀싱 진행", "분석 진행", "분석 완료", "정산 대기"]
+PROVIDERS = ["Macrogen", "Theragen", "Novogene"]
+SAMPLES_PER_ORDER = 8
+
+# (설명, 적용 전 SQL, 적용 후 SQL)
+QUERIES = [
+    ("칸반/셋업: 패널 + 상태",
+     "SELECT id FROM samples WHERE target_panel = 'TSO500' AND current_status = '분석 진행'",
+     "SELECT id FROM samples WHERE target_panel = 'TSO500' AND current_status = '분석 진행'"),
+    ("데이터 등록: 상태 IN",
+     "SELECT id FROM samples WHERE current_status IN ('시퀀싱 진행', '분석 진행')",
+     "SELECT id FROM samples WHERE current_status IN ('시퀀싱 진행', '분석 진행')"),
+    ("칸반 이동: 오더 + 상태",
+     "SELECT id FROM samples WHERE order_pk = 777 AND current_status = '접수 대기'",
+     "SELECT id FROM samples WHERE order_pk = 777 AND current_status = '접수 대기'"),
+    ("리포트: Sample ID 접두어",
+     "SELECT id FROM samples WHERE sample_id LIKE 'ACC-260101-%'",
+     "SELECT id FROM samples WHERE sample_id >= 'ACC-260101-' AND sample_id < 'ACC-260101.'"),
+    ("프로젝트 뷰: 접수일 최신순",
+     "SELECT id FROM orders ORDER BY reception_date DESC LIMIT 50",
+     "SELECT id FROM orders ORDER BY reception_date DESC LIMIT 50"),
+    ("접수일 구간",
+     "SELECT id FROM orders WHERE reception_date BETWEEN '2026-03-01' AND '2026-03-07'",
+     "SELECT id FROM orders WHERE reception_date BETWEEN '2026-03-01' AND '2026-03-07'"),
+    ("JSON: 해독 업체",
+     "SELECT id FROM samples WHERE json_extract(panel_metadata, '$.seq_provider') = 'Novogene'",
+     "SELECT id FROM samples WHERE seq_provider = 'Novogene'"),
+    ("JSON: TMB >= 20",
+     "SELECT id FROM analysis WHERE json_extract(analysis_results, '$.tmb_score') >= 20",
+     "SELECT id FROM analysis WHERE tmb_score >= 20"),
+]
+
+
+# ==========================================
+# [1] 합성 데이터 (Core executemany 로 빠르게 적재)
+# ==========================================
+def seed(engine, n_samples, seed_value=42):
+    rnd = random.Random(seed_value)
+    n_orders = max(n_samples // SAMPLES_PER_ORDER, 1)
+    start_day = date(2026, 1, 1)
+    now = datetime(2026, 6, 1)
+
+    orders, samples, analyses = [], [], []
+    for o in range(n_orders):
+        day = start_day + timedelta(days=o % 365)
+        orders.append({
+            "id": o + 1, "order_id": f"GCX-C01-{day:%y%m%d}-{o:05d}", "facility": "GCX",
+            "reception_date": day, "reception_type": "미정", "sales_unit_price": 0,
+        })
+    for i in range(n_samples):
+        o = i // SAMPLES_PER_ORDER
+        day = start_day + timedelta(days=o % 365)
+        samples.append({
+            "id": i + 1, "order_pk": min(o, n_orders - 1) + 1, "order_id": orders[min(o, n_orders - 1)]["order_id"],
+            "project_name": "Default_Project", "sample_id": f"ACC-{day:%y%m%d}-{o:05d}-{i % SAMPLES_PER_ORDER:03d}",
+            "target_panel": rnd.choice(PANELS), "sample_name": f"S{i}", "current_status": rnd.choice(STATUSES),
+            "panel_metadata": json.dumps({"seq_provider": rnd.choice(PROVIDERS)}), "created_at": now,
+        })
+        analyses.append({
+            "sample_id": i + 1, "analysis_status": "대기중",
+            "analysis_results": json.dumps({"analysis_type": "TSO500", "msi_status": rnd.choice(["MSS", "MSI-H"]),
+                                            "tmb_score": round(rnd.uniform(0, 40), 2)}),
+        })
+
+    with engine.begin() as conn:
+        conn.execute(Order.__table__.insert(), orders)
+        conn.execute(text(
+            "INSERT INTO samples (id, order_pk, order_id, project_name, sample_id, target_panel, sample_name, "
+            "current_status, panel_metadata, created_at) VALUES (:id, :order_pk, :order_id, :project_name, "
+            ":sample_id, :target_panel, :sample_name, :current_status, :panel_metadata, :created_at)"), samples)
+        conn.execute(text(
+            "INSERT INTO analysis (sample_id, analysis_status, analysis_results) "
+            "VALUES (:sample_id, :analysis_status, :analysis_results)"), analyses)
+
+
+def drop_plan_indexes(engine):
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name not in LEGACY_INDEXES and not index.unique:
+                    conn.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+
+
+# ==========================================
+# [2] 측정
+# ==========================================
+def explain(conn, sql):
+    rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return " / ".join(row[-1] for row in rows)
+
+
+def timed(conn, sql, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        conn.execute(text(sql)).all()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def measure(engine, which, repeat):
+    results = []
+    with engine.connect() as conn:
+        for label, before_sql, after_sql in QUERIES:
+            sql = before_sql if which == "before" else after_sql
+            results.append((explain(conn, sql), timed(conn, sql, repeat)))
+    return results
+
+
+def main(n_samples, repeat):
+    tmp_dir = tempfile.mkdtemp(prefix="lims_bench_")
+    engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+    Base.metadata.create_all(bind=engine)
+
+    t0 = time.perf_counter()
+    seed(engine, n_samples)
+    print(f"seeded {n_samples:,} samples in {time.perf_counter() - t0:.1f}s ({tmp_dir})\n")
+
+    drop_plan_indexes(engine)
+    before = measure(engine, "before", repeat)
+
+    applied = upgrade(engine, "app.migrations", log=lambda msg: None)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    after = measure(engine, "after", repeat)
+
+    print(f"migrations applied: {', '.join(rev.revision for rev in applied)}\n")
+    for (label, _, _), (plan_b, ms_b), (plan_a, ms_a) in zip(QUERIES, before, after):
+        speedup = ms_b / ms_a if ms_a else float("inf")
+        print(f"■ {label}   {ms_b:8.2f} ms → {ms_a:8.2f} ms  (x{speedup:.1f})")
+        print(f"    before: {plan_b}")
+        print(f"    after : {plan_a}")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="인덱스 / 생성 컬럼 계획 효과 측정")
+    parser.add_argument("--samples", type=int, default=100000, help="합성 샘플 수")
+    parser.add_argument("--repeat", type=int, default=5, help="쿼리별 반복 횟수 (중앙값 사용)")
+    args = parser.parse_args()
+    main(args.samples, args.repeat)
@@ -0,0 +1,183 @@
+"""
+분석 결과 수신 측정: 요청 안에서 바로 DB 병합(예전 webhook) vs 수신함 저장 후 202 + 백그라운드 배치 반영.
+
+임시 SQLite DB 에 샘플 --samples 개를 만들고 uvicorn 을 스레드로 띄운 뒤
+--clients 개 동시 연결로 --posts 건을 보냅니다 (/api/analysis/complete 와 /api/v1/result 반반,
+--retry-rate 비율은 같은 요청을 한 번 더 보내는 재시도, --unknown 건은 등록되지 않은 샘플).
+    1) inline : 예전 webhook 처럼 요청마다 세션 / 조회 / 병합 / commit (벤치 전용 /legacy 경로)
+    2) queue  : 새 엔드포인트 (수신함 저장 → 202, 워커가 배치로 반영)
+요청 지연(p50 / p95), 초당 수신 건수, 마지막 요청 이후 반영 완료까지 걸린 시간을 출력하고,
+queue 에서 중복 반영이 없는지 / 모르는 샘플이 dead letter 로 남았는지 확인합니다 (틀리면 종료 코드 1).
+
+실행 (ngs_web_lims 디렉터리에서):
+    python -m app.scripts.bench_ingest_queue
+    python -m app.scripts.bench_ingest_queue --posts 5000 --clients 32
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+WORK_DIR = tempfile.mkdtemp(prefix="lims_ingest_")
+os.environ["LIMS_DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIR, 'ingest.db')}"
+
+import httpx
+import uvicorn
+from fastapi import Body, FastAPI
+from sqlalchemy import func
+from sqlalchemy.orm.attributes import flag_modified
+
+from app.api import analysis_api
+from app.api.webhook import webhook_api
+from app.core import ingest_queue
+from app.core.database import SessionLocal, init_db
+from app.models._schema import Analysis, IngestEvent, Order, Sample
+
+ORDER_ID = "GCX-C01-260101-01"
+
+
+def seed(n_samples):
+    with SessionLocal() as db:
+        order = Order(order_id=ORDER_ID, facility="GCX", client_team="NGS", client_name="bench",
+                      reception_date=date(2026, 1, 1))
+        db.add(order)
+        db.flush()
+        db.add_all(Sample(order_pk=order.id, order_id=ORDER_ID, sample_id=f"ACC-260101-01-{i + 1:04d}-DNA",
+                          sample_name=f"S{i}", target_panel="TSO500", current_status="분석 진행", panel_metadata={})
+                   for i in range(n_samples))
+        db.commit()
+
+
+def legacy_webhook(data: dict = Body(...)):
+    """예전 /api/analysis/complete: 요청 안에서 조회 → 병합 → commit"""
+    db = SessionLocal()
+    try:
+        sample = db.query(Sample).filter(Sample.sample_id == data["sample_id"]).first()
+        if not sample:
+            return {"status": "error"}
+        if not sample.analysis:
+            sample.analysis = Analysis(sample_id=sample.id)
+            db.add(sample.analysis)
+        current = dict(sample.analysis.analysis_results or {})
+        for k, v in data.get("results", {}).items():
+            current[k] = str(v)
+        sample.analysis.analysis_results = current
+        flag_modified(sample.analysis, "analysis_results")
+        sample.analysis.analysis_status = "분석 완료"
+        sample.current_status = "분석 완료"
+        db.commit()
+        return {"status": "success"}
+    finally:
+        db.close()
+
+
+def make_app():
+    app = FastAPI()
+    app.include_router(analysis_api.router, prefix="/api/v1")
+    app.include_router(webhook_api)
+    app.post("/legacy")(legacy_webhook)
+    return app
+
+
+def start_server():
+    server = uvicorn.Server(uvicorn.Config(make_app(), host="127.0.0.1", port=0, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, server.servers[0].sockets[0].getsockname()[1]
+
+
+def build_requests(args, legacy):
+    reqs = []
+    for i in range(args.posts):
+        sample_id = f"ACC-260101-01-{i % args.samples + 1:04d}-DNA"
+        variants = [{"gene": "KRAS", "hgvs_p": f"p.G12{k}", "vaf": 0.12} for k in range(args.variants)]
+        if legacy:
+            reqs.append(("/legacy", {"sample_id": sample_id, "results": {"tmb": i, "msi": "MSS", "variants": variants}}))
+        elif i % 2:
+            reqs.append(("/api/analysis/complete", {"batch_id": f"RUN-{i}", "sample_id": sample_id,
+                                                    "pipeline": "TSO500", "results": {"tmb": i, "msi": "MSS", "variants": variants}}))
+        else:
+            reqs.append(("/api/v1/result", {
+                "batch_id": f"RUN-{i}", "order_id": ORDER_ID, "sample_id": sample_id, "pipeline_version": "v2.2.0",
+                "results": {"analysis_type": "TSO500", "tumor_purity": 0.4, "tmb_score": i / 10, "msi_status": "MSS",
+                            "mapped_reads_pct": 98.0, "variants": variants}}))
+    if not legacy:
+        reqs += [("/api/analysis/complete", {"batch_id": "RUN-X", "sample_id": f"ACC-999999-01-{k:03d}-DNA",
+                                             "results": {}}) for k in range(args.unknown)]
+        step = max(1, int(1 / args.retry_rate)) if args.retry_rate else 0
+        if step:
+            reqs += reqs[::step]   # 재시도 (같은 본문 한 번 더)
+    return reqs
+
+
+def fire(base, reqs, clients):
+    latencies = []
+    with httpx.Client(base_url=base, timeout=60, limits=httpx.Limits(max_connections=clients)) as client:
+        def _post(req):
+            t0 = time.perf_counter()
+            r = client.post(req[0], json=req[1])
+            r.raise_for_status()
+            return time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            latencies = list(pool.map(_post, reqs))
+        return time.perf_counter() - t0, latencies
+
+
+def report(label, elapsed, latencies, drained_s):
+    lat = sorted(latencies)
+    p95 = lat[int(len(lat) * 0.95) - 1] * 1000
+    print(f"{label:<7} {len(lat):>6} posts  {len(lat) / elapsed:7.0f} posts/s ({len(lat) / elapsed * 60:9,.0f}/min)  "
+          f"p50 {statistics.median(lat) * 1000:6.1f} ms  p95 {p95:6.1f} ms  applied +{drained_s:.2f} s")
+
+
+def main(args):
+    init_db()
+    seed(args.samples)
+    server, port = start_server()
+    base = f"http://127.0.0.1:{port}"
+    ok = True
+
+    elapsed, latencies = fire(base, build_requests(args, legacy=True), args.clients)
+    report("inline", elapsed, latencies, 0.0)
+
+    reqs = build_requests(args, legacy=False)
+    elapsed, latencies = fire(base, reqs, args.clients)
+    t0 = time.perf_counter()
+    while True:
+        with SessionLocal() as db:
+            pending = db.query(IngestEvent).filter(
+                IngestEvent.status.in_([ingest_queue.QUEUED, ingest_queue.RUNNING])).count()
+        if not pending:
+            break
+        time.sleep(0.05)
+    report("queue", elapsed, latencies, time.perf_counter() - t0)
+
+    with SessionLocal() as db:
+        counts = dict(db.query(IngestEvent.status, func.count()).group_by(IngestEvent.status).all())
+        total = db.query(IngestEvent).count()
+    ok &= total == args.posts + args.unknown                 # 재시도는 새 행을 만들지 않음
+    ok &= counts.get(ingest_queue.DEAD, 0) == args.unknown   # 모르는 샘플은 dead letter
+    ok &= counts.get(ingest_queue.DONE, 0) == args.posts
+    print(f"\ningest_events {total} rows (sent {len(reqs)} incl. retries)  {counts}  {'✅' if ok else '❌'}")
+    server.should_exit = True
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="분석 결과 수신: inline 병합 vs 수신함 + 백그라운드 배치")
+    parser.add_argument("--posts", type=int, default=1000, help="보낼 결과 수")
+    parser.add_argument("--samples", type=int, default=200, help="샘플 수")
+    parser.add_argument("--clients", type=int, default=16, help="동시 연결 수")
+    parser.add_argument("--variants", type=int, default=200, help="결과당 변이 수 (본문 크기)")
+    parser.add_argument("--retry-rate", type=float, default=0.1, help="같은 요청 재전송 비율")
+    parser.add_argument("--unknown", type=int, default=3, help="등록되지 않은 샘플 결과 수")
+    main(parser.parse_args())
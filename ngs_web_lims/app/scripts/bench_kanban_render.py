@@ -0,0 +1,135 @@
+"""
+칸반 보드 렌더링 측정: 전체 다시 그리기 vs 컬럼 / 카드 단위 부분 갱신.
+
+임시 SQLite DB에 합성 Order(기본 5,000건, Order 당 샘플 8건)를 넣고
+    1) legacy  : Order + 샘플 전체 로드 → 6개 컬럼 카드 전부 생성 (예전 render_kanban_board)
+    2) initial : GROUP BY 집계 → 카드 전부 생성 (첫 화면)
+    3) drag    : Order 하나를 다음 단계로 옮긴 뒤 집계 → fingerprint 비교 → 바뀐 카드만 Patch
+각각의 서버 처리 시간(중앙값)과 응답 크기(JSON)를 출력합니다.
+
+실행 (ngs_web_lims 디렉터리에서):
+    python -m app.scripts.bench_kanban_render
+    python -m app.scripts.bench_kanban_render --orders 20000 --repeat 3
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import tempfile
+import time
+from collections import namedtuple
+
+import plotly.utils
+from dash import no_update
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db_profile import create_lims_engine
+from app.core.migrations import upgrade
+from app.core.repository import order_status_counts, orders_with_samples
+from app.pages.kanban import STAGES, build_board_columns, make_order_card, render_board_update
+from app.scripts.bench_index_plan import SAMPLES_PER_ORDER, seed
+
+# order_status_counts() 행과 같은 모양
+Row = namedtuple("Row", "id order_id facility client_team client_name reception_date status n n_issue")
+
+
+def payload_bytes(outputs, board=None):
+    sent = [o for o in outputs if o is not no_update] + ([board] if board else [])
+    return len(json.dumps(sent, cls=plotly.utils.PlotlyJSONEncoder))
+
+
+def timed(fn, repeat):
+    samples, result = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples), result
+
+
+# ==========================================
+# [1] 렌더 경로
+# ==========================================
+def legacy_render(Session):
+    """예전 방식: 샘플 행을 모두 읽어 파이썬에서 집계 후 전체 카드 생성"""
+    db = Session()
+    try:
+        rows = []
+        for order in orders_with_samples(db):
+            counts, issues = {}, {}
+            for s in order.samples:
+                counts[s.current_status] = counts.get(s.current_status, 0) + 1
+                has_issue = s.issue_comment and str(s.issue_comment).strip() not in ["", "None", "nan"]
+                issues[s.current_status] = issues.get(s.current_status, 0) + (1 if has_issue else 0)
+            order_cols = (order.id, order.order_id, order.facility, order.client_team, order.client_name,
+                          order.reception_date)
+            rows.extend(Row(*order_cols, status, n, issues[status]) for status, n in counts.items())
+        columns = build_board_columns(rows)
+        return [[make_order_card(c) for c in cards] for cards in columns]
+    finally:
+        db.close()
+
+
+def diff_render(Session, prev_board):
+    db = Session()
+    try:
+        columns = build_board_columns(order_status_counts(db))
+    finally:
+        db.close()
+    return render_board_update(columns, prev_board)
+
+
+def drag_one_order(engine, n):
+    """n 번째 Order 의 '접수 대기' 샘플을 '접수 완료' 로 이동 (칸반 드래그 1회)"""
+    with engine.begin() as conn:
+        order_pk = conn.execute(text(
+            "SELECT order_pk FROM samples WHERE current_status = :s GROUP BY order_pk ORDER BY order_pk LIMIT 1 OFFSET :n"),
+            {"s": STAGES[0], "n": n}).scalar()
+        conn.execute(text("UPDATE samples SET current_status = :next WHERE order_pk = :pk AND current_status = :s"),
+                     {"next": STAGES[1], "pk": order_pk, "s": STAGES[0]})
+
+
+# ==========================================
+# [2] 측정
+# ==========================================
+def main(n_orders, repeat):
+    tmp_dir = tempfile.mkdtemp(prefix="lims_bench_")
+    engine = create_lims_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+    upgrade(engine, "app.migrations", log=lambda msg: None)
+    seed(engine, n_orders * SAMPLES_PER_ORDER)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    print(f"{n_orders:,} orders / {n_orders * SAMPLES_PER_ORDER:,} samples ({tmp_dir})\n")
+
+    legacy_ms, legacy_out = timed(lambda: legacy_render(Session), repeat)
+    legacy_bytes, n_cards = payload_bytes(legacy_out), sum(len(col) for col in legacy_out)
+    initial_ms, (initial_out, board) = timed(lambda: diff_render(Session, None), repeat)
+    initial_bytes = payload_bytes(initial_out, board)
+    # 수십 MB 짜리 컴포넌트 트리를 들고 있으면 GC 가 드래그 측정을 왜곡한다 (실서버는 응답 후 버림)
+    del legacy_out, initial_out
+    gc.collect()
+
+    drag_samples, drag_bytes, changed = [], 0, 0
+    for i in range(repeat):
+        drag_one_order(engine, i)
+        t0 = time.perf_counter()
+        outputs, board = diff_render(Session, board)
+        drag_samples.append((time.perf_counter() - t0) * 1000)
+        drag_bytes = payload_bytes(outputs, board)
+        changed = sum(o is not no_update for o in outputs)
+
+    print(f"{'path':<22} {'server ms':>10} {'payload KB':>11}")
+    print(f"{'legacy full render':<22} {legacy_ms:>10.1f} {legacy_bytes / 1024:>11.1f}")
+    print(f"{'initial (aggregated)':<22} {initial_ms:>10.1f} {initial_bytes / 1024:>11.1f}")
+    print(f"{'after 1 drag (diff)':<22} {statistics.median(drag_samples):>10.1f} {drag_bytes / 1024:>11.1f}"
+          f"   ({changed}/6 columns patched, {n_cards:,} cards on board)")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="칸반 보드 전체 / 부분 렌더링 비교")
+    parser.add_argument("--orders", type=int, default=5000, help="합성 Order 수")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (중앙값 사용)")
+    args = parser.parse_args()
+    main(args.orders, args.repeat)
@@ -0,0 +1,123 @@
+"""
+칸반 단계 이동(Order 드래그 1회) 측정: 샘플별 ORM 처리 vs 집합 단위 처리.
+
+임시 SQLite DB에 플레이트 크기(기본 384 샘플)의 Order 하나를 만들고 '접수 대기' → '접수 완료' 이동을
+    1) legacy : 샘플 객체를 하나씩 검사 → current_status 대입 → ActionLog 객체 add (예전 update_data)
+    2) bulk   : app.core.transitions.move_order_stage (일괄 검증 + UPDATE ... WHERE id IN + INSERT 한 번)
+으로 처리하면서 커밋까지의 시간(중앙값)과 실행된 SQL 문 수를 출력합니다.
+
+실행 (ngs_web_lims 디렉터리에서):
+    python -m app.scripts.bench_kanban_transition
+    python -m app.scripts.bench_kanban_transition --samples 96 --repeat 10
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import date
+
+from sqlalchemy import event, update
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db_profile import create_lims_engine
+from app.core.migrations import upgrade
+from app.core.transitions import STAGES, move_order_stage
+from app.models._schema import ActionLog, Order, Sample
+
+ORDER_ID = "BENCH-C01-260101-01"
+
+
+def seed(Session, n_samples):
+    db = Session()
+    try:
+        order = Order(order_id=ORDER_ID, facility="BENCH", client_team="NGS", client_name="bench",
+                      reception_date=date(2026, 1, 1))
+        db.add(order)
+        db.flush()
+        db.add_all([
+            Sample(order_pk=order.id, order_id=ORDER_ID, sample_id=f"ACC-260101-01-{i:03d}-DNA",
+                   sample_name=f"S{i:03d}", target_panel="WES", current_status=STAGES[0],
+                   sample_received="입고 완료", receiver_name="bench")
+            for i in range(n_samples)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def reset(engine):
+    with engine.begin() as conn:
+        conn.execute(update(Sample).values(current_status=STAGES[0]))
+        conn.execute(ActionLog.__table__.delete())
+
+
+# ==========================================
+# [1] 이동 경로
+# ==========================================
+def legacy_move(db):
+    """예전 방식: 샘플마다 검사 / 대입 / ActionLog 객체 생성 → 커밋 시 행마다 UPDATE / INSERT"""
+    samples = db.query(Sample).filter(Sample.order_id == ORDER_ID, Sample.current_status == STAGES[0]).all()
+    errors = []
+    for s in samples:
+        if str(s.sample_received or "").replace(" ", "") != "입고완료" or not s.receiver_name:
+            errors.append(s.sample_name)
+    if errors:
+        return errors
+    for s in samples:
+        s.current_status = STAGES[1]
+        db.add(ActionLog(sample_id=s.id, action_type="상태 변경 (Order 일괄)",
+                         previous_state=STAGES[0], new_state=STAGES[1], details="칸반 이동"))
+    return []
+
+
+def bulk_move(db):
+    return move_order_stage(db, ORDER_ID, STAGES[0], STAGES[1])[1]
+
+
+def measure(engine, Session, move, repeat):
+    statements = []
+    listener = lambda *args: statements.append(1)
+    timings = []
+    for _ in range(repeat):
+        reset(engine)
+        statements.clear()
+        event.listen(engine, "before_cursor_execute", listener)
+        t0 = time.perf_counter()
+        db = Session()
+        try:
+            errors = move(db)
+            if errors:
+                raise SystemExit(f"게이트키퍼 오류: {errors[:3]}")
+            db.commit()
+        finally:
+            db.close()
+        timings.append((time.perf_counter() - t0) * 1000)
+        event.remove(engine, "before_cursor_execute", listener)
+    return statistics.median(timings), len(statements)
+
+
+# ==========================================
+# [2] 측정
+# ==========================================
+def main(n_samples, repeat):
+    tmp_dir = tempfile.mkdtemp(prefix="lims_bench_")
+    engine = create_lims_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+    upgrade(engine, "app.migrations", log=lambda msg: None)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    seed(Session, n_samples)
+    print(f"Order 1건 / 샘플 {n_samples}건: '{STAGES[0]}' → '{STAGES[1]}' ({tmp_dir})\n")
+
+    print(f"{'path':<10} {'ms':>8} {'SQL 문':>8}")
+    for label, move in (("legacy", legacy_move), ("bulk", bulk_move)):
+        ms, n_sql = measure(engine, Session, move, repeat)
+        print(f"{label:<10} {ms:>8.1f} {n_sql:>8}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="칸반 Order 이동: 샘플별 ORM vs 집합 단위 처리")
+    parser.add_argument("--samples", type=int, default=384, help="Order 당 샘플 수")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (중앙값 사용)")
+    args = parser.parse_args()
+    main(args.samples, args.repeat)
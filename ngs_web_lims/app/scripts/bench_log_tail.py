@@ -0,0 +1,74 @@
+"""
+다운로드 콘솔 로그 읽기 측정: 폴링마다 readlines() 전체 vs LogTail(끝에서부터 새 줄만).
+
+--size-mb 크기의 진행률 로그를 만들어 두고, 폴링 사이에 --append 줄씩 새로 붙이면서
+    1) legacy : open → readlines() → 마지막 50줄  (예전 update_console_log)
+    2) tail   : app.core.log_tail.LogTail.read_since(cursor)
+폴링 1회 처리 시간(중앙값)과 최대 메모리 사용량을 출력합니다.
+
+실행 (ngs_web_lims 디렉터리에서):
+    python -m app.scripts.bench_log_tail
+    python -m app.scripts.bench_log_tail --size-mb 500 --polls 10
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from app.core.log_tail import LogTail
+
+LINE = "[10-18 09:00:00]    [ACC-260101-01-{i:03d}-DNA R1]  42.0% 1.2 GB / 2.9 GB  48.3 MB/s\n"
+
+
+def build_log(path, size_mb):
+    block = "".join(LINE.format(i=i % 1000) for i in range(10000))
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(max(1, int(size_mb * 1024 * 1024 / len(block)))):
+            f.write(block)
+
+
+def legacy_poll(path, _cursor):
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+        return "".join(lines[-50:]), None
+
+
+def measure(path, poll, polls, append):
+    """폴링 시간은 tracemalloc 없이 재고, 메모리는 마지막에 한 번 더 폴링하며 따로 잰다."""
+    def grow(n):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(LINE.format(i=n) for _ in range(append)))
+
+    timings, cursor = [], None
+    for n in range(polls):
+        grow(n)
+        t0 = time.perf_counter()
+        _, cursor = poll(path, cursor)
+        timings.append((time.perf_counter() - t0) * 1000)
+
+    grow(polls)
+    tracemalloc.start()
+    poll(path, cursor)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(timings), peak
+
+
+def main(args):
+    path = os.path.join(tempfile.mkdtemp(prefix="lims_logtail_"), "download_log.txt")
+    build_log(path, args.size_mb)
+    print(f"로그 {os.path.getsize(path) / 1024 / 1024:,.0f} MB, 폴링 {args.polls}회 (폴링마다 {args.append}줄 추가)\n")
+    tail = LogTail(path)
+    for label, poll in (("legacy", legacy_poll), ("tail", lambda p, c: tail.read_since(c))):
+        ms, peak = measure(path, poll, args.polls, args.append)
+        print(f"{label:<7} {ms:10.2f} ms / poll   peak {peak / 1024 / 1024:8.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="다운로드 콘솔 로그: readlines 전체 vs tail offset")
+    parser.add_argument("--size-mb", type=float, default=200, help="기존 로그 크기 (MB)")
+    parser.add_argument("--polls", type=int, default=5, help="폴링 횟수")
+    parser.add_argument("--append", type=int, default=20, help="폴링 사이에 붙는 줄 수")
+    main(parser.parse_args())
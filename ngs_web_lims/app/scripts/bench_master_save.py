@@ -0,0 +1,86 @@
+"""
+Master Data '최종 저장' (diff-only bulk save) 측정 스크립트.
+
+임시 SQLite DB에 N 개 샘플 보드를 만들고, 몇 개의 셀만 바꿨을 때
+apply_sample_changes 가 실행하는 SQL 수와 소요 시간을 출력합니다.
+WetLab / Sequencing / panel_metadata / Order 필드를 섞어 테이블별 라우팅도 함께 확인합니다.
+
+실행 (ngs_web_lims 디렉터리에서):
+    python -m app.scripts.bench_master_save
+    python -m app.scripts.bench_master_save --rows 10000 --edits 3 300
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.bulk_update import apply_sample_changes
+from app.models._schema import Base, Order, Sample, WetLabQC
+from app.scripts.bench_query_count import seed
+
+EDIT_FIELDS = [
+    ("sample_name", lambda i: f"renamed-{i}"),
+    ("dna_concentration", lambda i: str(10 + i)),
+    ("client_name", lambda i: f"client-{i}"),
+    ("seq_provider", lambda i: "Theragen"),
+    ("outsourced_date", lambda i: "2026-03-01"),
+]
+
+
+def build_changes(sample_ids, n_edits):
+    """행마다 필드 하나씩 돌아가며 n_edits 개의 셀 diff 생성"""
+    changes = {}
+    for i in range(n_edits):
+        sid = sample_ids[(i * 37) % len(sample_ids)]
+        field, make = EDIT_FIELDS[i % len(EDIT_FIELDS)]
+        changes.setdefault(str(sid), {})[field] = make(i)
+    return changes
+
+
+def main(n_rows, edit_counts):
+    tmp_dir = tempfile.mkdtemp(prefix="lims_bench_")
+    engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    with Session() as db:
+        seed(db, n_rows)
+        sample_ids = [row[0] for row in db.query(Sample.id).order_by(Sample.id).all()]
+
+    counter = {"n": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        counter["n"] += 1
+
+    print(f"board rows = {n_rows}")
+    for n_edits in edit_counts:
+        changes = build_changes(sample_ids, n_edits)
+        with Session() as db:
+            counter["n"] = 0
+            t0 = time.perf_counter()
+            saved = apply_sample_changes(db, changes)
+            db.commit()
+            elapsed = (time.perf_counter() - t0) * 1000
+        print(f"  edits={n_edits:<6} rows={saved:<6} statements={counter['n']:<4} {elapsed:8.1f} ms")
+
+    # 마지막 반영 결과 spot check
+    with Session() as db:
+        s = db.query(Sample).filter(Sample.id == sample_ids[0]).one()
+        wet = db.query(WetLabQC).filter(WetLabQC.sample_id == s.id).one()
+        order = db.query(Order).filter(Order.id == s.order_pk).one()
+        print(f"\n  spot check: sample_name={s.sample_name!r}, dna_concentration={wet.dna_concentration!r}, "
+              f"client_name={order.client_name!r}")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Master Data diff-only 저장 측정")
+    parser.add_argument("--rows", type=int, default=10000, help="보드 샘플 수")
+    parser.add_argument("--edits", type=int, nargs="+", default=[3, 30, 300], help="바꿀 셀 수 목록")
+    args = parser.parse_args()
+    main(args.rows, args.edits)
@@ -0,0 +1,192 @@
+"""
+페이지 조회 경로의 SQL 실행 횟수 측정 스크립트 (N+1 회귀 감지용).
+
+샘플 수(N)를 바꿔가며 임시 SQLite DB를 만들고, 각 페이지가 쓰는 repository 조회 +
+관계 접근 패턴을 그대로 흉내 낸 뒤 실행된 SELECT 수를 셉니다.
+N 이 늘어도 쿼리 수가 같아야 정상이며, 하나라도 늘어나면 종료 코드 1 로 끝납니다.
+같은 데이터 / 패턴으로 경로별 상한(MAX_QUERIES)까지 확인하는 테스트는 tests/test_query_count.py 입니다.
+
+실행 (ngs_web_lims 디렉터리에서):
+    python -m app.scripts.bench_query_count
+    python -m app.scripts.bench_query_count --sizes 100 1000 5000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.repository import (
+    master_board_query,
+    order_summaries,
+    order_with_samples,
+    orders_with_samples,
+    order_status_counts,
+    sample_query,
+    samples_by_ids,
+    samples_by_sample_ids,
+    samples_in_stage,
+    samples_with_prefix,
+)
+from app.models._schema import Analysis, Base, Order, Sample, Sequencing, WetLabQC
+
+SAMPLES_PER_ORDER = 10
+STATUSES = ["접수 대기", "접수 완료", "QC 진행", "시퀀싱 진행", "분석 진행", "분석 완료"]
+
+
+# ==========================================
+# [1] 합성 데이터
+# ==========================================
+def seed(db, n_samples):
+    n_orders = max(n_samples // SAMPLES_PER_ORDER, 1)
+    base_day = date(2026, 1, 1)
+    for o in range(n_orders):
+        order = Order(
+            order_id=f"GCX-C01-{o:06d}-01", facility="GCX", client_team="NGS",
+            client_name=f"client{o}", reception_date=base_day + timedelta(days=o % 365),
+        )
+        db.add(order)
+        db.flush()
+        for i in range(SAMPLES_PER_ORDER):
+            idx = o * SAMPLES_PER_ORDER + i
+            if idx >= n_samples:
+                break
+            s = Sample(
+                order_pk=order.id, order_id=order.order_id,
+                sample_id=f"ACC-{o:06d}-01-{i:03d}-DNA", sample_name=f"S{idx}",
+                target_panel="TSO500" if i % 2 else "WES",
+                current_status=STATUSES[idx % len(STATUSES)],
+                panel_metadata={"seq_provider": "Macrogen"},
+            )
+            db.add(s)
+            db.flush()
+            db.add(WetLabQC(sample_id=s.id, dna_concentration=float(i)))
+            db.add(Sequencing(sample_id=s.id))
+            db.add(Analysis(sample_id=s.id, analysis_status="대기중", analysis_results={"tmb_score": 1.0}))
+    db.commit()
+
+
+# ==========================================
+# [2] 페이지별 조회 패턴 (관계까지 모두 접근)
+# ==========================================
+def _touch(samples):
+    for s in samples:
+        _ = (s.order, s.wet_lab, s.sequencing, s.analysis)
+
+
+def scenario_master_board(db):
+    _touch(master_board_query(db).offset(0).limit(100).all())
+
+
+def scenario_master_delete(db):
+    ids = [row[0] for row in db.query(Sample.id).limit(50).all()]
+    for s in samples_by_ids(db, ids, logs=True):
+        _ = s.logs
+
+
+def scenario_kanban(db):
+    for row in order_status_counts(db, panel="WES", keyword="gcx"):
+        _ = (row.order_id, row.client_team, row.status, row.n)
+
+
+def scenario_project_view(db):
+    _ = [(o.order_id, n) for o, n in order_summaries(db)]
+    order = order_with_samples(db, order_summaries(db)[0][0].order_id)
+    _ = [s.sample_id for s in order.samples]
+
+
+def scenario_kanban_render(db):
+    for order in orders_with_samples(db):
+        _ = [(s.sample_id, s.current_status) for s in order.samples]
+
+
+def scenario_data_registration(db):
+    sample_ids = [row[0] for row in db.query(Sample.sample_id).limit(50).all()]
+    _touch(samples_by_sample_ids(db, sample_ids))
+
+
+def scenario_qc_report(db):
+    _touch(samples_with_prefix(db, None))
+
+
+def scenario_analysis_setup(db):
+    for s in samples_in_stage(db, "분석 진행", panel="TSO500", order=False, wet_lab=False, sequencing=False):
+        _ = s.analysis
+
+
+def scenario_clinical_report(db):
+    _touch(sample_query(db).all())
+
+
+SCENARIOS = {
+    "master_board": scenario_master_board,
+    "master_delete": scenario_master_delete,
+    "kanban": scenario_kanban,
+    "project_view": scenario_project_view,
+    "kanban_render": scenario_kanban_render,
+    "data_registration": scenario_data_registration,
+    "qc_report": scenario_qc_report,
+    "analysis_setup": scenario_analysis_setup,
+    "clinical_report": scenario_clinical_report,
+}
+
+
+# ==========================================
+# [3] 측정
+# ==========================================
+def measure(n_samples):
+    """N 개 샘플 DB에서 시나리오별 (쿼리 수, 소요 ms) 반환"""
+    tmp_dir = tempfile.mkdtemp(prefix="lims_bench_")
+    engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    with Session() as db:
+        seed(db, n_samples)
+
+    counter = {"n": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        counter["n"] += 1
+
+    results = {}
+    for name, fn in SCENARIOS.items():
+        with Session() as db:
+            counter["n"] = 0
+            t0 = time.perf_counter()
+            fn(db)
+            results[name] = (counter["n"], (time.perf_counter() - t0) * 1000)
+
+    engine.dispose()
+    return results
+
+
+def main(sizes):
+    table = {n: measure(n) for n in sizes}
+
+    print(f"{'scenario':<18}" + "".join(f"{f'N={n}':>22}" for n in sizes))
+    failed = []
+    for name in SCENARIOS:
+        cells = "".join(f"{f'{table[n][name][0]} q / {table[n][name][1]:.1f} ms':>22}" for n in sizes)
+        print(f"{name:<18}{cells}")
+        counts = {table[n][name][0] for n in sizes}
+        if len(counts) > 1:
+            failed.append(name)
+
+    if failed:
+        print(f"\n❌ 샘플 수에 따라 쿼리 수가 늘어나는 경로: {', '.join(failed)}")
+        return 1
+    print("\n✅ 모든 경로의 쿼리 수가 샘플 수와 무관합니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="페이지 조회 경로 쿼리 수(N+1) 측정")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000], help="샘플 수 목록")
+    args = parser.parse_args()
+    sys.exit(main(args.sizes))
@@ -0,0 +1,228 @@
+"""
+TSO 원격 결과 수집 측정: 클릭마다 새 SSH 접속 + 폴더마다 cat vs app.core.remote 연결 풀 + SFTP 병렬 읽기.
+
+paramiko 로 프로세스 안에 SSH 서버(비밀번호 인증, exec 'cat', SFTP 서브시스템)를 띄우고
+임시 폴더에 결과 폴더 --folders 개 (폴더마다 --size-kb KB JSON)를 만든 뒤
+    1) legacy : SSHClient 새로 접속 → 폴더마다 exec_command("cat ...") 차례로 (예전 handle_remote_sync)
+    2) pool   : SSHPool.read_files (연결 / SFTP 세션 재사용, --workers 병렬) — 첫 클릭(접속 포함) / 두 번째 클릭
+서버는 요청(open / stat / exec)마다 --latency-ms 만큼 늦게 응답해 원격 서버 왕복 지연을 흉내냅니다.
+받은 내용이 원본과 다르면 종료 코드 1 로 끝납니다. 실제 서버로 재려면 --host 등을 주세요 (폴더는 --base-dir 아래 기존 폴더).
+
+실행 (ngs_web_lims 디렉터리에서):
+    python -m app.scripts.bench_remote_sync
+    python -m app.scripts.bench_remote_sync --folders 100 --latency-ms 20 --workers 8
+"""
+import argparse
+import json
+import logging
+import os
+import shlex
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+import paramiko
+
+from app.core.remote import SSHPool
+
+USER, PASSWORD = "lims", "bench"
+RESULT_FILE = "Results.json"
+
+
+# ==========================================
+# [1] 프로세스 안 SSH / SFTP 서버
+# ==========================================
+class _Handle(paramiko.SFTPHandle):
+    def stat(self):
+        return paramiko.SFTPAttributes.from_stat(os.fstat(self.readfile.fileno()))
+
+
+class LocalSFTP(paramiko.SFTPServerInterface):
+    """원격 경로를 root 아래 로컬 경로로 그대로 매핑"""
+    root = "/"
+    latency = 0.0
+
+    def _local(self, path):
+        return os.path.join(self.root, path.lstrip("/"))
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def open(self, path, flags, attr):
+        self._wait()
+        mode = "rb" if not flags & (os.O_WRONLY | os.O_RDWR) else "wb"
+        try:
+            f = open(self._local(path), mode)
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        handle = _Handle(flags)
+        handle.filename = path
+        handle.readfile = f if mode == "rb" else None
+        handle.writefile = f if mode == "wb" else None
+        return handle
+
+    def stat(self, path):
+        self._wait()
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.stat(self._local(path)))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    lstat = stat
+
+    def mkdir(self, path, attr):
+        self._wait()
+        try:
+            os.mkdir(self._local(path))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        return paramiko.SFTP_OK
+
+
+class LocalSSH(paramiko.ServerInterface):
+    def check_auth_password(self, username, password):
+        ok = (username, password) == (USER, PASSWORD)
+        return paramiko.AUTH_SUCCESSFUL if ok else paramiko.AUTH_FAILED
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_channel_request(self, kind, chanid):
+        ok = kind == "session"
+        return paramiko.OPEN_SUCCEEDED if ok else paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_exec_request(self, channel, command):
+        threading.Thread(target=_exec, args=(channel, command.decode()), daemon=True).start()
+        return True
+
+
+def _exec(channel, command):
+    """'cat 경로' 만 지원 (legacy 경로 흉내)"""
+    time.sleep(LocalSFTP.latency)
+    args = shlex.split(command)
+    status = 1
+    if len(args) == 2 and args[0] == "cat":
+        try:
+            with open(os.path.join(LocalSFTP.root, args[1].lstrip("/")), "rb") as f:
+                channel.sendall(f.read())
+            status = 0
+        except OSError as e:
+            channel.sendall_stderr(f"cat: {e}\n".encode())
+    channel.send_exit_status(status)
+    channel.close()
+
+
+def start_server(root, latency_ms):
+    LocalSFTP.root = root
+    LocalSFTP.latency = latency_ms / 1000
+    logging.getLogger("paramiko").setLevel(logging.CRITICAL)   # 클라이언트가 끊을 때 나오는 reset 로그 숨김
+    host_key = paramiko.RSAKey.generate(2048)
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(100)
+
+    def _serve():
+        while True:
+            try:
+                sock, _ = listener.accept()
+            except OSError:
+                return
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)   # sshd 처럼 (Nagle 지연 없이)
+            transport = paramiko.Transport(sock)
+            transport.add_server_key(host_key)
+            transport.set_subsystem_handler("sftp", paramiko.SFTPServer, LocalSFTP)
+            transport.start_server(server=LocalSSH())
+
+    threading.Thread(target=_serve, daemon=True).start()
+    return listener
+
+
+# ==========================================
+# [2] 측정
+# ==========================================
+def legacy_sync(host, port, user, password, paths):
+    """예전 handle_remote_sync: 새로 접속 + 폴더마다 cat"""
+    ssh = paramiko.SSHClient()
+    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    ssh.connect(host, port=port, username=user, password=password, timeout=5)
+    try:
+        out = {}
+        for path in paths:
+            _, stdout, _ = ssh.exec_command(f"cat {path}")
+            if stdout.channel.recv_exit_status() == 0:
+                out[path] = stdout.read()
+        return out
+    finally:
+        ssh.close()
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def main(args):
+    server = None
+    expected = {}
+    if args.host:
+        host, port, user, password = args.host, args.port, args.user, args.password
+        names = sorted(d for d in SSHPool(host, user, password=password, port=port).run(
+            f"ls -1 {args.base_dir}")[1].split())[:args.folders]
+        paths = [f"{args.base_dir}/{n}/{RESULT_FILE}" for n in names]
+    else:
+        root = tempfile.mkdtemp(prefix="lims_remote_")
+        base = os.path.join(root, args.base_dir.lstrip("/"))
+        paths = []
+        for i in range(args.folders):
+            name = f"ACC-260101-01-{i + 1:03d}-DNA"
+            os.makedirs(os.path.join(base, name))
+            body = json.dumps({"sample_id": name, "tmb_score": i / 10,
+                               "variants": [{"gene": "KRAS", "vaf": 0.1, "note": "x" * 64}] * (args.size_kb * 8)}).encode()
+            with open(os.path.join(base, name, RESULT_FILE), "wb") as f:
+                f.write(body)
+            path = f"{args.base_dir}/{name}/{RESULT_FILE}"
+            paths.append(path)
+            expected[path] = body
+        server = start_server(root, args.latency_ms)
+        host, port, user, password = "127.0.0.1", server.getsockname()[1], USER, PASSWORD
+
+    total_kb = sum(len(b) for b in expected.values()) / 1024
+    print(f"{len(paths)} folders ({total_kb:,.0f} KB), latency {args.latency_ms} ms/request, workers {args.workers}\n")
+
+    legacy, legacy_s = timed(lambda: legacy_sync(host, port, user, password, paths))
+    print(f"legacy        {legacy_s:7.2f} s  {len(paths) / legacy_s:8.1f} folders/s")
+
+    pool = SSHPool(host, user, password=password, port=port, size=args.workers)
+    cold, cold_s = timed(lambda: pool.read_files(paths))
+    warm, warm_s = timed(lambda: pool.read_files(paths))
+    print(f"pool (1st)    {cold_s:7.2f} s  {len(paths) / cold_s:8.1f} folders/s")
+    print(f"pool (2nd)    {warm_s:7.2f} s  {len(paths) / warm_s:8.1f} folders/s  {pool.stats}")
+    pool.close()
+
+    reference = expected or legacy
+    ok = all(isinstance(r.get(p), bytes) and r[p] == reference.get(p) for r in (cold, warm) for p in paths)
+    ok &= not expected or legacy == expected
+    print(f"\npool(2nd) / legacy = x{legacy_s / warm_s:.1f}   {'✅' if ok else '❌'}")
+    if server is not None:
+        server.close()
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TSO 원격 결과 수집: 새 접속 + cat vs 연결 풀 + SFTP 병렬")
+    parser.add_argument("--folders", type=int, default=100, help="결과 폴더 수")
+    parser.add_argument("--size-kb", type=int, default=16, help="폴더당 결과 파일 크기 (KB, 대략)")
+    parser.add_argument("--latency-ms", type=float, default=10, help="서버 요청당 지연 (ms)")
+    parser.add_argument("--workers", type=int, default=4, help="풀 크기 / 병렬 읽기 수")
+    parser.add_argument("--base-dir", default="/data/ngs/results", help="원격 결과 최상위 경로")
+    parser.add_argument("--host", help="실제 SSH 서버 (없으면 프로세스 안 서버)")
+    parser.add_argument("--port", type=int, default=22)
+    parser.add_argument("--user", default=USER)
+    parser.add_argument("--password", default=PASSWORD)
+    main(parser.parse_args())
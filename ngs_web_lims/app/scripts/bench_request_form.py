@@ -0,0 +1,93 @@
+"""
+의뢰서(Excel) 업로드 파싱 측정: pd.read_excel 두 번 vs openpyxl read_only 스트리밍.
+
+TSO500 템플릿에 합성 샘플 행(기본 5,000건)을 채운 워크북을 만들고
+    1) legacy : pd.read_excel(header=None) → 헤더 탐색 → pd.read_excel(header=idx) → 전체 행을 브라우저로
+    2) stream : app.core.request_form.parse_request_form → 서버 보관(token) → 미리보기 + 통계만 브라우저로
+각각의 서버 처리 시간(중앙값)과 브라우저로 가는 데이터 크기를 출력합니다.
+
+실행 (ngs_web_lims 디렉터리에서):
+    python -m app.scripts.bench_request_form
+    python -m app.scripts.bench_request_form --rows 20000 --repeat 3
+"""
+import argparse
+import io
+import json
+import statistics
+import time
+
+import openpyxl
+import pandas as pd
+
+from app.core.config import BASE_DIR
+from app.core.request_form import PREVIEW_ROWS, discard_form, parse_request_form, store_form
+
+TEMPLATE = BASE_DIR / "app" / "templates" / "requests" / "tso_request.xlsx"
+FIRST_DATA_ROW = 24  # 템플릿의 예시(ex) 행 바로 아래 (1-based)
+
+
+def build_workbook(n_rows):
+    wb = openpyxl.load_workbook(TEMPLATE)
+    ws = wb.worksheets[0]
+    ws["D7"], ws["H7"], ws["H8"] = "홍길동", "010-0000-0000", "bench@example.com"
+    for i in range(n_rows):
+        r = FIRST_DATA_ROW + i
+        for col, value in ((1, i + 1), (2, "hLC"), (3, f"BENCH_{i:05d}"), (4, "FFPE"), (11, "DNA/RNA")):
+            ws.cell(r, col).value = value
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+# ==========================================
+# [1] 파싱 경로
+# ==========================================
+def legacy_parse(data):
+    df_raw = pd.read_excel(io.BytesIO(data), header=None)
+    header_idx = next((r for r in range(5, min(25, len(df_raw)))
+                       if "patientid" in "".join(str(v) for v in df_raw.iloc[r].tolist()).replace(" ", "").lower()), 15)
+    df = pd.read_excel(io.BytesIO(data), header=header_idx).dropna(axis=1, how="all")
+    df.columns = [str(c) if not str(c).startswith("Unnamed") else f"col_{i}" for i, c in enumerate(df.columns)]
+    pid_col = next((c for c in df.columns if "patient id" in c.lower() or "번호" in c.lower()), None)
+    if pid_col:
+        df = df.dropna(subset=[pid_col])
+        df = df[df[pid_col].astype(str).str.lower() != "ex"]
+    rows = df.fillna("").to_dict("records")
+    return rows  # 전부 브라우저로
+
+
+def stream_parse(data):
+    form = parse_request_form(data, "TSO500")
+    token = store_form(form)
+    discard_form(token)
+    return {"preview": form.rows[:PREVIEW_ROWS], "stats": form.stats, "token": token}
+
+
+def measure(fn, data, repeat):
+    timings, result = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(data)
+        timings.append((time.perf_counter() - t0) * 1000)
+    payload = len(json.dumps(result, ensure_ascii=False, default=str).encode("utf-8"))
+    return statistics.median(timings), payload
+
+
+# ==========================================
+# [2] 측정
+# ==========================================
+def main(n_rows, repeat):
+    data = build_workbook(n_rows)
+    print(f"의뢰서 {n_rows:,}행 / {len(data) / 1024:.0f} KB\n")
+    print(f"{'path':<8} {'server ms':>10} {'to browser KB':>14}")
+    for label, fn in (("legacy", legacy_parse), ("stream", stream_parse)):
+        ms, payload = measure(fn, data, repeat)
+        print(f"{label:<8} {ms:>10.1f} {payload / 1024:>14.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="의뢰서 업로드 파싱: pandas vs openpyxl 스트리밍")
+    parser.add_argument("--rows", type=int, default=5000, help="합성 샘플 행 수")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (중앙값 사용)")
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
@@ -0,0 +1,246 @@
+"""
+분석 결과 정규화 측정: result_normalize (노드마다 한 번) vs 예전 check_results.parse_json_like.
+
+0) 회귀: 문자열 치환으로 값이 바뀌던 사례("malignant neoplasm" → "maligNonet neoplasm", "nanopore" ...)와
+         NA / 빈 목록이 저장값에서 사라지던 사례가 expand 후에도 그대로인지 확인합니다.
+1) fuzz : 무작위로 중첩된 값(NA / 공백 / JSON 문자열 / python dict 문자열 / 숫자 / None)을 --fuzz 개 만들어
+          clean 이 예전 함수와 같은지(예전 함수가 null / true / false / nan 을 바꿔치기하던 값은 제외), expand 가 두 번 적용해도 같은지(idempotent), JSON 으로 저장 후 다시 읽어도 같은지,
+          expand 해서 저장한 값을 화면에서 clean 해도 원본을 바로 clean 한 것과 같은지 확인합니다.
+2) depth: TSO500 Results.json 모양(Header / TMB / MSI / QC / Small_Variants ...)을 Analysis_Details 아래로
+          1 ~ --max-depth 단계 중첩 (한 단계 걸러 JSON 문자열로) 해서 expand / clean / 예전 함수 시간을 잽니다.
+          예전 함수는 dict 값마다 세 번씩 재귀해서 3^깊이로 늘어나므로 한 번이 --legacy-budget 초를 넘으면 더 재지 않습니다.
+3) size : 깊이 3 에서 변이 수를 --variants 부터 10 배씩 늘려 잽니다.
+각 sweep 에서 clean 시간 / 입력 바이트(ns/B)가 첫(가장 작은) 입력의 --tolerance 배를 넘지 않아야 선형으로 봅니다.
+(깊을수록 이스케이프 문자가 많아 ns/B 는 오히려 줄어듭니다. 3^깊이 같은 초선형이면 크게 늘어납니다.)
+회귀 / fuzz 불일치가 있거나 선형이 아니면 종료 코드 1 로 끝납니다.
+
+실행 (ngs_web_lims 디렉터리에서):
+    python -m app.scripts.bench_result_normalize
+    python -m app.scripts.bench_result_normalize --max-depth 16 --variants 2000 --fuzz 5000
+"""
+import argparse
+import ast
+import gc
+import json
+import random
+import re
+import statistics
+import sys
+import time
+
+from app.core.result_normalize import clean, expand
+
+GENES = ["KRAS", "EGFR", "TP53", "PIK3CA", "BRAF", "ERBB2", "ALK", "MET", "NRAS", "IDH1", "BRCA1", "BRCA2"]
+EMPTY = ["NA", "N/A", "null", "None", "", "   ", " na "]
+
+
+def legacy_parse_json_like(value):
+    """예전 check_results.parse_json_like (비교 기준, 그대로 옮김)"""
+    if isinstance(value, dict):
+        return {k: legacy_parse_json_like(v) for k, v in value.items()
+                if legacy_parse_json_like(v) is not None and legacy_parse_json_like(v) != []}
+
+    if isinstance(value, list):
+        return [legacy_parse_json_like(v) for v in value if legacy_parse_json_like(v) is not None]
+
+    if isinstance(value, str):
+        s = value.strip()
+        if not s or s.upper() in ["NA", "N/A", "NONE", "NULL"]:
+            return None
+        if s.startswith("{") or s.startswith("["):
+            try:
+                return legacy_parse_json_like(json.loads(s))
+            except Exception:
+                try:
+                    s_safe = s.replace("null", "None").replace("true", "True").replace("false", "False").replace("nan", "None")
+                    return legacy_parse_json_like(ast.literal_eval(s_safe))
+                except Exception:
+                    try:
+                        s_json = re.sub(r"'([^']*)'", r'"\1"', s)
+                        return legacy_parse_json_like(json.loads(s_json))
+                    except:
+                        return s
+        return s
+
+    return value
+
+
+# ==========================================
+# [0] 회귀: 저장값은 원본 그대로
+# ==========================================
+REGRESSION_CASES = [
+    # (입력, expand 결과)
+    ("{'Diagnosis': 'malignant neoplasm', 'Note': 'construe', 'Platform': 'nanopore'}",
+     {"Diagnosis": "malignant neoplasm", "Note": "construe", "Platform": "nanopore"}),
+    ({"msi_status": "NA", "variants": [], "tmb_score": 1.0},
+     {"msi_status": "NA", "variants": [], "tmb_score": 1.0}),
+    ("{'msi_status': 'NA', 'variants': [], 'comment': None, 'flag': True}",
+     {"msi_status": "NA", "variants": [], "comment": None, "flag": True}),
+    ('{"score": NaN}', '{"score": NaN}'),              # SQLite json 함수가 못 읽는 값은 문자열 그대로
+    ("{1: 'a'}", "{1: 'a'}"),                        # JSON 키로 바꾸면 값이 달라지므로 문자열 그대로
+    ("  PASS ", "  PASS "),
+]
+
+
+def run_regression():
+    failures = [(value, expected, expand(value)) for value, expected in REGRESSION_CASES if expand(value) != expected]
+    for value, expected, got in failures:
+        print(f"  ❌ {value!r:.80} → {got!r:.80} (기대 {expected!r:.80})")
+    print(f"regress {len(REGRESSION_CASES)} cases  {'✅' if not failures else f'❌ {len(failures)} failures'}")
+    return not failures
+
+
+# ==========================================
+# [1] fuzz
+# ==========================================
+def fuzz_value(rng, depth):
+    roll = rng.random()
+    if depth <= 0 or roll < 0.35:
+        return rng.choice([
+            lambda: rng.choice(EMPTY),
+            lambda: None,
+            lambda: rng.randint(-5, 5000),
+            lambda: round(rng.uniform(0, 100), 3),
+            lambda: rng.choice([True, False]),
+            lambda: f"  {rng.choice(GENES)} p.G{rng.randint(1, 999)}D ",
+            lambda: rng.choice(["PASS", "FAIL", "MSS", "[broken", "{not json", "[]", "{}"]),
+        ])()
+    if roll < 0.55:
+        return [fuzz_value(rng, depth - 1) for _ in range(rng.randint(0, 4))]
+    if roll < 0.8:
+        return {f"k{i}": fuzz_value(rng, depth - 1) for i in range(rng.randint(0, 4))}
+    inner = fuzz_value(rng, depth - 1)
+    # 문자열로 한 번 더 감싸기: JSON / python repr (작은따옴표, None, True)
+    return json.dumps(inner) if rng.random() < 0.5 else str(inner)
+
+
+# 예전 함수가 문자열 전체에서 바꿔치기하던 토큰 (값 안에 있으면 일부러 결과가 다르므로 legacy 비교에서 제외)
+LEGACY_REWRITES = re.compile(r"null|true|false|nan")
+
+
+def run_fuzz(n, seed, depth):
+    rng = random.Random(seed)
+    failures, skipped = [], 0
+    for i in range(n):
+        value = fuzz_value(rng, rng.randint(1, depth))
+        stored = expand(value)
+        comparable = not LEGACY_REWRITES.search(repr(value))
+        skipped += not comparable
+        checks = {
+            "legacy": not comparable or clean(value) == legacy_parse_json_like(value),
+            "idempotent": expand(stored) == stored,
+            "json": json.loads(json.dumps(stored)) == stored,
+            "display": clean(stored) == clean(value),
+        }
+        failures += [(i, name, value) for name, ok in checks.items() if not ok]
+    for i, name, value in failures[:5]:
+        print(f"  ❌ #{i} {name}: {value!r:.200}")
+    print(f"fuzz    {n:,} values (depth ≤ {depth}, legacy 비교 제외 {skipped:,})  "
+          f"{'✅' if not failures else f'❌ {len(failures)} failures'}")
+    return not failures
+
+
+# ==========================================
+# [2] TSO500 Results.json 모양
+# ==========================================
+def tso500_results(rng, n_variants, depth):
+    """depth 단계 중첩 (홀수 단계는 JSON 문자열로) — 맨 안쪽에 큰 목록들"""
+    inner = {
+        "Small_Variants": [{
+            "Gene": rng.choice(GENES), "Chromosome": f"chr{rng.randint(1, 22)}",
+            "Genomic_Position": rng.randint(1, 200_000_000), "Reference_Call": "C", "Alternative_Call": "T",
+            "Allele_Frequency": round(rng.random(), 4), "Depth": rng.randint(50, 2000),
+            "P_Dot_Notation": f"p.(Gly{rng.randint(1, 999)}Asp)", "C_Dot_Notation": f"c.{rng.randint(1, 3000)}G>A",
+            "Consequences": "missense_variant", "Transcript": "NA", "Exon": rng.choice(["NA", str(rng.randint(1, 20))]),
+        } for _ in range(n_variants)],
+        "Gene_Amplifications": [{"Gene": g, "Fold_Change": round(rng.uniform(1, 8), 2)} for g in GENES],
+        "Fusions": "[]",
+        "Splice_Variants": "NA",
+    }
+    for level in range(depth):
+        inner = {
+            "Header": {"Run_ID": f"RUN-{level}", "Pipeline": "TSO500 v2.2", "Notes": "NA"},
+            "TMB": json.dumps({"TMB": round(rng.uniform(0, 30), 2), "Nonsynonymous_TMB": "N/A"}),
+            "MSI": str({"Percent_Unstable_Sites": 3.1, "Status": "MSS", "Comment": None}),
+            "QC": {f"metric{k}": {"LSL": 0, "USL": 100, "value": rng.randint(0, 100)} for k in range(20)},
+            "Analysis_Details": json.dumps(inner) if level % 2 == 0 else inner,
+        }
+    return inner
+
+
+def count_nodes(value):
+    if isinstance(value, dict):
+        return 1 + sum(count_nodes(v) for v in value.values())
+    if isinstance(value, list):
+        return 1 + sum(count_nodes(v) for v in value)
+    return 1
+
+
+def timed(fn, repeat):
+    times = []
+    out = None
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    return out, statistics.median(times)
+
+
+def measure(label, payload, args, legacy_on):
+    """→ (clean ns/B, 예전 함수를 계속 잴지, 결과가 같았는지)"""
+    size = len(json.dumps(payload))
+    stored, t_expand = timed(lambda: expand(payload), args.repeat)
+    new, t_new = timed(lambda: clean(payload), args.repeat)
+    same = clean(stored) == new
+    cell = (f"{label:<12} {size / 1024:9,.0f} KB  {count_nodes(new):>9,} nodes  "
+            f"expand {t_expand * 1000:9.2f} ms  clean {t_new * 1000:9.2f} ms")
+    if legacy_on:
+        old, t_old = timed(lambda: legacy_parse_json_like(payload), 1)
+        same &= old == new
+        cell += f"  legacy {t_old * 1000:11.1f} ms ({t_old / t_new:7,.0f}x){'' if same else '  ❌ 결과 다름'}"
+        legacy_on = t_old <= args.legacy_budget
+    else:
+        cell += "  legacy    (생략: 예산 초과)"
+    print(cell)
+    return t_new * 1e9 / size, legacy_on, same
+
+
+def main(args):
+    ok = run_regression()
+    ok &= run_fuzz(args.fuzz, args.seed, args.fuzz_depth)
+    rng = random.Random(args.seed)
+    sweeps = {
+        f"depth sweep ({args.variants} variants)":
+            [(f"depth {d}", lambda d=d: tso500_results(rng, args.variants, d)) for d in range(1, args.max_depth + 1)],
+        "size sweep (depth 3)":
+            [(f"{n:,} var", lambda n=n: tso500_results(rng, n, 3))
+             for n in (args.variants, args.variants * 10, args.variants * 100)],
+    }
+    linear = True
+    for title, cases in sweeps.items():
+        print(f"\n{title}")
+        per_byte, legacy_on = [], True
+        for label, make in cases:
+            ns, legacy_on, same = measure(label, make(), args, legacy_on)
+            per_byte.append(ns)
+            ok &= same
+        growth = max(per_byte) / per_byte[0]
+        linear &= growth <= args.tolerance
+        print(f"  clean {per_byte[0]:.1f} ns/B → 최대 {max(per_byte):.1f} ns/B (x{growth:.2f})  "
+              f"{'✅ 선형' if growth <= args.tolerance else f'❌ 허용 x{args.tolerance} 초과'}")
+    if not (ok and linear):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="분석 결과 정규화: expand / clean 단일 패스 vs 예전 parse_json_like")
+    parser.add_argument("--fuzz", type=int, default=2000, help="fuzz 값 개수")
+    parser.add_argument("--fuzz-depth", type=int, default=6, help="fuzz 값 최대 중첩 깊이")
+    parser.add_argument("--max-depth", type=int, default=12, help="TSO500 결과 최대 중첩 깊이")
+    parser.add_argument("--variants", type=int, default=500, help="Small_Variants 행 수 (depth sweep)")
+    parser.add_argument("--legacy-budget", type=float, default=2.0, help="예전 함수 한 번에 쓸 최대 초")
+    parser.add_argument("--tolerance", type=float, default=3.0, help="ns/B 가 첫 입력 대비 늘어나도 되는 최대 배수")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (중앙값)")
+    parser.add_argument("--seed", type=int, default=25)
+    main(parser.parse_args())
@@ -0,0 +1,163 @@
+"""
+분석 결과 저장 방식 측정: analysis_results 한 칸에 전부 vs 큰 섹션을 analysis_blobs 로 분리 (app/core/result_store.py).
+
+임시 SQLite DB 두 개에 같은 run 을 적재합니다 (--samples 개, 절반 TSO500 / 절반 WTS,
+샘플당 변이 --variants 개, WTS 는 fusion 50 개 + 발현 --expression 개).
+    1) inline : 예전처럼 전부 analysis_results 에 (result_store.MIN_BYTES 를 무한대로)
+    2) blobs  : 큰 섹션은 압축해서 analysis_blobs 로
+단계마다 걸린 시간을 출력합니다.
+    ingest  : ingest_results 로 적재 + commit
+    list    : 목록 화면처럼 Sample + analysis 를 joinedload 로 전부 읽기 (섹션은 안 읽음)
+    webhook : merge_webhook_results 로 샘플마다 작은 값 하나 갱신
+    report  : full_results 로 섹션까지 전부 읽기 (처음 / 캐시 후)
+DB 파일 크기도 비교하고, 읽은 섹션이 적재한 값과 다르면 종료 코드 1 로 끝납니다.
+
+실행 (ngs_web_lims 디렉터리에서):
+    python -m app.scripts.bench_result_store
+    python -m app.scripts.bench_result_store --samples 96 --variants 5000 --expression 20000
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from app.api.analysis_api import AnalysisPayload
+from app.core import result_store
+from app.core.analysis_ingest import ingest_results, merge_webhook_results
+from app.core.db_profile import create_lims_engine
+from app.core.migrations import upgrade
+from app.models._schema import Order, Sample
+
+ORDER_ID = "GCX-C01-260101-01"
+GENES = ["KRAS", "EGFR", "TP53", "PIK3CA", "BRAF", "ERBB2", "ALK", "MET", "NRAS", "IDH1", "BRCA1", "BRCA2"]
+CONSEQUENCES = ["missense_variant", "synonymous_variant", "frameshift_variant", "stop_gained", "splice_region_variant"]
+
+
+def make_payloads(args):
+    rng = random.Random(7)
+    payloads = []
+    for i in range(args.samples):
+        sample_id = f"ACC-260101-01-{i + 1:03d}-{'DNA' if i % 2 == 0 else 'RNA'}"
+        if i % 2 == 0:
+            results = {
+                "analysis_type": "TSO500", "tumor_purity": 0.4, "tmb_score": round(rng.uniform(0, 30), 2),
+                "msi_status": "MSS", "mapped_reads_pct": 98.2,
+                "variants": [{"gene": rng.choice(GENES), "chrom": f"chr{rng.randint(1, 22)}",
+                              "pos": rng.randint(1, 200_000_000), "ref": rng.choice("ACGT"), "alt": rng.choice("ACGT"),
+                              "hgvs_c": f"c.{rng.randint(1, 3000)}G>A", "hgvs_p": f"p.G{rng.randint(1, 999)}D",
+                              "vaf": round(rng.random(), 4), "depth": rng.randint(50, 2000),
+                              "consequence": rng.choice(CONSEQUENCES), "transcript": f"NM_{rng.randint(1, 999999):06d}.4"}
+                             for _ in range(args.variants)],
+            }
+        else:
+            results = {
+                "analysis_type": "WTS", "rin_score": 7.5, "mapping_rate": 91.3,
+                "fusions": [{"gene_pair": f"{rng.choice(GENES)}-{rng.choice(GENES)}",
+                             "supporting_reads": rng.randint(1, 500)} for _ in range(50)],
+                "expression_profile": [{"gene": f"GENE{k}", "tpm": round(rng.expovariate(0.05), 3)}
+                                       for k in range(args.expression)],
+            }
+        payloads.append({"batch_id": "RUN-1", "order_id": ORDER_ID, "sample_id": sample_id,
+                         "pipeline_version": "v2.2.0", "results": results})
+    return payloads
+
+
+def seed(Session, payloads):
+    with Session() as db:
+        order = Order(order_id=ORDER_ID, facility="GCX", client_team="NGS", client_name="bench",
+                      reception_date=date(2026, 1, 1))
+        db.add(order)
+        db.flush()
+        db.add_all(Sample(order_pk=order.id, order_id=ORDER_ID, sample_id=p["sample_id"], sample_name=p["sample_id"],
+                          target_panel="TSO500", current_status="분석 진행", panel_metadata={}) for p in payloads)
+        db.commit()
+
+
+def timed(fn):
+    gc.collect()
+    t0 = time.perf_counter()
+    out = fn()
+    return out, (time.perf_counter() - t0) * 1000
+
+
+def run(label, min_bytes, payloads, work_dir):
+    result_store.MIN_BYTES = min_bytes
+    result_store._cache.clear()
+    result_store._cache_size = 0
+    path = os.path.join(work_dir, f"{label}.db")
+    engine = create_lims_engine(f"sqlite:///{path}")
+    upgrade(engine, "app.migrations", log=lambda msg: None)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    seed(Session, payloads)
+    models = [AnalysisPayload.model_validate(p) for p in payloads]
+
+    def _ingest():
+        with Session() as db:
+            ingest_results(db, models)
+            db.commit()
+
+    def _list():
+        with Session() as db:
+            samples = db.query(Sample).options(joinedload(Sample.analysis)).all()
+            return sum(s.analysis.tmb_score or 0 for s in samples)
+
+    def _webhook():
+        with Session() as db:
+            merge_webhook_results(db, [{"sample_id": p["sample_id"], "results": {"qc_status": "PASS"}}
+                                       for p in payloads])
+            db.commit()
+
+    def _report():
+        with Session() as db:
+            samples = db.query(Sample).options(joinedload(Sample.analysis)).order_by(Sample.id).all()
+            return [result_store.full_results(s.analysis) for s in samples]
+
+    times = {}
+    _, times["ingest"] = timed(_ingest)
+    _, times["list"] = timed(_list)
+    _, times["webhook"] = timed(_webhook)
+    loaded, times["report"] = timed(_report)
+    _, times["report(cache)"] = timed(_report)
+
+    ok = True
+    for payload, results in zip(payloads, loaded):
+        expected = payload["results"]
+        ok &= results.get("qc_status") == "PASS"
+        ok &= all(results.get(k) == v for k, v in expected.items())
+
+    with engine.connect() as conn:
+        conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        blob_rows = conn.execute(text("SELECT COUNT(*) FROM analysis_blobs")).scalar()
+    size_mb = os.path.getsize(path) / 1024 / 1024
+    engine.dispose()
+
+    cells = "  ".join(f"{k} {v:8.1f} ms" for k, v in times.items())
+    print(f"{label:<7} {cells}  db {size_mb:6.1f} MB  blobs {blob_rows:<4} {'✅' if ok else '❌'}")
+    return ok
+
+
+def main(args):
+    work_dir = tempfile.mkdtemp(prefix="lims_blobs_")
+    payloads = make_payloads(args)
+    codec = result_store.CODEC_ZSTD if result_store.zstandard is not None else result_store.CODEC_ZLIB
+    print(f"{args.samples} samples, {args.variants} variants / {args.expression} expression rows, codec {codec}\n")
+    min_bytes = result_store.MIN_BYTES
+    ok = run("inline", float("inf"), payloads, work_dir)
+    ok &= run("blobs", min_bytes, payloads, work_dir)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="분석 결과 저장: JSON 한 칸 vs 큰 섹션 blob 분리")
+    parser.add_argument("--samples", type=int, default=48, help="run 하나의 샘플 수")
+    parser.add_argument("--variants", type=int, default=2000, help="DNA 샘플당 변이 수")
+    parser.add_argument("--expression", type=int, default=10000, help="RNA 샘플당 발현 행 수")
+    main(parser.parse_args())
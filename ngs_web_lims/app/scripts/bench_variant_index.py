@@ -0,0 +1,174 @@
+"""
+샘플 간 변이 검색 측정: variants 테이블 인덱스 조회 vs analysis_results JSON 전체 디코드 + 필터.
+
+임시 SQLite DB 에 샘플 --samples 개, 변이 --rows 행(기본 1,000 만)을 넣습니다.
+KRAS G12C 는 --hotspot-rate 비율의 샘플에만 심어 두고 아래 조회를 --repeat 번씩 재서 중앙값을 출력합니다.
+    samples(KRAS G12C)  : variant_index.samples_with(gene, protein)   — (gene, protein_change) 인덱스
+    region(chr12 1kb)   : variant_index.search(chrom, pos_from, pos_to) — (chrom, pos) 인덱스
+    sample(all)         : variant_index.search(sample_id)              — (sample_id) 인덱스
+    gene(TP53, vaf≥0.3) : variant_index.search(gene, min_vaf) 첫 페이지
+비교용으로 샘플 --legacy-samples 개는 변이를 analysis_results JSON 에도 넣고,
+"JSON 을 전부 읽어 디코드 → KRAS G12C 필터" 시간을 재서 전체 샘플 수로 환산합니다.
+찾은 G12C 샘플 수가 심은 수와 다르면 종료 코드 1 로 끝납니다.
+
+실행 (ngs_web_lims 디렉터리에서):
+    python -m app.scripts.bench_variant_index                          # 1,000 만 행 (적재에 수 분)
+    python -m app.scripts.bench_variant_index --rows 1000000 --samples 2000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.core import variant_index
+from app.core.db_profile import create_lims_engine
+from app.core.migrations import upgrade
+from app.models._schema import Analysis, Order, Sample
+
+ORDER_ID = "GCX-C01-260101-01"
+GENES = ["TP53", "EGFR", "PIK3CA", "BRAF", "ERBB2", "ALK", "MET", "NRAS", "IDH1", "BRCA1", "BRCA2", "APC",
+         "PTEN", "ARID1A", "KMT2D", "NOTCH1", "ATM", "RB1", "CDKN2A", "SMAD4"] + [f"GENE{i}" for i in range(480)]
+CONSEQUENCES = ["missense_variant", "synonymous_variant", "frameshift_variant", "stop_gained", "intron_variant"]
+CHROMS = [f"chr{c}" for c in list(range(1, 23)) + ["X"]]
+
+
+def seed_samples(Session, n_samples):
+    with Session() as db:
+        order = Order(order_id=ORDER_ID, facility="GCX", client_team="NGS", client_name="bench",
+                      reception_date=date(2026, 1, 1))
+        db.add(order)
+        db.flush()
+        db.bulk_insert_mappings(Sample, [
+            {"order_pk": order.id, "order_id": ORDER_ID, "sample_id": f"ACC-260101-{i // 1000:02d}-{i % 1000:04d}-DNA",
+             "sample_name": f"S{i}", "target_panel": "TSO500", "current_status": "분석 완료", "panel_metadata": {}}
+            for i in range(n_samples)])
+        db.commit()
+        return [pk for (pk,) in db.query(Sample.id).order_by(Sample.id)]
+
+
+def sample_variants(rng, sample_pk, n, hotspot):
+    """샘플 하나의 변이 (원본 TSO500 필드 이름) — hotspot 이면 KRAS G12C 포함"""
+    rows = []
+    for k in range(n):
+        if hotspot and k == 0:
+            gene, chrom, pos, prot = "KRAS", "12", 25245350, "p.(Gly12Cys)"
+        else:
+            gene = rng.choice(GENES)
+            chrom, pos = rng.choice(CHROMS)[3:], rng.randint(1, 200_000_000)
+            prot = f"p.(Ala{rng.randint(1, 999)}Val)"
+        rows.append({"Gene": gene, "Chromosome": chrom, "Genomic_Position": pos, "Reference_Call": "C",
+                     "Alternative_Call": "T", "Allele_Frequency": round(rng.random(), 4), "Depth": rng.randint(50, 2000),
+                     "Consequences": rng.choice(CONSEQUENCES), "P_Dot_Notation": prot})
+    return rows
+
+
+def load(Session, sample_pks, args):
+    """변이를 variants 에 (to_row 로 변환해서) 넣고, 앞쪽 --legacy-samples 개는 analysis_results JSON 에도"""
+    rng = random.Random(11)
+    per_sample = max(1, args.rows // len(sample_pks))
+    planted, batch, legacy = 0, [], []
+    t0 = time.perf_counter()
+    with Session() as db:
+        for i, pk in enumerate(sample_pks):
+            hotspot = rng.random() < args.hotspot_rate
+            planted += hotspot
+            raw = sample_variants(rng, pk, per_sample, hotspot)
+            batch.extend(variant_index.to_row(pk, v) for v in raw)
+            if i < args.legacy_samples:
+                legacy.append({"sample_id": pk, "analysis_status": "분석 완료",
+                               "analysis_results": {"analysis_type": "TSO500", "variants": raw}})
+            if len(batch) >= 200_000:
+                variant_index.insert_variants(db, batch)
+                db.commit()
+                batch = []
+                done = (i + 1) * per_sample
+                print(f"\r  loading {done:>12,} rows  {done / (time.perf_counter() - t0):9,.0f} rows/s", end="", flush=True)
+        variant_index.insert_variants(db, batch)
+        db.bulk_insert_mappings(Analysis, legacy)
+        db.commit()
+    elapsed = time.perf_counter() - t0
+    total = per_sample * len(sample_pks)
+    print(f"\r  loaded {total:,} rows in {elapsed:.0f} s ({total / elapsed:,.0f} rows/s){' ' * 20}")
+    return planted
+
+
+def median_ms(fn, repeat):
+    times = []
+    out = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return out, statistics.median(times)
+
+
+def legacy_scan(Session, n):
+    """예전 방식: analysis_results 를 전부 읽고 JSON 디코드 후 KRAS G12C 필터"""
+    hits = 0
+    with Session() as db:
+        for (raw,) in db.query(Analysis.analysis_results).limit(n).yield_per(200):
+            data = json.loads(raw) if isinstance(raw, str) else raw
+            hits += any(v.get("Gene") == "KRAS" and "Gly12Cys" in str(v.get("P_Dot_Notation"))
+                        for v in data.get("variants", []))
+    return hits
+
+
+def main(args):
+    work_dir = tempfile.mkdtemp(prefix="lims_variants_")
+    path = os.path.join(work_dir, "variants.db")
+    engine = create_lims_engine(f"sqlite:///{path}")
+    upgrade(engine, "app.migrations", log=lambda msg: None)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    print(f"{args.rows:,} variant rows over {args.samples:,} samples → {path}")
+    sample_pks = seed_samples(Session, args.samples)
+    planted = load(Session, sample_pks, args)
+    with engine.connect() as conn:
+        conn.execute(text("ANALYZE"))
+        conn.commit()
+    print(f"  db {os.path.getsize(path) / 1024 / 1024:,.0f} MB, KRAS G12C planted in {planted:,} samples\n")
+
+    some_sample = f"ACC-260101-{(args.samples // 2) // 1000:02d}-{(args.samples // 2) % 1000:04d}-DNA"
+    queries = [
+        ("samples(KRAS G12C)", lambda db: variant_index.samples_with(db, gene="KRAS", protein="G12C",
+                                                                     limit=variant_index.MAX_LIMIT)),
+        ("region(chr12 1kb)", lambda db: variant_index.search(db, chrom="12", pos_from=25_245_000,
+                                                             pos_to=25_246_000, limit=200)),
+        ("sample(all)", lambda db: variant_index.search(db, sample_id=some_sample, limit=variant_index.MAX_LIMIT)),
+        ("gene(TP53, vaf≥0.3)", lambda db: variant_index.search(db, gene="TP53", min_vaf=0.3, limit=200)),
+    ]
+    ok = True
+    with Session() as db:
+        for label, fn in queries:
+            rows, ms = median_ms(lambda: fn(db), args.repeat)
+            print(f"{label:<22} {ms:9.2f} ms  {len(rows):>6} rows")
+            if label.startswith("samples"):
+                ok &= len(rows) == min(planted, variant_index.MAX_LIMIT)
+
+    n_legacy = min(args.legacy_samples, args.samples)
+    if n_legacy:
+        hits, ms = median_ms(lambda: legacy_scan(Session, n_legacy), 1)
+        print(f"\njson scan {n_legacy:,} samples  {ms:9.1f} ms  ({hits} hits)"
+              f"  → {args.samples:,} samples ≈ {ms / n_legacy * args.samples / 1000:,.1f} s")
+    engine.dispose()
+    print("✅" if ok else "❌ G12C 샘플 수가 심은 수와 다릅니다")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="샘플 간 변이 검색: variants 인덱스 vs JSON 스캔")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="전체 변이 행 수")
+    parser.add_argument("--samples", type=int, default=20_000, help="샘플 수")
+    parser.add_argument("--hotspot-rate", type=float, default=0.02, help="KRAS G12C 를 심을 샘플 비율")
+    parser.add_argument("--legacy-samples", type=int, default=1000, help="JSON 스캔 비교에 쓸 샘플 수")
+    parser.add_argument("--repeat", type=int, default=5, help="조회 반복 횟수 (중앙값)")
+    main(parser.parse_args())
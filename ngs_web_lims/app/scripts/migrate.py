@@ -0,0 +1,46 @@
+"""
+스키마 마이그레이션 실행 스크립트.
+
+실행 (ngs_web_lims 디렉터리에서, LIMS_DATABASE_URL 기준 DB):
+    python -m app.scripts.migrate               # 밀린 revision 적용
+    python -m app.scripts.migrate --dry-run     # 적용될 revision 만 출력
+    python -m app.scripts.migrate --history     # 적용 이력
+    python -m app.scripts.migrate --stamp 0002  # DDL 없이 0002 까지 적용된 것으로 기록
+"""
+import argparse
+
+from app.core.database import MIGRATIONS_PACKAGE, maintenance_engine
+from app.core.migrations import history, stamp, upgrade
+
+
+def main(args, engine):
+    print(f"DB: {engine.url.render_as_string(hide_password=True)}")
+
+    if args.history:
+        for revision, description, applied_at in history(engine, MIGRATIONS_PACKAGE):
+            mark = f"✅ {applied_at:%Y-%m-%d %H:%M:%S}" if applied_at else "⏳ 미적용"
+            print(f"  [{revision}] {description:<50} {mark}")
+        return
+
+    if args.stamp:
+        stamped = stamp(engine, MIGRATIONS_PACKAGE, args.stamp)
+        print(f"기록 완료: {', '.join(rev.revision for rev in stamped) or '변경 없음'}")
+        return
+
+    pending = upgrade(engine, MIGRATIONS_PACKAGE, dry_run=args.dry_run)
+    if not pending:
+        print("스키마가 이미 최신입니다.")
+    elif args.dry_run:
+        print(f"DRY-RUN: {len(pending)}개 revision 이 적용 대기 중입니다.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LIMS 스키마 마이그레이션")
+    parser.add_argument("--dry-run", action="store_true", help="적용하지 않고 대기 중인 revision 만 출력")
+    parser.add_argument("--history", action="store_true", help="revision 적용 이력 출력")
+    parser.add_argument("--stamp", metavar="REVISION", help="DDL 없이 해당 revision 까지 적용된 것으로 기록")
+    engine = maintenance_engine()   # DDL / backfill 이 PostgreSQL statement·lock 타임아웃에 걸리지 않도록
+    try:
+        main(parser.parse_args(), engine)
+    finally:
+        engine.dispose()
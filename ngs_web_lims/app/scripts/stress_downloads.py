@@ -0,0 +1,184 @@
+"""
+Raw Data 다운로드 관리자(app/core/downloads.py) 점검 / 측정.
+
+로컬에 Range 를 지원하는 가짜 FASTQ 서버를 띄우고 임시 DB 에 작업을 등록해 받습니다.
+    - 서버는 연결당 전송 속도를 --rate-mb MB/s 로 제한하고 (외부 업체 서버 흉내)
+      요청의 --fail-rate 비율만큼 전송 도중 연결을 끊거나 503 을 돌려줍니다.
+    - 파일 --bad-md5 개는 일부러 틀린 MD5 를 넣어 'MD5 불일치' 로 끝나는지 봅니다.
+    1) serial : 워커 1개 (예전 wget 스크립트처럼 차례로)
+    2) pool   : 워커 --workers 개
+각각 걸린 시간 / 재시도 / Range 이어받기 횟수를 출력하고, 받은 파일의 MD5 가 원본과 같은지 검사합니다.
+실패가 있으면 종료 코드 1 로 끝납니다.
+
+실행 (ngs_web_lims 디렉터리에서):
+    python -m app.scripts.stress_downloads
+    python -m app.scripts.stress_downloads --files 32 --size-mb 16 --workers 8 --fail-rate 0.3
+"""
+import argparse
+import hashlib
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.db_profile import create_lims_engine
+from app.core import downloads
+from app.core.downloads import DONE, MD5_MISMATCH, DownloadManager, enqueue
+from app.core.migrations import upgrade
+from app.models._schema import DownloadTask
+
+
+# ==========================================
+# [1] 가짜 FASTQ 서버 (Range / 속도 제한 / 장애 주입)
+# ==========================================
+class FastqHandler(BaseHTTPRequestHandler):
+    files = {}          # "/S001_R1.fastq.gz" → bytes
+    rate = 0            # bytes/s (0 = 무제한)
+    fail_rate = 0.0
+    stats = {"requests": 0, "ranges": 0, "drops": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body = self.files.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        start = 0
+        m = re.match(r"bytes=(\d+)-", self.headers.get("Range", ""))
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["ranges"] += bool(m)
+            fault = random.random() < self.fail_rate
+            error = fault and random.random() < 0.3   # 장애 중 30% 는 503, 나머지는 전송 도중 끊기
+            self.stats["errors" if error else "drops"] += fault
+        if m:
+            start = int(m.group(1))
+            if start >= len(body):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(body)}")
+                self.end_headers()
+                return
+        if error:
+            self.send_error(503)
+            return
+
+        self.send_response(206 if m else 200)
+        if m:
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        self.send_header("Content-Length", str(len(body) - start))
+        self.end_headers()
+
+        cut = start + int((len(body) - start) * random.uniform(0.1, 0.9)) if fault else len(body)
+        step = 64 * 1024
+        for pos in range(start, cut, step):
+            self.wfile.write(body[pos:min(pos + step, cut)])
+            if self.rate:
+                time.sleep(step / self.rate)
+        if fault:
+            self.close_connection = True  # 도중에 끊기 (Content-Length 보다 적게 보냄)
+
+
+def start_server(files, rate_mb, fail_rate):
+    FastqHandler.files = files
+    FastqHandler.rate = int(rate_mb * 1024 * 1024)
+    FastqHandler.fail_rate = fail_rate
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FastqHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ==========================================
+# [2] 실행 / 검증
+# ==========================================
+def run(label, url, workers, rows, files, bad_rows, args):
+    work_dir = tempfile.mkdtemp(prefix=f"lims_dl_{label}_")
+    engine = create_lims_engine(f"sqlite:///{os.path.join(work_dir, 'dl.db')}")
+    upgrade(engine, "app.migrations", log=lambda msg: None)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    downloads.LOG_PATH = os.path.join(work_dir, "download_log.txt")  # 콘솔 로그도 임시 폴더로
+    rows = [{**r, "fastq_r1": os.path.join(work_dir, r["fastq_r1"]), "fastq_r2": os.path.join(work_dir, r["fastq_r2"])}
+            for r in rows]
+
+    FastqHandler.stats.update(requests=0, ranges=0, drops=0, errors=0)
+    manager = DownloadManager(Session, workers=workers, max_attempts=args.attempts, backoff_s=0.05)
+    t0 = time.perf_counter()
+    with Session() as db:
+        summary = enqueue(db, rows)
+        db.commit()
+    manager.submit(summary["queued"])
+    manager.join()
+    elapsed = time.perf_counter() - t0
+
+    with Session() as db:
+        tasks = db.query(DownloadTask).all()
+    engine.dispose()
+
+    ok = True
+    for t in tasks:
+        bad = t.sample_id in bad_rows and t.read == "R1"
+        if bad:
+            ok &= t.status == MD5_MISMATCH and not os.path.exists(t.dest_path)
+            continue
+        source = files[f"/{t.sample_id}_{t.read}.fastq.gz"]
+        with open(t.dest_path, "rb") as f:
+            ok &= t.status == DONE and hashlib.md5(f.read()).hexdigest() == hashlib.md5(source).hexdigest()
+
+    total_mb = sum(len(b) for b in files.values()) / 1024 / 1024
+    retries = sum(t.attempts - 1 for t in tasks if t.attempts)
+    s = FastqHandler.stats
+    print(f"{label:<7} {workers:>3} workers {elapsed:7.2f} s  {total_mb / elapsed:7.1f} MB/s  "
+          f"retries={retries} range-resume={s['ranges']} drops={s['drops']} 503={s['errors']}  "
+          f"{'✅' if ok else '❌'}")
+    return ok, elapsed
+
+
+def main(args):
+    random.seed(args.seed)
+    size = int(args.size_mb * 1024 * 1024)
+    samples = [f"ACC-260101-01-{i + 1:03d}-DNA" for i in range(args.files // 2)]
+    files = {f"/{sid}_{read}.fastq.gz": random.randbytes(size) for sid in samples for read in ("R1", "R2")}
+    server = start_server(files, args.rate_mb, args.fail_rate)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    bad_rows = set(samples[:args.bad_md5])
+    rows = []
+    for sid in samples:
+        md5 = {read: hashlib.md5(files[f"/{sid}_{read}.fastq.gz"]).hexdigest() for read in ("R1", "R2")}
+        rows.append({
+            "sample_id": sid,
+            "download_link": f"{url}/{sid}_R1.fastq.gz {url}/{sid}_R2.fastq.gz",
+            "fastq_r1": f"raw/{sid}_R1.fastq.gz", "md5_r1": "0" * 32 if sid in bad_rows else md5["R1"],
+            "fastq_r2": f"raw/{sid}_R2.fastq.gz", "md5_r2": md5["R2"],
+        })
+
+    print(f"{len(files)} files × {args.size_mb} MB, {args.rate_mb} MB/s per connection, "
+          f"fail-rate {args.fail_rate}, bad md5 {len(bad_rows)}\n")
+    ok_serial, serial_s = run("serial", url, 1, rows, files, bad_rows, args)
+    ok_pool, pool_s = run("pool", url, args.workers, rows, files, bad_rows, args)
+    print(f"\npool / serial = x{serial_s / pool_s:.1f}")
+    server.shutdown()
+    if not (ok_serial and ok_pool):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Raw Data 다운로드 관리자 점검 (로컬 가짜 서버)")
+    parser.add_argument("--files", type=int, default=16, help="파일 수 (샘플당 R1 / R2 두 개)")
+    parser.add_argument("--size-mb", type=float, default=4, help="파일 크기 (MB)")
+    parser.add_argument("--rate-mb", type=float, default=16, help="연결당 전송 속도 제한 (MB/s, 0 = 무제한)")
+    parser.add_argument("--workers", type=int, default=4, help="pool 워커 수")
+    parser.add_argument("--fail-rate", type=float, default=0.2, help="요청 중 끊기 / 503 비율")
+    parser.add_argument("--bad-md5", type=int, default=1, help="일부러 틀린 MD5 를 넣을 샘플 수 (R1)")
+    parser.add_argument("--attempts", type=int, default=8, help="파일당 최대 시도 횟수")
+    parser.add_argument("--seed", type=int, default=7)
+    main(parser.parse_args())
@@ -78,6 +78,7 @@ def create_navbar():
                     children=[
                         dbc.DropdownMenuItem("Analysis Board", href="/analysis/", external_link=True),
                         dbc.DropdownMenuItem("Analysis Reivew", href="/check_results/", external_link=True),
+                        dbc.DropdownMenuItem("Variant Search", href="/variants/", external_link=True),
                     ],
                     nav=True, in_navbar=True,
                 ),
@@ -0,0 +1,6 @@
+# tests/conftest.py
+"""ngs_web_lims 디렉터리에서 `python -m pytest` 로 실행합니다 (app 패키지를 import 할 수 있도록 경로 추가)."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
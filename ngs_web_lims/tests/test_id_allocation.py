@@ -0,0 +1,27 @@
+# tests/test_id_allocation.py
+"""
+ID 채번 동시성 테스트 (app/scripts/stress_id_allocation.py 의 부하를 작게).
+
+임시 SQLite 파일에 여러 프로세스가 동시에
+    - 신규 등록 흐름(Order seq 발급 → Order + 샘플 INSERT → 커밋)과
+    - 플레이트 단위 일괄 예약(reserve)
+을 반복한 뒤, 발급된 번호가 중복 / 누락 없이 1..N 이고 중복 ID 로 인한 IntegrityError 가 없는지 확인합니다.
+"""
+from app.scripts.stress_id_allocation import run, sequence_problems
+
+WORKERS = 4
+ROUNDS = 10
+PLATE = 8
+
+
+def test_concurrent_allocation_has_no_duplicates_or_gaps(tmp_path):
+    result = run(f"sqlite:///{tmp_path / 'stress.db'}", WORKERS, ROUNDS, PLATE)
+    total = WORKERS * ROUNDS
+
+    assert result["failures"] == 0
+    assert sequence_problems(result["order_seqs"], total) == (0, [])
+    assert sequence_problems(result["plate_values"], total * PLATE) == (0, [])
+
+
+def test_sequence_problems_reports_duplicates_and_gaps():
+    assert sequence_problems([1, 2, 2, 4], 4) == (1, [3])
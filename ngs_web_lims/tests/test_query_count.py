@@ -0,0 +1,80 @@
+# tests/test_query_count.py
+"""
+페이지 조회 경로(app/core/repository.py)의 SQL 실행 횟수 회귀 테스트 (N+1 감지).
+
+app/scripts/bench_query_count.py 와 같은 합성 데이터 / 조회 패턴을 샘플 수 두 가지로 돌려서
+    - 경로마다 실행된 문장 수가 MAX_QUERIES 이하이고
+    - 샘플 수가 늘어도 문장 수가 같아야 통과합니다.
+문장 수는 엔진의 before_cursor_execute 리스너로 셉니다.
+"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models._schema import Base
+from app.scripts.bench_query_count import SCENARIOS, seed
+
+SIZES = (20, 200)
+
+# 경로별 허용 문장 수 (repository 를 바꿔서 늘어나면 여기를 같이 고치고 이유를 남길 것)
+MAX_QUERIES = {
+    "master_board": 1,        # contains_eager: 1:1 관계 4개를 한 SELECT 에
+    "master_delete": 3,       # PK 조회 + 샘플 그래프 + logs selectinload
+    "kanban": 1,              # (order, status) GROUP BY 한 번
+    "project_view": 4,        # 요약 2회(GROUP BY) + Order 1 + 샘플 selectinload
+    "kanban_render": 2,       # orders_with_samples: Order + 샘플 selectinload
+    "data_registration": 2,   # sample_id 조회 + samples_by_sample_ids
+    "qc_report": 1,
+    "analysis_setup": 1,
+    "clinical_report": 1,
+}
+
+
+@contextmanager
+def count_statements(engine):
+    counter = {"n": 0}
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        counter["n"] += 1
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+
+@pytest.fixture(scope="module")
+def databases(tmp_path_factory):
+    """{샘플 수: (engine, Session)} — 크기마다 한 번만 만들어 모든 경로가 같이 씀"""
+    out = {}
+    for n in SIZES:
+        path = tmp_path_factory.mktemp("query_count") / f"lims_{n}.db"
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        with Session() as db:
+            seed(db, n)
+        out[n] = (engine, Session)
+    yield out
+    for engine, _ in out.values():
+        engine.dispose()
+
+
+def run_counted(engine, Session, scenario):
+    with Session() as db, count_statements(engine) as counter:
+        scenario(db)
+    return counter["n"]
+
+
+def test_every_scenario_has_a_bound():
+    assert set(MAX_QUERIES) == set(SCENARIOS)
+
+
+@pytest.mark.parametrize("name", list(SCENARIOS))
+def test_query_count(databases, name):
+    counts = {n: run_counted(engine, Session, SCENARIOS[name]) for n, (engine, Session) in databases.items()}
+    assert max(counts.values()) <= MAX_QUERIES[name], f"{name}: 허용 {MAX_QUERIES[name]}회, 실제 {counts}"
+    assert len(set(counts.values())) == 1, f"{name}: 샘플 수에 따라 문장 수가 달라짐 {counts}"
@@ -0,0 +1,26 @@
+# tests/test_shared_modules.py
+"""
+ngs_web_lims / lims 두 앱에 똑같이 복사해 두는 모듈이 서로 어긋나지 않았는지 확인합니다.
+두 앱은 각자 `app` 패키지로 따로 배포되어 공유 패키지가 없으므로, 한쪽만 고치면 여기서 실패합니다.
+"""
+import filecmp
+import os
+
+import pytest
+
+NGS_APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+LIMS_APP = os.path.join(os.path.dirname(os.path.dirname(NGS_APP)), "lims", "app")
+
+SHARED_MODULES = (
+    "core/checksum.py",
+    "core/db_profile.py",
+    "core/id_allocator.py",
+    "core/migrations.py",
+)
+
+
+@pytest.mark.skipif(not os.path.isdir(LIMS_APP), reason="lims 앱이 같은 저장소에 없음")
+@pytest.mark.parametrize("module", SHARED_MODULES)
+def test_shared_module_is_identical(module):
+    ngs, lims = os.path.join(NGS_APP, module), os.path.join(LIMS_APP, module)
+    assert filecmp.cmp(ngs, lims, shallow=False), f"{module} 가 ngs_web_lims 와 lims 에서 다릅니다. 양쪽을 같게 맞추세요."